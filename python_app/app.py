@@ -3,10 +3,12 @@ import time
 import json
 import urllib3
 import random
+import threading
 import subprocess
 import binascii  # 新增：用于解码 MiniMax 的 Hex 音频数据
 import requests  # 确保导入 requests
-from flask import Flask, request, jsonify, render_template, send_from_directory
+from collections import deque
+from flask import Flask, Response, request, jsonify, render_template, send_from_directory, stream_with_context
 from openai import OpenAI
 from volcenginesdkarkruntime import Ark
 from PIL import Image
@@ -36,6 +38,9 @@ MINIMAX_URL = "https://api.minimaxi.com/v1/t2a_v2"
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 SYSTEM_PROMPT_PATH = '/Users/kyrie/Desktop/happy/python_app/system_content.txt'
 WISHES_JSON_PATH = '/Users/kyrie/Desktop/happy/data/text.json'
+# 现场提交的愿望逐行追加到这里（JSON Lines），重启后从中恢复编号与最近的愿望
+LIVE_WISHES_PATH = os.path.join(os.path.dirname(WISHES_JSON_PATH), 'live_wishes.jsonl')
+LIVE_WISH_MAX_CHARS = 60
 
 # 静态文件目录
 UPLOAD_FOLDER = os.path.join(BASE_DIR, 'static/uploads')
@@ -87,6 +92,174 @@ def get_new_year_wishes():
         print(f"读取愿望失败: {e}")
     return jsonify(default_wishes)
 
+# ================== 业务接口 1.1: 现场愿望（提交 + SSE 推送） ==================
+class LiveWishStore:
+    """现场愿望的持久化与广播。
+
+    提交的愿望先进入待写批次，由写线程攒够 batch_size 条或等满 flush_interval 秒后
+    一次写盘并 fsync；请求等所在批次落盘才返回，返回成功的愿望不会因断电丢失，
+    又不必每条都 fsync。落盘后的愿望进入最近列表，唤醒所有 SSE 连接。
+
+    写盘失败时整批愿望作废（文件截回写入前的长度），各请求收到 OSError；等待超时
+    时若愿望还没被写线程取走就撤回。两种情况返回失败的愿望都不会再出现，客户端
+    重试不会产生重复。
+    """
+
+    def __init__(self, path, batch_size=64, flush_interval=0.2, history=1000):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._pending = []  # [(愿望, 落盘事件, 结果)]
+        self._pending_cond = threading.Condition()
+        self._recent = deque(maxlen=history)  # 已落盘的愿望，供断线重连补发
+        self._recent_cond = threading.Condition()
+        self._next_id = 1
+        self._load()
+        threading.Thread(target=self._writer, name="live-wish-writer", daemon=True).start()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    wish = json.loads(line)
+                except ValueError:
+                    continue  # 断电时可能留下写了一半的最后一行
+                self._recent.append(wish)
+                self._next_id = max(self._next_id, int(wish.get('id', 0)) + 1)
+        print(f"已恢复 {len(self._recent)} 条现场愿望，下一个编号 {self._next_id}")
+
+    @property
+    def last_id(self):
+        with self._recent_cond:
+            return self._recent[-1]['id'] if self._recent else 0
+
+    def append(self, text, color, timeout=5.0):
+        done = threading.Event()
+        result = {}  # 写盘失败时由写线程填入 error
+        with self._pending_cond:
+            wish = {"id": self._next_id, "text": text, "color": color, "ts": time.time()}
+            self._next_id += 1
+            entry = (wish, done, result)
+            self._pending.append(entry)
+            self._pending_cond.notify()
+        if not done.wait(timeout):
+            with self._pending_cond:
+                if entry in self._pending:
+                    self._pending.remove(entry)
+                    raise TimeoutError("现场愿望写盘超时")
+            # 已被写线程取走：等这一批写完（或失败），结果才确定
+            done.wait()
+        if 'error' in result:
+            raise result['error']
+        return wish
+
+    def _writer(self):
+        while True:
+            with self._pending_cond:
+                self._pending_cond.wait_for(lambda: self._pending)
+                # 第一条到达后再等一小会儿，让同一时段的提交合并成一次 fsync
+                self._pending_cond.wait_for(lambda: len(self._pending) >= self.batch_size, self.flush_interval)
+                batch, self._pending = self._pending, []
+            try:
+                self._write_batch([wish for wish, _, _ in batch])
+            except OSError as e:
+                print(f"写入现场愿望失败: {e}，本批 {len(batch)} 条作废")
+                for _, done, result in batch:
+                    result['error'] = e
+                    done.set()
+                continue
+            with self._recent_cond:
+                self._recent.extend(wish for wish, _, _ in batch)
+                self._recent_cond.notify_all()
+            for _, done, _ in batch:
+                done.set()
+
+    def _write_batch(self, wishes):
+        with open(self.path, 'a', encoding='utf-8') as f:
+            offset = f.tell()
+            try:
+                for wish in wishes:
+                    f.write(json.dumps(wish, ensure_ascii=False) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            except OSError:
+                # 已写出一部分的批次不能留在文件里，否则重启后会恢复出请求方以为失败的愿望
+                try:
+                    f.truncate(offset)
+                except (OSError, ValueError):
+                    pass
+                raise
+
+    def since(self, last_id):
+        with self._recent_cond:
+            return [wish for wish in self._recent if wish['id'] > last_id]
+
+    def wait_since(self, last_id, timeout):
+        """阻塞到有编号大于 last_id 的愿望或超时。"""
+        with self._recent_cond:
+            self._recent_cond.wait_for(lambda: self._recent and self._recent[-1]['id'] > last_id, timeout)
+            return [wish for wish in self._recent if wish['id'] > last_id]
+
+
+_live_wishes = None
+_live_wishes_lock = threading.Lock()
+
+
+def live_wishes():
+    """现场愿望存储；第一次用到时才读取历史并启动写线程，导入本模块没有副作用。"""
+    global _live_wishes
+    with _live_wishes_lock:
+        if _live_wishes is None:
+            _live_wishes = LiveWishStore(LIVE_WISHES_PATH)
+        return _live_wishes
+
+
+@app.route('/wishes', methods=['POST'])
+def submit_wish():
+    payload = request.get_json(silent=True) or request.form
+    text = str(payload.get('text') or '').strip()
+    if not text:
+        return jsonify({"error": "愿望内容不能为空"}), 400
+    if len(text) > LIVE_WISH_MAX_CHARS:
+        return jsonify({"error": f"愿望最多 {LIVE_WISH_MAX_CHARS} 个字"}), 400
+    color = str(payload.get('color') or '#FFF8DC')
+    try:
+        wish = live_wishes().append(text, color)
+    except TimeoutError as e:
+        print(f"提交愿望失败: {e}")
+        return jsonify({"error": "保存愿望超时，请稍后再试"}), 503
+    except OSError as e:
+        print(f"提交愿望失败: {e}")
+        return jsonify({"error": "保存愿望失败，请稍后再试"}), 503
+    return jsonify(wish), 201
+
+
+@app.route('/wishes/stream')
+def stream_wishes():
+    """SSE 推送新愿望；断线重连时浏览器/看板带上 Last-Event-ID，从断点继续补发。"""
+    store = live_wishes()
+    start = request.headers.get('Last-Event-ID') or request.args.get('since')
+    try:
+        last_id = int(start) if start is not None else store.last_id
+    except ValueError:
+        last_id = store.last_id
+
+    def generate(last_id):
+        yield "retry: 3000\n\n"
+        while True:
+            wishes = store.wait_since(last_id, timeout=15)
+            if not wishes:
+                yield ": keep-alive\n\n"  # 心跳，让代理与客户端知道连接还活着
+                continue
+            for wish in wishes:
+                last_id = wish['id']
+                yield f"id: {wish['id']}\nevent: wish\ndata: {json.dumps(wish, ensure_ascii=False)}\n\n"
+
+    headers = {'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    return Response(stream_with_context(generate(last_id)), mimetype='text/event-stream', headers=headers)
+
 # ================== 业务接口 2: 视频生成 ==================
 @app.route('/generate_video', methods=['POST'])
 def generate_video():
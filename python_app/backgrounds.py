@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from PySide6.QtCore import QObject, QRunnable, QSize, Qt, QThreadPool, Signal
+from PySide6.QtGui import QGuiApplication, QImage, QImageReader, QPixmap
+
+# 背景图的两种摆放方式：铺满全屏（居中裁剪）或贴在左下角的小图
+LAYOUT_COVER = "cover"
+LAYOUT_FOOTER = "footer"
+FOOTER_HEIGHT_RATIO = 0.32
+FOOTER_MARGIN_RATIO = 0.05
+
+
+class _DecodeSignals(QObject):
+    finished = Signal(str, QImage)
+
+
+class _DecodeTask(QRunnable):
+    """在线程池中用 QImageReader 解码，尽量直接按目标尺寸解码以减少内存与耗时。"""
+
+    def __init__(self, key: str, path: str, target: QSize) -> None:
+        super().__init__()
+        self.key = key
+        self.path = path
+        self.target = target
+        self.signals = _DecodeSignals()
+
+    def run(self) -> None:
+        reader = QImageReader(self.path)
+        reader.setAutoTransform(True)
+        original = reader.size()
+        if original.isValid() and not self.target.isEmpty():
+            decode_size = original.scaled(self.target, Qt.AspectRatioMode.KeepAspectRatioByExpanding)
+            if decode_size.width() < original.width():
+                # 支持的格式（如 JPEG）会直接按比例解码，其余格式由 Qt 读取后缩放
+                reader.setScaledSize(decode_size)
+        image = reader.read()
+        self.signals.finished.emit(self.key, image)
+
+
+class BackgroundCache(QObject):
+    """背景图缓存。
+
+    原图在线程池中异步解码，缩放结果按 (图片, 目标尺寸, 摆放方式, 设备像素比) 缓存。
+    摆放方式由展示阶段决定，因此窗口尺寸或阶段变化时只缩放一次，重绘时直接取用。
+    """
+
+    image_ready = Signal(str)
+    all_settled = Signal()  # 所有已提交的解码任务都已结束（无论成功与否）
+
+    def __init__(self, parent: Optional[QObject] = None, max_scaled: int = 8) -> None:
+        super().__init__(parent)
+        self.max_scaled = max_scaled
+        self._sources: Dict[str, QImage] = {}
+        self._pending: Dict[str, _DecodeTask] = {}
+        self._scaled: "OrderedDict[Tuple[str, int, int, str, float], QPixmap]" = OrderedDict()
+        self._pool = QThreadPool.globalInstance()
+
+    def load(self, key: str, path: str, decode_hint: Optional[QSize] = None) -> None:
+        if key in self._sources or key in self._pending:
+            return
+        task = _DecodeTask(key, path, decode_hint or self._screen_pixel_size())
+        task.signals.finished.connect(self._on_decoded)
+        self._pending[key] = task
+        self._pool.start(task)
+
+    def is_ready(self, key: str) -> bool:
+        return key in self._sources
+
+    def is_loading(self) -> bool:
+        return bool(self._pending)
+
+    def source_size(self, key: str) -> QSize:
+        image = self._sources.get(key)
+        return image.size() if image is not None else QSize()
+
+    def _on_decoded(self, key: str, image: QImage) -> None:
+        self._pending.pop(key, None)
+        if image.isNull():
+            print(f"警告: 背景图 {key} 解码失败")
+            if not self._pending:
+                self.all_settled.emit()
+            return
+        self._sources[key] = image
+        # 同一图片的旧缩放结果作废
+        for cache_key in [k for k in self._scaled if k[0] == key]:
+            del self._scaled[cache_key]
+        print(f"背景图 {key} 解码完成，尺寸: {image.width()}x{image.height()}")
+        self.image_ready.emit(key)
+        if not self._pending:
+            self.all_settled.emit()
+
+    def scaled(self, key: str, size: QSize, layout: str, dpr: float) -> Optional[QPixmap]:
+        """取缩放好的背景；未命中时缩放一次并缓存。原图尚未解码时返回 None。"""
+        cache_key = (key, size.width(), size.height(), layout, round(dpr, 2))
+        pixmap = self._scaled.get(cache_key)
+        if pixmap is not None:
+            self._scaled.move_to_end(cache_key)
+            return pixmap
+        source = self._sources.get(key)
+        if source is None or size.isEmpty():
+            return None
+        pixmap = self._scale(source, size, layout, dpr)
+        if pixmap is None:
+            return None
+        self._scaled[cache_key] = pixmap
+        while len(self._scaled) > self.max_scaled:
+            self._scaled.popitem(last=False)
+        return pixmap
+
+    def prepare(self, key: str, size: QSize, layout: str, dpr: float) -> None:
+        """在尺寸或阶段变化时预先缩放，避免首帧重绘时卡顿。"""
+        self.scaled(key, size, layout, dpr)
+
+    @staticmethod
+    def _scale(source: QImage, size: QSize, layout: str, dpr: float) -> Optional[QPixmap]:
+        pixel_width = max(1, round(size.width() * dpr))
+        pixel_height = max(1, round(size.height() * dpr))
+        if layout == LAYOUT_COVER:
+            image = source.scaled(
+                QSize(pixel_width, pixel_height),
+                Qt.AspectRatioMode.KeepAspectRatioByExpanding,
+                Qt.TransformationMode.SmoothTransformation,
+            )
+        else:
+            footer_height = int(pixel_height * FOOTER_HEIGHT_RATIO)
+            if footer_height <= 0:
+                return None
+            image = source.scaledToHeight(footer_height, Qt.TransformationMode.SmoothTransformation)
+        pixmap = QPixmap.fromImage(image)
+        pixmap.setDevicePixelRatio(dpr)
+        return pixmap
+
+    @staticmethod
+    def _screen_pixel_size() -> QSize:
+        screen = QGuiApplication.primaryScreen()
+        if screen is None:
+            return QSize(1920, 1080)
+        size = screen.size()
+        ratio = screen.devicePixelRatio()
+        return QSize(round(size.width() * ratio), round(size.height() * ratio))
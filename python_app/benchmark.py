@@ -0,0 +1,335 @@
+"""QuoteBoard 的离屏渲染基准测试。
+
+在 ``QT_QPA_PLATFORM=offscreen`` 下用合成金句构建看板，以手动时钟逐帧驱动
+text / book / post_fireworks / other 各阶段，把整棵控件树绘制到离屏 ``QImage``，
+输出各阶段的帧时间、内存分配与峰值内存（JSON），便于在无显示器的 Linux 上跨提交对比。
+
+用法::
+
+    python -m python_app.benchmark --quotes 300 --text-length 80 --frames 240 -o bench.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import gc
+import io
+import json
+import os
+import platform
+import random
+import resource
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+from PySide6.QtCore import QSize, Qt, qVersion
+from PySide6.QtGui import QColor, QImage
+from PySide6.QtWidgets import QApplication
+
+from .board import QuoteBoard
+from .clock import ManualClock
+from .gc_policy import GcPolicy
+from .metrics import gc_pauses, layer_timings
+from .models import Achievement, Quote
+from .quality import QUALITY_LEVELS
+
+PHASES = ("text", "book", "post_fireworks", "other")
+_CHARACTERS = "冬日暖阳照在窗台上慢慢来一切都会好起来的记得按时吃饭早点休息你已经做得很好了今天也要开心"
+_COLORS = ("#E6E6FA", "#FFE4E1", "#F0FFF0", "#FFF8DC", "#E0FFFF", "#FFEFD5")
+
+
+def synthetic_quotes(count: int, text_length: int, rng: random.Random) -> List[Quote]:
+    """按 text / book / other 三类均分生成指定长度的金句。"""
+    categories = ("text", "book", "other")
+    quotes: List[Quote] = []
+    for index in range(count):
+        length = max(1, int(rng.gauss(text_length, text_length * 0.2)))
+        text = "".join(rng.choice(_CHARACTERS) for _ in range(length))
+        quotes.append(Quote(text=f"{index:04d} {text}", color=rng.choice(_COLORS), category=categories[index % 3]))
+    return quotes
+
+
+def synthetic_compliments(count: int, rng: random.Random) -> List[Achievement]:
+    return [
+        Achievement(text="".join(rng.choice(_CHARACTERS) for _ in range(16)), color=rng.choice(_COLORS))
+        for _ in range(count)
+    ]
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=Path(__file__).resolve().parent,
+            capture_output=True,
+            text=True,
+            timeout=5,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return result.stdout.strip() or None
+
+
+def _frame_summary(frame_ms: Sequence[float]) -> Dict[str, float]:
+    ordered = sorted(frame_ms)
+    if not ordered:
+        return {}
+    last = len(ordered) - 1
+
+    def _pick(percent: float) -> float:
+        return round(ordered[min(last, round(percent / 100.0 * last))], 3)
+
+    return {
+        "mean": round(statistics.fmean(ordered), 3),
+        "p50": _pick(50),
+        "p95": _pick(95),
+        "p99": _pick(99),
+        "max": round(ordered[-1], 3),
+    }
+
+
+class BoardBenchmark:
+    """以固定帧长逐帧驱动看板。雪花与烟花的模拟时间来自手动时钟，与真实耗时无关。"""
+
+    def __init__(
+        self,
+        quotes: List[Quote],
+        compliments: List[Achievement],
+        size: QSize,
+        frame_ms: float = 1000.0 / 60.0,
+        composite_cards: bool = False,
+        quality: str = "high",
+        track_allocations: bool = True,
+        gc_policy: Optional[GcPolicy] = None,
+    ) -> None:
+        self.size = size
+        self.frame_s = frame_ms / 1000.0
+        self.track_allocations = track_allocations
+        self.clock = ManualClock()
+        self.board = QuoteBoard(quotes, compliments, composite_cards=composite_cards, gc_policy=gc_policy)
+        # 卡片节奏、阶段切换由基准测试逐帧驱动，不交给看板自己的定时器
+        self.board.paused = True
+        self.board.mark_ready()
+        governor = self.board.quality
+        governor.set_level(next(i for i, level in enumerate(governor.levels) if level.name == quality))
+        governor.locked = True
+        self.board.setAttribute(Qt.WidgetAttribute.WA_DontShowOnScreen, True)
+        self.board.resize(size)
+        self.board.show()
+        self.board.splash.hide()
+        self.board._build_fireworks_overlays()
+        snow = self.board.snow_effect
+        snow.timer.stop()
+        snow.simulation.stepper.time_source = self.clock
+        for overlay in self.board.fireworks_overlays:
+            overlay.simulation.stepper.time_source = self.clock
+        self.image = QImage(size, QImage.Format.Format_ARGB32_Premultiplied)
+        QApplication.processEvents()
+        self.board.gc_policy.freeze_startup()
+
+    # region 各阶段的准备与每帧动作
+    def _enter(self, phase: str) -> None:
+        board = self.board
+        board.card_manager.fade_out_all()
+        for card in board.book_cards:
+            board._fade_out_and_release(card)
+        board.book_cards = []
+        # 上一阶段残留的烟花不计入本阶段
+        for overlay in board.fireworks_overlays:
+            overlay.timer.stop()
+            overlay.simulation.particles.clear()
+            overlay.simulation.rockets.clear()
+            overlay.active = False
+            overlay.hide()
+        board.card_phase = phase
+        if phase == "book":
+            board._set_background("book")
+            board._init_book_grid()
+            board.book_batch_count = 0
+        elif phase == "post_fireworks":
+            board._set_background("fireworks")
+        else:
+            board._set_background("default")
+
+    def _deque_for(self, phase: str):
+        return {
+            "text": self.board.text_quotes,
+            "book": self.board.book_quotes,
+            "other": self.board.other_quotes,
+        }.get(phase)
+
+    def _step(self, phase: str, frame: int, card_every: int, burst_every: int) -> None:
+        board = self.board
+        if phase == "post_fireworks":
+            if frame % burst_every == 0:
+                board._heart_fireworks_burst()
+        else:
+            remaining = self._deque_for(phase)
+            # 留下最后两条，避免触发看板自身的阶段收尾流程
+            if frame % card_every == 0 and remaining is not None and len(remaining) > 2:
+                board._add_new_card()
+        board.snow_effect._update_flakes()
+        for overlay in board.fireworks_overlays:
+            if overlay.active:
+                overlay.timer.stop()
+                overlay._tick()
+
+    # endregion
+
+    def run_phase(self, phase: str, frames: int, card_interval_ms: float, burst_interval_ms: float) -> Dict[str, object]:
+        self._enter(phase)
+        QApplication.processEvents()
+        card_every = max(1, round(card_interval_ms / 1000.0 / self.frame_s))
+        burst_every = max(1, round(burst_interval_ms / 1000.0 / self.frame_s))
+        layer_timings.paint_ms.clear()
+        gc.collect()
+        self.board.gc_policy.transition(phase)
+        gc_before = [stats["collections"] for stats in gc.get_stats()]
+        gc_pauses.clear()
+        blocks_before = sys.getallocatedblocks()
+        if self.track_allocations:
+            tracemalloc.reset_peak()
+            traced_before, _ = tracemalloc.get_traced_memory()
+
+        frame_ms: List[float] = []
+        for frame in range(frames):
+            self.clock.advance(self.frame_s)
+            start = time.perf_counter()
+            self._step(phase, frame, card_every, burst_every)
+            self.image.fill(QColor(0, 0, 0, 0))
+            self.board.render(self.image)
+            frame_ms.append((time.perf_counter() - start) * 1000.0)
+            # 处理 deleteLater、动画等排队事件，不计入帧时间
+            QApplication.processEvents()
+
+        result: Dict[str, object] = {
+            "frames": frames,
+            "frame_ms": _frame_summary(frame_ms),
+            "cards_visible": len(self.board.card_manager.cards) + len(self.board.book_cards),
+            "particles_last_frame": sum(len(overlay.particles) for overlay in self.board.fireworks_overlays),
+            "paint_ms": {layer: round(value, 3) for layer, value in sorted(layer_timings.paint_ms.items())},
+            "net_allocated_blocks": sys.getallocatedblocks() - blocks_before,
+            "gc_collections": [
+                stats["collections"] - before for stats, before in zip(gc.get_stats(), gc_before)
+            ],
+            "gc_pauses": gc_pauses.as_dict(),
+        }
+        if self.track_allocations:
+            traced_after, traced_peak = tracemalloc.get_traced_memory()
+            result["python_net_kib"] = round((traced_after - traced_before) / 1024, 1)
+            result["python_peak_kib"] = round(traced_peak / 1024, 1)
+        return result
+
+
+def _parse_size(value: str) -> QSize:
+    width, _, height = value.lower().partition("x")
+    return QSize(int(width), int(height))
+
+
+def _parse_args(argv: Sequence[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="QuoteBoard 离屏渲染基准测试")
+    parser.add_argument("--quotes", type=int, default=300, help="合成金句数量（三类均分，默认 300）")
+    parser.add_argument("--text-length", type=int, default=60, help="金句平均字数（默认 60）")
+    parser.add_argument("--frames", type=int, default=240, help="每个阶段的帧数（默认 240）")
+    parser.add_argument("--fps", type=float, default=60.0, help="模拟帧率，决定每帧推进的时间（默认 60）")
+    parser.add_argument("--size", type=_parse_size, default=QSize(1920, 1080), help="画布尺寸，如 1920x1080")
+    parser.add_argument("--phases", nargs="+", choices=PHASES, default=list(PHASES), help="要测量的阶段")
+    parser.add_argument(
+        "--quality",
+        choices=[level.name for level in QUALITY_LEVELS],
+        default="high",
+        help="固定的画质等级（默认 high）",
+    )
+    parser.add_argument("--composite-cards", action="store_true", help="使用合成卡片图层")
+    parser.add_argument("--card-interval-ms", type=float, default=400.0, help="模拟时间中的出卡间隔")
+    parser.add_argument("--burst-interval-ms", type=float, default=1600.0, help="模拟时间中的烟花间隔")
+    parser.add_argument("--seed", type=int, default=1, help="合成数据的随机种子")
+    parser.add_argument("--gc-policy", action="store_true", help="启用看板的垃圾回收策略（冻结启动对象、推迟第 2 代回收）")
+    parser.add_argument("--no-tracemalloc", action="store_true", help="不跟踪 Python 内存分配（帧时间更接近真实）")
+    parser.add_argument("--verbose", action="store_true", help="保留看板自身的日志输出")
+    parser.add_argument("-o", "--output", type=Path, help="JSON 输出文件（默认打印到标准输出）")
+    return parser.parse_args(list(argv))
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = _parse_args(sys.argv[1:] if argv is None else argv)
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    app = QApplication.instance() or QApplication([sys.argv[0], "-platform", os.environ["QT_QPA_PLATFORM"]])
+
+    # 固定种子：合成数据、卡片摆放与烟花都可复现
+    random.seed(args.seed)
+    rng = random.Random(args.seed)
+    quotes = synthetic_quotes(args.quotes, args.text_length, rng)
+    compliments = synthetic_compliments(8, rng)
+
+    track_allocations = not args.no_tracemalloc
+    if track_allocations:
+        tracemalloc.start()
+    log = io.StringIO()
+    redirect = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(log)
+    gc_policy = GcPolicy(enabled=args.gc_policy)
+    gc_policy.install()
+    started = time.perf_counter()
+    with redirect:
+        bench = BoardBenchmark(
+            quotes,
+            compliments,
+            args.size,
+            frame_ms=1000.0 / args.fps,
+            composite_cards=args.composite_cards,
+            quality=args.quality,
+            track_allocations=track_allocations,
+            gc_policy=gc_policy,
+        )
+        setup_ms = (time.perf_counter() - started) * 1000.0
+        phases = {
+            phase: bench.run_phase(phase, args.frames, args.card_interval_ms, args.burst_interval_ms)
+            for phase in args.phases
+        }
+    gc_policy.uninstall()
+    if track_allocations:
+        tracemalloc.stop()
+
+    report = {
+        "meta": {
+            "revision": _git_revision(),
+            "python": platform.python_version(),
+            "qt": qVersion(),
+            "platform": platform.platform(),
+            "qpa": app.platformName(),
+        },
+        "config": {
+            "quotes": args.quotes,
+            "text_length": args.text_length,
+            "frames": args.frames,
+            "fps": args.fps,
+            "size": [args.size.width(), args.size.height()],
+            "quality": args.quality,
+            "composite_cards": args.composite_cards,
+            "card_interval_ms": args.card_interval_ms,
+            "burst_interval_ms": args.burst_interval_ms,
+            "seed": args.seed,
+            "tracemalloc": track_allocations,
+            "gc_policy": args.gc_policy,
+        },
+        "setup_ms": round(setup_ms, 1),
+        "phases": phases,
+        # Linux 下单位为 KiB
+        "peak_rss_kib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    }
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        args.output.write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,40 +2,69 @@ from __future__ import annotations
 
 import random
 from collections import deque
-from typing import Deque, List, Optional
+from typing import Callable, Collection, Deque, Dict, List, Optional, Sequence, Set, Tuple, Union
 
 import math
+import time
+from pathlib import Path
 
-from PySide6.QtCore import QPointF, QRect, Qt, QTimer, QPropertyAnimation, QEasingCurve, Property
-from PySide6.QtGui import QFont, QPainter, QPixmap, QColor, QPen, QPainterPath
-from PySide6.QtWidgets import QLabel, QVBoxLayout, QWidget
+from PySide6.QtCore import QPointF, QRect, QSize, Qt, QTimer, QPropertyAnimation, QEasingCurve, Property, Signal
+from PySide6.QtGui import QFont, QFontMetrics, QLinearGradient, QPainter, QPixmap, QColor, QPen, QPainterPath
+from PySide6.QtWidgets import QWidget
 
+from .card_compositor import CardCompositeLayer
 from .card_manager import CardManager
+from .card_pool import CardPool
 from .card_widget import QuoteCard
+from .clock import FrameClock, ShowClock
 from .effects import SnowEffect, FireworksOverlay
+from .effects_worker import EffectsRenderer
+from .gc_policy import GcPolicy
+from .backgrounds import (
+    BackgroundCache,
+    FOOTER_MARGIN_RATIO,
+    LAYOUT_COVER,
+    LAYOUT_FOOTER,
+)
+from .glyph_cache import glyph_cache
+from .hud import PerformanceHud
+from .kiosk import RecyclingSampler
+from .live_feed import LiveQuoteQueue
+from .power import PowerManager
+from .metrics import layer_timings, startup_metrics, tracer
 from .models import Quote, Achievement
+from .quality import QualityDebugOverlay, QualityGovernor
+from .quote_store import QuoteQueue, QuoteStore
+from .reveal_text import RevealText
+from .text_layout import CONTENT_FONTS, content_font
+from .timeline import SHOW_PHASES, ShowTimeline, ShowTimings, compile_timeline, derive_rng
 
 
 class SplashOverlay(QWidget):
     def __init__(self, parent=None) -> None:
         super().__init__(parent)
         self.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents, True)
-        self.setStyleSheet(
-            "background: qlineargradient(x1:0, y1:0, x2:1, y2:1,"
-            "  stop:0 #eef6fb, stop:1 #f3b8d9);"
-        )
-        layout = QVBoxLayout(self)
-        layout.setContentsMargins(0, 0, 0, 0)
-        layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.label = QLabel("正在为你生成暖冬提醒…")
-        self.label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.label.setFont(QFont("Source Han Sans", 28, QFont.Weight.Medium))
-        self.label.setStyleSheet("color: #2c3e50;")
-        layout.addWidget(self.label)
-
-    def start(self, duration_ms: int, finished_callback) -> None:
-        self.show()
-        QTimer.singleShot(duration_ms, finished_callback)
+        self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground, True)
+        self.text = "正在为你生成暖冬提醒…"
+        self.text_font = QFont("Source Han Sans", 28, QFont.Weight.Medium)
+        self.text_color = QColor("#2c3e50")
+
+    def set_text(self, text: str) -> None:
+        self.text = text
+        self.update()
+
+    def paintEvent(self, event) -> None:  # type: ignore[override]
+        # 文字位图只光栅化一次，渐变底色只铺在文字区域
+        pixmap = glyph_cache.fitted_text(self.text, self.text_font, self.text_color, self.devicePixelRatioF())
+        size = pixmap.deviceIndependentSize().toSize()
+        rect = QRect(0, 0, size.width(), size.height())
+        rect.moveCenter(self.rect().center())
+        gradient = QLinearGradient(rect.topLeft(), rect.bottomRight())
+        gradient.setColorAt(0.0, QColor("#eef6fb"))
+        gradient.setColorAt(1.0, QColor("#f3b8d9"))
+        painter = QPainter(self)
+        painter.fillRect(rect, gradient)
+        painter.drawPixmap(rect.topLeft(), pixmap)
 
 
 class CloverEmojiOverlay(QWidget):
@@ -47,7 +76,10 @@ class CloverEmojiOverlay(QWidget):
         self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground, True)
         self._opacity = 0.0
         self._visible = False
-        self.animation: Optional[QPropertyAnimation] = None
+        # 淡入淡出共用一个动画对象，便于统一挂起
+        self.animation = QPropertyAnimation(self, b"opacity", self)
+        self.animation.setEasingCurve(QEasingCurve.Type.InOutQuad)
+        self.animation.finished.connect(self._on_animation_finished)
         self.hide()
 
     def get_opacity(self) -> float:
@@ -65,36 +97,43 @@ class CloverEmojiOverlay(QWidget):
         self.show()
         self.raise_()
         
-        if self.animation:
-            self.animation.stop()
-        
-        self.animation = QPropertyAnimation(self, b"opacity")
+        self.animation.stop()
         self.animation.setDuration(1500)  # 1.5秒淡入
         self.animation.setStartValue(0.0)
         self.animation.setEndValue(1.0)
-        self.animation.setEasingCurve(QEasingCurve.Type.InOutQuad)
         self.animation.start()
 
     def hide_emoji(self) -> None:
         """淡出隐藏emoji"""
-        if self.animation:
-            self.animation.stop()
-        
-        self.animation = QPropertyAnimation(self, b"opacity")
+        self.animation.stop()
         self.animation.setDuration(500)  # 0.5秒淡出
         self.animation.setStartValue(self._opacity)
         self.animation.setEndValue(0.0)
-        self.animation.setEasingCurve(QEasingCurve.Type.InOutQuad)
-        self.animation.finished.connect(self._on_fade_out_finished)
         self.animation.start()
 
-    def _on_fade_out_finished(self) -> None:
-        self._visible = False
-        self.hide()
+    def _on_animation_finished(self) -> None:
+        if self.animation.endValue() == 0.0:
+            self._visible = False
+            self.hide()
 
     def emoji_visible(self) -> bool:
         return self._visible
 
+    def prepare(self) -> None:
+        """按当前尺寸预先光栅化emoji，首次淡入时不再卡顿。"""
+        rect = self.rect()
+        emoji_width = rect.width() * 0.9
+        emoji_height = rect.height() * 0.9
+        if emoji_width > 0 and emoji_height > 0:
+            self._emoji_pixmap(emoji_width, emoji_height)
+
+    def _emoji_pixmap(self, emoji_width: float, emoji_height: float) -> QPixmap:
+        # 计算emoji字体大小（基于可用区域）；彩色emoji只光栅化一次，动画只改透明度
+        font_size = int(min(emoji_width, emoji_height) * 0.8)
+        font = QFont("Apple Color Emoji", font_size)
+        emoji_size = QSize(int(emoji_width), int(emoji_height))
+        return glyph_cache.text("🍀", font, QColor("#000000"), emoji_size, self.devicePixelRatioF())
+
     def paintEvent(self, event) -> None:  # type: ignore[override]
         if self._opacity <= 0.0:
             return
@@ -116,10 +155,8 @@ class CloverEmojiOverlay(QWidget):
         if emoji_width <= 0 or emoji_height <= 0:
             return
         
-        # 计算emoji字体大小（基于可用区域）
-        font_size = int(min(emoji_width, emoji_height) * 0.8)
-        font = QFont("Apple Color Emoji", font_size)
-        painter.setFont(font)
+        pixmap = self._emoji_pixmap(emoji_width, emoji_height)
+        painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
         
         # 保存画笔状态
         painter.save()
@@ -133,65 +170,89 @@ class CloverEmojiOverlay(QWidget):
         painter.rotate(-30)
         
         # 绘制🍀emoji居中（相对于旋转后的坐标系）
-        emoji_rect = QRect(
-            int(-emoji_width / 2),
-            int(-emoji_height / 2),
-            int(emoji_width),
-            int(emoji_height)
-        )
-        painter.drawText(emoji_rect, Qt.AlignmentFlag.AlignCenter, "🍀")
+        painter.drawPixmap(int(-emoji_width / 2), int(-emoji_height / 2), pixmap)
         
         # 恢复画笔状态
         painter.restore()
 
 
 class QuoteBoard(QWidget):
+    phase_changed = Signal(str)
+
     def __init__(
         self,
         quotes: List[Quote],
         compliments: Optional[List[Achievement]] = None,
         parent=None,
+        target_fps: float = 50.0,
+        threaded_effects: bool = False,
+        composite_cards: bool = False,
+        card_pool_size: int = 24,
+        show_clock: Optional[ShowClock] = None,
+        seed: Optional[int] = None,
+        gc_policy: Optional[GcPolicy] = None,
     ) -> None:
         super().__init__(parent)
         self.setMouseTracking(True)
+
+        # 演出调度全部挂在虚拟时钟上：可倍速播放、跳到指定阶段，配合种子逐条复现
+        self.show_clock = show_clock or ShowClock(self)
+        self.seed = seed
+        self.rng = random.Random(seed)
+        # 烟花的落点与种子单独成流：各屏画质不同、绽放层数不同，也不影响出卡的随机数
+        self.fireworks_rng = derive_rng(seed, "fireworks")
+        self.timings = ShowTimings()
+        self.timeline = ShowTimeline()
+        self.phase_log: Deque[Tuple[int, str]] = deque(maxlen=512)
+        self._show_origin_ms: Optional[float] = None
+        self._pending_seek: Optional[str] = None
+        # 常驻模式：展示完一轮后不进入 idle，从循环采样器补满金句重新开始
+        self.kiosk_mode = False
+        self.kiosk_cycles = 0
+        self.kiosk_round_size: Optional[int] = None  # 每类每轮最多展示的条数，None 表示全部
+        # 现场愿望：由 attach_live_feed 接入，在 text 与 other 阶段按最小间隔插进出卡序列
+        self.live_queue: Optional[LiveQuoteQueue] = None
+        self.live_min_gap_ms = 4000
+        self.live_shown = 0
+        self._last_live_ms: Optional[int] = None
+        # 窗口隐藏、被遮挡、演出 idle 或暂停时，统一挂起所有登记的定时器与动画
+        self.power = PowerManager(self)
+        self.power.register_hooks(self.show_clock.pause, self.show_clock.resume)
+        self.idle_grace_ms = 3000  # 进入 idle 后等淡入淡出播完再挂起
+        # 动画阶段推迟第 2 代回收，改在阶段切换与挂起时进行；未传入时只是空策略
+        self.gc_policy = gc_policy or GcPolicy(enabled=False)
+        self.power.suspended_changed.connect(self._on_power_suspended)
+
+        # 画质调节器：按实测帧时间缩放雪花、烟花等特效
+        self.quality = QualityGovernor(target_fps, self)
+        # 共享帧时钟：逐字显示等逐帧推进的组件统一由它驱动
+        self.frame_clock = FrameClock(self, time_source=self.show_clock.now)
+        self.power.register_timer(self.frame_clock.timer)
+        # 可选：雪花与烟花的模拟和光栅化放到独立线程，界面线程只负责贴图
+        self.effects_renderer: Optional[EffectsRenderer] = (
+            EffectsRenderer(self) if threaded_effects else None
+        )
+        if self.effects_renderer is not None:
+            renderer = self.effects_renderer
+            self.power.register_hooks(lambda: renderer.set_suspended(True), lambda: renderer.set_suspended(False))
         
         # 背景透明度属性（用于动画）
         self._background_opacity = 1.0
 
-        text_quotes = [quote for quote in quotes if quote.category == "text"]
-        book_quotes = [quote for quote in quotes if quote.category == "book"]
-        others = [quote for quote in quotes if quote.category not in {"text", "book"}]
-
-        self.intro_quote: Optional[Quote] = text_quotes.pop(0) if text_quotes else None
-
-        self.text_quotes: Deque[Quote] = deque(text_quotes)
-        self.text_count = len(self.text_quotes)
-        self.text_shown = 0
-        self.text_finished = self.text_count == 0
-        self.text_interval_ms = 800
-
-        self.book_quotes: Deque[Quote] = deque(book_quotes)
-        self.book_total = len(self.book_quotes)
-        self.book_interval_ms = 1200
-        self.book_shown = 0
-        self.books_finished = self.book_total == 0
         self.book_grid_positions: List[QRect] = []
         self.book_grid_index = 0
         self.book_cards: List[QuoteCard] = []
         self.book_max_visible = 3
         self.book_batch_count = 0
+        self.set_quotes(quotes, compliments)
 
-        self.other_quotes: Deque[Quote] = deque(others)
-        self.compliments = compliments or []
-
-        if not self.text_finished:
-            self.card_phase: str = "text"
-        elif self.book_total:
-            self.card_phase = "book"
-        elif self.other_quotes:
-            self.card_phase = "other"
-        else:
-            self.card_phase = "idle"
+        # 启动画面：数据与资源在后台加载，全部就绪后才结束（见 mark_ready）
+        self.splash_min_ms = 600
+        self._assets_ready = False
+        self._splash_shown_at: Optional[float] = None
+        self._splash_finished = False
+        # 多屏同步时本屏只是共享画布的一块：卡片与烟花按整块画布摆放，None 表示画布就是本屏
+        self.canvas: Optional[QRect] = None
 
         self.cards_container = QWidget(self)
         self.cards_container.setObjectName("cardsContainer")
@@ -200,20 +261,39 @@ class QuoteBoard(QWidget):
         self.cards_container.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground, True)
         self.cards_container.setStyleSheet("background: transparent;")
         
-        print(f"初始化: book_total={self.book_total}, books_finished={self.books_finished}")
         print(f"cards_container 是否透明: {self.cards_container.testAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)}")
 
-        self.card_manager = CardManager(self.cards_container)
+        # 合成模式：散落的卡片光栅化为位图后由同一图层一次绘制
+        self.card_layer: Optional[CardCompositeLayer] = None
+        if composite_cards:
+            self.card_layer = CardCompositeLayer(self.cards_container)
+            self.card_layer.time_source = self.show_clock.now
+            self.power.register_timer(self.card_layer.timer)
+            self.card_layer.hovered.connect(self._on_card_hovered)
+            self.card_layer.unhovered.connect(self._on_card_unhovered)
+        # 卡片对象池：淡出后的卡片按模式回收，新金句直接复用已构建的控件
+        self.card_pool = CardPool(card_pool_size, on_create=self._connect_card_signals, time_scale=self._time_scale)
+        self.card_manager = CardManager(
+            self.cards_container,
+            composite_layer=self.card_layer,
+            pool=self.card_pool,
+            rng=self.rng,
+            call_later=self.show_clock.call_later,
+        )
+        self.card_manager.fade_all_ms = self.timings.fade_all_ms
 
-        self.snow_effect = SnowEffect(self)
+        self.snow_effect = SnowEffect(
+            self, quality=self.quality, renderer=self.effects_renderer, time_source=self.show_clock.now
+        )
         self.snow_effect.lower()
+        self.power.register_timer(self.snow_effect.timer)
         # 确保雪花效果透明，不遮挡背景
         self.snow_effect.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents, True)
         self.snow_effect.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground, True)
 
-        self.fireworks_overlays: List[FireworksOverlay] = [FireworksOverlay(self) for _ in range(18)]
-        for overlay in self.fireworks_overlays:
-            overlay.lower()
+        # 烟花图层在首帧之后分批创建（见 _build_fireworks_overlays）
+        self.fireworks_overlay_count = 18
+        self.fireworks_overlays: List[FireworksOverlay] = []
 
         self.heart_firework_colors = [
             QColor("#ff6b6b"),
@@ -232,64 +312,43 @@ class QuoteBoard(QWidget):
 
         self.paused = False
         self.distraction_free = False
-        self.hover_card: Optional[QuoteCard] = None
+        # 控件模式下为 QuoteCard，合成模式下为 CardSprite
+        self.hover_card: Optional[object] = None
         self.intro_card: Optional[QuoteCard] = None
-        self.intro_timer: Optional[QTimer] = None
-        self.intro_full_text = ""
-        self.intro_index = 0
-
-        self.compliment_timer: Optional[QTimer] = None
-        self.compliment_full_text = ""
-        self.compliment_char_index = 0
+        self.intro_text: Optional[RevealText] = None
+        self.intro_char_interval_ms = 60
 
         self.background_color = QColor("#f7f5f3")
-        # 默认背景图（text.json阶段）
-        self.default_background = QPixmap(
-            "/Users/kyrie/Desktop/happy/ChatGPT Image Nov 1, 2025, 12_47_46 PM.png"
-        )
-        # 烟花阶段的背景图（迪士尼城堡）
-        self.fireworks_background = QPixmap(
-            "/Users/kyrie/Desktop/happy/Gemini_Generated_Image_q0r36jq0r36jq0r3.png"
-        )
-        if self.fireworks_background.isNull():
-            print("警告: 迪士尼城堡背景图 加载失败")
-        else:
-            print(f"迪士尼城堡背景图 加载成功，尺寸: {self.fireworks_background.width()}x{self.fireworks_background.height()}")
-        
-        # book.json阶段的背景图（圣诞主题）
-        self.book_background = QPixmap(
-            "/Users/kyrie/Desktop/happy/WechatIMG407.jpg"
-        )
-        if self.book_background.isNull():
-            print("警告: WechatIMG407.jpg 加载失败")
-        else:
-            print(f"WechatIMG407.jpg 加载成功，尺寸: {self.book_background.width()}x{self.book_background.height()}")
-        
-        self.background_pixmap = self.default_background
-
-        self.card_timer = QTimer(self)
-        self.card_timer.setSingleShot(True)
-        self.card_timer.timeout.connect(self._on_card_timer)
-
-        self.compliment_label = QLabel("", self)
+        # 背景图在线程池中异步解码，缩放结果按尺寸/阶段缓存
+        self.background_cache = BackgroundCache(self)
+        self.background_cache.image_ready.connect(self._on_background_ready)
+        self.background_paths = {
+            # 默认背景图（text.json阶段）
+            "default": "/Users/kyrie/Desktop/happy/ChatGPT Image Nov 1, 2025, 12_47_46 PM.png",
+            # 烟花阶段的背景图（迪士尼城堡）
+            "fireworks": "/Users/kyrie/Desktop/happy/Gemini_Generated_Image_q0r36jq0r36jq0r3.png",
+            # book.json阶段的背景图（圣诞主题）
+            "book": "/Users/kyrie/Desktop/happy/WechatIMG407.jpg",
+        }
+        for key, path in self.background_paths.items():
+            self.background_cache.load(key, path)
+        self.background_key = "default"
+
+        self.card_timer = self.show_clock.timer(self._on_card_timer, "card")
+
+        # 祝福语横幅：整句只排版一次，逐字显示由共享帧时钟驱动
+        self.compliment_label = RevealText("", self, clock=self.frame_clock)
         self.compliment_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.compliment_label.setStyleSheet(
-            "background: rgba(0, 0, 0, 0.42);"
-            "color: #ffffff;"
-            "padding: 14px 28px;"
-            "border-radius: 18px;"
-            "letter-spacing: 1px;"
-        )
-        self.compliment_label.setFont(QFont("Source Han Sans", 26, QFont.Weight.DemiBold))
+        self.compliment_label.setBackground(QColor(0, 0, 0, 107), radius=18, padding=(28, 14))
+        self.compliment_label.setColor(QColor("#ffffff"))
+        compliment_font = QFont("Source Han Sans", 26, QFont.Weight.DemiBold)
+        compliment_font.setLetterSpacing(QFont.SpacingType.AbsoluteSpacing, 1)
+        self.compliment_label.setFont(compliment_font)
         self.compliment_label.hide()
 
-        self.heart_fireworks_timer = QTimer(self)
-        self.heart_fireworks_timer.setSingleShot(True)
-        self.heart_fireworks_timer.timeout.connect(self._run_heart_fireworks_cycle)
-        self.heart_fireworks_limit = len(compliments) if compliments else 3
+        self.heart_fireworks_timer = self.show_clock.timer(self._run_heart_fireworks_cycle, "fireworks")
+        self.heart_fireworks_limit = len(self.compliments) if self.compliments else 3
         self.heart_fireworks_count = 0
-        self.heart_fireworks_interval_ms = 2000  # 保留作为最小间隔，实际使用动态计算
-        self.compliment_char_interval_ms = 120  # 每个字符显示的间隔时间（毫秒）
         self.compliment_index = 0
         self.post_heart_pending = False
         self.current_compliment_text = ""  # 当前显示的祝福语文本，用于计算显示时间
@@ -305,8 +364,18 @@ class QuoteBoard(QWidget):
 
         self.clover_overlay = CloverEmojiOverlay(self)
         self.clover_overlay.hide()
+        self.power.register_animation(self.clover_overlay.animation)
 
         self.heart_fade_ms = 1600
+
+        self.quality_overlay = QualityDebugOverlay(self.quality, self)
+        self.hud = PerformanceHud(self, self)
+        # 录制 trace 时定期写入粒子、卡片数量等计数器
+        self.trace_dir = Path("traces")
+        self._trace_counter_timer = QTimer(self)
+        self._trace_counter_timer.setInterval(250)
+        self._trace_counter_timer.timeout.connect(self._record_trace_counters)
+        self.power.register_timer(self._trace_counter_timer)
     
     def get_background_opacity(self) -> float:
         return self._background_opacity
@@ -317,21 +386,270 @@ class QuoteBoard(QWidget):
     
     background_opacity = Property(float, get_background_opacity, set_background_opacity)
 
+    @property
+    def card_phase(self) -> str:
+        return self._card_phase
+
+    @card_phase.setter
+    def card_phase(self, phase: str) -> None:
+        previous = getattr(self, "_card_phase", "")
+        self._card_phase = phase
+        if phase != previous:
+            self._announce_phase(previous, phase)
+
+    def _announce_phase(self, previous: str, phase: str) -> None:
+        tracer.instant("phase", "phase", {"from": previous, "to": phase})
+        if self._show_origin_ms is not None:
+            self.phase_log.append((self.show_time_ms(), phase))
+            # 常驻模式的 idle 只是两轮之间的过渡，不挂起
+            self.power.set_reason("idle", phase == "idle" and not self.kiosk_mode, self.idle_grace_ms)
+            self.gc_policy.transition(phase)
+        self.phase_changed.emit(phase)
+
+    def _time_scale(self) -> float:
+        """卡片淡入淡出随本看板的演出倍速缩短。"""
+        return self.show_clock.speed
+
+    def _on_power_suspended(self, suspended: bool) -> None:
+        if suspended:
+            self.gc_policy.idle_gap("suspended")
+
+    def set_quotes(
+        self,
+        quotes: Union[QuoteStore, Sequence[Quote]],
+        compliments: Optional[List[Achievement]] = None,
+        loading: Sequence[str] = (),
+    ) -> None:
+        """载入（或替换）待展示的金句与祝福语，重置各阶段的进度。
+
+        各阶段按分类索引数组从 ``quote_store`` 取用，不复制金句；传入列表时先转成列式存储。
+        ``loading`` 为仍在后台流式读取的分类，其余金句稍后经 ``append_quotes`` 补入。
+        """
+        store = quotes if isinstance(quotes, QuoteStore) else QuoteStore.from_quotes(quotes)
+        self.quote_store = store
+        text_indices = store.indices("text")
+        book_indices = store.indices("book")
+        other_indices = store.indices_except(("text", "book"))
+
+        self.intro_quote: Optional[Quote] = store[text_indices[0]] if text_indices else None
+        text_indices = text_indices[1:]
+        self.compliments = compliments or []
+        self.heart_fireworks_limit = len(self.compliments) if self.compliments else 3
+
+        # 常驻模式下每轮从循环采样器重新取出同样数量的金句；采样器用到时才创建
+        self._samplers: Dict[str, RecyclingSampler[int]] = {}
+        self.loading_categories: Set[str] = set(loading)
+        self._after_loading: List[Callable[[], None]] = []
+        self._load_round(text_indices, book_indices, other_indices, intro=True)
+        print(f"初始化: book_total={self.book_total}, books_finished={self.books_finished}")
+
+    def append_quotes(self, quotes: List[Quote]) -> None:
+        """流式读取期间补入一批金句：排到各自分类的队尾，停在空队列上的出卡循环随即继续。"""
+        store = self.quote_store
+        for quote in quotes:
+            index = store.append(quote.text, quote.color, quote.category)
+            if quote.category == "text":
+                self.text_quotes.append(index)
+                self.text_count += 1
+            elif quote.category == "book":
+                self.book_quotes.append(index)
+                self.book_total += 1
+                if self.books_finished and self.card_phase in {"intro", "text", "book"}:
+                    self.books_finished = False
+            else:
+                self.other_quotes.append(index)
+        if self._show_origin_ms is not None and self.card_phase in {"text", "book", "other"}:
+            self._schedule_next_card()
+
+    def finish_category(self, category: str) -> None:
+        """某个分类已全部读入；若该阶段的卡片已经出完，现在收尾。"""
+        self.loading_categories.discard(category)
+        if self._show_origin_ms is None or self.card_timer.is_active():
+            return
+        if category == "text" and self.card_phase == "text" and not self.text_quotes and not self.text_finished:
+            self._finish_text_phase()
+        elif category == "book" and self.card_phase == "book" and not self.book_quotes and not self.books_finished:
+            self._finish_book_phase()
+
+    def finish_loading(self) -> None:
+        """全部金句读入完毕：按最终条数重新编译时间线，继续因等待数据而推迟的阶段切换。"""
+        self.loading_categories.clear()
+        other_total = self.other_shown + len(self.other_quotes)
+        self.timeline = compile_timeline(
+            self.timings,
+            self.text_count,
+            self.book_total,
+            other_total,
+            [compliment.text for compliment in self.compliments],
+            seed=self.seed,
+        )
+        print(f"[data] 全部金句已读入：text={self.text_count} book={self.book_total} other={other_total}")
+        callbacks, self._after_loading = self._after_loading, []
+        for callback in callbacks:
+            callback()
+
+    def apply_quote_changes(self, added: Sequence[Quote] = (), removed: Collection[int] = ()) -> None:
+        """热重载：删去 ``removed``（``quote_store`` 中的下标），把 ``added`` 写入存储。
+
+        尚未出完的阶段把新增的金句排到队尾，已经出完的阶段不再回头，新金句留给常驻
+        模式的下一轮；删除导致当前阶段的队列出空时随即收尾。时间线不重新编译。
+        """
+        if removed:
+            self.quote_store.discard(removed)
+            self.text_count -= self.text_quotes.discard(removed)
+            self.book_total -= self.book_quotes.discard(removed)
+            self.other_quotes.discard(removed)
+        store = self.quote_store
+        for quote in added:
+            index = store.append(quote.text, quote.color, quote.category)
+            if quote.category == "text":
+                if not self.text_finished:
+                    self.text_quotes.append(index)
+                    self.text_count += 1
+            elif quote.category == "book":
+                if not self.books_finished:
+                    self.book_quotes.append(index)
+                    self.book_total += 1
+            else:
+                self.other_quotes.append(index)
+        # 采样器按当时的展示顺序建立，下一轮重新创建
+        self._samplers.clear()
+        if self._show_origin_ms is None:
+            return
+        if self.card_phase == "text" and not self.text_quotes and not self.text_finished:
+            self.card_timer.stop()
+            self._finish_text_phase()
+        elif self.card_phase == "book" and not self.book_quotes and not self.books_finished:
+            self.card_timer.stop()
+            self._finish_book_phase()
+        elif self.card_phase == "other" and not self.other_quotes:
+            self.card_timer.stop()
+            self._schedule_next_card()
+        elif self.card_phase in {"text", "book", "other"}:
+            self._schedule_next_card()
+
+    def update_compliments(self, compliments: List[Achievement]) -> None:
+        """热重载：替换祝福语。烟花进行中时已经展示过的保持原位，其余按新列表的顺序接在后面。"""
+        shown = self.compliments[:self.compliment_index] if self.card_phase == "post_fireworks" else []
+        shown_texts = {compliment.text for compliment in shown}
+        self.compliments = shown + [compliment for compliment in compliments if compliment.text not in shown_texts]
+        self.compliment_index = len(shown)
+        self.heart_fireworks_limit = len(self.compliments) if self.compliments else 3
+
+    def _defer_until_loaded(self, callback: Callable[[], None]) -> bool:
+        """还有分类在流式读取时，把依赖完整数据的阶段切换推迟到 finish_loading。"""
+        if not self.loading_categories:
+            return False
+        print(f"[data] 等待金句读入完成：{', '.join(sorted(self.loading_categories))}")
+        self._after_loading.append(callback)
+        return True
+
+    def _load_round(self, text_quotes: Sequence[int], book_quotes: Sequence[int], others: Sequence[int], intro: bool) -> None:
+        """装入一轮要展示的金句（``quote_store`` 中的下标），重置各阶段进度并重新编译时间线。"""
+        self.text_quotes = QuoteQueue(self.quote_store, text_quotes)
+        self.text_count = len(self.text_quotes)
+        self.text_shown = 0
+        self.text_finished = self.text_count == 0
+
+        self.book_quotes = QuoteQueue(self.quote_store, book_quotes)
+        self.book_total = len(self.book_quotes)
+        self.book_shown = 0
+        self.books_finished = self.book_total == 0
+
+        self.other_quotes = QuoteQueue(self.quote_store, others)
+        self.other_shown = 0
+        # 常驻模式的每一轮由主随机数派生出独立种子，整段运行仍可复现
+        round_seed = self.seed if intro or self.seed is None else self.rng.randrange(2**32)
+        self.timeline = compile_timeline(
+            self.timings,
+            len(self.text_quotes),
+            self.book_total,
+            len(self.other_quotes),
+            [compliment.text for compliment in self.compliments],
+            seed=round_seed,
+            intro=intro,
+        )
+
+        if intro:
+            # 开场卡片结束后由 _start_card_loop 进入第一个有内容的阶段
+            self.card_phase = "intro"
+        elif not self.text_finished:
+            self.card_phase = "text"
+        elif self.book_total:
+            self.card_phase = "book"
+        elif self.other_quotes:
+            self.card_phase = "other"
+        else:
+            self.card_phase = "idle"
+
     def start(self) -> None:
+        """显示启动画面；调用 mark_ready 之前一直停留在启动画面。"""
         self.splash.setGeometry(self.rect())
-        self.splash.start(3000, self._after_splash)
+        self.splash.show()
+        self._splash_shown_at = self.show_clock.now_ms()
+        # 首帧之后再创建烟花图层，避免拖慢窗口出现
+        QTimer.singleShot(0, self._build_fireworks_overlays)
+        if self._assets_ready:
+            self._finish_splash()
+
+    def mark_ready(self) -> None:
+        """后台加载全部完成：结束启动画面（至少显示 splash_min_ms，避免一闪而过）。"""
+        if self._assets_ready:
+            return
+        self._assets_ready = True
+        if self._splash_shown_at is not None:
+            self._finish_splash()
+
+    def _finish_splash(self) -> None:
+        assert self._splash_shown_at is not None
+        elapsed_ms = self.show_clock.now_ms() - self._splash_shown_at
+        self.show_clock.call_later(max(0.0, self.splash_min_ms - elapsed_ms), self._after_splash, "splash")
+
+    def warm_up_glyphs(self) -> None:
+        """在启动画面期间解析各处用到的字体，并预先光栅化大号文字。"""
+        fonts = [
+            self.splash.text_font,
+            self.compliment_label.font(),
+            QFont("STKaiti", 22),
+            QFont("Microsoft YaHei", 12),
+        ]
+        fonts.extend(content_font(mode) for mode in CONTENT_FONTS)
+        for font in fonts:
+            # 触发字体匹配与回退字体加载
+            QFontMetrics(font).horizontalAdvance("暖冬提醒")
+        self.clover_overlay.setGeometry(self.rect())
+        self.clover_overlay.prepare()
+
+    def _build_fireworks_overlays(self) -> None:
+        while len(self.fireworks_overlays) < self.fireworks_overlay_count:
+            overlay = FireworksOverlay(
+                self, quality=self.quality, renderer=self.effects_renderer, time_source=self.show_clock.now
+            )
+            overlay.setGeometry(self.canvas_rect())
+            overlay.lower()
+            self.power.register_timer(overlay.timer)
+            self.fireworks_overlays.append(overlay)
 
     # region 生命周期
     def resizeEvent(self, event) -> None:  # type: ignore[override]
         super().resizeEvent(event)
+        self._layout_layers()
+
+    def _layout_layers(self) -> None:
         rect = self.rect()
-        self.cards_container.setGeometry(rect)
+        canvas = self.canvas_rect()
+        self.cards_container.setGeometry(canvas)
+        if self.card_layer is not None:
+            self.card_layer.setGeometry(self.cards_container.rect())
+            self.card_layer.lower()
         self.snow_effect.setGeometry(rect)
         self.splash.setGeometry(rect)
         for overlay in self.fireworks_overlays:
-            overlay.setGeometry(rect)
+            overlay.setGeometry(canvas)
         self.clover_overlay.setGeometry(rect)
-        self.card_manager.set_viewport_size(rect.size())
+        self.quality_overlay.move(12, 12)
+        self.card_manager.set_viewport_size(canvas.size())
+        self._prepare_background()
         if self.compliment_label.isVisible():
             self.compliment_label.adjustSize()
             target_y = rect.center().y() + int(rect.height() * 0.30)
@@ -344,15 +662,29 @@ class QuoteBoard(QWidget):
 
     # region 启动流程
     def _after_splash(self) -> None:
+        if self._splash_finished:
+            return
+        self._splash_finished = True
         self.splash.hide()
+        # 时间线以开场为零点
+        self._show_origin_ms = self.show_clock.now_ms()
+        # 数据、位图与图层都已就绪，此后基本不再变化
+        self.gc_policy.freeze_startup()
+        # 载入金句时已处于 intro，开场时才记入阶段日志并通知同步与 trace
+        self._card_phase = "intro"
+        self._announce_phase("", "intro")
         self._show_intro_card()
+        if self._pending_seek is not None:
+            phase, self._pending_seek = self._pending_seek, None
+            self.seek(phase)
 
     def _show_intro_card(self) -> None:
         quote = self._intro_quote()
-        self.intro_card = QuoteCard(quote)
+        self.intro_card = QuoteCard(quote, time_scale=self._time_scale)
+        self.power.register_animation(self.intro_card.fade_animation)
         self.intro_card.setParent(self)
-        self.intro_card.content_label.setText("")
         size = self.intro_card.sizeHint()
+        self.intro_text = self.intro_card.use_reveal_text(RevealText(clock=self.frame_clock))
         width = max(420, size.width())
         height = max(260, size.height())
         self.intro_card.resize(width, height)
@@ -361,12 +693,8 @@ class QuoteBoard(QWidget):
         self.intro_card.show()
         self.intro_card.fade_in()
 
-        self.intro_full_text = quote.text
-        self.intro_index = 0
-        self.intro_timer = QTimer(self)
-        self.intro_timer.timeout.connect(self._typewriter_step)
-        self.intro_timer.start(60)
-        QTimer.singleShot(5200, self._finish_intro)
+        self.intro_text.start(self.intro_char_interval_ms)
+        self.show_clock.call_later(self.timings.intro_ms, self._finish_intro, "intro")
 
     def _intro_quote(self) -> Quote:
         # 固定返回"听听音乐，让大脑放松一下。"
@@ -386,30 +714,25 @@ class QuoteBoard(QWidget):
         # 如果没找到，创建一个
         return Quote(text=fixed_text, color="#E6E6FA", category="text")
 
-    def _typewriter_step(self) -> None:
-        if not self.intro_card:
-            return
-        self.intro_index += 1
-        text = self.intro_full_text[: self.intro_index]
-        self.intro_card.content_label.setText(text)
-        if self.intro_index >= len(self.intro_full_text):
-            if self.intro_timer:
-                self.intro_timer.stop()
-
     def _finish_intro(self) -> None:
-        if self.intro_timer:
-            self.intro_timer.stop()
+        if self.intro_text:
+            self.intro_text.stop()
         if not self.intro_card:
             self._start_card_loop()
             return
 
+        intro_card = self.intro_card
+
         def _after_fade():
-            if self.intro_card:
-                self.intro_card.deleteLater()
-            self.intro_card = None
+            intro_card.deleteLater()
+            if self.intro_card is intro_card:
+                self.intro_card = None
+                self.intro_text = None
             self._start_card_loop()
 
-        self.intro_card.fade_out(_after_fade)
+        # 淡出动画只负责画面，后续流程按虚拟时钟推进，保证加速与复现时时刻一致
+        intro_card.fade_out()
+        self.show_clock.call_later(self.timings.card_fade_ms, _after_fade, "intro_fade")
 
     # endregion
 
@@ -430,7 +753,11 @@ class QuoteBoard(QWidget):
         elif self.card_phase != "other" and (not self.book_total or self.books_finished) and self.other_quotes:
             self.card_phase = "other"
         elif not self.other_quotes and (self.books_finished or not self.book_total) and self.text_finished:
+            if self._defer_until_loaded(self._start_regular_loop):
+                return
             self.card_phase = "idle"
+            if self.kiosk_mode:
+                self.card_manager.fade_out_all(self._begin_kiosk_round)
             return
         self._schedule_next_card()
 
@@ -475,60 +802,79 @@ class QuoteBoard(QWidget):
     def _after_text_fade_out(self) -> None:
         """text 淡出后，切换背景并开始下一阶段"""
         print("[_after_text_fade_out] text 淡出完成")
+        if self._defer_until_loaded(self._after_text_fade_out):
+            return
         if self.book_total and not self.books_finished:
             print(f"[_after_text_fade_out] 切换到 book 阶段，book_total={self.book_total}")
             self.card_phase = "book"
-            self.background_pixmap = self.book_background
+            self._set_background("book")
             self.set_background_opacity(1.0)
             self.update()
             self._init_book_grid()
-            QTimer.singleShot(500, self._schedule_next_card)
+            self.show_clock.call_later(self.timings.phase_gap_ms, self._schedule_next_card, "book")
         else:
             self._start_fireworks_phase()
 
+    def _background_layout(self) -> str:
+        # post_fireworks/book/other阶段使用全屏背景图，text阶段使用底部小图
+        if self.card_phase in ("post_fireworks", "book", "other"):
+            return LAYOUT_COVER
+        return LAYOUT_FOOTER
+
+    def _set_background(self, key: str) -> None:
+        self.background_key = key
+        self._prepare_background()
+
+    def _prepare_background(self) -> None:
+        if self.width() <= 0 or self.height() <= 0:
+            return
+        self.background_cache.prepare(
+            self.background_key, self.size(), self._background_layout(), self.devicePixelRatioF()
+        )
+
+    def _on_background_ready(self, key: str) -> None:
+        if key == self.background_key:
+            self._prepare_background()
+            self.update()
+
     def paintEvent(self, event) -> None:  # type: ignore[override]
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-        painter.fillRect(self.rect(), self.background_color)
-        
-        if not self.background_pixmap.isNull():
-            # post_fireworks/book/other阶段使用全屏背景图
-            if self.card_phase in ("post_fireworks", "book", "other"):
-                # 只在阶段切换时打印日志
-                if self._last_paint_phase != self.card_phase:
-                    print(f"[paintEvent] 阶段切换: {self._last_paint_phase} -> {self.card_phase}")
-                    print(f"[paintEvent] 窗口尺寸={self.size()}, pixmap尺寸={self.background_pixmap.size()}")
-                    self._last_paint_phase = self.card_phase
-                
-                # 按比例缩放至全屏
-                scaled = self.background_pixmap.scaled(
-                    self.size(),
-                    Qt.AspectRatioMode.KeepAspectRatioByExpanding,
-                    Qt.TransformationMode.SmoothTransformation
-                )
-                # 居中裁剪
-                x = (self.width() - scaled.width()) // 2
-                y = (self.height() - scaled.height()) // 2
+        # 上层的特效与卡片都是半透明的，任何一层更新都会重绘看板，这里即一帧
+        self.quality.record_present()
+        with layer_timings.paint("background"):
+            startup_metrics.mark("first_pixel")
+            painter = QPainter(self)
+            painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+            painter.fillRect(self.rect(), self.background_color)
+
+            layout = self._background_layout()
+            scaled = self.background_cache.scaled(
+                self.background_key, self.size(), layout, self.devicePixelRatioF()
+            )
+            if scaled is not None:
+                # 逻辑像素尺寸（缓存的位图已按设备像素比放大）
+                ratio = scaled.devicePixelRatio()
+                scaled_width = round(scaled.width() / ratio)
+                scaled_height = round(scaled.height() / ratio)
+                if layout == LAYOUT_COVER:
+                    # 只在阶段切换时打印日志
+                    if self._last_paint_phase != self.card_phase:
+                        print(f"[paintEvent] 阶段切换: {self._last_paint_phase} -> {self.card_phase}")
+                        print(
+                            f"[paintEvent] 窗口尺寸={self.size()}, "
+                            f"原图尺寸={self.background_cache.source_size(self.background_key)}"
+                        )
+                        self._last_paint_phase = self.card_phase
+                    # 居中裁剪
+                    x = (self.width() - scaled_width) // 2
+                    y = (self.height() - scaled_height) // 2
+                else:
+                    x = int(self.width() * FOOTER_MARGIN_RATIO)
+                    y = self.height() - scaled_height - int(self.height() * FOOTER_MARGIN_RATIO)
                 painter.save()
                 painter.setOpacity(self._background_opacity)
                 painter.drawPixmap(x, y, scaled)
                 painter.restore()
-            else:
-                # text阶段使用底部小图
-                available_height = int(self.height() * 0.32)
-                if available_height > 0:
-                    scaled = self.background_pixmap.scaledToHeight(
-                        available_height, Qt.TransformationMode.SmoothTransformation
-                    )
-                    margin_x = int(self.width() * 0.05)
-                    margin_y = int(self.height() * 0.05)
-                    x = margin_x
-                    y = self.height() - scaled.height() - margin_y
-                    painter.save()
-                    painter.setOpacity(self._background_opacity)
-                    painter.drawPixmap(x, y, scaled)
-                    painter.restore()
-        super().paintEvent(event)
+            super().paintEvent(event)
 
     def _start_fireworks_phase(self) -> None:
         print("开始烟花阶段，切换到城堡背景")
@@ -537,17 +883,21 @@ class QuoteBoard(QWidget):
         self.heart_fireworks_count = 0
         self.compliment_index = 0
 
-        self.background_pixmap = self.fireworks_background
+        self._set_background("fireworks")
         self.set_background_opacity(1.0)
         self.update()
-        QTimer.singleShot(500, self._start_heart_fireworks)
+        if self.timings.fireworks_fade_in:
+            self._fade_to_fireworks_background()
+        else:
+            self.show_clock.call_later(self.timings.phase_gap_ms, self._start_heart_fireworks, "fireworks")
 
     def _start_heart_fireworks(self) -> None:
+        self._build_fireworks_overlays()
         if not self.fireworks_overlays:
             return
         print("开始播放烟花，切换到迪士尼城堡背景图")
         # 切换到烟花背景图
-        self.background_pixmap = self.fireworks_background
+        self._set_background("fireworks")
         # 确保背景是完全不变暗的
         self.set_background_opacity(1.0)
         self.update()
@@ -556,23 +906,25 @@ class QuoteBoard(QWidget):
 
     def _fade_to_fireworks_background(self) -> None:
         """先淡入迪士尼背景，结束后再启动烟花。"""
-        self.background_pixmap = self.fireworks_background
+        self._set_background("fireworks")
         # 从0到1做淡入
         if self.background_fade_animation and self.background_fade_animation.state() == QPropertyAnimation.Running:
             self.background_fade_animation.stop()
         self.set_background_opacity(0.0)
         self.background_fade_animation = QPropertyAnimation(self, b"background_opacity")
-        self.background_fade_animation.setDuration(1000)
+        self.background_fade_animation.setDuration(max(1, round(self.timings.fireworks_fade_ms / self.show_clock.speed)))
         self.background_fade_animation.setStartValue(0.0)
         self.background_fade_animation.setEndValue(1.0)
         self.background_fade_animation.setEasingCurve(QEasingCurve.Type.InOutQuad)
-        self.background_fade_animation.finished.connect(self._after_background_fade_in)
+        self.power.register_animation(self.background_fade_animation)
         self.background_fade_animation.start()
+        # 淡入动画只负责画面，后续流程按虚拟时钟推进，与编译时间线一致
+        self.show_clock.call_later(self.timings.fireworks_fade_ms, self._after_background_fade_in, "fireworks_fade")
 
     def _after_background_fade_in(self) -> None:
-        """背景淡入后停顿2s再播放烟花。"""
+        """背景淡入后停顿 fireworks_pause_ms 再播放烟花。"""
         self.set_background_opacity(1.0)
-        QTimer.singleShot(2000, self._start_heart_fireworks)
+        self.show_clock.call_later(self.timings.fireworks_pause_ms, self._start_heart_fireworks, "fireworks")
 
     def _fade_out_emoji_and_cards(self) -> None:
         """让🍀和 text 一起淡出。"""
@@ -582,8 +934,7 @@ class QuoteBoard(QWidget):
         self._dismiss_heart_cards()
 
     def _stop_heart_fireworks(self) -> None:
-        if self.heart_fireworks_timer.isActive():
-            self.heart_fireworks_timer.stop()
+        self.heart_fireworks_timer.stop()
         self.heart_fireworks_count = self.heart_fireworks_limit
         for overlay in self.fireworks_overlays:
             overlay.hide()
@@ -596,16 +947,8 @@ class QuoteBoard(QWidget):
         self.set_background_opacity(1.0)
         print(f"烟花轮次: {self.heart_fireworks_count}/{self.heart_fireworks_limit}")
         
-        # 动态计算间隔时间：确保上一轮祝福语完全显示
-        # 计算时间 = 字符数 × 字符间隔时间 + 额外停留时间（让用户有时间阅读）
-        if self.current_compliment_text:
-            text_length = len(self.current_compliment_text)
-            typing_duration = text_length * self.compliment_char_interval_ms
-            # 额外停留时间：根据文本长度动态调整，最少1秒，最多3秒
-            extra_display_time = min(3000, max(1000, text_length * 20))
-            dynamic_interval = typing_duration + extra_display_time
-        else:
-            dynamic_interval = self.heart_fireworks_interval_ms
+        # 动态计算间隔时间：确保上一轮祝福语完全显示，再留出阅读时间
+        dynamic_interval = self.timings.compliment_interval_ms(self.current_compliment_text)
         
         if self.heart_fireworks_count < self.heart_fireworks_limit:
             print(f"下一条祝福语将在 {dynamic_interval}ms 后显示（文本长度: {len(self.current_compliment_text) if self.current_compliment_text else 0} 字符）")
@@ -613,26 +956,40 @@ class QuoteBoard(QWidget):
         else:
             print(f"所有 zanshang.json 内容显示完成，等待 {dynamic_interval}ms 后切换阶段")
             self.heart_fireworks_timer.stop()
-            QTimer.singleShot(dynamic_interval, self._after_heart_fireworks_complete)
+            self.show_clock.call_later(dynamic_interval, self._after_heart_fireworks_complete, "fireworks_done")
 
     def _heart_fireworks_burst(self) -> None:
         if not self.fireworks_overlays:
             return
-        rect = self.rect()
+        rect = self.canvas_rect()
         if rect.isEmpty():
             return
 
-        total = len(self.fireworks_overlays)
+        # 按当前画质限制同时绽放的数量与粒子数；落点与种子总是为全部图层抽取，
+        # 超出 max_bursts 的只是不绘制，随机数的消耗与画质无关
+        level = self.quality.level
+        particle_count = max(12, round(90 * level.particle_scale))
         for index, overlay in enumerate(self.fireworks_overlays):
             color = self.heart_firework_colors[index % len(self.heart_firework_colors)]
 
-            target_x = rect.width() * random.uniform(0.15, 0.85)
-            target_y = rect.height() * random.uniform(0.15, 0.45)
+            target_x = rect.width() * self.fireworks_rng.uniform(0.15, 0.85)
+            target_y = rect.height() * self.fireworks_rng.uniform(0.15, 0.45)
             position = QPointF(target_x, target_y)
+            seed = self.fireworks_rng.randrange(2**32)
+            if index >= level.max_bursts:
+                continue
 
             overlay.setGeometry(rect)
             overlay.raise_()
-            overlay.trigger(color, position, simultaneous=True, bursts=1, particle_count=90, launch_from_bottom=True)
+            overlay.trigger(
+                color,
+                position,
+                simultaneous=True,
+                bursts=1,
+                particle_count=particle_count,
+                launch_from_bottom=True,
+                seed=seed,
+            )
 
     def _show_compliment(self) -> None:
         if not self.compliments:
@@ -644,46 +1001,36 @@ class QuoteBoard(QWidget):
         compliment = self.compliments[self.compliment_index]
         self.compliment_index += 1
 
-        self.compliment_full_text = compliment.text
         self.current_compliment_text = compliment.text  # 保存当前祝福语文本，用于计算显示时间
-        self.compliment_char_index = 0
-        self.compliment_label.setText("")
+        self.compliment_label.setText(compliment.text)
 
+        # 按整句排版确定横幅尺寸，逐字显示期间不再改变大小
         rect = self.rect()
+        self.compliment_label.setMinimumWidth(800)
+        self.compliment_label.setMaximumWidth(max(800, rect.width() - 80))
+        self.compliment_label.adjustSize()
         target_y = rect.center().y() + int(rect.height() * 0.30)
         self.compliment_label.move(
-            rect.center().x() - 400,
+            rect.center().x() - self.compliment_label.width() // 2,
             target_y,
         )
-        self.compliment_label.setMinimumWidth(800)
         self.compliment_label.raise_()
         self.compliment_label.show()
-
-        if self.compliment_timer:
-            self.compliment_timer.stop()
-        self.compliment_timer = QTimer(self)
-        self.compliment_timer.timeout.connect(self._compliment_typewriter_step)
-        self.compliment_timer.start(self.compliment_char_interval_ms)
-
-    def _compliment_typewriter_step(self) -> None:
-        if self.compliment_char_index < len(self.compliment_full_text):
-            self.compliment_char_index += 1
-            text = self.compliment_full_text[:self.compliment_char_index]
-            self.compliment_label.setText(text)
-        else:
-            if self.compliment_timer:
-                self.compliment_timer.stop()
+        self.compliment_label.start(self.timings.compliment_char_ms)
 
     def _after_heart_fireworks_complete(self) -> None:
         if not self.post_heart_pending:
             return
         self.post_heart_pending = False
-        if self.compliment_timer:
-            self.compliment_timer.stop()
+        self.compliment_label.stop()
         self.compliment_label.hide()
 
         print(f"烟花结束 - other_quotes: {len(self.other_quotes)}")
+        if not self.other_quotes and self._defer_until_loaded(self._start_other_or_idle):
+            return
+        self._start_other_or_idle()
 
+    def _start_other_or_idle(self) -> None:
         if self.other_quotes:
             self.card_phase = "other"
         else:
@@ -693,35 +1040,72 @@ class QuoteBoard(QWidget):
     def _schedule_next_card(self) -> None:
         if self.paused or self.card_phase in {"idle", "post_fireworks"}:
             return
-        if self.card_timer.isActive():
+        if self.card_timer.is_active():
             return
         interval = self._next_interval()
         if interval is None:
+            if self.card_phase == "other" and not self.other_quotes:
+                # 流式读取尚未结束时等读完再判断，之后补入的金句会重新启动出卡
+                if self._defer_until_loaded(self._schedule_next_card):
+                    return
+                # other 展示完毕进入 idle；常驻模式淡出全部卡片后开始新一轮
+                self.card_phase = "idle"
+                if self.kiosk_mode:
+                    self.card_manager.fade_out_all(self._begin_kiosk_round)
             return
         self.card_timer.start(interval)
 
     def _next_interval(self) -> Optional[int]:
         if self.card_phase == "text":
             if self.text_quotes:
-                return self.text_interval_ms
+                return self.timings.text_interval_ms
             return None
         if self.card_phase == "book":
             if self.book_quotes:
-                return self.book_interval_ms
+                return self.timings.book_interval_ms
             return None
         if self.card_phase == "other":
             if self.other_quotes:
-                return random.randint(2400, 3200)
+                # 随机间隔在编译时间线时已由种子抽好
+                interval = self.timeline.other_interval(self.other_shown)
+                if interval is None:
+                    interval = self.rng.randint(*self.timings.other_interval_ms)
+                return interval
         return None
 
     def _on_card_timer(self) -> None:
         self.card_timer.stop()
         if self.paused or self.card_phase not in {"text", "book", "other"}:
             return
-        self._add_new_card()
+        with tracer.span("card:add", "cards"):
+            self._add_new_card()
         self._schedule_next_card()
+        # 两张卡片之间是动画阶段里最安静的时刻
+        self.gc_policy.maybe_collect()
+
+    def attach_live_feed(self, queue: LiveQuoteQueue, min_gap_ms: Optional[int] = None) -> None:
+        """接入现场愿望队列；两条现场愿望之间至少间隔 ``min_gap_ms`` 演出时间。"""
+        self.live_queue = queue
+        if min_gap_ms is not None:
+            self.live_min_gap_ms = min_gap_ms
+
+    def _take_live_quote(self) -> Optional[Quote]:
+        # 现场愿望只占用 text/other 的出卡位，不消耗本轮金句，也不打乱 book 网格
+        if self.live_queue is None or self.card_phase not in {"text", "other"}:
+            return None
+        now = self.show_time_ms()
+        if self._last_live_ms is not None and now - self._last_live_ms < self.live_min_gap_ms:
+            return None
+        quote = self.live_queue.pop()
+        if quote is not None:
+            self._last_live_ms = now
+            self.live_shown += 1
+        return quote
 
     def _next_quote(self) -> Quote:
+        live = self._take_live_quote()
+        if live is not None:
+            return live
         if self.card_phase == "text" and self.text_quotes:
             self.text_shown += 1
             return self.text_quotes.popleft()
@@ -729,21 +1113,18 @@ class QuoteBoard(QWidget):
             self.book_shown += 1
             return self.book_quotes.popleft()
         if self.card_phase == "other" and self.other_quotes:
+            self.other_shown += 1
             return self.other_quotes.popleft()
         raise RuntimeError("没有可用的金句数据")
 
     def _add_new_card(self) -> None:
         quote = self._next_quote()
-        card = QuoteCard(quote)
-        card.hovered.connect(self._on_card_hovered)
-        card.unhovered.connect(self._on_card_unhovered)
+        card = self.card_pool.acquire(quote)
 
         if quote.category == "text":
             self.card_manager.add_card(card)
-            if not self.text_quotes and not self.text_finished:
-                self.text_finished = True
-                print("text 完成，淡出所有卡片")
-                self.card_manager.fade_out_all(self._after_text_fade_out)
+            if not self.text_quotes and not self.text_finished and "text" not in self.loading_categories:
+                self._finish_text_phase()
                 return
         elif quote.category == "book":
             print(f"[_add_new_card] 添加 book 卡片，当前显示={len(self.book_cards)}, batch_count={self.book_batch_count}")
@@ -774,10 +1155,8 @@ class QuoteBoard(QWidget):
                 print(f"[_add_new_card] book 卡片已添加，当前 book_cards 数量: {len(self.book_cards)}")
             else:
                 print(f"[_add_new_card] 警告：网格位置未初始化")
-            if not self.book_quotes and not self.books_finished:
-                self.books_finished = True
-                print("book 完成，淡出所有卡片")
-                self._fade_out_book_cards()
+            if not self.book_quotes and not self.books_finished and "book" not in self.loading_categories:
+                self._finish_book_phase()
                 return
         else:
             self.card_manager.add_card(card)
@@ -785,13 +1164,65 @@ class QuoteBoard(QWidget):
         if self.card_phase not in {"idle", "post_fireworks"}:
             self._schedule_next_card()
 
+    def _sampler_source(self, category: str) -> Sequence[int]:
+        store = self.quote_store
+        if category == "text":
+            return store.indices("text")[1:]  # 第一条是开场卡片
+        if category == "book":
+            return store.indices("book")
+        return store.indices_except(("text", "book"))
+
+    def _finish_text_phase(self) -> None:
+        self.text_finished = True
+        print("text 完成，淡出所有卡片")
+        self.card_manager.fade_out_all(self._after_text_fade_out)
+
+    def _finish_book_phase(self) -> None:
+        self.books_finished = True
+        print("book 完成，淡出所有卡片")
+        self._fade_out_book_cards()
+
+    def _begin_kiosk_round(self) -> None:
+        """常驻模式：从循环采样器补满各类金句，不再显示开场卡片，从头开始新一轮。"""
+        if not self.kiosk_mode or self.card_phase != "idle":
+            return
+        self.kiosk_cycles += 1
+
+        def take(category: str) -> List[int]:
+            sampler = self._samplers.get(category)
+            if sampler is None:
+                sampler = self._samplers[category] = RecyclingSampler(self._sampler_source(category), self.rng)
+            count = len(sampler) if self.kiosk_round_size is None else min(len(sampler), self.kiosk_round_size)
+            return sampler.take(count)
+
+        # 新一轮的时间线从此刻重新计时
+        self._show_origin_ms = self.show_clock.now_ms()
+        self._load_round(take("text"), take("book"), take("other"), intro=False)
+        self.book_batch_count = 0
+        self._set_background("default")
+        self.set_background_opacity(1.0)
+        print(f"[kiosk] 第 {self.kiosk_cycles} 轮开始：text={self.text_count} book={self.book_total} other={len(self.other_quotes)}")
+        self._start_card_loop()
+
+    def shed_load(self) -> None:
+        """资源超限时收起所有卡片，并清空卡片对象池与各类位图缓存。"""
+        self.card_manager.fade_out_all()
+        for card in self.book_cards:
+            self._fade_out_and_release(card)
+        self.book_cards = []
+        self.book_batch_count = 0
+        self.card_pool.clear()
+        glyph_cache.clear()
+        if self.card_layer is not None:
+            self.card_layer.raster_cache.clear()
+
     def _clear_book_batch(self) -> None:
         """清空当前批次的 book 卡片"""
         if not self.book_cards:
             return
         print(f"[_clear_book_batch] 清空 {len(self.book_cards)} 张卡片")
         for card in self.book_cards:
-            card.fade_out(card.deleteLater)
+            self._fade_out_and_release(card)
         self.book_cards = []
 
     def _fade_out_book_cards(self) -> None:
@@ -801,21 +1232,29 @@ class QuoteBoard(QWidget):
             return
 
         for card in self.book_cards:
-            card.fade_out(card.deleteLater)
+            self._fade_out_and_release(card)
 
         self.book_cards = []
-        QTimer.singleShot(1600, self._after_book_fade_out)
+        self.show_clock.call_later(self.timings.fade_all_ms, self._after_book_fade_out, "book_fade")
 
     def _after_book_fade_out(self) -> None:
         """book 卡片淡出后，切换背景并开始烟花"""
         print("book 卡片淡出完成，切换到城堡背景，准备烟花")
         self._start_fireworks_phase()
 
+    def _fade_out_and_release(self, card: QuoteCard) -> None:
+        card.fade_out(lambda: self.card_manager.release_card(card))
+
     # region 互动状态
-    def _on_card_hovered(self, card: QuoteCard) -> None:
+    def _connect_card_signals(self, card: QuoteCard) -> None:
+        self.power.register_animation(card.fade_animation)
+        card.hovered.connect(self._on_card_hovered)
+        card.unhovered.connect(self._on_card_unhovered)
+
+    def _on_card_hovered(self, card: object) -> None:
         self.hover_card = card
 
-    def _on_card_unhovered(self, card: QuoteCard) -> None:
+    def _on_card_unhovered(self, card: object) -> None:
         if self.hover_card is card:
             self.hover_card = None
 
@@ -826,26 +1265,128 @@ class QuoteBoard(QWidget):
 
     # region 控制逻辑
     def toggle_pause(self) -> None:
+        """暂停即冻结演出时钟并挂起所有定时器与动画（含烟花），恢复后从原处继续。"""
         self.paused = not self.paused
-        if self.paused:
-            if self.card_timer.isActive():
-                self.card_timer.stop()
-            self.snow_effect.pause()
-            if self.heart_fireworks_timer and self.heart_fireworks_timer.isActive():
-                self.heart_fireworks_timer.stop()
-            if self.compliment_timer and self.compliment_timer.isActive():
-                self.compliment_timer.stop()
-            self.compliment_label.hide()
+        self.power.set_reason("paused", self.paused)
+
+    def canvas_rect(self) -> QRect:
+        """共享画布在本屏坐标系中的位置（本屏左上角之外的部分为负坐标）。"""
+        return QRect(self.canvas) if self.canvas is not None else self.rect()
+
+    def set_canvas(self, canvas: Optional[QRect]) -> None:
+        self.canvas = QRect(canvas) if canvas is not None else None
+        self._layout_layers()
+
+    @property
+    def show_started(self) -> bool:
+        return self._show_origin_ms is not None
+
+    def show_time_ms(self) -> int:
+        """开场以来的虚拟时间（毫秒），与编译时间线中的时刻对应。"""
+        if self._show_origin_ms is None:
+            return 0
+        return round(self.show_clock.now_ms() - self._show_origin_ms)
+
+    def set_speed(self, speed: float) -> None:
+        """调整演出倍速：调度、逐字显示、雪花烟花模拟与卡片淡入淡出一起加速。"""
+        speed = max(0.25, min(100.0, speed))
+        self.show_clock.set_speed(speed)
+        print(f"[show] 播放速度 {speed:g}x")
+
+    def seek(self, phase: str) -> None:
+        """跳到时间线中某一阶段的开头，此前各阶段的金句视为已经展示。
+
+        只能向后跳；开场之前调用时等开场后再跳。
+        """
+        if phase not in SHOW_PHASES:
+            raise ValueError(f"未知阶段 {phase}（可选: {', '.join(SHOW_PHASES)}）")
+        if self._show_origin_ms is None:
+            self._pending_seek = phase
+            return
+        target_ms = self.timeline.phase_start(phase)
+        now_ms = self.show_time_ms()
+        if target_ms < now_ms:
+            raise ValueError(f"阶段 {phase} 已经过去（{target_ms} ms < {now_ms} ms），时间线只能向后跳")
+
+        self._cancel_show()
+        order = SHOW_PHASES.index(phase)
+        if order > SHOW_PHASES.index("text"):
+            self.text_shown += len(self.text_quotes)
+            self.text_quotes.clear()
+            self.text_finished = True
+        if order > SHOW_PHASES.index("book"):
+            self.book_shown += len(self.book_quotes)
+            self.book_quotes.clear()
+            self.books_finished = True
+        if order > SHOW_PHASES.index("post_fireworks"):
+            self.compliment_index = len(self.compliments)
+            self.heart_fireworks_count = self.heart_fireworks_limit
+        self.show_clock.advance(target_ms - now_ms)
+        print(f"[show] 跳到阶段 {phase}（{target_ms} ms）")
+
+        if phase == "intro":
+            self._show_intro_card()
+        elif phase == "text":
+            self._start_card_loop()
+        elif phase == "book":
+            self._after_text_fade_out()
+        elif phase == "post_fireworks":
+            self._start_fireworks_phase()
+        elif phase == "other":
+            self.post_heart_pending = True
+            self._after_heart_fireworks_complete()
         else:
-            self.snow_effect.resume()
-            if self.card_phase not in {"idle", "post_fireworks"}:
-                self._schedule_next_card()
-            if (
-                self.post_heart_pending
-                and self.heart_fireworks_count < self.heart_fireworks_limit
-                and not self.heart_fireworks_timer.isActive()
-            ):
-                self.heart_fireworks_timer.start(self.heart_fireworks_interval_ms)
+            self.card_phase = "idle"
+
+    def _cancel_show(self) -> None:
+        """撤销所有待执行的演出调度，并收起当前阶段的画面。"""
+        self.show_clock.cancel_all()
+        if self.intro_text is not None:
+            self.intro_text.stop()
+        if self.intro_card is not None:
+            self.intro_card.deleteLater()
+            self.intro_card = None
+            self.intro_text = None
+        self.card_manager.fade_out_all()
+        for card in self.book_cards:
+            self._fade_out_and_release(card)
+        self.book_cards = []
+        self.book_batch_count = 0
+        self._stop_heart_fireworks()
+        self.post_heart_pending = False
+
+    def toggle_hud(self) -> None:
+        self.hud.set_active(not self.hud.isVisible())
+
+    def toggle_trace(self) -> Optional[Path]:
+        """开始录制 trace；再次调用时停止并写入 trace_dir，返回文件路径。"""
+        if not tracer.recording:
+            tracer.start()
+            self._trace_counter_timer.start()
+            print("[trace] 开始录制")
+            return None
+        self._trace_counter_timer.stop()
+        path = self.trace_dir / f"trace-{time.strftime('%Y%m%d-%H%M%S')}.json"
+        count = tracer.stop(path)
+        print(f"[trace] 已保存 {count} 个事件到 {path}（可用 chrome://tracing 或 Perfetto 打开）")
+        return path
+
+    def _record_trace_counters(self) -> None:
+        tracer.counter(
+            "counts",
+            {
+                "cards": len(self.card_manager.cards) + len(self.book_cards),
+                "particles": sum(len(overlay.particles) for overlay in self.fireworks_overlays),
+                "flakes": len(self.snow_effect.flakes),
+            },
+        )
+        tracer.counter("fps", {"fps": round(self.quality.fps, 1)})
+
+    def toggle_quality_overlay(self) -> None:
+        visible = not self.quality_overlay.isVisible()
+        self.quality_overlay.setVisible(visible)
+        if visible:
+            self.quality_overlay.raise_()
 
     def toggle_distraction_free(self) -> None:
         self.distraction_free = not self.distraction_free
@@ -0,0 +1,254 @@
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Tuple
+
+from PySide6.QtCore import QEasingCurve, QPoint, QRect, QRectF, QSize, Qt, QTimer, Signal
+from PySide6.QtGui import QEnterEvent, QPainter, QPaintEvent, QPixmap, QRegion
+from PySide6.QtWidgets import QWidget
+
+from .card_widget import QuoteCard
+from .metrics import layer_timings
+from .models import Quote
+
+
+@dataclass
+class CardSprite:
+    """合成层中的一张卡片：只保存位图与动画状态，不再持有控件树。"""
+
+    quote: Quote
+    mode: str
+    rect: QRect
+    pixmap: QPixmap
+    hover_pixmap: Optional[QPixmap] = None
+    opacity: float = 0.0
+    scale: float = 1.0
+    fade_from: float = 0.0
+    fade_to: float = 0.0
+    fade_start: float = 0.0
+    fade_duration: float = 0.0  # 0 表示没有进行中的淡入淡出
+    on_faded: Optional[Callable[[], None]] = None
+    removing: bool = False
+
+    @property
+    def animating(self) -> bool:
+        return self.fade_duration > 0
+
+
+class CardRasterCache:
+    """按 (文本, 模式, 颜色, 尺寸, 设备像素比, 悬停) 缓存卡片位图。"""
+
+    def __init__(self, max_entries: int = 128) -> None:
+        self.max_entries = max_entries
+        self._pixmaps: "OrderedDict[Tuple[str, str, str, int, int, float, bool], QPixmap]" = OrderedDict()
+
+    def get(self, card: QuoteCard, size: QSize, dpr: float, hover: bool = False) -> QPixmap:
+        quote = card.quote
+        key = (quote.text, card.mode, quote.color, size.width(), size.height(), round(dpr, 2), hover)
+        pixmap = self._pixmaps.get(key)
+        if pixmap is not None:
+            self._pixmaps.move_to_end(key)
+            return pixmap
+        pixmap = self.rasterize(card, size, dpr, hover)
+        self._pixmaps[key] = pixmap
+        while len(self._pixmaps) > self.max_entries:
+            self._pixmaps.popitem(last=False)
+        return pixmap
+
+    def __len__(self) -> int:
+        return len(self._pixmaps)
+
+    def clear(self) -> None:
+        self._pixmaps.clear()
+
+    def hover_variant(self, sprite: CardSprite, dpr: float) -> QPixmap:
+        """悬停时才需要的高亮版本，按需临时构建控件光栅化一次。"""
+        card = QuoteCard(sprite.quote)
+        try:
+            return self.get(card, sprite.rect.size(), dpr, hover=True)
+        finally:
+            card.deleteLater()
+
+    @staticmethod
+    def rasterize(card: QuoteCard, size: QSize, dpr: float, hover: bool = False) -> QPixmap:
+        card.resize(size)
+        card.layout.activate()
+        previous_hover = card._hover
+        card._hover = hover
+        card.opacity_effect.setOpacity(1.0)
+        pixmap = QPixmap(QSize(max(1, round(size.width() * dpr)), max(1, round(size.height() * dpr))))
+        pixmap.setDevicePixelRatio(dpr)
+        pixmap.fill(Qt.GlobalColor.transparent)
+        card.render(pixmap, QPoint(), QRegion(), QWidget.RenderFlag.DrawChildren)
+        card._hover = previous_hover
+        return pixmap
+
+
+class CardCompositeLayer(QWidget):
+    """在一次绘制中合成所有卡片位图，按卡片分别应用透明度与缩放。
+
+    取代每张卡片各自的 ``QGraphicsOpacityEffect``：淡入淡出只改变绘制时的不透明度，
+    不会触发整棵控件树的离屏渲染。悬停命中检测也在这里完成。
+    """
+
+    hovered = Signal(object)
+    unhovered = Signal(object)
+
+    fade_ms = 600  # 与 QuoteCard 的透明度动画保持一致
+
+    def __init__(self, parent: Optional[QWidget] = None, raster_cache: Optional[CardRasterCache] = None) -> None:
+        super().__init__(parent)
+        self.setMouseTracking(True)
+        self.setAttribute(Qt.WidgetAttribute.WA_NoSystemBackground, True)
+        self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground, True)
+        self.raster_cache = raster_cache or CardRasterCache()
+        self.sprites: List[CardSprite] = []
+        self.hover_sprite: Optional[CardSprite] = None
+        self._easing = QEasingCurve(QEasingCurve.Type.OutCubic)
+        # 淡入淡出的计时来源，演出使用虚拟时钟时随之加速
+        self.time_source: Callable[[], float] = time.perf_counter
+        self._timer = QTimer(self)
+        self._timer.setInterval(16)
+        self._timer.timeout.connect(self._advance_fades)
+
+    @property
+    def timer(self) -> QTimer:
+        """驱动淡入淡出的定时器（供 PowerManager 登记）。"""
+        return self._timer
+
+    # region 卡片管理
+    def add(self, sprite: CardSprite) -> None:
+        self.sprites.append(sprite)
+        self._start_fade(sprite, 0.0, 1.0)
+
+    def fade_out(self, sprite: CardSprite, finished_callback: Optional[Callable[[], None]] = None) -> None:
+        sprite.removing = True
+        if sprite is self.hover_sprite:
+            self._set_hover(None)
+
+        def _on_faded() -> None:
+            self.remove(sprite)
+            if finished_callback:
+                finished_callback()
+
+        self._start_fade(sprite, sprite.opacity, 0.0, _on_faded)
+
+    def remove(self, sprite: CardSprite) -> None:
+        if sprite in self.sprites:
+            self.sprites.remove(sprite)
+            self.update(sprite.rect)
+        if sprite is self.hover_sprite:
+            self._set_hover(None)
+
+    def move(self, sprite: CardSprite, rect: QRect) -> None:
+        old = QRect(sprite.rect)
+        sprite.rect = rect
+        self.update(old)
+        self.update(rect)
+
+    def raise_sprite(self, sprite: CardSprite) -> None:
+        if sprite in self.sprites:
+            self.sprites.remove(sprite)
+            self.sprites.append(sprite)
+            self.update(sprite.rect)
+
+    # endregion
+
+    # region 动画
+    def _start_fade(
+        self,
+        sprite: CardSprite,
+        start: float,
+        end: float,
+        on_faded: Optional[Callable[[], None]] = None,
+    ) -> None:
+        sprite.opacity = start
+        sprite.fade_from = start
+        sprite.fade_to = end
+        sprite.fade_start = self.time_source()
+        sprite.fade_duration = self.fade_ms / 1000.0
+        sprite.on_faded = on_faded
+        if not self._timer.isActive():
+            self._timer.start()
+        self.update(sprite.rect)
+
+    def _advance_fades(self) -> None:
+        now = self.time_source()
+        finished: List[CardSprite] = []
+        for sprite in self.sprites:
+            if not sprite.animating:
+                continue
+            progress = min(1.0, (now - sprite.fade_start) / sprite.fade_duration)
+            eased = self._easing.valueForProgress(progress)
+            sprite.opacity = sprite.fade_from + (sprite.fade_to - sprite.fade_from) * eased
+            self.update(sprite.rect)
+            if progress >= 1.0:
+                sprite.fade_duration = 0.0
+                finished.append(sprite)
+        for sprite in finished:
+            callback = sprite.on_faded
+            sprite.on_faded = None
+            if callback:
+                callback()
+        if not any(sprite.animating for sprite in self.sprites):
+            self._timer.stop()
+
+    # endregion
+
+    # region 悬停
+    def _sprite_at(self, pos: QPoint) -> Optional[CardSprite]:
+        for sprite in reversed(self.sprites):
+            if not sprite.removing and sprite.rect.contains(pos):
+                return sprite
+        return None
+
+    def _set_hover(self, sprite: Optional[CardSprite]) -> None:
+        if sprite is self.hover_sprite:
+            return
+        previous = self.hover_sprite
+        self.hover_sprite = sprite
+        if previous is not None:
+            self.update(previous.rect)
+            self.unhovered.emit(previous)
+        if sprite is not None:
+            if sprite.hover_pixmap is None:
+                sprite.hover_pixmap = self.raster_cache.hover_variant(sprite, self.devicePixelRatioF())
+            self.update(sprite.rect)
+            self.hovered.emit(sprite)
+
+    def mouseMoveEvent(self, event) -> None:  # type: ignore[override]
+        self._set_hover(self._sprite_at(event.position().toPoint()))
+        super().mouseMoveEvent(event)
+
+    def leaveEvent(self, event: QEnterEvent) -> None:  # type: ignore[override]
+        self._set_hover(None)
+        super().leaveEvent(event)
+
+    # endregion
+
+    def paintEvent(self, event: QPaintEvent) -> None:  # type: ignore[override]
+        with layer_timings.paint("cards"):
+            if not self.sprites:
+                return
+            painter = QPainter(self)
+            painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
+            dirty = event.rect()
+            for sprite in self.sprites:
+                if sprite.opacity <= 0.0 or not sprite.rect.intersects(dirty):
+                    continue
+                pixmap = sprite.pixmap
+                if sprite is self.hover_sprite and sprite.hover_pixmap is not None:
+                    pixmap = sprite.hover_pixmap
+                painter.setOpacity(sprite.opacity)
+                if sprite.scale != 1.0:
+                    center = QRectF(sprite.rect).center()
+                    painter.save()
+                    painter.translate(center)
+                    painter.scale(sprite.scale, sprite.scale)
+                    painter.translate(-center)
+                    painter.drawPixmap(sprite.rect.topLeft(), pixmap)
+                    painter.restore()
+                else:
+                    painter.drawPixmap(sprite.rect.topLeft(), pixmap)
@@ -3,75 +3,141 @@ from __future__ import annotations
 import random
 
 from dataclasses import dataclass
-from typing import List
+from typing import Callable, List, Optional
 
-from PySide6.QtCore import QRect, QSize
+from PySide6.QtCore import QRect, QSize, QTimer
 
+from .card_compositor import CardCompositeLayer, CardSprite
+from .card_pool import CardPool
 from .card_widget import QuoteCard
+from .placement import PlacementEngine
 
 
-@dataclass
+@dataclass(eq=False)
 class CardSlot:
-    widget: QuoteCard
+    # 控件模式下持有 widget；合成模式下卡片只以位图形式存在于 sprite 中
+    widget: Optional[QuoteCard]
     rect: QRect
+    sprite: Optional[CardSprite] = None
 
 
 class CardManager:
-    def __init__(self, container, margin: int = 32) -> None:
+    def __init__(
+        self,
+        container,
+        margin: int = 32,
+        composite_layer: Optional[CardCompositeLayer] = None,
+        pool: Optional[CardPool] = None,
+        rng: Optional[random.Random] = None,
+        call_later: Optional[Callable[[int, Callable[[], None]], object]] = None,
+    ) -> None:
         self.container = container
         self.margin = margin
         self.viewport_size = QSize(1280, 720)
         self.cards: List[CardSlot] = []
         self.max_cards = 90
+        self.composite_layer = composite_layer
+        self.pool = pool
+        self.rng = rng or random.Random()
+        self.placement = PlacementEngine(rng=self.rng)
+        # 淡出全部卡片后的回调由它延时执行，演出使用虚拟时钟时替换为 ShowClock.call_later
+        self.call_later = call_later or QTimer.singleShot
+        self.fade_all_ms = 1600
+        self.evicted_covered = 0  # 因被新卡片完全遮住而提前淡出的数量
+
+    def release_card(self, card: QuoteCard) -> None:
+        """卡片不再展示：有对象池时归还复用，否则销毁。"""
+        if self.pool is not None:
+            self.pool.release(card)
+        else:
+            card.deleteLater()
 
     def set_viewport_size(self, size: QSize) -> None:
         self.viewport_size = size
+        # 按原有顺序重新摆放，让索引只包含已摆好的卡片
+        self.placement.clear()
         for slot in self.cards:
-            rect = self._random_rect(slot.rect.size())
+            rect = self._place_rect(slot.rect.size())
             slot.rect = rect
-            slot.widget.setGeometry(rect)
-            slot.widget.raise_()
-
-    def _random_rect(self, size: QSize) -> QRect:
-        width = max(size.width(), 240)
-        height = max(size.height(), 150)
-        available_width = max(0, self.viewport_size.width() - width - self.margin * 2)
-        available_height = max(0, self.viewport_size.height() - height - self.margin * 2)
-        x = self.margin + (random.randint(0, available_width) if available_width > 0 else 0)
-        y = self.margin + (random.randint(0, available_height) if available_height > 0 else 0)
-        return QRect(x, y, width, height)
+            self.placement.insert(slot, rect)
+            if slot.sprite is not None and self.composite_layer is not None:
+                self.composite_layer.move(slot.sprite, rect)
+                self.composite_layer.raise_sprite(slot.sprite)
+            elif slot.widget is not None:
+                slot.widget.setGeometry(rect)
+                slot.widget.raise_()
+
+    def _place_rect(self, size: QSize) -> QRect:
+        size = QSize(max(size.width(), 240), max(size.height(), 150))
+        return self.placement.place(size, self.viewport_size, self.margin)
 
     def add_card(self, card: QuoteCard) -> None:
         size_hint = card.sizeHint()
-        width_variation = random.randint(-18, 22)
-        height_variation = random.randint(-24, 26)
+        width_variation = self.rng.randint(-18, 22)
+        height_variation = self.rng.randint(-24, 26)
         adjusted_size = QSize(
             max(260, size_hint.width() + width_variation),
             max(170, size_hint.height() + height_variation),
         )
-        rect = self._random_rect(adjusted_size)
-
-        card.setParent(self.container)
-        card.setGeometry(rect)
-        card.show()
-        card.raise_()
-        card.fade_in()
-
-        slot = CardSlot(widget=card, rect=rect)
+        rect = self._place_rect(adjusted_size)
+
+        if self.composite_layer is not None:
+            slot = self._add_composited(card, rect)
+        else:
+            card.setParent(self.container)
+            card.setGeometry(rect)
+            card.show()
+            card.raise_()
+            card.fade_in()
+            slot = CardSlot(widget=card, rect=rect)
         self.cards.append(slot)
+        self.placement.insert(slot, rect)
 
+        self._evict_covered(slot)
         if len(self.cards) > self.max_cards:
             self._remove_oldest()
 
+    def _evict_covered(self, newest: CardSlot) -> None:
+        """淡出被后来的卡片完全遮住的旧卡片，它们已看不见却仍在参与合成。"""
+        order = {slot: index for index, slot in enumerate(self.cards)}
+        candidates = [
+            slot for slot in self.placement.keys_intersecting(newest.rect)
+            if slot is not newest and slot in order
+        ]
+        for slot in sorted(candidates, key=order.__getitem__):
+            newer = [
+                other for other in self.placement.keys_intersecting(slot.rect)
+                if order.get(other, -1) > order[slot]
+            ]
+            if self.placement.covered_by(slot, newer):
+                self.cards.remove(slot)
+                self.placement.remove(slot)
+                self.evicted_covered += 1
+                self._fade_out_slot(slot)
+
+    def _add_composited(self, card: QuoteCard, rect: QRect) -> CardSlot:
+        """把卡片光栅化一次交给合成层，控件本身随即释放。"""
+        layer = self.composite_layer
+        assert layer is not None
+        pixmap = layer.raster_cache.get(card, rect.size(), layer.devicePixelRatioF())
+        sprite = CardSprite(quote=card.quote, mode=card.mode, rect=rect, pixmap=pixmap)
+        layer.add(sprite)
+        self.release_card(card)
+        return CardSlot(widget=None, rect=rect, sprite=sprite)
+
+    def _fade_out_slot(self, slot: CardSlot) -> None:
+        if slot.sprite is not None and self.composite_layer is not None:
+            self.composite_layer.fade_out(slot.sprite)
+        elif slot.widget is not None:
+            widget = slot.widget
+            widget.fade_out(lambda: self.release_card(widget))
+
     def _remove_oldest(self) -> None:
         if not self.cards:
             return
         slot = self.cards.pop(0)
-
-        def _on_finished() -> None:
-            slot.widget.deleteLater()
-
-        slot.widget.fade_out(_on_finished)
+        self.placement.remove(slot)
+        self._fade_out_slot(slot)
 
     def fade_out_all(self, callback=None) -> None:
         """淡出所有卡片"""
@@ -81,10 +147,10 @@ class CardManager:
             return
 
         for slot in self.cards:
-            slot.widget.fade_out(slot.widget.deleteLater)
+            self._fade_out_slot(slot)
 
         self.cards = []
+        self.placement.clear()
         if callback:
-            import PySide6.QtCore
-            PySide6.QtCore.QTimer.singleShot(1600, callback)
+            self.call_later(self.fade_all_ms, callback)
 
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+from .card_widget import QuoteCard
+from .models import Quote
+
+
+@dataclass
+class CardPoolStats:
+    created: int = 0
+    reused: int = 0
+    released: int = 0
+    discarded: int = 0  # 超过高水位被直接销毁的卡片
+
+    @property
+    def reuse_rate(self) -> float:
+        total = self.created + self.reused
+        return self.reused / total if total else 0.0
+
+    def as_dict(self) -> Dict[str, float]:
+        return {
+            "created": self.created,
+            "reused": self.reused,
+            "released": self.released,
+            "discarded": self.discarded,
+            "reuse_rate": round(self.reuse_rate, 3),
+        }
+
+
+class CardPool:
+    """按模式（program / letter）分别缓存空闲的 QuoteCard。
+
+    取用时把空闲卡片重新绑定到新的金句，省去样式表解析、布局与动画的重复构建；
+    归还时只隐藏控件。每种模式的空闲数量超过 ``high_water`` 后直接销毁。
+    新建的卡片按 ``time_scale`` 缩放淡入淡出时长。
+    """
+
+    def __init__(
+        self,
+        high_water: int = 24,
+        on_create: Optional[Callable[[QuoteCard], None]] = None,
+        time_scale: Optional[Callable[[], float]] = None,
+    ) -> None:
+        self.high_water = max(0, high_water)
+        self.on_create = on_create
+        self.time_scale = time_scale
+        self.stats = CardPoolStats()
+        self._idle: Dict[str, List[QuoteCard]] = {"program": [], "letter": []}
+
+    def acquire(self, quote: Quote) -> QuoteCard:
+        idle = self._idle.setdefault(QuoteCard.mode_for(quote), [])
+        if idle:
+            card = idle.pop()
+            card.rebind(quote)
+            self.stats.reused += 1
+            return card
+        card = QuoteCard(quote, time_scale=self.time_scale)
+        self.stats.created += 1
+        if self.on_create is not None:
+            self.on_create(card)
+        return card
+
+    def release(self, card: QuoteCard) -> None:
+        idle = self._idle.setdefault(card.mode, [])
+        if card in idle:
+            return
+        self.stats.released += 1
+        if len(idle) >= self.high_water:
+            self.stats.discarded += 1
+            card.deleteLater()
+            return
+        card.reset_for_reuse()
+        idle.append(card)
+
+    def idle_count(self) -> int:
+        return sum(len(cards) for cards in self._idle.values())
+
+    def clear(self) -> None:
+        for cards in self._idle.values():
+            for card in cards:
+                card.deleteLater()
+            cards.clear()
@@ -1,13 +1,12 @@
 from __future__ import annotations
 
-from typing import Optional
+from typing import Callable, Dict, Optional, Tuple
 
 from PySide6.QtCore import QEasingCurve, QPropertyAnimation, QRect, Qt, Signal, QSize
 from PySide6.QtGui import (
     QColor,
     QEnterEvent,
     QFont,
-    QFontMetrics,
     QLinearGradient,
     QPainter,
     QPaintEvent,
@@ -21,18 +20,40 @@ from PySide6.QtWidgets import (
     QWidget,
 )
 
+from .metrics import layer_timings
 from .models import Quote
+from .reveal_text import RevealText
+from .text_layout import (
+    CONTENT_COLORS,
+    CONTENT_MARGINS,
+    card_mode,
+    content_font,
+    layout_cache,
+    target_width_for,
+)
 
 
 class QuoteCard(QWidget):
     hovered = Signal(object)
     unhovered = Signal(object)
 
-    def __init__(self, quote: Quote, parent: Optional[QWidget] = None) -> None:
+    # 标题栏、按钮、署名等固定部件的高度只与模式有关，按模式缓存
+    _chrome_heights: Dict[str, Tuple[int, int]] = {}
+    # 淡入淡出时长；演出加速播放时按所属看板的 time_scale（当前倍速）同步缩短
+    fade_ms = 600
+
+    def __init__(
+        self,
+        quote: Quote,
+        parent: Optional[QWidget] = None,
+        time_scale: Optional[Callable[[], float]] = None,
+    ) -> None:
         super().__init__(parent)
         self.quote = quote
+        self.time_scale: Callable[[], float] = time_scale or (lambda: 1.0)
         self._hover = False
-        self.mode = "program" if quote.category == "text" else "letter"
+        self.mode = self.mode_for(quote)
+        self._size_cache: Optional[Tuple[str, QSize]] = None
         self.setAttribute(Qt.WidgetAttribute.WA_StyledBackground, True)
         self.setAutoFillBackground(False)
         self.setObjectName("quoteCard")
@@ -43,7 +64,7 @@ class QuoteCard(QWidget):
         self.setGraphicsEffect(self.opacity_effect)
 
         self._opacity_animation = QPropertyAnimation(self.opacity_effect, b"opacity", self)
-        self._opacity_animation.setDuration(600)
+        self._opacity_animation.setDuration(self.fade_ms)
         self._opacity_animation.setEasingCurve(QEasingCurve.Type.OutCubic)
         self._finished_callback = None
 
@@ -53,8 +74,50 @@ class QuoteCard(QWidget):
         else:
             self._build_letter_layout()
 
+    @staticmethod
+    def mode_for(quote: Quote) -> str:
+        return card_mode(quote)
+
+    def rebind(self, quote: Quote) -> None:
+        """复用已有控件展示新的金句：更新文本、重新计算尺寸并复位动画。"""
+        if self.mode_for(quote) != self.mode:
+            raise ValueError(f"卡片模式不匹配: {self.mode} -> {self.mode_for(quote)}")
+        self.quote = quote
+        self._hover = False
+        self._reset_animation()
+        self.opacity_effect.setOpacity(0.0)
+        self.content_label.setText(quote.text)
+        self._size_cache = None
+        self.updateGeometry()
+        self.update()
+
+    def reset_for_reuse(self) -> None:
+        """归还对象池时调用：停止淡入淡出并断开完成回调，隐藏控件等待下次 rebind。"""
+        self._reset_animation()
+        self.hide()
+
+    def use_reveal_text(self, reveal: RevealText) -> RevealText:
+        """用逐字显示控件替换正文标签，字体与颜色保持一致。"""
+        reveal.setFont(self.content_label.font())
+        reveal.setColor(QColor(CONTENT_COLORS[self.mode]))
+        reveal.setAlignment(Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignTop)
+        reveal.setText(self.quote.text)
+        self.layout.replaceWidget(self.content_label, reveal)
+        self.content_label.hide()
+        reveal.show()
+        return reveal
+
+    def _reset_animation(self) -> None:
+        self._opacity_animation.stop()
+        if self._finished_callback is not None:
+            try:
+                self._opacity_animation.finished.disconnect(self._finished_callback)
+            except (TypeError, RuntimeError):
+                pass
+            self._finished_callback = None
+
     def _build_program_layout(self) -> None:
-        self.layout.setContentsMargins(24, 12, 24, 22)
+        self.layout.setContentsMargins(*CONTENT_MARGINS["program"])
         self.layout.setSpacing(14)
 
         title_bar = QHBoxLayout()
@@ -92,9 +155,9 @@ class QuoteCard(QWidget):
         self.content_label = QLabel(self.quote.text)
         self.content_label.setWordWrap(True)
         self.content_label.setAlignment(Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignTop)
-        self.content_label.setFont(QFont("Microsoft YaHei", 13))
+        self.content_label.setFont(content_font("program"))
         self.content_label.setStyleSheet(
-            "color: #6b3a29; background: transparent; line-height: 1.65;"
+            f"color: {CONTENT_COLORS['program']}; background: transparent; line-height: 1.65;"
         )
 
         text_column.addWidget(self.content_label)
@@ -123,7 +186,7 @@ class QuoteCard(QWidget):
         self.layout.addLayout(button_row)
 
     def _build_letter_layout(self) -> None:
-        self.layout.setContentsMargins(34, 30, 34, 36)
+        self.layout.setContentsMargins(*CONTENT_MARGINS["letter"])
         self.layout.setSpacing(20)
 
         self.header_label = QLabel("To Jtter:")
@@ -134,9 +197,9 @@ class QuoteCard(QWidget):
         self.content_label = QLabel(self.quote.text)
         self.content_label.setWordWrap(True)
         self.content_label.setAlignment(Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignTop)
-        self.content_label.setFont(QFont("Songti SC", 22))
+        self.content_label.setFont(content_font("letter"))
         self.content_label.setStyleSheet(
-            "color: #2c2c2c; background: transparent; line-height: 1.8;"
+            f"color: {CONTENT_COLORS['letter']}; background: transparent; line-height: 1.8;"
         )
 
         self.signature_label = QLabel("Kyrie")
@@ -151,24 +214,27 @@ class QuoteCard(QWidget):
         self.layout.addWidget(self.signature_label)
 
     # region 动画控制
+    @property
+    def fade_animation(self) -> QPropertyAnimation:
+        return self._opacity_animation
+
+    def _apply_time_scale(self) -> None:
+        self._opacity_animation.setDuration(max(1, round(self.fade_ms / self.time_scale())))
+
     def fade_in(self) -> None:
         self.opacity_effect.setOpacity(0.0)
         self._opacity_animation.stop()
+        self._apply_time_scale()
         self._opacity_animation.setStartValue(0.0)
         self._opacity_animation.setEndValue(1.0)
         self._opacity_animation.start()
 
     def fade_out(self, finished_callback=None) -> None:
-        self._opacity_animation.stop()
-        if self._finished_callback is not None:
-            try:
-                self._opacity_animation.finished.disconnect(self._finished_callback)
-            except (TypeError, RuntimeError):
-                pass
-            self._finished_callback = None
+        self._reset_animation()
         if finished_callback:
             self._opacity_animation.finished.connect(finished_callback)
             self._finished_callback = finished_callback
+        self._apply_time_scale()
         self._opacity_animation.setStartValue(self.opacity_effect.opacity())
         self._opacity_animation.setEndValue(0.0)
         self._opacity_animation.start()
@@ -186,62 +252,63 @@ class QuoteCard(QWidget):
         return super().leaveEvent(event)
 
     def paintEvent(self, event: QPaintEvent) -> None:  # type: ignore[override]
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-        rect = self.rect()
-        if self.mode == "program":
-            border_color = QColor("#e3b383")
-            painter.setPen(border_color)
-            painter.setBrush(QColor("#fff6ef"))
-            painter.drawRoundedRect(rect.adjusted(0, 0, -1, -1), 9, 9)
-
-            title_height = 40
-            title_rect = QRect(rect.left() + 1, rect.top() + 1, rect.width() - 2, title_height)
-            gradient = QLinearGradient(title_rect.topLeft(), title_rect.bottomLeft())
-            gradient.setColorAt(0.0, QColor("#ffe9d7"))
-            gradient.setColorAt(1.0, QColor("#ffd3b0"))
-            painter.setPen(Qt.PenStyle.NoPen)
-            painter.setBrush(gradient)
-            painter.drawRoundedRect(title_rect, 8, 8)
-            painter.drawRect(title_rect.adjusted(0, 8, 0, 0))
-
-            body_rect = QRect(
-                rect.left() + 1,
-                title_rect.bottom(),
-                rect.width() - 2,
-                rect.height() - title_height - 2,
-            )
-            painter.setBrush(QColor("#fffdf9"))
-            painter.drawRect(body_rect)
-
-            if self._hover:
-                hover_overlay = QColor(255, 248, 236, 120)
-                painter.setBrush(hover_overlay)
-                painter.setPen(Qt.PenStyle.NoPen)
+        with layer_timings.paint("card"):
+            painter = QPainter(self)
+            painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+            rect = self.rect()
+            if self.mode == "program":
+                border_color = QColor("#e3b383")
+                painter.setPen(border_color)
+                painter.setBrush(QColor("#fff6ef"))
                 painter.drawRoundedRect(rect.adjusted(0, 0, -1, -1), 9, 9)
-        else:
-            paper = QColor("#fffaf0")
-            paper.setAlpha(235)
-            painter.setBrush(paper)
-            border_color = QColor(self.quote.color)
-            border_color.setAlpha(160)
-            painter.setPen(border_color)
-            painter.drawRoundedRect(rect.adjusted(0, 0, -1, -1), 20, 20)
-
-            painter.setPen(QColor(0, 0, 0, 28))
-            for offset in range(60, rect.height(), 48):
-                y = rect.top() + offset
-                if y >= rect.bottom() - 24:
-                    break
-                painter.drawLine(rect.left() + 26, y, rect.right() - 26, y)
-
-            if self._hover:
-                hover_overlay = QColor(255, 255, 255, 100)
-                painter.setBrush(hover_overlay)
-                painter.setPen(Qt.PenStyle.NoPen)
-                painter.drawRoundedRect(rect, 20, 20)
 
-        super().paintEvent(event)
+                title_height = 40
+                title_rect = QRect(rect.left() + 1, rect.top() + 1, rect.width() - 2, title_height)
+                gradient = QLinearGradient(title_rect.topLeft(), title_rect.bottomLeft())
+                gradient.setColorAt(0.0, QColor("#ffe9d7"))
+                gradient.setColorAt(1.0, QColor("#ffd3b0"))
+                painter.setPen(Qt.PenStyle.NoPen)
+                painter.setBrush(gradient)
+                painter.drawRoundedRect(title_rect, 8, 8)
+                painter.drawRect(title_rect.adjusted(0, 8, 0, 0))
+
+                body_rect = QRect(
+                    rect.left() + 1,
+                    title_rect.bottom(),
+                    rect.width() - 2,
+                    rect.height() - title_height - 2,
+                )
+                painter.setBrush(QColor("#fffdf9"))
+                painter.drawRect(body_rect)
+
+                if self._hover:
+                    hover_overlay = QColor(255, 248, 236, 120)
+                    painter.setBrush(hover_overlay)
+                    painter.setPen(Qt.PenStyle.NoPen)
+                    painter.drawRoundedRect(rect.adjusted(0, 0, -1, -1), 9, 9)
+            else:
+                paper = QColor("#fffaf0")
+                paper.setAlpha(235)
+                painter.setBrush(paper)
+                border_color = QColor(self.quote.color)
+                border_color.setAlpha(160)
+                painter.setPen(border_color)
+                painter.drawRoundedRect(rect.adjusted(0, 0, -1, -1), 20, 20)
+
+                painter.setPen(QColor(0, 0, 0, 28))
+                for offset in range(60, rect.height(), 48):
+                    y = rect.top() + offset
+                    if y >= rect.bottom() - 24:
+                        break
+                    painter.drawLine(rect.left() + 26, y, rect.right() - 26, y)
+
+                if self._hover:
+                    hover_overlay = QColor(255, 255, 255, 100)
+                    painter.setBrush(hover_overlay)
+                    painter.setPen(Qt.PenStyle.NoPen)
+                    painter.drawRoundedRect(rect, 20, 20)
+
+            super().paintEvent(event)
 
     def _build_stylesheet(self) -> str:
         return (
@@ -255,66 +322,48 @@ class QuoteCard(QWidget):
         text = (content if content is not None else self.quote.text).strip()
         if not text:
             text = " "
+        if self._size_cache is not None and self._size_cache[0] == text:
+            return QSize(self._size_cache[1])
 
         margins = self.layout.contentsMargins()
-        metrics = QFontMetrics(self.content_label.font())
-
-        length = len(text)
-        if self.mode == "program":
-            if length <= 60:
-                target_width = 420
-            elif length <= 120:
-                target_width = 500
-            else:
-                target_width = 580
-        else:
-            if length <= 60:
-                target_width = 440
-            elif length <= 120:
-                target_width = 520
-            else:
-                target_width = 600
-
-        available_width = max(160, target_width - margins.left() - margins.right())
-        bounding_height = metrics.boundingRect(
-            0,
-            0,
-            available_width,
-            0,
-            Qt.TextFlag.TextWordWrap | Qt.AlignmentFlag.AlignLeft,
-            text,
-        ).height()
+        target_width = target_width_for(self.mode, len(text))
+        # 折行高度优先取自预排版缓存，未命中时才在此测量
+        bounding_height = layout_cache.text_height(
+            self.content_label.font(), text, self.mode, target_width
+        )
 
         spacing_total = self.layout.spacing()
-        if self.mode == "program":
-            header_height = max(self.window_title.sizeHint().height(), 20)
-            button_height = self.button_label.sizeHint().height()
-            base_height = (
-                margins.top()
-                + header_height
-                + spacing_total
-                + bounding_height
-                + spacing_total
-                + button_height
-                + margins.bottom()
-            )
-            min_height = 180
-        else:
-            header_height = self.header_label.sizeHint().height()
-            signature_height = self.signature_label.sizeHint().height()
-            base_height = (
-                margins.top()
-                + header_height
-                + spacing_total
-                + bounding_height
-                + spacing_total
-                + signature_height
-                + margins.bottom()
-            )
-            min_height = 240
-
-        total_height = max(min_height, base_height)
-        return QSize(target_width, total_height)
+        header_height, footer_height = self._chrome_size()
+        base_height = (
+            margins.top()
+            + header_height
+            + spacing_total
+            + bounding_height
+            + spacing_total
+            + footer_height
+            + margins.bottom()
+        )
+        min_height = 180 if self.mode == "program" else 240
+
+        size = QSize(target_width, max(min_height, base_height))
+        self._size_cache = (text, size)
+        return QSize(size)
+
+    def _chrome_size(self) -> Tuple[int, int]:
+        heights = QuoteCard._chrome_heights.get(self.mode)
+        if heights is None:
+            if self.mode == "program":
+                heights = (
+                    max(self.window_title.sizeHint().height(), 20),
+                    self.button_label.sizeHint().height(),
+                )
+            else:
+                heights = (
+                    self.header_label.sizeHint().height(),
+                    self.signature_label.sizeHint().height(),
+                )
+            QuoteCard._chrome_heights[self.mode] = heights
+        return heights
 
     def sizeHint(self) -> QSize:  # type: ignore[override]
         return self._calculate_size()
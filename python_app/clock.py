@@ -0,0 +1,261 @@
+from __future__ import annotations
+
+import heapq
+import time
+from typing import Callable, List, Optional
+
+from PySide6.QtCore import QObject, QTimer
+
+FrameCallback = Callable[[float], None]
+
+
+class FrameClock(QObject):
+    """全局共享的帧时钟。
+
+    需要逐帧推进的组件订阅回调即可，不再各自创建 QTimer；没有订阅者时定时器停止。
+    回调参数为当前时间（秒），由 ``time_source`` 提供。
+    """
+
+    def __init__(
+        self,
+        parent: Optional[QObject] = None,
+        interval_ms: int = 16,
+        time_source: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        super().__init__(parent)
+        self.time_source = time_source
+        self._subscribers: List[FrameCallback] = []
+        self._timer = QTimer(self)
+        self._timer.setInterval(interval_ms)
+        self._timer.timeout.connect(self._on_timeout)
+
+    @property
+    def interval_ms(self) -> int:
+        return self._timer.interval()
+
+    @property
+    def timer(self) -> QTimer:
+        return self._timer
+
+    def set_interval(self, interval_ms: int) -> None:
+        self._timer.setInterval(max(1, interval_ms))
+
+    def now(self) -> float:
+        return self.time_source()
+
+    def subscribe(self, callback: FrameCallback) -> None:
+        if callback in self._subscribers:
+            return
+        self._subscribers.append(callback)
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def unsubscribe(self, callback: FrameCallback) -> None:
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
+        if not self._subscribers:
+            self._timer.stop()
+
+    def is_subscribed(self, callback: FrameCallback) -> bool:
+        return callback in self._subscribers
+
+    def _on_timeout(self) -> None:
+        now = self.time_source()
+        # 回调中可能取消订阅，遍历副本
+        for callback in list(self._subscribers):
+            callback(now)
+
+
+class ManualClock:
+    """手动推进的时钟，可作为各模拟器与 ``FrameClock`` 的 ``time_source``。"""
+
+    def __init__(self, start: float = 0.0) -> None:
+        self.now = start
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> float:
+        self.now += max(0.0, seconds)
+        return self.now
+
+
+class ScheduledCall:
+    """ShowClock 上登记的一次回调，可通过 :meth:`ShowClock.cancel` 取消。"""
+
+    __slots__ = ("due_ms", "seq", "callback", "name", "cancelled")
+
+    def __init__(self, due_ms: float, seq: int, callback: Callable[[], None], name: str) -> None:
+        self.due_ms = due_ms
+        self.seq = seq
+        self.callback = callback
+        self.name = name
+        self.cancelled = False
+
+    def __lt__(self, other: "ScheduledCall") -> bool:
+        return (self.due_ms, self.seq) < (other.due_ms, other.seq)
+
+
+class ShowClock(QObject):
+    """演出的虚拟时钟（毫秒）。
+
+    启动画面、开场、阶段切换、出卡间隔、烟花轮次等调度都通过 :meth:`call_later`
+    登记在这里。虚拟时间按 ``speed`` 倍速跟随真实时间；``stepped`` 模式下每次
+    定时器触发固定推进 ``tick_ms * speed``，与机器快慢无关。到期回调严格按
+    （到期时间, 登记顺序）执行，执行期间 :meth:`now_ms` 恰好等于其到期时间，
+    因此回调里再登记的后续调度不受定时器抖动影响，整场演出可以逐条复现。
+    ``driven`` 模式不启动内部定时器，虚拟时间只随 :meth:`advance` 推进（离线渲染）。
+    """
+
+    def __init__(
+        self,
+        parent: Optional[QObject] = None,
+        speed: float = 1.0,
+        tick_ms: int = 16,
+        stepped: bool = False,
+        driven: bool = False,
+    ) -> None:
+        super().__init__(parent)
+        self.stepped = stepped or driven
+        self.driven = driven
+        self.tick_ms = tick_ms
+        self._speed = max(0.01, speed)
+        self._now_ms = 0.0
+        self._wall_anchor = time.perf_counter()
+        self._virtual_anchor = 0.0
+        self._dispatching_at: Optional[float] = None
+        self._paused = False
+        self._queue: List[ScheduledCall] = []
+        self._seq = 0
+        self._timer = QTimer(self)
+        self._timer.setInterval(tick_ms)
+        self._timer.timeout.connect(self._on_tick)
+        if not driven:
+            self._timer.start()
+
+    @property
+    def speed(self) -> float:
+        return self._speed
+
+    def set_speed(self, speed: float) -> None:
+        if not self._paused:
+            self._rebase(self.now_ms())
+        self._speed = max(0.01, speed)
+
+    @property
+    def paused(self) -> bool:
+        return self._paused
+
+    def pause(self) -> None:
+        """冻结虚拟时间：调度、逐字显示与特效模拟都停在当前时刻。"""
+        if self._paused:
+            return
+        self._now_ms = self.now_ms()
+        self._paused = True
+        self._timer.stop()
+
+    def resume(self) -> None:
+        if not self._paused:
+            return
+        self._paused = False
+        self._rebase(self._now_ms)
+        if not self.driven:
+            self._timer.start()
+
+    def now_ms(self) -> float:
+        if self._dispatching_at is not None:
+            return self._dispatching_at
+        if self.stepped or self._paused:
+            return self._now_ms
+        wall_ms = (time.perf_counter() - self._wall_anchor) * 1000.0 * self._speed
+        return max(self._now_ms, self._virtual_anchor + wall_ms)
+
+    def now(self) -> float:
+        """当前虚拟时间（秒），可直接作为各模拟器的 ``time_source``。"""
+        return self.now_ms() / 1000.0
+
+    def call_later(self, delay_ms: float, callback: Callable[[], None], name: str = "") -> ScheduledCall:
+        call = ScheduledCall(self.now_ms() + max(0.0, delay_ms), self._seq, callback, name)
+        self._seq += 1
+        heapq.heappush(self._queue, call)
+        return call
+
+    def cancel(self, call: Optional[ScheduledCall]) -> None:
+        if call is not None:
+            call.cancelled = True
+
+    def cancel_all(self) -> None:
+        for call in self._queue:
+            call.cancelled = True
+        self._queue.clear()
+
+    def pending(self) -> int:
+        return sum(1 for call in self._queue if not call.cancelled)
+
+    def timer(self, callback: Callable[[], None], name: str = "") -> "ShowTimer":
+        return ShowTimer(self, callback, name)
+
+    def advance(self, delta_ms: float) -> float:
+        """立即把虚拟时间推进 ``delta_ms``，途中到期的回调依次执行（快进）。"""
+        self._run_until(self.now_ms() + max(0.0, delta_ms))
+        self._rebase(self._now_ms)
+        return self._now_ms
+
+    def _rebase(self, now_ms: float) -> None:
+        self._now_ms = now_ms
+        self._virtual_anchor = now_ms
+        self._wall_anchor = time.perf_counter()
+
+    def _on_tick(self) -> None:
+        if self.stepped:
+            self._run_until(self._now_ms + self.tick_ms * self._speed)
+        else:
+            self._run_until(self.now_ms())
+
+    def _run_until(self, target_ms: float) -> None:
+        # 在回调中快进（如 seek）时，外层回调随后看到的时间也应是快进后的时间
+        outer = self._dispatching_at
+        while self._queue and self._queue[0].due_ms <= target_ms:
+            call = heapq.heappop(self._queue)
+            if call.cancelled:
+                continue
+            self._now_ms = max(self._now_ms, call.due_ms)
+            self._dispatching_at = self._now_ms
+            try:
+                call.callback()
+            finally:
+                self._dispatching_at = outer
+        self._now_ms = max(self._now_ms, target_ms)
+        if outer is not None:
+            self._dispatching_at = self._now_ms
+
+
+class ShowTimer:
+    """挂在 ShowClock 上的单次定时器，用法与单次 QTimer 相同。"""
+
+    def __init__(self, clock: ShowClock, callback: Callable[[], None], name: str = "") -> None:
+        self._clock = clock
+        self._callback = callback
+        self.name = name
+        self._call: Optional[ScheduledCall] = None
+
+    def start(self, interval_ms: float) -> None:
+        self.stop()
+        self._call = self._clock.call_later(interval_ms, self._fire, self.name)
+
+    def stop(self) -> None:
+        self._clock.cancel(self._call)
+        self._call = None
+
+    def is_active(self) -> bool:
+        return self._call is not None and not self._call.cancelled
+
+    def remaining_ms(self) -> float:
+        if not self.is_active():
+            return 0.0
+        assert self._call is not None
+        return max(0.0, self._call.due_ms - self._clock.now_ms())
+
+    def _fire(self) -> None:
+        self._call = None
+        self._callback()
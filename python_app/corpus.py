@@ -0,0 +1,376 @@
+"""编译后的金句语料：把 data 目录下的全部金句来源一次性编译成紧凑的二进制文件。
+
+启动时不再逐个解析 JSON、规范化和去重，而是把编译结果映射进内存，整列拷贝进
+``QuoteStore``，不为每条金句创建对象。颜色与分类在编译时驻留为字符串池的下标。
+``manifest.json`` 记录每个来源文件的大小、mtime 与 SHA-256：大小与 mtime 都
+没变时直接使用编译结果；变了再比对哈希，内容确实改变才重新编译。打乱顺序仍在
+加载时进行，与直接解析 JSON 的结果一致。
+
+    python -m python_app.corpus [data 目录]   # 部署时预先编译
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import mmap
+import os
+import random
+import struct
+import sys
+import tempfile
+from array import array
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .data_loader import (
+    ACHIEVEMENTS_SOURCE,
+    SOURCES_MANIFEST,
+    collect_quotes,
+    discover_sources,
+    iter_quotes,
+    load_achievements,
+    order_quotes,
+)
+from .models import Achievement, Quote
+from .quote_store import CODE_TYPECODE, INDEX_TYPECODE, QuoteStore
+
+MAGIC = b"QCRP"
+# 编译格式或规范化规则改变时加一，旧的编译结果会被自动重编
+FORMAT_VERSION = 2
+CORPUS_DIRNAME = ".compiled"
+CORPUS_FILENAME = "corpus.bin"
+MANIFEST_FILENAME = "manifest.json"
+
+# 文件头：魔数、版本、颜色数、分类数、金句条数、祝福语条数、字符串池字节数、文本字节数。
+# 其后依次为：字符串池（颜色在前、分类在后）、各分类条数、每行文本的起止字节偏移、
+# 每行的颜色编码、每条金句的分类编码、UTF-8 文本；祝福语排在金句之后，没有分类。
+# 数值一律小端，各列按 4 字节对齐，可以整列拷贝进 QuoteStore
+_HEADER = struct.Struct("<4sIIIIIII")
+
+
+def _sources(data_dir: Path) -> Dict[str, Path]:
+    """参与编译的文件（相对路径 -> 路径）：全部金句来源、祝福语与 sources.json。
+
+    新增或删除来源文件同样使编译结果失效。
+    """
+    sources = {source.name: source.path for source in discover_sources(data_dir)}
+    for name in (ACHIEVEMENTS_SOURCE, SOURCES_MANIFEST):
+        if (data_dir / name).exists():
+            sources[name] = data_dir / name
+    return sources
+
+
+def _fingerprint(path: Path, with_hash: bool) -> Dict[str, object]:
+    stat = path.stat()
+    entry: Dict[str, object] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+    if with_hash:
+        entry["sha256"] = hashlib.sha256(path.read_bytes()).hexdigest()
+    return entry
+
+
+class CompiledCorpus:
+    """映射进内存的编译结果。"""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        with open(path, "rb") as handle:
+            self._map = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            (
+                magic, version, color_count, category_count, quote_count, achievement_count, pool_bytes, text_bytes,
+            ) = _HEADER.unpack_from(self._map, 0)
+            if magic != MAGIC or version != FORMAT_VERSION:
+                raise ValueError(f"{path.name} 不是当前版本的编译语料")
+            self.quote_count = quote_count
+            self.achievement_count = achievement_count
+            offset = _HEADER.size
+            pool = self._map[offset:offset + pool_bytes].decode("utf-8").split("\0") if color_count + category_count else []
+            if len(pool) != color_count + category_count:
+                raise ValueError(f"{path.name} 字符串池已损坏")
+            self.color_table = pool[:color_count]
+            self.category_table = pool[color_count:]
+            offset += pool_bytes
+            offset += -offset % 4
+            rows = quote_count + achievement_count
+            self._counts_offset = offset
+            offset += category_count * 4
+            self._offsets_offset = offset
+            offset += (rows + 1) * 4
+            self._colors_offset = offset
+            offset += rows * 2
+            self._categories_offset = offset
+            offset += quote_count * 2
+            offset += -offset % 4
+            self._text_offset = offset
+            if offset + text_bytes != len(self._map):
+                raise ValueError(f"{path.name} 长度不符，可能写入不完整")
+        except Exception:
+            self.close()
+            raise
+
+    def close(self) -> None:
+        self._map.close()
+
+    def _array(self, typecode: str, offset: int, count: int) -> array:
+        column = array(typecode)
+        column.frombytes(self._map[offset:offset + count * column.itemsize])
+        if sys.byteorder == "big":
+            column.byteswap()
+        return column
+
+    def read(self) -> Tuple[QuoteStore, List[Achievement]]:
+        """整列拷贝出金句存储（各分类按文件中的顺序）与祝福语，不逐条解析。"""
+        quotes, rows = self.quote_count, self.quote_count + self.achievement_count
+        offsets = self._array(INDEX_TYPECODE, self._offsets_offset, rows + 1)
+        colors = self._array(CODE_TYPECODE, self._colors_offset, rows)
+        counts = self._array(INDEX_TYPECODE, self._counts_offset, len(self.category_table))
+        # 金句按分类连续存放，各分类的存储下标就是一段连续区间
+        orders: Dict[str, array] = {}
+        start = 0
+        for name, count in zip(self.category_table, counts):
+            orders[name] = array(INDEX_TYPECODE, range(start, start + count))
+            start += count
+        text_end = offsets[quotes]
+        store = QuoteStore.from_columns(
+            self._map[self._text_offset:self._text_offset + text_end],
+            offsets[:quotes + 1],
+            colors[:quotes],
+            self._array(CODE_TYPECODE, self._categories_offset, quotes),
+            self.color_table,
+            self.category_table,
+            orders,
+        )
+        text = self._map[self._text_offset + text_end:self._text_offset + offsets[rows]]
+        achievements = [
+            Achievement(
+                text=text[offsets[row] - text_end:offsets[row + 1] - text_end].decode("utf-8"),
+                color=store.color_table[colors[row]],
+            )
+            for row in range(quotes, rows)
+        ]
+        return store, achievements
+
+
+def _little_endian(column: array) -> bytes:
+    if sys.byteorder == "big":
+        column = array(column.typecode, column)
+        column.byteswap()
+    return column.tobytes()
+
+
+def _write_corpus(path: Path, store: QuoteStore, achievements: List[Achievement]) -> None:
+    """写出编译语料；``store`` 中的金句须按分类连续存放（文本、偏移与编码直接就是各列）。"""
+    text, offsets, colors, categories = store.columns()
+    offsets = array(INDEX_TYPECODE, offsets)
+    colors = array(CODE_TYPECODE, colors)
+    achievement_text = bytearray()
+    for achievement in achievements:
+        achievement_text += achievement.text.encode("utf-8")
+        offsets.append(len(text) + len(achievement_text))
+        colors.append(store.color_code(achievement.color))
+    counts = array(INDEX_TYPECODE, (len(store.indices(name)) for name in store.category_table))
+
+    pool_blob = "\0".join((*store.color_table, *store.category_table)).encode("utf-8")
+    text_blob = bytes(text) + bytes(achievement_text)
+    header = _HEADER.pack(
+        MAGIC, FORMAT_VERSION, len(store.color_table), len(store.category_table),
+        len(store), len(achievements), len(pool_blob), len(text_blob),
+    )
+    parts = [header, pool_blob, b"\0" * (-(len(header) + len(pool_blob)) % 4)]
+    parts += [_little_endian(counts), _little_endian(offsets), _little_endian(colors), _little_endian(categories)]
+    parts.append(b"\0" * (-sum(len(part) for part in parts) % 4))
+    parts.append(text_blob)
+    _atomic_write(path, b"".join(parts))
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    # 先写临时文件再替换，多个进程同时编译或中途断电都不会留下半个文件
+    fd, temp = tempfile.mkstemp(prefix=path.name, suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(data)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.chmod(temp, 0o644)  # mkstemp 默认只有本人可读
+        os.replace(temp, path)
+    except BaseException:
+        try:
+            os.unlink(temp)
+        except OSError:
+            pass
+        raise
+
+
+def _read_manifest(path: Path) -> Optional[Dict[str, object]]:
+    try:
+        manifest = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(manifest, dict) or manifest.get("version") != FORMAT_VERSION:
+        return None
+    return manifest
+
+
+def _is_fresh(data_dir: Path, manifest: Dict[str, object]) -> Tuple[bool, bool]:
+    """返回（编译结果是否仍然有效, 清单中的 mtime 是否需要刷新）。"""
+    recorded = manifest.get("sources")
+    if not isinstance(recorded, dict):
+        return False, False
+    present = _sources(data_dir)
+    if set(present) != set(recorded):
+        return False, False
+    touched = False
+    for name, path in present.items():
+        entry = recorded[name]
+        current = _fingerprint(path, with_hash=False)
+        if current["size"] != entry.get("size"):
+            return False, False
+        if current["mtime_ns"] != entry.get("mtime_ns"):
+            # 只是被 touch 或重新检出：内容相同就不必重编
+            if _fingerprint(path, with_hash=True)["sha256"] != entry.get("sha256"):
+                return False, False
+            entry["mtime_ns"] = current["mtime_ns"]
+            touched = True
+    return True, touched
+
+
+def _write_manifest(out_dir: Path, manifest: Dict[str, object]) -> None:
+    _atomic_write(out_dir / MANIFEST_FILENAME, json.dumps(manifest, ensure_ascii=False, indent=2).encode("utf-8"))
+
+
+def _source_fingerprints(data_dir: Path) -> Dict[str, Dict[str, object]]:
+    return {name: _fingerprint(path, with_hash=True) for name, path in _sources(data_dir).items()}
+
+
+def corpus_is_fresh(data_dir: Path, out_dir: Optional[Path] = None) -> bool:
+    """编译语料存在且与来源一致；来源只是 mtime 变化时顺便刷新清单。"""
+    out_dir = out_dir or data_dir / CORPUS_DIRNAME
+    manifest = _read_manifest(out_dir / MANIFEST_FILENAME)
+    if manifest is None or not (out_dir / CORPUS_FILENAME).exists():
+        return False
+    fresh, touched = _is_fresh(data_dir, manifest)
+    if fresh and touched:
+        try:
+            _write_manifest(out_dir, manifest)
+        except OSError:
+            pass
+    return fresh
+
+
+def compile_corpus(data_dir: Path, out_dir: Optional[Path] = None) -> Path:
+    """解析 JSON 来源并写出编译语料与清单，返回语料路径。"""
+    out_dir = out_dir or data_dir / CORPUS_DIRNAME
+    out_dir.mkdir(parents=True, exist_ok=True)
+    # 先记录指纹再解析：编译期间来源被改动时，下次启动会发现并重编
+    sources = _source_fingerprints(data_dir)
+    categorised = collect_quotes(data_dir)
+    achievements = load_achievements(data_dir)
+    corpus_path = out_dir / CORPUS_FILENAME
+    store = QuoteStore.from_quotes(quote for quotes in categorised.values() for quote in quotes)
+    _write_corpus(corpus_path, store, achievements)
+    _write_manifest(out_dir, {"version": FORMAT_VERSION, "corpus": CORPUS_FILENAME, "sources": sources})
+    print(f"[corpus] 已编译 {len(store)} 条金句、{len(achievements)} 条祝福语 -> {corpus_path}")
+    return corpus_path
+
+
+def load_corpus(
+    data_dir: Path, rng: random.Random, out_dir: Optional[Path] = None
+) -> Tuple[QuoteStore, List[Achievement]]:
+    """读取编译语料，来源有变化时先重编；展示顺序由 ``rng`` 打乱，同一种子总是相同。"""
+    out_dir = out_dir or data_dir / CORPUS_DIRNAME
+    corpus_path = out_dir / CORPUS_FILENAME
+    if not corpus_is_fresh(data_dir, out_dir):
+        try:
+            compile_corpus(data_dir, out_dir)
+        except OSError as exc:
+            # data 目录只读等情况：退回直接解析 JSON
+            print(f"警告: 无法写入编译语料（{exc}），本次直接解析 JSON")
+            return QuoteStore.from_quotes(order_quotes(collect_quotes(data_dir), rng)), load_achievements(data_dir)
+    try:
+        corpus = CompiledCorpus(corpus_path)
+    except (OSError, ValueError) as exc:
+        print(f"警告: 编译语料不可用（{exc}），重新编译")
+        compile_corpus(data_dir, out_dir)
+        corpus = CompiledCorpus(corpus_path)
+    try:
+        store, achievements = corpus.read()
+    finally:
+        corpus.close()
+    # 与 order_quotes 一样按分类依次打乱，同一种子得到同样的展示顺序
+    store.shuffle(rng)
+    return store, achievements
+
+
+def stream_corpus(
+    data_dir: Path,
+    rng: random.Random,
+    out_dir: Optional[Path] = None,
+    first_batch: int = 64,
+    batch_size: int = 2048,
+    shuffle_buffer: int = 1024,
+) -> Iterator[Tuple[List[Quote], Optional[str]]]:
+    """边解析 JSON 边分批产出金句，结束后顺便写出编译语料，下次启动直接读取。
+
+    每次产出 ``(金句批次, 刚解析完的分类或 None)``。整体打乱要等全部读完，这里改用
+    容量为 ``shuffle_buffer`` 的洗牌缓冲：缓冲满后每来一条就随机换出一条，某个分类
+    读完时把缓冲打乱后全部送出。第一批只攒 ``first_batch`` 条，首张卡片的等待时间
+    与语料规模无关；内存只多出缓冲与一个批次。
+    """
+    out_dir = out_dir or data_dir / CORPUS_DIRNAME
+    sources = _source_fingerprints(data_dir)
+    storage = QuoteStore()  # 文件顺序的紧凑副本，用于写出编译语料
+    pending: List[Quote] = []
+    limit = first_batch
+    buffer: List[Quote] = []
+    category: Optional[str] = None
+
+    def drain() -> Iterator[Tuple[List[Quote], Optional[str]]]:
+        nonlocal buffer, pending
+        rng.shuffle(buffer)
+        pending.extend(buffer)
+        buffer = []
+        batch, pending = pending, []
+        yield batch, category
+
+    for quote in iter_quotes(data_dir):
+        storage.append(quote.text, quote.color, quote.category)
+        if quote.category != category:
+            if category is not None:
+                yield from drain()
+                limit = batch_size
+            category = quote.category
+        if len(buffer) < shuffle_buffer:
+            buffer.append(quote)
+            continue
+        slot = rng.randrange(shuffle_buffer)
+        pending.append(buffer[slot])
+        buffer[slot] = quote
+        if len(pending) >= limit:
+            batch, pending = pending, []
+            limit = batch_size
+            yield batch, None
+    if category is not None:
+        yield from drain()
+
+    try:
+        out_dir.mkdir(parents=True, exist_ok=True)
+        _write_corpus(out_dir / CORPUS_FILENAME, storage, load_achievements(data_dir))
+        _write_manifest(out_dir, {"version": FORMAT_VERSION, "corpus": CORPUS_FILENAME, "sources": sources})
+        print(f"[corpus] 流式读取 {len(storage)} 条金句，已写出编译语料")
+    except OSError as exc:
+        print(f"警告: 无法写入编译语料（{exc}），下次启动仍需解析 JSON")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    data_dir = Path(argv[0]) if argv else Path(__file__).resolve().parent.parent / "data"
+    if not data_dir.is_dir():
+        print(f"错误: 找不到数据目录 {data_dir}")
+        return 1
+    compile_corpus(data_dir)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
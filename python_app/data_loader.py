@@ -1,22 +1,25 @@
 from __future__ import annotations
 
+import codecs
+import fnmatch
 import json
+import multiprocessing
+import os
 import random
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterable, List, Sequence
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Set, Tuple
 
 from .models import Achievement, Quote
 
 
-def _normalise_quote_entries(entries: Iterable[dict], category: str) -> List[Quote]:
-    quotes: List[Quote] = []
-    for item in entries:
-        text = item.get("text")
-        color = item.get("color", "#ffffff")
-        if not text:
-            continue
-        quotes.append(Quote(text=text.strip(), color=color, category=category))
-    return quotes
+def _normalise_quote(item: dict, category: str) -> Optional[Quote]:
+    text = item.get("text")
+    color = item.get("color", "#ffffff")
+    if not text:
+        return None
+    return Quote(text=text.strip(), color=color, category=category)
 
 
 def _load_json(path: Path) -> Sequence:
@@ -35,32 +38,345 @@ def _load_json(path: Path) -> Sequence:
     raise ValueError(f"Unsupported JSON structure in {path}")
 
 
-def load_quotes(data_dir: Path) -> List[Quote]:
-    mapping = {
-        "text.json": "text",
-        "book.json": "book",
-    }
-
-    categorised: dict[str, List[Quote]] = {"text": [], "book": []}
-    for filename, category in mapping.items():
-        path = data_dir / filename
-        if not path.exists():
+_JSON_DELIMITERS = frozenset(", \t\r\n]")
+
+
+def iter_json_array(path: Path, chunk_size: int = 1 << 16) -> Iterator[object]:
+    """逐个产出顶层数组中的元素，内存中只保留一个读块与当前元素。
+
+    顶层不是数组（如 ``{"quotes": [...]}``）时退回 ``_load_json`` 整体解析。
+    """
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    with open(path, "rb") as handle:
+        buffer = ""
+        pos = 0
+        eof = False
+
+        def fill() -> None:
+            nonlocal buffer, pos, eof
+            chunk = handle.read(chunk_size)
+            eof = not chunk
+            buffer = buffer[pos:] + text_decoder.decode(chunk, final=eof)
+            pos = 0
+
+        def skip_whitespace() -> bool:
+            """跳过空白，返回后面是否还有字符。"""
+            nonlocal pos
+            while True:
+                while pos < len(buffer) and buffer[pos] in " \t\r\n":
+                    pos += 1
+                if pos < len(buffer):
+                    return True
+                if eof:
+                    return False
+                fill()
+
+        if not skip_whitespace():
+            raise ValueError(f"{path.name} 是空文件")
+        if buffer[pos] != "[":
+            yield from _load_json(path)
+            return
+        pos += 1
+        expect_item = True
+        while skip_whitespace():
+            char = buffer[pos]
+            if char == "]":
+                return
+            if not expect_item:
+                if char != ",":
+                    raise ValueError(f"{path.name} 的数组元素之间缺少逗号")
+                pos += 1
+                expect_item = True
+                continue
+            try:
+                item, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                fill()  # 元素跨越了读块边界，读入更多再试
+                continue
+            # 数字与 true/false/null 可能在读块边界处被截断（如 "1." 只读到 "1"）：
+            # 后面紧跟分隔符或已到文件末尾才算完整，否则读入更多后重新解析
+            if buffer[pos] not in '"{[' and not eof and (end >= len(buffer) or buffer[end] not in _JSON_DELIMITERS):
+                fill()
+                continue
+            pos = end
+            expect_item = False
+            yield item
+        raise ValueError(f"{path.name} 的顶层数组没有闭合")
+
+
+# 金句来源的默认规则（没有 sources.json 时使用）：文件名模式 -> 分类。未匹配的来源归入
+# ``DEFAULT_CATEGORY``，由看板的 other 阶段展示
+QUOTE_SOURCES = {
+    "text.json": "text",
+    "book.json": "book",
+}
+ACHIEVEMENTS_SOURCE = "zanshang.json"
+SOURCES_MANIFEST = "sources.json"
+DEFAULT_CATEGORY = "other"
+DEFAULT_QUOTE_COLOR = "#ffffff"
+# Web 服务在 data 目录里追加的现场愿望日志（见 app.py），已经经推送上屏，不作为来源
+DEFAULT_IGNORE = ["live_wishes.jsonl"]
+# 来源总字节数超过该值、且不止一个来源时才用进程池并行解析；小数据在本进程解析更快
+PARALLEL_MIN_BYTES = 4 << 20
+
+
+@dataclass(frozen=True)
+class QuoteSource:
+    """data 目录中的一个金句来源；``name`` 为相对 data 目录的路径。"""
+
+    path: Path
+    name: str
+    category: str
+    color: str = DEFAULT_QUOTE_COLOR
+
+
+@dataclass(frozen=True)
+class _SourceRule:
+    pattern: str
+    category: str
+    color: str = DEFAULT_QUOTE_COLOR
+
+
+def _read_sources_manifest(data_dir: Path) -> Tuple[List[_SourceRule], str, List[str]]:
+    """读取 data/sources.json，返回（规则, 默认分类, 忽略的模式）。
+
+    格式::
+
+        {
+          "sources": [{"pattern": "text.json", "category": "text"},
+                      {"pattern": "packs/*.jsonl", "category": "festival", "color": "#FFB6C1"}],
+          "default_category": "other",
+          "ignore": ["drafts/*"]
+        }
+
+    规则按顺序匹配，先匹配者生效；分类的展示顺序为 text、book，其余按规则中首次出现的顺序。
+    """
+    path = data_dir / SOURCES_MANIFEST
+    if not path.exists():
+        return [_SourceRule(pattern, category) for pattern, category in QUOTE_SOURCES.items()], DEFAULT_CATEGORY, DEFAULT_IGNORE
+    manifest = json.loads(path.read_text(encoding="utf-8"))
+    if not isinstance(manifest, dict):
+        raise ValueError(f"{SOURCES_MANIFEST} 的顶层应为对象")
+    rules = []
+    for entry in manifest.get("sources", []):
+        if not isinstance(entry, dict) or not entry.get("pattern") or not entry.get("category"):
+            raise ValueError(f"{SOURCES_MANIFEST} 中的来源规则需要 pattern 与 category: {entry}")
+        rules.append(_SourceRule(str(entry["pattern"]), str(entry["category"]), str(entry.get("color") or DEFAULT_QUOTE_COLOR)))
+    default_category = str(manifest.get("default_category") or DEFAULT_CATEGORY)
+    ignore = [str(pattern) for pattern in manifest.get("ignore", DEFAULT_IGNORE)]
+    return rules, default_category, ignore
+
+
+def discover_sources(data_dir: Path) -> List[QuoteSource]:
+    """找出 data 目录（含子目录）中所有可解析的金句来源，按分类与文件名排好顺序。
+
+    祝福语文件、sources.json 以及以点开头的文件和目录（如编译语料）不算金句来源；
+    后缀没有对应解析器的文件（音频等）直接略过。同一分类的来源相邻，结果与文件系统
+    的遍历顺序无关。
+    """
+    if not data_dir.is_dir():
+        return []
+    rules, default_category, ignore = _read_sources_manifest(data_dir)
+    rank = {"text": 0, "book": 1}
+    for rule in rules:
+        rank.setdefault(rule.category, len(rank))
+    rank.setdefault(default_category, len(rank))
+    sources = []
+    for path in data_dir.rglob("*"):
+        name = path.relative_to(data_dir).as_posix()
+        if any(part.startswith(".") for part in name.split("/")):
+            continue
+        if name in (ACHIEVEMENTS_SOURCE, SOURCES_MANIFEST) or path.suffix.lower() not in QUOTE_PARSERS:
+            continue
+        if any(fnmatch.fnmatchcase(name, pattern) for pattern in ignore) or not path.is_file():
             continue
-        entries = _load_json(path)
-        quotes = _normalise_quote_entries(entries, category)
-        # 不需要在这里处理优先级，让board.py从text_quotes中取
-        categorised[category].extend(quotes)
+        rule = next((rule for rule in rules if fnmatch.fnmatchcase(name, rule.pattern)), None)
+        if rule is None:
+            sources.append(QuoteSource(path, name, default_category))
+        else:
+            sources.append(QuoteSource(path, name, rule.category, rule.color))
+    sources.sort(key=lambda source: (rank.get(source.category, len(rank)), source.category, source.name))
+    return sources
+
+
+def _item_to_quote(item: object, source: QuoteSource) -> Optional[Quote]:
+    if isinstance(item, str):
+        text = item.strip()
+        return Quote(text=text, color=source.color, category=source.category) if text else None
+    if isinstance(item, dict):
+        return _normalise_quote({"color": source.color, **item}, source.category)
+    return None
+
 
-    # 去重：同一分类下按文本去重，避免不同类型之间相互覆盖
+def _parse_json_source(source: QuoteSource) -> Iterator[Quote]:
+    for item in iter_json_array(source.path):
+        quote = _item_to_quote(item, source)
+        if quote is not None:
+            yield quote
+
+
+def _parse_jsonl_source(source: QuoteSource) -> Iterator[Quote]:
+    with open(source.path, encoding="utf-8-sig") as handle:
+        for number, line in enumerate(handle, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                item = json.loads(line)
+            except ValueError as exc:
+                raise ValueError(f"{source.name} 第 {number} 行不是有效的 JSON: {exc}") from None
+            quote = _item_to_quote(item, source)
+            if quote is not None:
+                yield quote
+
+
+_QA_PREFIXES = {"Q": ("Q：", "Q:", "问："), "A": ("A：", "A:", "答：")}
+
+
+def _parse_text_source(source: QuoteSource) -> Iterator[Quote]:
+    """纯文本：含 Q/A 标记时每组问答为一条（问题一行、回答一行），否则每个非空行一条。
+
+    没有问题的回答单独成条；不带标记的行接在上一段回答后面。
+    """
+    lines = [line.replace("\u200b", "").strip() for line in source.path.read_text(encoding="utf-8-sig").splitlines()]
+    lines = [line for line in lines if line]
+
+    def marker(line: str) -> Tuple[Optional[str], str]:
+        for kind, prefixes in _QA_PREFIXES.items():
+            for prefix in prefixes:
+                if line.startswith(prefix):
+                    return kind, line[len(prefix):].strip()
+        return None, line
+
+    if not any(marker(line)[0] for line in lines):
+        for line in lines:
+            yield Quote(text=line, color=source.color, category=source.category)
+        return
+    question: Optional[str] = None
+    answer: List[str] = []
+
+    def flush() -> Iterator[Quote]:
+        if answer:
+            text = "".join(answer) if question is None else f"{question}\n{''.join(answer)}"
+            yield Quote(text=text, color=source.color, category=source.category)
+
+    for line in lines:
+        kind, body = marker(line)
+        if kind == "Q":
+            yield from flush()
+            question, answer = body, []
+        elif kind == "A":
+            if answer:
+                yield from flush()
+                question = None
+            answer = [body]
+        elif answer:
+            answer.append(body)
+    yield from flush()
+
+
+# 后缀 -> 解析器。解析器在进程池的子进程中运行，新增格式时在本模块中注册模块级函数
+QUOTE_PARSERS: Dict[str, Callable[[QuoteSource], Iterator[Quote]]] = {
+    ".json": _parse_json_source,
+    ".jsonl": _parse_jsonl_source,
+    ".txt": _parse_text_source,
+}
+
+
+def iter_source(source: QuoteSource) -> Iterator[Quote]:
+    """按文件中的顺序逐条产出某个来源的金句（未去重）；格式错误时抛出 ValueError。"""
+    return QUOTE_PARSERS[source.path.suffix.lower()](source)
+
+
+def load_quote_source(source: QuoteSource) -> List[Quote]:
+    """解析单个来源，按文本去重并保持文件中的顺序（热重载只重读改动的文件）。"""
+    unique: Dict[str, Quote] = {}
+    for quote in iter_source(source):
+        unique.setdefault(quote.text, quote)
+    return list(unique.values())
+
+
+def _parse_columns(source: QuoteSource) -> Tuple[List[str], List[str]]:
+    """进程池中的解析任务：只回传文本与颜色两列，减少跨进程序列化的对象数。
+
+    格式错误时与流式读取一致，保留出错位置之前的条目。
+    """
+    texts: List[str] = []
+    colors: List[str] = []
+    seen: Set[str] = set()
+    try:
+        for quote in iter_source(source):
+            if quote.text not in seen:
+                seen.add(quote.text)
+                texts.append(quote.text)
+                colors.append(quote.color)
+    except (OSError, ValueError) as exc:
+        print(f"警告: 金句来源 {source.name} 解析中断，只保留已读入的部分: {exc}")
+    return texts, colors
+
+
+def _parse_all(sources: Sequence[QuoteSource], workers: Optional[int]) -> List[Tuple[List[str], List[str]]]:
+    """按 ``sources`` 的顺序返回各来源的解析结果。"""
+    total = sum(source.path.stat().st_size for source in sources)
+    workers = min(len(sources), workers or os.cpu_count() or 1)
+    if workers > 1 and total >= PARALLEL_MIN_BYTES:
+        # 与离线渲染一致使用 spawn：调用方进程里可能已经有 Qt 线程
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            return list(pool.map(_parse_columns, sources))
+    return [_parse_columns(source) for source in sources]
+
+
+def iter_quotes(data_dir: Path) -> Iterator[Quote]:
+    """按 ``discover_sources`` 的顺序逐条产出规范化、按分类去重后的金句（文件中的顺序）。
+
+    与 ``collect_quotes`` 结果相同，但不必先读完整个文件；同一分类的来源相邻。
+    """
+    seen: Dict[str, Set[str]] = {}
+    for source in discover_sources(data_dir):
+        texts = seen.setdefault(source.category, set())
+        try:
+            for quote in iter_source(source):
+                if quote.text in texts:
+                    continue
+                texts.add(quote.text)
+                yield quote
+        except (OSError, ValueError) as exc:
+            print(f"警告: 金句来源 {source.name} 解析中断，只保留已读入的部分: {exc}")
+
+
+def collect_quotes(data_dir: Path, workers: Optional[int] = None) -> Dict[str, List[Quote]]:
+    """解析各来源文件，按分类去重，保持文件中的顺序（尚未打乱）。
+
+    来源较多较大时在进程池中并行解析；结果按 ``discover_sources`` 的顺序合并，
+    与完成先后无关，因此每次得到的顺序相同。
+    """
+    sources = discover_sources(data_dir)
+    categorised: Dict[str, List[Quote]] = {"text": [], "book": []}
+    unique: Dict[str, Dict[str, Quote]] = {}
+    for source, columns in zip(sources, _parse_all(sources, workers)):
+        # 去重：同一分类下按文本去重，避免不同类型之间相互覆盖
+        bucket = unique.setdefault(source.category, {})
+        for text, color in zip(*columns):
+            if text not in bucket:
+                bucket[text] = Quote(text=text, color=color, category=source.category)
+    for category, bucket in unique.items():
+        categorised[category] = list(bucket.values())
+    return categorised
+
+
+def order_quotes(categorised: Dict[str, List[Quote]], rng: Optional[random.Random] = None) -> List[Quote]:
+    """各分类分别打乱（给出 ``rng`` 时用它，否则用全局随机数）后按 text、book、其它的顺序拼接。"""
+    shuffle = (rng or random).shuffle
     for category, quote_list in categorised.items():
-        unique: dict[str, Quote] = {}
-        for quote in quote_list:
-            unique.setdefault(quote.text, quote)
-        shuffled = list(unique.values())
-        random.shuffle(shuffled)
+        shuffled = list(quote_list)
+        shuffle(shuffled)
         categorised[category] = shuffled
 
-    ordered = categorised["text"] + categorised["book"]
+    ordered = categorised.get("text", []) + categorised.get("book", [])
     if not ordered:
         return []
 
@@ -74,8 +390,12 @@ def load_quotes(data_dir: Path) -> List[Quote]:
     return ordered
 
 
+def load_quotes(data_dir: Path) -> List[Quote]:
+    return order_quotes(collect_quotes(data_dir))
+
+
 def load_achievements(data_dir: Path) -> List[Achievement]:
-    path = data_dir / "zanshang.json"
+    path = data_dir / ACHIEVEMENTS_SOURCE
     if not path.exists():
         return []
     entries = _load_json(path)
@@ -0,0 +1,256 @@
+"""数据热重载：演出进行中修改 data 目录下的 JSON，不必重启全屏看板。
+
+``QFileSystemWatcher`` 同时监视 data 目录与各来源文件（编辑器常用“写临时文件再
+改名”的方式保存，改名后对原文件的监视会失效，目录的变动可以补上）。变动先防抖
+``debounce_ms``，再按 (大小, mtime) 找出真正改动的文件（包括新增与删除的来源），
+只在线程池中重读这些文件，与看板当前的列式存储（启动时来自编译语料）逐条比较，
+得出新增与删除的条目，交回界面线程分批应用；sources.json 改动时全部来源按新的
+分类规则重新归类。解析失败（如文件只写了一半）时保留现有内容，等下一次改动。
+
+    python -m python_app.main --watch-data
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Set, Tuple
+
+from PySide6.QtCore import QFileSystemWatcher, QObject, QRunnable, QThreadPool, QTimer, Signal
+
+from .data_loader import (
+    ACHIEVEMENTS_SOURCE,
+    SOURCES_MANIFEST,
+    QuoteSource,
+    discover_sources,
+    load_achievements,
+    load_quote_source,
+)
+from .models import Achievement, Quote
+from .quote_store import QuoteStore
+
+if TYPE_CHECKING:  # pragma: no cover - 仅用于类型标注
+    from .board import QuoteBoard
+
+Stamp = Tuple[int, int]  # (字节数, mtime_ns)
+
+
+@dataclass
+class DataDiff:
+    """一次热重载的结果：``removed`` 是 ``QuoteStore`` 中的下标。"""
+
+    added: List[Quote] = field(default_factory=list)
+    removed: List[int] = field(default_factory=list)
+    compliments: Optional[List[Achievement]] = None  # None 表示祝福语没有变化
+    parsed: Dict[str, List[Quote]] = field(default_factory=dict)
+
+
+def _stamp(path: Path) -> Optional[Stamp]:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+def compute_diff(
+    sources: List[QuoteSource],
+    categories: Set[str],
+    reparse: Set[str],
+    store: QuoteStore,
+    cache: Dict[str, List[Quote]],
+    data_dir: Optional[Path] = None,
+) -> DataDiff:
+    """重新汇总 ``categories`` 中各分类的金句，与 ``store`` 中的现有条目比较。
+
+    ``reparse`` 中的来源重新解析，其余来源取自 ``cache``（没有缓存时才读取）。
+    文本相同但颜色改变的条目按先删后增处理；给出 ``data_dir`` 时一并重读祝福语。
+    """
+    diff = DataDiff()
+    for category in categories:
+        quotes: List[Quote] = []
+        seen: Set[str] = set()
+        for source in sources:
+            if source.category != category:
+                continue
+            parsed = cache.get(source.name) if source.name not in reparse else None
+            if parsed is None:
+                parsed = diff.parsed[source.name] = load_quote_source(source)
+            for quote in parsed:
+                if quote.text not in seen:
+                    seen.add(quote.text)
+                    quotes.append(quote)
+        current = {store.text(index): index for index in store.indices(category)}
+        kept: Set[int] = set()
+        for quote in quotes:
+            index = current.get(quote.text)
+            if index is not None and store.color(index) == quote.color:
+                kept.add(index)
+            else:
+                diff.added.append(quote)
+        diff.removed.extend(index for index in current.values() if index not in kept)
+    if data_dir is not None:
+        diff.compliments = load_achievements(data_dir)
+    return diff
+
+
+class _ReloadSignals(QObject):
+    finished = Signal(object)
+    failed = Signal(str)
+
+
+class _ReloadTask(QRunnable):
+    def __init__(self, function: Callable[[], DataDiff]) -> None:
+        super().__init__()
+        self.function = function
+        self.signals = _ReloadSignals()
+
+    def run(self) -> None:
+        try:
+            result = self.function()
+        except Exception as exc:  # noqa: BLE001 - 交给界面线程统一报告
+            self.signals.failed.emit(str(exc))
+            return
+        self.signals.finished.emit(result)
+
+
+class DataWatcher(QObject):
+    """监视 data 目录，把来源文件的改动增量地应用到看板。
+
+    构造时记下各来源的指纹，``start`` 之后才开始重载（应在金句全部读入后调用）；
+    期间发生的改动在 ``start`` 时一并补上。同一时刻只有一个重载任务，任务进行中
+    的新改动等它结束后再处理。新增条目每 ``apply_batch`` 条交给看板一次，两批之间
+    让出事件循环。
+    """
+
+    reloaded = Signal(list)  # 本次重载的文件名
+
+    def __init__(
+        self,
+        data_dir: Path,
+        board: "QuoteBoard",
+        debounce_ms: int = 500,
+        apply_batch: int = 2048,
+        pool: Optional[QThreadPool] = None,
+        parent: Optional[QObject] = None,
+    ) -> None:
+        super().__init__(parent)
+        self.data_dir = data_dir
+        self.board = board
+        self.apply_batch = apply_batch
+        self._pool = pool or QThreadPool.globalInstance()
+        self._sources: Dict[str, QuoteSource] = {}
+        self._stamps: Dict[str, Stamp] = {}
+        self._cache: Dict[str, List[Quote]] = {}
+        self._task: Optional[_ReloadTask] = None
+        self._pending: Tuple[Dict[str, QuoteSource], Dict[str, Stamp], List[str]] = ({}, {}, [])
+        self._sources, self._stamps = self._scan()
+        self._started = False
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.fileChanged.connect(self._on_changed)
+        self._watcher.directoryChanged.connect(self._on_changed)
+        self._debounce = QTimer(self)
+        self._debounce.setSingleShot(True)
+        self._debounce.setInterval(debounce_ms)
+        self._debounce.timeout.connect(self._reload)
+
+    def start(self) -> None:
+        if self._started:
+            return
+        self._started = True
+        if self.data_dir.exists():
+            self._watcher.addPath(str(self.data_dir))
+        self._watch_files()
+        print(f"[data] 正在监视 {self.data_dir} 中的改动")
+        self._reload()
+
+    def stop(self) -> None:
+        self._started = False
+        self._debounce.stop()
+        paths = self._watcher.files() + self._watcher.directories()
+        if paths:
+            self._watcher.removePaths(paths)
+
+    def _scan(self) -> Tuple[Dict[str, QuoteSource], Dict[str, Stamp]]:
+        """当前的金句来源与各文件（含祝福语与 sources.json）的指纹。"""
+        sources = {source.name: source for source in discover_sources(self.data_dir)}
+        stamps = {}
+        paths = [(name, source.path) for name, source in sources.items()]
+        paths += [(name, self.data_dir / name) for name in (ACHIEVEMENTS_SOURCE, SOURCES_MANIFEST)]
+        for name, path in paths:
+            stamp = _stamp(path)
+            if stamp is not None:
+                stamps[name] = stamp
+        return sources, stamps
+
+    def _watch_files(self) -> None:
+        watched = set(self._watcher.files()) | set(self._watcher.directories())
+        paths = [self.data_dir / name for name in (*self._stamps, ACHIEVEMENTS_SOURCE, SOURCES_MANIFEST)]
+        # 子目录中的主题金句包：新建的文件只会触发所在目录的变动
+        paths += [path for path in self.data_dir.rglob("*") if path.is_dir() and not any(
+            part.startswith(".") for part in path.relative_to(self.data_dir).parts
+        )]
+        for path in paths:
+            if str(path) not in watched and path.exists():
+                self._watcher.addPath(str(path))
+
+    def _on_changed(self, _path: str) -> None:
+        if self._started:
+            self._debounce.start()
+
+    def _reload(self) -> None:
+        if not self._started or self._task is not None:
+            return
+        try:
+            sources, stamps = self._scan()
+        except (OSError, ValueError) as exc:
+            print(f"警告: [data] 无法读取 {SOURCES_MANIFEST}（{exc}），保留已载入的内容，等待下一次改动")
+            return
+        # 改名保存后原文件的监视已失效，新建的文件也要加上
+        self._watch_files()
+        changed = sorted(name for name in stamps.keys() | self._stamps.keys() if stamps.get(name) != self._stamps.get(name))
+        if not changed:
+            return
+        print(f"[data] 检测到改动：{', '.join(changed)}，后台重新读取")
+        if SOURCES_MANIFEST in changed:
+            # 分类规则变了：全部来源按新规则重新归类
+            reparse = set(sources)
+            categories = {source.category for source in sources.values()} | set(self.board.quote_store.categories())
+        else:
+            reparse = {name for name in changed if name in sources}
+            categories = {sources[name].category for name in reparse}
+            categories |= {self._sources[name].category for name in changed if name in self._sources}
+        self._pending = (sources, stamps, changed)
+        store, cache = self.board.quote_store, dict(self._cache)
+        source_list = list(sources.values())
+        achievements_dir = self.data_dir if ACHIEVEMENTS_SOURCE in changed else None
+        task = _ReloadTask(lambda: compute_diff(source_list, categories, reparse, store, cache, achievements_dir))
+        task.signals.finished.connect(self._on_diff)
+        task.signals.failed.connect(self._on_failed)
+        self._task = task
+        self._pool.start(task)
+
+    def _on_failed(self, message: str) -> None:
+        self._task = None
+        print(f"警告: [data] 热重载失败（{message}），保留已载入的内容，等待下一次改动")
+
+    def _on_diff(self, diff: DataDiff) -> None:
+        self._sources, self._stamps, changed = self._pending
+        self._cache = {name: quotes for name, quotes in {**self._cache, **diff.parsed}.items() if name in self._sources}
+        if diff.compliments is not None:
+            self.board.update_compliments(diff.compliments)
+        print(f"[data] 热重载 {', '.join(changed)}：新增 {len(diff.added)} 条，删除 {len(diff.removed)} 条")
+        # 删除与第一批新增一起应用：整份替换的文件不会让当前阶段先出空、提前收尾
+        self._apply(diff, changed, 0, set(diff.removed))
+
+    def _apply(self, diff: DataDiff, changed: List[str], start: int, removed: Set[int]) -> None:
+        end = start + self.apply_batch
+        if removed or start < len(diff.added):
+            self.board.apply_quote_changes(diff.added[start:end], removed)
+        if end < len(diff.added):
+            QTimer.singleShot(0, lambda: self._apply(diff, changed, end, set()))
+            return
+        self._task = None
+        self.reloaded.emit(changed)
+        # 重载期间若又有改动，这里接着处理
+        self._reload()
@@ -2,13 +2,83 @@ from __future__ import annotations
 
 import math
 import random
+import time
 from dataclasses import dataclass, field
-from typing import List
+from typing import TYPE_CHECKING, Callable, List, Optional
 
 from PySide6.QtCore import QPointF, QTimer, Qt
-from PySide6.QtGui import QColor, QPainter, QPaintEvent
+from PySide6.QtGui import QColor, QImage, QPainter, QPaintEvent
 from PySide6.QtWidgets import QWidget
 
+from .metrics import layer_timings, tracer
+from .quality import QualityGovernor, QualityLevel, QUALITY_LEVELS
+
+if TYPE_CHECKING:  # pragma: no cover - 仅用于类型标注
+    from .effects_worker import EffectsRenderer
+
+
+# 以下常量均为"每个模拟步"的量，数值沿用原先按定时器节拍调好的手感
+SNOW_STEP_S = 0.040
+FIREWORKS_STEP_S = 0.016
+ROCKET_GRAVITY = 0.08
+PARTICLE_GRAVITY = 0.24
+PARTICLE_DAMPING = 0.86
+
+
+class FixedStepper:
+    """固定步长积分器。
+
+    累计两次 :meth:`advance` 之间的真实时间，按固定步长推进模拟，剩余不足一步的
+    时间作为插值系数 :attr:`alpha` 供渲染使用。定时器合并或界面线程卡顿时会补足
+    步数；单次最多补 ``max_steps`` 步，超出部分直接丢弃，避免卡顿后越追越慢。
+    """
+
+    def __init__(
+        self,
+        step_s: float,
+        max_steps: int = 8,
+        time_source: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        self.step_s = step_s
+        self.max_steps = max_steps
+        self.time_source = time_source
+        self.accumulator = 0.0
+        self._last: Optional[float] = None
+
+    @property
+    def alpha(self) -> float:
+        return min(1.0, self.accumulator / self.step_s)
+
+    def reset(self) -> None:
+        self.accumulator = 0.0
+        self._last = self.time_source()
+
+    def advance(self) -> int:
+        """返回本次需要推进的模拟步数。"""
+        now = self.time_source()
+        if self._last is None:
+            self._last = now
+            return 0
+        self.accumulator += max(0.0, now - self._last)
+        self._last = now
+        steps = min(self.max_steps, int(self.accumulator / self.step_s))
+        self.accumulator -= steps * self.step_s
+        if self.accumulator >= self.step_s:
+            self.accumulator %= self.step_s
+        return steps
+
+
+def _lerp(previous: float, current: float, alpha: float) -> float:
+    return previous + (current - previous) * alpha
+
+
+def _interpolated_trail(trail: List[QPointF], particle, alpha: float) -> List[QPointF]:
+    """以插值后的当前位置替换拖尾末端，其余拖尾点保持模拟步上的位置。"""
+    head = QPointF(_lerp(particle.prev_x, particle.x, alpha), _lerp(particle.prev_y, particle.y, alpha))
+    if not trail:
+        return [head]
+    return trail[:-1] + [head]
+
 
 @dataclass
 class Snowflake:
@@ -17,72 +87,211 @@ class Snowflake:
     velocity_y: float
     drift: float
     opacity: float
+    previous: QPointF = field(default_factory=QPointF)
 
+    def __post_init__(self) -> None:
+        self.previous = QPointF(self.position)
 
-class SnowEffect(QWidget):
-    def __init__(self, parent=None, flake_count: int = 70) -> None:
-        super().__init__(parent)
-        self.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents, True)
-        self.setAttribute(Qt.WidgetAttribute.WA_NoSystemBackground, True)
-        self.flake_count = flake_count
+
+class SnowSimulation:
+    """雪花的模拟状态，不依赖控件，既可由 SnowEffect 直接驱动，也可交给渲染线程。"""
+
+    def __init__(
+        self,
+        flake_count: int = 70,
+        level: QualityLevel = QUALITY_LEVELS[0],
+        time_source: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        self.base_flake_count = flake_count
+        self.level = level
+        self.flake_count = self._scaled_flake_count()
         self.flakes: List[Snowflake] = []
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self._update_flakes)
-        self.timer.start(40)
+        self.width = 0
+        self.height = 0
+        self.stepper = FixedStepper(SNOW_STEP_S, time_source=time_source)
 
-    def resizeEvent(self, event) -> None:  # type: ignore[override]
-        super().resizeEvent(event)
+    @property
+    def active(self) -> bool:
+        return True
+
+    def _scaled_flake_count(self) -> int:
+        return max(1, round(self.base_flake_count * self.level.snow_density))
+
+    def resize(self, width: int, height: int) -> None:
+        self.width = width
+        self.height = height
         self._init_flakes()
 
+    def apply_quality(self, level: QualityLevel) -> None:
+        """按画质等级增减雪花，保留已有雪花避免画面跳变。"""
+        self.level = level
+        self.flake_count = self._scaled_flake_count()
+        if not self.flakes:
+            return
+        if len(self.flakes) > self.flake_count:
+            del self.flakes[self.flake_count:]
+        else:
+            width = max(1, self.width)
+            height = max(1, self.height)
+            while len(self.flakes) < self.flake_count:
+                self.flakes.append(self._new_flake(width, height))
+
+    def _new_flake(self, width: int, height: int) -> Snowflake:
+        return Snowflake(
+            position=QPointF(random.uniform(0, width), random.uniform(0, height)),
+            radius=random.uniform(1.5, 4.5),
+            velocity_y=random.uniform(0.6, 1.8),
+            drift=random.uniform(-0.5, 0.5),
+            opacity=random.uniform(0.25, 0.65),
+        )
+
     def _init_flakes(self) -> None:
-        self.flakes = []
-        width = max(1, self.width())
-        height = max(1, self.height())
-        for _ in range(self.flake_count):
-            self.flakes.append(
-                Snowflake(
-                    position=QPointF(random.uniform(0, width), random.uniform(0, height)),
-                    radius=random.uniform(1.5, 4.5),
-                    velocity_y=random.uniform(0.6, 1.8),
-                    drift=random.uniform(-0.5, 0.5),
-                    opacity=random.uniform(0.25, 0.65),
-                )
-            )
+        width = max(1, self.width)
+        height = max(1, self.height)
+        self.flakes = [self._new_flake(width, height) for _ in range(self.flake_count)]
 
-    def _update_flakes(self) -> None:
+    def reset_clock(self) -> None:
+        self.stepper.reset()
+
+    def advance(self) -> bool:
         if not self.flakes:
             self._init_flakes()
-        width = self.width()
-        height = self.height()
+            self.stepper.reset()
+        for _ in range(self.stepper.advance()):
+            self._step()
+        return True
+
+    def _step(self) -> None:
+        width = self.width
+        height = self.height
         for flake in self.flakes:
+            flake.previous = flake.position
             x = flake.position.x() + flake.drift
             y = flake.position.y() + flake.velocity_y
+            wrapped = False
             if y > height:
                 y = -flake.radius
                 x = random.uniform(0, width)
+                wrapped = True
             if x > width:
                 x = 0
+                wrapped = True
             if x < 0:
                 x = width
+                wrapped = True
             flake.position = QPointF(x, y)
+            if wrapped:
+                # 绕回时不做插值，避免出现横穿屏幕的残影
+                flake.previous = flake.position
+
+    def render(self, painter: QPainter) -> None:
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing, self.level.antialiasing)
+        painter.setPen(Qt.PenStyle.NoPen)
+        alpha = self.stepper.alpha
+        for flake in self.flakes:
+            color = QColor(255, 255, 255)
+            color.setAlphaF(flake.opacity)
+            painter.setBrush(color)
+            position = QPointF(
+                _lerp(flake.previous.x(), flake.position.x(), alpha),
+                _lerp(flake.previous.y(), flake.position.y(), alpha),
+            )
+            painter.drawEllipse(position, flake.radius, flake.radius)
+
+
+class SnowEffect(QWidget):
+    interval_ms = 40
+
+    def __init__(
+        self,
+        parent=None,
+        flake_count: int = 70,
+        quality: Optional[QualityGovernor] = None,
+        renderer: Optional[EffectsRenderer] = None,
+        time_source: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        super().__init__(parent)
+        self.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents, True)
+        self.setAttribute(Qt.WidgetAttribute.WA_NoSystemBackground, True)
+        self.quality = quality
+        level = quality.level if quality else QUALITY_LEVELS[0]
+        self.simulation = SnowSimulation(flake_count, level, time_source=time_source)
+        self.renderer = renderer
+        self._frame: Optional[QImage] = None
+        self._last_tick: Optional[float] = None
+        if quality is not None:
+            quality.level_changed.connect(self.apply_quality)
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self._update_flakes)
+        if renderer is not None:
+            # 模拟与光栅化都在渲染线程完成，本控件只负责贴图
+            self._sim_id = renderer.register(self, self.simulation, self.interval_ms)
+        else:
+            self.timer.start(self.interval_ms)
+
+    @property
+    def flakes(self) -> List[Snowflake]:
+        return self.simulation.flakes
+
+    def apply_quality(self, level: QualityLevel) -> None:
+        if self.renderer is not None:
+            self.renderer.set_quality(self._sim_id, level)
+            return
+        self.simulation.apply_quality(level)
         self.update()
 
+    def resizeEvent(self, event) -> None:  # type: ignore[override]
+        super().resizeEvent(event)
+        if self.renderer is not None:
+            self.renderer.resize(self._sim_id, self.size(), self.devicePixelRatioF())
+        else:
+            self.simulation.resize(self.width(), self.height())
+
+    def _record_frame(self) -> None:
+        now = time.perf_counter()
+        if self.quality is not None and self._last_tick is not None:
+            self.quality.record_frame((now - self._last_tick) * 1000.0, self.interval_ms)
+        self._last_tick = now
+
+    def _update_flakes(self) -> None:
+        with tracer.span("tick:snow", "tick"):
+            self._record_frame()
+            self.simulation.advance()
+            self.update()
+
+    def present_frame(self, frame: QImage, generation: int = 0) -> None:
+        """渲染线程交回的一帧。"""
+        self._record_frame()
+        self._frame = frame
+        self.update()
+
+    def simulation_idle(self, generation: int = 0) -> None:
+        pass
+
     def pause(self) -> None:
+        self._last_tick = None
+        if self.renderer is not None:
+            self.renderer.set_running(self._sim_id, False)
+            return
         self.timer.stop()
 
     def resume(self) -> None:
+        if self.renderer is not None:
+            self.renderer.set_running(self._sim_id, True)
+            return
         if not self.timer.isActive():
-            self.timer.start(40)
+            self.simulation.reset_clock()
+            self.timer.start(self.interval_ms)
 
     def paintEvent(self, event: QPaintEvent) -> None:  # type: ignore[override]
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-        painter.setPen(Qt.PenStyle.NoPen)
-        for flake in self.flakes:
-            color = QColor(255, 255, 255)
-            color.setAlphaF(flake.opacity)
-            painter.setBrush(color)
-            painter.drawEllipse(flake.position, flake.radius, flake.radius)
+        with layer_timings.paint("snow"):
+            painter = QPainter(self)
+            if self.renderer is not None:
+                if self._frame is not None:
+                    painter.drawImage(0, 0, self._frame)
+                self.renderer.frame_consumed(self._sim_id)
+                return
+            self.simulation.render(painter)
 
 
 @dataclass
@@ -94,6 +303,12 @@ class Particle:
     life: float
     color: QColor
     trail: List[QPointF] = field(default_factory=list)
+    prev_x: float = 0.0
+    prev_y: float = 0.0
+
+    def __post_init__(self) -> None:
+        self.prev_x = self.x
+        self.prev_y = self.y
 
 
 @dataclass
@@ -106,20 +321,44 @@ class RocketParticle:
     color: QColor
     burst_config: dict = field(default_factory=dict)
     trail: List[QPointF] = field(default_factory=list)
+    prev_x: float = 0.0
+    prev_y: float = 0.0
 
+    def __post_init__(self) -> None:
+        self.prev_x = self.x
+        self.prev_y = self.y
 
-class FireworksOverlay(QWidget):
-    def __init__(self, parent=None) -> None:
-        super().__init__(parent)
-        self.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents, True)
-        self.setAttribute(Qt.WidgetAttribute.WA_NoSystemBackground, True)
-        self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground, True)
+
+class FireworksSimulation:
+    """烟花的模拟状态：火箭、粒子与固定步长积分，可在任意线程推进和绘制。
+
+    随机数来自自己的 ``rng``；触发时传入 ``seed`` 后，同一次绽放在任何进程、
+    任何一块屏幕上都会得到完全相同的火箭与粒子。
+    """
+
+    def __init__(
+        self,
+        level: QualityLevel = QUALITY_LEVELS[0],
+        time_source: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        self.level = level
         self.particles: List[Particle] = []
         self.rockets: List[RocketParticle] = []
         self.active = False
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self._tick)
-        self.timer.setInterval(16)
+        self.width = 0
+        self.height = 0
+        self.stepper = FixedStepper(FIREWORKS_STEP_S, time_source=time_source)
+        self.rng = random.Random()
+
+    def resize(self, width: int, height: int) -> None:
+        self.width = width
+        self.height = height
+
+    def apply_quality(self, level: QualityLevel) -> None:
+        self.level = level
+
+    def _scaled_count(self, count: int) -> int:
+        return max(8, round(count * self.level.particle_scale))
 
     def trigger(
         self,
@@ -129,12 +368,15 @@ class FireworksOverlay(QWidget):
         bursts: int | None = None,
         particle_count: int | None = None,
         launch_from_bottom: bool = True,
+        seed: Optional[int] = None,
     ) -> None:
+        if seed is not None:
+            self.rng.seed(seed)
         self.active = True
         self.particles = []
         self.rockets = []
-        width = self.width()
-        height = self.height()
+        width = self.width
+        height = self.height
 
         if center is None:
             center_x = width / 2
@@ -147,17 +389,17 @@ class FireworksOverlay(QWidget):
 
         if launch_from_bottom:
             for _ in range(total_bursts):
-                hue_shift = random.randint(-20, 20)
+                hue_shift = self.rng.randint(-20, 20)
                 color = QColor(base_color)
                 h, s, v, a = color.getHsv()
                 color.setHsv((h + hue_shift) % 360, min(255, s + 30), v, a)
 
-                start_x = center_x + random.uniform(-width * 0.15, width * 0.15)
+                start_x = center_x + self.rng.uniform(-width * 0.15, width * 0.15)
                 start_y = height + 10
-                target_y = center_y + random.uniform(-height * 0.1, height * 0.1)
+                target_y = center_y + self.rng.uniform(-height * 0.1, height * 0.1)
 
-                launch_speed = random.uniform(12.0, 16.0)
-                default_count = 80 if simultaneous else 160
+                launch_speed = self.rng.uniform(12.0, 16.0)
+                default_count = self._scaled_count(80 if simultaneous else 160)
                 count = particle_count if particle_count is not None else default_count
 
                 self.rockets.append(
@@ -165,7 +407,7 @@ class FireworksOverlay(QWidget):
                         x=start_x,
                         y=start_y,
                         target_y=target_y,
-                        vx=random.uniform(-0.5, 0.5),
+                        vx=self.rng.uniform(-0.5, 0.5),
                         vy=-launch_speed,
                         color=color,
                         burst_config={
@@ -178,48 +420,59 @@ class FireworksOverlay(QWidget):
         else:
             base_radius = max(220.0, min(width, height) * 0.35)
             for _ in range(total_bursts):
-                hue_shift = random.randint(-20, 20)
+                hue_shift = self.rng.randint(-20, 20)
                 color = QColor(base_color)
                 h, s, v, a = color.getHsv()
                 color.setHsv((h + hue_shift) % 360, min(255, s + 30), v, a)
-                default_count = 80 if simultaneous else 160
+                default_count = self._scaled_count(80 if simultaneous else 160)
                 count = particle_count if particle_count is not None else default_count
                 for i in range(count):
                     angle = (math.pi * 2 / count) * i
-                    speed = random.uniform(18.0, 26.0) if simultaneous else random.uniform(12.0, 18.0)
+                    speed = self.rng.uniform(18.0, 26.0) if simultaneous else self.rng.uniform(12.0, 18.0)
                     vx = math.cos(angle) * speed
                     vy = math.sin(angle) * speed
-                    origin_x = center_x + math.cos(angle) * random.uniform(0, base_radius) * 0.28
-                    origin_y = center_y + math.sin(angle) * random.uniform(0, base_radius) * 0.28
-                    origin_x += random.uniform(-20, 20)
-                    origin_y += random.uniform(-20, 20)
+                    origin_x = center_x + math.cos(angle) * self.rng.uniform(0, base_radius) * 0.28
+                    origin_y = center_y + math.sin(angle) * self.rng.uniform(0, base_radius) * 0.28
+                    origin_x += self.rng.uniform(-20, 20)
+                    origin_y += self.rng.uniform(-20, 20)
                     self.particles.append(
                         Particle(
                             x=origin_x,
                             y=origin_y,
                             vx=vx,
                             vy=vy,
-                            life=random.uniform(0.55, 0.85),
+                            life=self.rng.uniform(0.55, 0.85),
                             color=color,
                             trail=[QPointF(origin_x, origin_y)],
                         )
                     )
 
-        self.timer.start()
-        self.show()
-        self.raise_()
-        self.update()
+        self.stepper.reset()
 
-    def _tick(self) -> None:
+    def reset_clock(self) -> None:
+        self.stepper.reset()
+
+    def advance(self) -> bool:
+        """推进到当前时间，返回模拟是否仍在进行。"""
+        for _ in range(self.stepper.advance()):
+            self._step()
+        if not self.particles and not self.rockets:
+            self.active = False
+        return self.active
+
+    def _step(self) -> None:
+        level = self.level
         alive_rockets: List[RocketParticle] = []
         for rocket in self.rockets:
+            rocket.prev_x = rocket.x
+            rocket.prev_y = rocket.y
             rocket.x += rocket.vx
             rocket.y += rocket.vy
-            rocket.vy += 0.08
+            rocket.vy += ROCKET_GRAVITY
 
             rocket.trail.append(QPointF(rocket.x, rocket.y))
-            if len(rocket.trail) > 10:
-                rocket.trail.pop(0)
+            if len(rocket.trail) > level.rocket_trail:
+                del rocket.trail[: len(rocket.trail) - level.rocket_trail]
 
             if rocket.y <= rocket.target_y:
                 self._explode_rocket(rocket)
@@ -228,41 +481,33 @@ class FireworksOverlay(QWidget):
 
         self.rockets = alive_rockets
 
-        gravity = 0.24
-        damping = 0.86
-        dt = 0.016
         alive_particles: List[Particle] = []
         for p in self.particles:
+            p.prev_x = p.x
+            p.prev_y = p.y
             p.x += p.vx
             p.y += p.vy
-            p.vy += gravity
-            p.vx *= damping
-            p.vy *= damping
-            p.life -= dt
+            p.vy += PARTICLE_GRAVITY
+            p.vx *= PARTICLE_DAMPING
+            p.vy *= PARTICLE_DAMPING
+            p.life -= FIREWORKS_STEP_S
             p.trail.append(QPointF(p.x, p.y))
-            if len(p.trail) > 8:
-                p.trail.pop(0)
+            if len(p.trail) > level.particle_trail:
+                del p.trail[: len(p.trail) - level.particle_trail]
             if p.life > 0:
                 alive_particles.append(p)
         self.particles = alive_particles
 
-        if not self.particles and not self.rockets:
-            self.timer.stop()
-            self.active = False
-            self.hide()
-
-        self.update()
-
     def _explode_rocket(self, rocket: RocketParticle) -> None:
         count = rocket.burst_config.get("count", 80)
         simultaneous = rocket.burst_config.get("simultaneous", False)
 
-        explosion_type = random.choice(["sphere", "ring", "spiral"])
+        explosion_type = self.rng.choice(["sphere", "ring", "spiral"])
 
         if explosion_type == "sphere":
             for i in range(count):
                 angle = (math.pi * 2 / count) * i
-                speed = random.uniform(18.0, 28.0) if simultaneous else random.uniform(14.0, 20.0)
+                speed = self.rng.uniform(18.0, 28.0) if simultaneous else self.rng.uniform(14.0, 20.0)
                 vx = math.cos(angle) * speed
                 vy = math.sin(angle) * speed
 
@@ -272,7 +517,7 @@ class FireworksOverlay(QWidget):
                         y=rocket.y,
                         vx=vx,
                         vy=vy,
-                        life=random.uniform(0.6, 0.9),
+                        life=self.rng.uniform(0.6, 0.9),
                         color=rocket.color,
                         trail=[QPointF(rocket.x, rocket.y)],
                     )
@@ -280,7 +525,7 @@ class FireworksOverlay(QWidget):
         elif explosion_type == "ring":
             for i in range(count):
                 angle = (math.pi * 2 / count) * i
-                speed = random.uniform(16.0, 22.0)
+                speed = self.rng.uniform(16.0, 22.0)
                 vx = math.cos(angle) * speed
                 vy = math.sin(angle) * speed
 
@@ -290,7 +535,7 @@ class FireworksOverlay(QWidget):
                         y=rocket.y,
                         vx=vx,
                         vy=vy,
-                        life=random.uniform(0.6, 0.9),
+                        life=self.rng.uniform(0.6, 0.9),
                         color=rocket.color,
                         trail=[QPointF(rocket.x, rocket.y)],
                     )
@@ -299,7 +544,7 @@ class FireworksOverlay(QWidget):
             for i in range(count):
                 angle = (math.pi * 4 / count) * i
                 radius_factor = (i / count) * 0.5 + 0.5
-                speed = random.uniform(14.0, 20.0) * radius_factor
+                speed = self.rng.uniform(14.0, 20.0) * radius_factor
                 vx = math.cos(angle) * speed
                 vy = math.sin(angle) * speed
 
@@ -309,21 +554,19 @@ class FireworksOverlay(QWidget):
                         y=rocket.y,
                         vx=vx,
                         vy=vy,
-                        life=random.uniform(0.6, 0.9),
+                        life=self.rng.uniform(0.6, 0.9),
                         color=rocket.color,
                         trail=[QPointF(rocket.x, rocket.y)],
                     )
                 )
 
-    def paintEvent(self, event: QPaintEvent) -> None:  # type: ignore[override]
-        if not self.active:
-            return
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+    def render(self, painter: QPainter) -> None:
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing, self.level.antialiasing)
         painter.setPen(Qt.PenStyle.NoPen)
 
+        step_alpha = self.stepper.alpha
         for rocket in self.rockets:
-            trail = rocket.trail if rocket.trail else [QPointF(rocket.x, rocket.y)]
+            trail = _interpolated_trail(rocket.trail, rocket, step_alpha)
             trail_length = len(trail)
             for index, point in enumerate(reversed(trail)):
                 ratio = (index + 1) / trail_length
@@ -335,7 +578,7 @@ class FireworksOverlay(QWidget):
                 painter.drawEllipse(point, radius, radius)
 
         for particle in self.particles:
-            trail = particle.trail if particle.trail else [QPointF(particle.x, particle.y)]
+            trail = _interpolated_trail(particle.trail, particle, step_alpha)
             trail_length = len(trail)
             for index, point in enumerate(reversed(trail)):
                 ratio = (index + 1) / trail_length
@@ -346,3 +589,141 @@ class FireworksOverlay(QWidget):
                 painter.setBrush(color)
                 painter.drawEllipse(point, radius, radius)
 
+
+class FireworksOverlay(QWidget):
+    def __init__(
+        self,
+        parent=None,
+        quality: Optional[QualityGovernor] = None,
+        renderer: Optional[EffectsRenderer] = None,
+        time_source: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        super().__init__(parent)
+        self.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents, True)
+        self.setAttribute(Qt.WidgetAttribute.WA_NoSystemBackground, True)
+        self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground, True)
+        self.quality = quality
+        self.simulation = FireworksSimulation(self.level, time_source=time_source)
+        self.renderer = renderer
+        self.active = False
+        # 每次 trigger 加一；渲染线程交回的帧与空闲信号带着触发时的代号
+        self.generation = 0
+        self._frame: Optional[QImage] = None
+        self._last_tick: Optional[float] = None
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self._tick)
+        self.timer.setInterval(self.interval_ms)
+        if renderer is not None:
+            self._sim_id = renderer.register(self, self.simulation, self.interval_ms)
+        if quality is not None:
+            quality.level_changed.connect(self._on_quality_changed)
+
+    @property
+    def level(self) -> QualityLevel:
+        return self.quality.level if self.quality else QUALITY_LEVELS[0]
+
+    @property
+    def interval_ms(self) -> int:
+        # 渲染频率随画质变化，模拟步长固定，低帧率下不会出现慢动作
+        return self.level.frame_interval_ms
+
+    @property
+    def particles(self) -> List[Particle]:
+        return self.simulation.particles
+
+    @property
+    def rockets(self) -> List[RocketParticle]:
+        return self.simulation.rockets
+
+    def _on_quality_changed(self, level: QualityLevel) -> None:
+        if self.renderer is not None:
+            self.renderer.set_quality(self._sim_id, level)
+            self.renderer.set_interval(self._sim_id, level.frame_interval_ms)
+        else:
+            self.simulation.apply_quality(level)
+            self.timer.setInterval(level.frame_interval_ms)
+
+    def resizeEvent(self, event) -> None:  # type: ignore[override]
+        super().resizeEvent(event)
+        if self.renderer is not None:
+            self.renderer.resize(self._sim_id, self.size(), self.devicePixelRatioF())
+        else:
+            self.simulation.resize(self.width(), self.height())
+
+    def trigger(
+        self,
+        base_color: QColor,
+        center: QPointF | None = None,
+        simultaneous: bool = False,
+        bursts: int | None = None,
+        particle_count: int | None = None,
+        launch_from_bottom: bool = True,
+        seed: Optional[int] = None,
+    ) -> None:
+        self.active = True
+        self._last_tick = None
+        self.generation += 1
+        options = {
+            "base_color": QColor(base_color),
+            "center": QPointF(center) if center is not None else None,
+            "simultaneous": simultaneous,
+            "bursts": bursts,
+            "particle_count": particle_count,
+            "launch_from_bottom": launch_from_bottom,
+            "seed": seed,
+        }
+        if self.renderer is not None:
+            self._frame = None
+            # 隐藏状态下的 resizeEvent 会延迟到显示时，这里先同步尺寸
+            self.renderer.resize(self._sim_id, self.size(), self.devicePixelRatioF())
+            self.renderer.trigger(self._sim_id, options, self.generation)
+        else:
+            self.simulation.resize(self.width(), self.height())
+            self.simulation.trigger(**options)
+            self.timer.start(self.interval_ms)
+        self.show()
+        self.raise_()
+        self.update()
+
+    def _record_frame(self) -> None:
+        now = time.perf_counter()
+        if self.quality is not None and self._last_tick is not None:
+            self.quality.record_frame((now - self._last_tick) * 1000.0, self.interval_ms)
+        self._last_tick = now
+
+    def _tick(self) -> None:
+        with tracer.span("tick:fireworks", "tick"):
+            self._record_frame()
+            if not self.simulation.advance():
+                self.timer.stop()
+                self.active = False
+                self.hide()
+            self.update()
+
+    def present_frame(self, frame: QImage, generation: int = 0) -> None:
+        """渲染线程交回的一帧；重新触发之前的帧直接丢弃。"""
+        if not self.active or generation != self.generation:
+            return
+        self._record_frame()
+        self._frame = frame
+        self.update()
+
+    def simulation_idle(self, generation: int = 0) -> None:
+        # 上一轮烟花结束的信号可能在重新触发后才到达，不能据此隐藏新一轮
+        if generation != self.generation:
+            return
+        self.active = False
+        self._frame = None
+        self.hide()
+
+    def paintEvent(self, event: QPaintEvent) -> None:  # type: ignore[override]
+        with layer_timings.paint("fireworks"):
+            if not self.active:
+                return
+            painter = QPainter(self)
+            if self.renderer is not None:
+                if self._frame is not None:
+                    painter.drawImage(0, 0, self._frame)
+                self.renderer.frame_consumed(self._sim_id)
+                return
+            self.simulation.render(painter)
@@ -0,0 +1,272 @@
+from __future__ import annotations
+
+import time
+from typing import Dict, List, Optional
+
+from PySide6.QtCore import QCoreApplication, QObject, QSize, Qt, QThread, QTimer, Signal, Slot
+from PySide6.QtGui import QImage, QPainter
+from PySide6.QtWidgets import QWidget
+
+from .metrics import tracer
+from .quality import QualityLevel
+
+# 界面线程迟迟未取走帧时（例如控件被隐藏），超过该时间后不再等待
+_PENDING_TIMEOUT_S = 0.25
+
+
+class _SimulationEntry:
+    __slots__ = (
+        "simulation",
+        "interval_s",
+        "running",
+        "size",
+        "dpr",
+        "buffers",
+        "back",
+        "pending_since",
+        "last_render",
+        "generation",
+    )
+
+    def __init__(self, simulation, interval_ms: int) -> None:
+        self.simulation = simulation
+        self.interval_s = interval_ms / 1000.0
+        self.running = True
+        self.size = QSize()
+        self.dpr = 1.0
+        self.buffers: List[Optional[QImage]] = [None, None]
+        self.back = 0
+        self.pending_since: Optional[float] = None
+        self.last_render = 0.0
+        # 最近一次 trigger 的代号，随帧与空闲信号一起交回，界面线程据此丢弃过期的信号
+        self.generation = 0
+
+
+class _EffectsWorker(QObject):
+    """运行在渲染线程中：推进所有已登记的模拟，并把结果光栅化到双缓冲 QImage。"""
+
+    frame_ready = Signal(int, int, QImage)  # sim_id, 代号, 帧
+    simulation_idle = Signal(int, int)  # sim_id, 代号
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._entries: Dict[int, _SimulationEntry] = {}
+        self._timer: Optional[QTimer] = None
+        self._suspended = False
+
+    @Slot()
+    def start(self) -> None:
+        # 定时器必须在渲染线程内创建
+        self._timer = QTimer(self)
+        self._timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self._timer.timeout.connect(self._tick)
+        self._restart_timer()
+
+    @Slot()
+    def stop(self) -> None:
+        if self._timer is not None:
+            self._timer.stop()
+
+    @Slot(bool)
+    def set_suspended(self, suspended: bool) -> None:
+        self._suspended = suspended
+        if suspended:
+            self.stop()
+        else:
+            self._restart_timer()
+
+    @Slot(int, object, int)
+    def add(self, sim_id: int, simulation, interval_ms: int) -> None:
+        self._entries[sim_id] = _SimulationEntry(simulation, interval_ms)
+        self._restart_timer()
+
+    @Slot(int, QSize, float)
+    def resize(self, sim_id: int, size: QSize, dpr: float) -> None:
+        entry = self._entries.get(sim_id)
+        if entry is None:
+            return
+        entry.size = QSize(size)
+        entry.dpr = dpr
+        entry.buffers = [None, None]
+        entry.simulation.resize(size.width(), size.height())
+
+    @Slot(int, object, int)
+    def trigger(self, sim_id: int, options: dict, generation: int) -> None:
+        entry = self._entries.get(sim_id)
+        if entry is None:
+            return
+        entry.generation = generation
+        entry.simulation.trigger(**options)
+        entry.running = True
+        entry.pending_since = None
+
+    @Slot(int, bool)
+    def set_running(self, sim_id: int, running: bool) -> None:
+        entry = self._entries.get(sim_id)
+        if entry is None or entry.running == running:
+            return
+        entry.running = running
+        if running:
+            entry.simulation.reset_clock()
+            entry.pending_since = None
+
+    @Slot(int, int)
+    def set_interval(self, sim_id: int, interval_ms: int) -> None:
+        entry = self._entries.get(sim_id)
+        if entry is None:
+            return
+        entry.interval_s = interval_ms / 1000.0
+        self._restart_timer()
+
+    @Slot(int, object)
+    def set_quality(self, sim_id: int, level: QualityLevel) -> None:
+        entry = self._entries.get(sim_id)
+        if entry is not None:
+            entry.simulation.apply_quality(level)
+
+    @Slot(int)
+    def frame_consumed(self, sim_id: int) -> None:
+        entry = self._entries.get(sim_id)
+        if entry is not None:
+            entry.pending_since = None
+
+    def _restart_timer(self) -> None:
+        if self._timer is None or not self._entries or self._suspended:
+            return
+        interval_s = min(entry.interval_s for entry in self._entries.values())
+        self._timer.start(max(1, int(interval_s * 1000)))
+
+    def _tick(self) -> None:
+        with tracer.span("tick:worker", "tick"):
+            now = time.perf_counter()
+            for sim_id, entry in self._entries.items():
+                if not entry.running or entry.size.isEmpty():
+                    continue
+                if entry.pending_since is not None:
+                    # 上一帧尚未被界面线程绘制，跳过以免帧堆积
+                    if now - entry.pending_since < _PENDING_TIMEOUT_S:
+                        continue
+                    entry.pending_since = None
+                # 定时器按最短间隔运行，较慢的特效（如雪花）在此按自身间隔降频
+                if now - entry.last_render < entry.interval_s * 0.9:
+                    continue
+                simulation = entry.simulation
+                if not simulation.active:
+                    continue
+                if not simulation.advance():
+                    self.simulation_idle.emit(sim_id, entry.generation)
+                    continue
+                entry.last_render = now
+                entry.pending_since = now
+                self.frame_ready.emit(sim_id, entry.generation, self._rasterize(entry))
+
+    def _rasterize(self, entry: _SimulationEntry) -> QImage:
+        entry.back ^= 1
+        pixel_size = QSize(
+            max(1, round(entry.size.width() * entry.dpr)),
+            max(1, round(entry.size.height() * entry.dpr)),
+        )
+        image = entry.buffers[entry.back]
+        if image is None or image.size() != pixel_size:
+            image = QImage(pixel_size, QImage.Format.Format_ARGB32_Premultiplied)
+            image.setDevicePixelRatio(entry.dpr)
+            entry.buffers[entry.back] = image
+        image.fill(Qt.GlobalColor.transparent)
+        painter = QPainter(image)
+        entry.simulation.render(painter)
+        painter.end()
+        return image
+
+
+class EffectsRenderer(QObject):
+    """界面线程侧的入口。
+
+    特效控件在此登记自己的模拟对象，之后模拟的推进与光栅化都在独立的 ``QThread``
+    中完成；渲染好的帧通过信号交回控件，由控件在 ``paintEvent`` 中一次 ``drawImage``。
+    模拟对象登记后归渲染线程所有，界面线程只应读取其统计信息。
+
+    ``trigger`` 带一个代号，此后的帧与空闲信号都带着它交回控件：控件重新触发后，
+    渲染线程在此之前发出、尚在队列中的信号可以据此识别并丢弃。
+    """
+
+    _add = Signal(int, object, int)
+    _resize = Signal(int, QSize, float)
+    _trigger = Signal(int, object, int)
+    _set_running = Signal(int, bool)
+    _set_interval = Signal(int, int)
+    _set_quality = Signal(int, object)
+    _frame_consumed = Signal(int)
+    _set_suspended = Signal(bool)
+
+    def __init__(self, parent: Optional[QObject] = None) -> None:
+        super().__init__(parent)
+        self._widgets: Dict[int, QWidget] = {}
+        self._next_id = 0
+
+        self._thread = QThread()
+        self._thread.setObjectName("effects-render")
+        self._worker = _EffectsWorker()
+        self._worker.moveToThread(self._thread)
+        self._thread.started.connect(self._worker.start)
+        self._thread.finished.connect(self._worker.deleteLater)
+
+        self._add.connect(self._worker.add)
+        self._resize.connect(self._worker.resize)
+        self._trigger.connect(self._worker.trigger)
+        self._set_running.connect(self._worker.set_running)
+        self._set_interval.connect(self._worker.set_interval)
+        self._set_quality.connect(self._worker.set_quality)
+        self._frame_consumed.connect(self._worker.frame_consumed)
+        self._set_suspended.connect(self._worker.set_suspended)
+        self._worker.frame_ready.connect(self._on_frame_ready)
+        self._worker.simulation_idle.connect(self._on_simulation_idle)
+
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.shutdown)
+        self._thread.start()
+
+    def register(self, widget: QWidget, simulation, interval_ms: int) -> int:
+        sim_id = self._next_id
+        self._next_id += 1
+        self._widgets[sim_id] = widget
+        self._add.emit(sim_id, simulation, interval_ms)
+        return sim_id
+
+    def resize(self, sim_id: int, size: QSize, dpr: float) -> None:
+        self._resize.emit(sim_id, QSize(size), float(dpr))
+
+    def trigger(self, sim_id: int, options: dict, generation: int = 0) -> None:
+        self._trigger.emit(sim_id, options, generation)
+
+    def set_running(self, sim_id: int, running: bool) -> None:
+        self._set_running.emit(sim_id, running)
+
+    def set_interval(self, sim_id: int, interval_ms: int) -> None:
+        self._set_interval.emit(sim_id, interval_ms)
+
+    def set_quality(self, sim_id: int, level: QualityLevel) -> None:
+        self._set_quality.emit(sim_id, level)
+
+    def frame_consumed(self, sim_id: int) -> None:
+        self._frame_consumed.emit(sim_id)
+
+    def set_suspended(self, suspended: bool) -> None:
+        """挂起或恢复渲染线程的定时器。"""
+        self._set_suspended.emit(suspended)
+
+    def shutdown(self) -> None:
+        if not self._thread.isRunning():
+            return
+        self._thread.quit()
+        self._thread.wait(2000)
+
+    def _on_frame_ready(self, sim_id: int, generation: int, frame: QImage) -> None:
+        widget = self._widgets.get(sim_id)
+        if widget is not None:
+            widget.present_frame(frame, generation)
+
+    def _on_simulation_idle(self, sim_id: int, generation: int) -> None:
+        widget = self._widgets.get(sim_id)
+        if widget is not None:
+            widget.simulation_idle(generation)
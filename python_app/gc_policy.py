@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import gc
+import time
+from typing import Dict, Optional, Tuple
+
+from .metrics import gc_pauses, tracer
+
+# 动画阶段的回收阈值：第 0 代照常回收短命对象，第 2 代基本不会自动触发，
+# 留到阶段切换与空闲时主动回收
+ANIMATION_THRESHOLDS = (2000, 20, 1_000_000)
+# 会持续播放卡片或烟花动画的阶段
+ANIMATION_PHASES = frozenset({"intro", "text", "book", "post_fireworks", "other"})
+
+
+class GcPolicy:
+    """循环垃圾回收的调度策略。
+
+    - 启动加载完成后 ``freeze_startup`` 把金句、位图、图层等长期对象移出回收范围；
+    - 进入动画阶段时提高阈值，把耗时的第 2 代回收推迟到阶段切换与空闲时由
+      ``collect`` 主动完成；推迟超过 ``max_deferral_s`` 时在下一个空档补做一次；
+    - ``install`` 后通过 ``gc.callbacks`` 记录每次停顿，写入 ``gc_pauses``，
+      录制 trace 时同时写出 gc 事件。
+
+    ``enabled=False`` 时只记录停顿，不改动阈值、也不主动回收。
+    """
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        animation_thresholds: Tuple[int, int, int] = ANIMATION_THRESHOLDS,
+        max_deferral_s: float = 120.0,
+    ) -> None:
+        self.enabled = enabled
+        self.animation_thresholds = animation_thresholds
+        self.max_deferral_s = max_deferral_s
+        self.frozen_objects = 0
+        self.forced_collections: Dict[str, int] = {}
+        self._installed = False
+        self._animating = False
+        self._default_thresholds = gc.get_threshold()
+        self._last_full_collect = time.monotonic()
+        self._collect_started: Optional[float] = None
+
+    @property
+    def animating(self) -> bool:
+        return self._animating
+
+    def install(self) -> None:
+        if self._installed:
+            return
+        self._installed = True
+        self._default_thresholds = gc.get_threshold()
+        gc.callbacks.append(self._on_gc)
+
+    def uninstall(self) -> None:
+        if not self._installed:
+            return
+        self._installed = False
+        if self._on_gc in gc.callbacks:
+            gc.callbacks.remove(self._on_gc)
+        self._set_animating(False)
+
+    def _on_gc(self, phase: str, info: Dict[str, int]) -> None:
+        # 回调在回收前后各调用一次，不能在这里分配大量对象或再次触发回收
+        if phase == "start":
+            self._collect_started = time.perf_counter()
+            return
+        if self._collect_started is None:
+            return
+        started, self._collect_started = self._collect_started, None
+        elapsed = time.perf_counter() - started
+        generation = info.get("generation", 0)
+        gc_pauses.record(generation, elapsed * 1000.0, info.get("collected", 0))
+        if generation == 2:
+            self._last_full_collect = time.monotonic()
+        tracer.complete(f"gc:gen{generation}", "gc", started, elapsed, {"collected": info.get("collected", 0)})
+
+    def freeze_startup(self) -> int:
+        """回收一次后冻结当前所有对象，之后的回收不再遍历它们。"""
+        if not self.enabled:
+            return 0
+        self.collect("startup")
+        gc.freeze()
+        self.frozen_objects = gc.get_freeze_count()
+        print(f"[gc] 已冻结 {self.frozen_objects} 个启动期对象")
+        return self.frozen_objects
+
+    def transition(self, phase: str) -> None:
+        """阶段切换：先补做被推迟的回收，再按新阶段调整阈值。"""
+        if not self.enabled:
+            return
+        self.collect(f"phase:{phase}")
+        self._set_animating(phase in ANIMATION_PHASES)
+
+    def idle_gap(self, reason: str = "idle") -> None:
+        """动画挂起或两轮之间的空档，适合做完整回收。"""
+        if self.enabled:
+            self.collect(reason)
+
+    def maybe_collect(self, reason: str = "overdue") -> bool:
+        """动画阶段持续太久时，在调用方认为安全的空档补做一次完整回收。"""
+        if not self.enabled or time.monotonic() - self._last_full_collect < self.max_deferral_s:
+            return False
+        self.collect(reason)
+        return True
+
+    def collect(self, reason: str, generation: int = 2) -> int:
+        collected = gc.collect(generation)
+        self._last_full_collect = time.monotonic()
+        kind = reason.split(":", 1)[0]
+        self.forced_collections[kind] = self.forced_collections.get(kind, 0) + 1
+        return collected
+
+    def _set_animating(self, animating: bool) -> None:
+        if animating == self._animating:
+            return
+        self._animating = animating
+        gc.set_threshold(*(self.animation_thresholds if animating else self._default_thresholds))
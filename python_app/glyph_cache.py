@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Callable, Hashable, Tuple
+
+from PySide6.QtCore import QRect, QSize, Qt
+from PySide6.QtGui import QColor, QFont, QFontMetrics, QPainter, QPixmap
+
+PaintFunction = Callable[[QPainter], None]
+
+
+class GlyphPixmapCache:
+    """大号文字的位图缓存，键为 (文本, 字体, 颜色, 尺寸, 设备像素比)。
+
+    彩色 emoji 与大字号文字的光栅化代价很高，而覆盖层的动画只改变透明度与变换。
+    文字光栅化一次后，每帧只需贴图。
+    """
+
+    def __init__(self, max_entries: int = 48) -> None:
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._pixmaps: "OrderedDict[Tuple[Hashable, ...], QPixmap]" = OrderedDict()
+
+    def text(
+        self,
+        text: str,
+        font: QFont,
+        color: QColor,
+        size: QSize,
+        dpr: float,
+        alignment: Qt.AlignmentFlag = Qt.AlignmentFlag.AlignCenter,
+    ) -> QPixmap:
+        """把 ``text`` 绘制在 ``size`` 大小的透明位图中。"""
+        key = ("text", text, font.key(), QColor(color).name(QColor.NameFormat.HexArgb), int(alignment))
+
+        def _paint(painter: QPainter) -> None:
+            painter.setFont(font)
+            painter.setPen(QColor(color))
+            painter.drawText(QRect(0, 0, size.width(), size.height()), int(alignment), text)
+
+        return self.lookup(key, size, dpr, _paint)
+
+    def fitted_text(self, text: str, font: QFont, color: QColor, dpr: float) -> QPixmap:
+        """按文字自身的外接矩形生成位图。"""
+        metrics = QFontMetrics(font)
+        size = QSize(metrics.horizontalAdvance(text) + 2, metrics.height())
+        return self.text(text, font, color, size, dpr)
+
+    def lookup(self, key: Tuple[Hashable, ...], size: QSize, dpr: float, paint: PaintFunction) -> QPixmap:
+        """通用入口：``key`` 描述内容，未命中时用 ``paint`` 在逻辑坐标中绘制一次。"""
+        full_key = key + (size.width(), size.height(), round(dpr, 2))
+        pixmap = self._pixmaps.get(full_key)
+        if pixmap is not None:
+            self._pixmaps.move_to_end(full_key)
+            self.hits += 1
+            return pixmap
+        self.misses += 1
+        pixmap = self._rasterize(size, dpr, paint)
+        self._pixmaps[full_key] = pixmap
+        while len(self._pixmaps) > self.max_entries:
+            self._pixmaps.popitem(last=False)
+        return pixmap
+
+    @staticmethod
+    def _rasterize(size: QSize, dpr: float, paint: PaintFunction) -> QPixmap:
+        pixmap = QPixmap(QSize(max(1, round(size.width() * dpr)), max(1, round(size.height() * dpr))))
+        pixmap.setDevicePixelRatio(dpr)
+        pixmap.fill(Qt.GlobalColor.transparent)
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setRenderHint(QPainter.RenderHint.TextAntialiasing)
+        paint(painter)
+        painter.end()
+        return pixmap
+
+    def clear(self) -> None:
+        self._pixmaps.clear()
+
+    def __len__(self) -> int:
+        return len(self._pixmaps)
+
+
+glyph_cache = GlyphPixmapCache()
+
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Optional
+
+from PySide6.QtCore import Qt, QTimer
+from PySide6.QtWidgets import QLabel, QWidget
+
+from .metrics import gc_pauses, layer_timings, tracer
+
+if TYPE_CHECKING:  # pragma: no cover - 仅用于类型标注
+    from .board import QuoteBoard
+
+
+class PerformanceHud(QLabel):
+    """右上角的性能面板：帧率、帧时间与定时器迟到的分位数、粒子与卡片数量、当前阶段和各图层绘制耗时。
+
+    只在可见时按 ``refresh_ms`` 刷新，隐藏后不产生任何开销。
+    """
+
+    def __init__(self, board: "QuoteBoard", parent: Optional[QWidget] = None, refresh_ms: int = 500) -> None:
+        super().__init__(parent)
+        self.board = board
+        self.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents, True)
+        self.setStyleSheet(
+            "background: rgba(0, 0, 0, 0.55);"
+            "color: #ffe08a;"
+            "padding: 6px 10px;"
+            "border-radius: 6px;"
+            "font-family: Menlo, monospace;"
+            "font-size: 12px;"
+        )
+        self._timer = QTimer(self)
+        self._timer.setInterval(refresh_ms)
+        self._timer.timeout.connect(self.refresh)
+        board.power.register_timer(self._timer)
+        self.hide()
+
+    def set_active(self, visible: bool) -> None:
+        self.setVisible(visible)
+        if visible:
+            self.refresh()
+            self.raise_()
+            self._timer.start()
+        else:
+            self._timer.stop()
+
+    def refresh(self) -> None:
+        board = self.board
+        governor = board.quality
+        p50, p95, p99 = governor.frame_stats.percentiles((50, 95, 99)).values()
+        late95, late99 = governor.lateness_stats.percentiles((95, 99)).values()
+        particles = sum(len(overlay.particles) for overlay in board.fireworks_overlays)
+        rockets = sum(len(overlay.rockets) for overlay in board.fireworks_overlays)
+        cards = len(board.card_manager.cards) + len(board.book_cards)
+        paint = "  ".join(
+            f"{layer} {elapsed:.2f}" for layer, elapsed in sorted(layer_timings.paint_ms.items())
+        )
+        lines = [
+            f"{governor.fps:5.1f} fps  帧时间 p50 {p50:.1f} / p95 {p95:.1f} / p99 {p99:.1f} ms  "
+            f"定时器迟到 p95 {late95:.1f} / p99 {late99:.1f} ms",
+            f"阶段 {board.card_phase}  卡片 {cards}  粒子 {particles}  火箭 {rockets}  "
+            f"雪花 {len(board.snow_effect.flakes)}",
+            f"绘制(ms) {paint or '-'}",
+            f"GC 停顿(ms) 0代 p95 {gc_pauses.recent[0].percentile(95):.2f}  "
+            f"2代 {gc_pauses.counts[2]} 次 最长 {gc_pauses.max_ms[2]:.1f}"
+            f"{'  已推迟' if board.gc_policy.animating else ''}",
+        ]
+        if tracer.recording:
+            lines.append("● 正在录制 trace（T 停止并保存）")
+        self.setText("\n".join(lines))
+        self.adjustSize()
+        if self.parentWidget() is not None:
+            self.move(self.parentWidget().width() - self.width() - 12, 12)
@@ -0,0 +1,259 @@
+from __future__ import annotations
+
+import gc
+import json
+import random
+import sys
+import time
+import tracemalloc
+from collections import Counter, deque
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Deque, Dict, Generic, List, Optional, Sequence, Set, TypeVar
+
+from PySide6.QtCore import QAbstractAnimation, QObject, QTimer, Signal
+from PySide6.QtWidgets import QApplication
+
+from .metrics import gc_pauses
+
+if TYPE_CHECKING:  # pragma: no cover - 仅用于类型标注
+    from .board import QuoteBoard
+
+T = TypeVar("T")
+
+
+class RecyclingSampler(Generic[T]):
+    """把有限的条目变成取之不尽的来源。
+
+    每轮把全部条目洗牌后依次取出；新一轮会把上一轮最后 ``avoid_recent`` 条排到后面，
+    避免轮次交界处连续出现同一条。
+    """
+
+    def __init__(self, items: Sequence[T], rng: Optional[random.Random] = None, avoid_recent: int = 8) -> None:
+        self._items = list(items)
+        self.rng = rng or random.Random()
+        self.avoid_recent = avoid_recent
+        self.rounds = 0
+        self._order: Deque[int] = deque()
+        self._recent: Deque[int] = deque(maxlen=max(1, avoid_recent))
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def take(self, count: int) -> List[T]:
+        if not self._items:
+            return []
+        taken: List[T] = []
+        for _ in range(max(0, count)):
+            if not self._order:
+                self._refill()
+            index = self._order.popleft()
+            self._recent.append(index)
+            taken.append(self._items[index])
+        return taken
+
+    def _refill(self) -> None:
+        order = list(range(len(self._items)))
+        self.rng.shuffle(order)
+        if self.avoid_recent and len(order) > len(self._recent):
+            recent = set(self._recent)
+            order = [i for i in order if i not in recent] + [i for i in order if i in recent]
+        self._order.extend(order)
+        self.rounds += 1
+
+
+@dataclass(frozen=True)
+class ResourceLimits:
+    """常驻模式下允许的 Qt 对象数量上限。"""
+
+    max_widgets: int = 400
+    max_timers: int = 64
+    max_animations: int = 256
+
+
+def _current_rss_kib() -> int:
+    """当前常驻内存（KiB）；没有 /proc 时退回到峰值，没有 ``resource`` 模块（Windows）时为 0。"""
+    try:
+        import resource  # 仅 POSIX 提供；看板在 Windows 上也要能导入本模块
+    except ImportError:
+        return 0
+    try:
+        with open("/proc/self/statm", "r", encoding="ascii") as handle:
+            pages = int(handle.read().split()[1])
+        return pages * resource.getpagesize() // 1024
+    except (OSError, ValueError, IndexError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # macOS 上单位为字节
+        return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def count_qt_objects() -> Dict[str, int]:
+    """统计存活的控件、定时器与动画（只能统计到挂在对象树上的定时器与动画）。"""
+    app = QApplication.instance()
+    widgets = QApplication.allWidgets()
+    roots: List[QObject] = [app] if app is not None else []
+    roots.extend(QApplication.topLevelWidgets())
+    return {
+        "widgets": len(widgets),
+        "timers": sum(len(root.findChildren(QTimer)) for root in roots),
+        "animations": sum(len(root.findChildren(QAbstractAnimation)) for root in roots),
+    }
+
+
+class LeakMonitor(QObject):
+    """常驻运行时的内存与 Qt 对象采样器。
+
+    每隔 ``interval_s`` 秒记录 tracemalloc 已分配内存、常驻内存、gc 对象数与
+    控件/定时器/动画数量。预热若干次采样后取基线：内存增长同时超过
+    ``growth_kib`` 与 ``growth_ratio`` 时写出报告（含相对基线增长最多的分配位置
+    与控件类型分布），随后以当前值作为新基线；Qt 对象数超过 ``limits`` 时
+    额外让看板释放卡片与缓存。
+    """
+
+    growth_detected = Signal(str, str)  # 原因, 报告路径
+
+    def __init__(
+        self,
+        board: "QuoteBoard",
+        report_dir: Path,
+        interval_s: float = 60.0,
+        limits: Optional[ResourceLimits] = None,
+        warmup_samples: int = 5,
+        growth_kib: int = 8192,
+        growth_ratio: float = 0.2,
+        history: int = 1440,
+        parent: Optional[QObject] = None,
+    ) -> None:
+        super().__init__(parent)
+        self.board = board
+        self.report_dir = report_dir
+        self.limits = limits or ResourceLimits()
+        self.warmup_samples = warmup_samples
+        self.growth_kib = growth_kib
+        self.growth_ratio = growth_ratio
+        self.samples: Deque[Dict[str, float]] = deque(maxlen=history)
+        self.reports: Deque[Path] = deque(maxlen=32)
+        self._baseline: Optional[Dict[str, float]] = None
+        self._baseline_snapshot: Optional[tracemalloc.Snapshot] = None
+        self._over_limit: Set[str] = set()
+        self._started_at = time.monotonic()
+        self._owns_tracemalloc = False
+        self._timer = QTimer(self)
+        self._timer.setInterval(max(1, int(interval_s * 1000)))
+        self._timer.timeout.connect(self.sample)
+
+    def start(self) -> None:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(1)
+            self._owns_tracemalloc = True
+        self._started_at = time.monotonic()
+        self._timer.start()
+        print(f"[kiosk] 资源采样已开始，每 {self._timer.interval() / 1000:g} 秒一次，报告目录 {self.report_dir}")
+
+    def stop(self) -> None:
+        self._timer.stop()
+        self._baseline_snapshot = None
+        if self._owns_tracemalloc:
+            tracemalloc.stop()
+            self._owns_tracemalloc = False
+
+    def sample(self) -> Dict[str, float]:
+        traced, peak = tracemalloc.get_traced_memory() if tracemalloc.is_tracing() else (0, 0)
+        sample: Dict[str, float] = {
+            "uptime_s": round(time.monotonic() - self._started_at, 1),
+            "traced_kib": traced // 1024,
+            "traced_peak_kib": peak // 1024,
+            "rss_kib": _current_rss_kib(),
+            "gc_objects": len(gc.get_objects()),
+            "cards": len(self.board.card_manager.cards) + len(self.board.book_cards),
+            "pool_idle": self.board.card_pool.idle_count(),
+            "cycles": self.board.kiosk_cycles,
+        }
+        sample.update(count_qt_objects())
+        self.samples.append(sample)
+        self._check_limits(sample)
+        self._check_growth(sample)
+        return sample
+
+    def _check_limits(self, sample: Dict[str, float]) -> None:
+        ceilings = {
+            "widgets": self.limits.max_widgets,
+            "timers": self.limits.max_timers,
+            "animations": self.limits.max_animations,
+        }
+        for name, ceiling in ceilings.items():
+            if sample[name] <= ceiling:
+                self._over_limit.discard(name)
+                continue
+            if name in self._over_limit:
+                continue
+            # 同一项持续超限只报告一次，回落后再次超限时重新报告
+            self._over_limit.add(name)
+            print(f"警告: [kiosk] {name} 数量 {int(sample[name])} 超过上限 {ceiling}，释放卡片与缓存")
+            self.board.shed_load()
+            self._write_report(f"limit:{name}", sample)
+
+    def _check_growth(self, sample: Dict[str, float]) -> None:
+        if len(self.samples) < self.warmup_samples:
+            return
+        if self._baseline is None:
+            self._rebase(sample)
+            return
+        grown = [
+            name
+            for name in ("traced_kib", "rss_kib")
+            if sample[name] - self._baseline[name] > max(self.growth_kib, self._baseline[name] * self.growth_ratio)
+        ]
+        if grown:
+            growth = ", ".join(f"{name} +{int(sample[name] - self._baseline[name])}" for name in grown)
+            print(f"警告: [kiosk] 内存持续增长（{growth}），已写出报告")
+            self._write_report("growth:" + "+".join(grown), sample)
+            self._rebase(sample)
+
+    def _rebase(self, sample: Dict[str, float]) -> None:
+        self._baseline = dict(sample)
+        self._baseline_snapshot = tracemalloc.take_snapshot() if tracemalloc.is_tracing() else None
+
+    def _top_allocations(self, limit: int = 25) -> List[Dict[str, object]]:
+        if not tracemalloc.is_tracing():
+            return []
+        snapshot = tracemalloc.take_snapshot().filter_traces(
+            (tracemalloc.Filter(False, tracemalloc.__file__),)
+        )
+        if self._baseline_snapshot is not None:
+            stats = snapshot.compare_to(self._baseline_snapshot, "lineno")
+            return [
+                {
+                    "location": str(stat.traceback),
+                    "size_diff_kib": round(stat.size_diff / 1024, 1),
+                    "count_diff": stat.count_diff,
+                    "size_kib": round(stat.size / 1024, 1),
+                }
+                for stat in stats[:limit]
+            ]
+        return [
+            {"location": str(stat.traceback), "size_kib": round(stat.size / 1024, 1), "count": stat.count}
+            for stat in snapshot.statistics("lineno")[:limit]
+        ]
+
+    def _write_report(self, reason: str, sample: Dict[str, float]) -> Path:
+        widget_types = Counter(type(widget).__name__ for widget in QApplication.allWidgets())
+        report = {
+            "reason": reason,
+            "time": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "sample": sample,
+            "baseline": self._baseline,
+            "limits": asdict(self.limits),
+            "card_pool": self.board.card_pool.stats.as_dict(),
+            "gc_pauses": gc_pauses.as_dict(),
+            "widget_types": dict(widget_types.most_common(15)),
+            "top_allocations": self._top_allocations(),
+            "history": list(self.samples)[-60:],
+        }
+        self.report_dir.mkdir(parents=True, exist_ok=True)
+        path = self.report_dir / f"kiosk-{time.strftime('%Y%m%d-%H%M%S')}-{reason.replace(':', '_')}.json"
+        with path.open("w", encoding="utf-8") as handle:
+            json.dump(report, handle, ensure_ascii=False, indent=2)
+        self.reports.append(path)
+        self.growth_detected.emit(reason, str(path))
+        return path
@@ -0,0 +1,221 @@
+"""现场愿望：订阅 Web 服务的 SSE 推送，把观众刚提交的愿望插进正在进行的演出。
+
+网络读取与解析都在独立的订阅线程中完成，界面线程只在出卡时从
+``LiveQuoteQueue`` 非阻塞地取一条。队列有容量上限：放满后订阅线程停止读取，
+积压留在服务端（TCP 窗口写满后服务端的推送也随之阻塞），断线重连时凭
+``Last-Event-ID`` 从上次的位置继续，不丢也不重复。看板另外限制现场愿望的
+出卡间隔，突发的一大批提交只会按节奏逐条上屏。
+
+    python -m python_app.main --live-feed http://127.0.0.1:5001/wishes/stream
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+from typing import List, Optional, Tuple
+
+from PySide6.QtCore import QObject, Signal
+
+from .models import Quote
+
+DEFAULT_LIVE_COLOR = "#FFF8DC"
+
+
+class LiveQuoteQueue:
+    """线程安全的有界优先队列：订阅线程 ``put``，界面线程 ``pop``。
+
+    ``priority`` 大的先出，同优先级按到达顺序。队列已满时 ``put`` 阻塞，直到界面
+    取走一条、超时或 ``close``。在队列里等待超过 ``max_age_s`` 的愿望已经不再
+    “现场”，出队时直接丢弃。
+    """
+
+    def __init__(self, capacity: int = 32, max_age_s: Optional[float] = 300.0) -> None:
+        self.capacity = capacity
+        self.max_age_s = max_age_s
+        self.received = 0
+        self.expired = 0
+        self._heap: List[Tuple[int, int, float, Quote]] = []
+        self._order = itertools.count()
+        self._cond = threading.Condition()
+        self._closed = False
+
+    def __len__(self) -> int:
+        with self._cond:
+            return len(self._heap)
+
+    @property
+    def full(self) -> bool:
+        with self._cond:
+            return len(self._heap) >= self.capacity
+
+    def put(self, quote: Quote, priority: int = 0, timeout: Optional[float] = None) -> bool:
+        """放入一条愿望；队列关闭或等待超时返回 False。"""
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._closed or len(self._heap) < self.capacity, timeout):
+                return False
+            if self._closed:
+                return False
+            heapq.heappush(self._heap, (-priority, next(self._order), time.monotonic(), quote))
+            self.received += 1
+            return True
+
+    def pop(self) -> Optional[Quote]:
+        """取出优先级最高的一条，没有时返回 None，不阻塞。"""
+        with self._cond:
+            deadline = None if self.max_age_s is None else time.monotonic() - self.max_age_s
+            while self._heap:
+                _priority, _order, arrived, quote = heapq.heappop(self._heap)
+                self._cond.notify()
+                if deadline is not None and arrived < deadline:
+                    self.expired += 1
+                    continue
+                return quote
+            return None
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+
+def _parse_wish(data: str) -> Optional[Tuple[Quote, int]]:
+    try:
+        wish = json.loads(data)
+    except ValueError:
+        return None
+    if not isinstance(wish, dict):
+        return None
+    text = str(wish.get("text") or "").strip()
+    if not text:
+        return None
+    color = str(wish.get("color") or DEFAULT_LIVE_COLOR)
+    try:
+        priority = int(wish.get("priority") or 0)
+    except (TypeError, ValueError):
+        priority = 0
+    return Quote(text=text, color=color, category="text"), priority
+
+
+class LiveFeedSubscriber(QObject):
+    """在后台线程中读取 SSE 流，把解析好的愿望放进 ``queue``。
+
+    断线后按 1、2、4…秒退避重连（最长 ``max_backoff_s``），并带上最后收到的事件
+    编号。信号从订阅线程发出，按 Qt 的排队连接送到界面线程。
+    """
+
+    wish_received = Signal(str)
+    connection_changed = Signal(bool)
+
+    def __init__(
+        self,
+        url: str,
+        queue: LiveQuoteQueue,
+        read_timeout_s: float = 45.0,
+        max_backoff_s: float = 30.0,
+        parent: Optional[QObject] = None,
+    ) -> None:
+        super().__init__(parent)
+        self.url = url
+        self.queue = queue
+        self.read_timeout_s = read_timeout_s
+        self.max_backoff_s = max_backoff_s
+        self.last_event_id: Optional[str] = None
+        self.connected = False
+        self._stop = threading.Event()
+        self._response = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="live-feed", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout_s: float = 2.0) -> None:
+        self._stop.set()
+        self.queue.close()
+        response = self._response
+        if response is not None:
+            try:
+                response.close()
+            except OSError:
+                pass
+        if self._thread is not None:
+            self._thread.join(timeout_s)
+            self._thread = None
+
+    def _set_connected(self, connected: bool) -> None:
+        if connected != self.connected:
+            self.connected = connected
+            self.connection_changed.emit(connected)
+
+    def _run(self) -> None:
+        backoff = 1.0
+        while not self._stop.is_set():
+            headers = {"Accept": "text/event-stream", "Cache-Control": "no-cache"}
+            if self.last_event_id is not None:
+                headers["Last-Event-ID"] = self.last_event_id
+            try:
+                request = urllib.request.Request(self.url, headers=headers)
+                with urllib.request.urlopen(request, timeout=self.read_timeout_s) as response:
+                    self._response = response
+                    self._set_connected(True)
+                    print(f"[live] 已连接现场愿望推送 {self.url}")
+                    backoff = 1.0
+                    self._consume(response)
+            except (OSError, urllib.error.URLError, ValueError) as exc:
+                if not self._stop.is_set():
+                    print(f"警告: [live] 现场愿望推送连接中断（{exc}），{backoff:.0f} 秒后重连")
+            finally:
+                self._response = None
+                self._set_connected(False)
+            if self._stop.wait(backoff):
+                break
+            backoff = min(self.max_backoff_s, backoff * 2)
+
+    def _consume(self, response) -> None:
+        """逐行解析 SSE：空行结束一个事件，注释行（服务端心跳）忽略。"""
+        event = "message"
+        event_id: Optional[str] = None
+        data: List[str] = []
+        for raw in response:
+            if self._stop.is_set():
+                return
+            line = raw.decode("utf-8", errors="replace").rstrip("\r\n")
+            if not line:
+                if data:
+                    self._dispatch(event, "\n".join(data))
+                if event_id is not None:
+                    self.last_event_id = event_id
+                event, event_id, data = "message", None, []
+                continue
+            if line.startswith(":"):
+                continue
+            field, _, value = line.partition(":")
+            value = value[1:] if value.startswith(" ") else value
+            if field == "data":
+                data.append(value)
+            elif field == "event":
+                event = value
+            elif field == "id":
+                event_id = value
+
+    def _dispatch(self, event: str, data: str) -> None:
+        if event not in ("wish", "message"):
+            return
+        parsed = _parse_wish(data)
+        if parsed is None:
+            print(f"警告: [live] 忽略无法解析的愿望: {data[:80]}")
+            return
+        quote, priority = parsed
+        # 队列满时在这里等待：不再读取网络流，压力一路传回服务端
+        while not self.queue.put(quote, priority, timeout=0.5):
+            if self._stop.is_set():
+                return
+        self.wish_received.emit(quote.text)
@@ -1,15 +1,27 @@
 from __future__ import annotations
 
+import argparse
+import random
 import sys
 from pathlib import Path
+from typing import List
 
 from PySide6.QtCore import Qt, QTimer
-from PySide6.QtGui import QFontDatabase
 from PySide6.QtWidgets import QApplication, QMainWindow
 
 try:  # 支持作为脚本直接运行
     from .board import QuoteBoard
-    from .data_loader import load_quotes, load_achievements
+    from .clock import ShowClock
+    from .data_watcher import DataWatcher
+    from .gc_policy import GcPolicy
+    from .kiosk import LeakMonitor
+    from .live_feed import LiveFeedSubscriber, LiveQuoteQueue
+    from .metrics import startup_metrics
+    from .power import WindowPowerWatcher
+    from .render import config_from_args, parse_size, render_show
+    from .startup import StartupLoader
+    from .sync import SYNC_PORT, CanvasTile, SyncFollower, SyncMaster, parse_address
+    from .timeline import SHOW_PHASES
 except ImportError:  # pragma: no cover - 仅在脚本模式下使用
     if __package__ in (None, ""):
         package_dir = Path(__file__).resolve().parent
@@ -17,7 +29,17 @@ except ImportError:  # pragma: no cover - 仅在脚本模式下使用
         if str(project_root) not in sys.path:
             sys.path.append(str(project_root))
         from python_app.board import QuoteBoard  # type: ignore[no-redef]
-        from python_app.data_loader import load_quotes, load_achievements  # type: ignore[no-redef]
+        from python_app.clock import ShowClock  # type: ignore[no-redef]
+        from python_app.data_watcher import DataWatcher  # type: ignore[no-redef]
+        from python_app.gc_policy import GcPolicy  # type: ignore[no-redef]
+        from python_app.kiosk import LeakMonitor  # type: ignore[no-redef]
+        from python_app.live_feed import LiveFeedSubscriber, LiveQuoteQueue  # type: ignore[no-redef]
+        from python_app.metrics import startup_metrics  # type: ignore[no-redef]
+        from python_app.power import WindowPowerWatcher  # type: ignore[no-redef]
+        from python_app.render import config_from_args, parse_size, render_show  # type: ignore[no-redef]
+        from python_app.startup import StartupLoader  # type: ignore[no-redef]
+        from python_app.sync import SYNC_PORT, CanvasTile, SyncFollower, SyncMaster, parse_address  # type: ignore[no-redef]
+        from python_app.timeline import SHOW_PHASES  # type: ignore[no-redef]
     else:
         raise
 
@@ -31,6 +53,8 @@ class MainWindow(QMainWindow):
         self.setWindowTitle("温馨金句 - Python 版")
         self.setStyleSheet("background-color: #f7f5f3;")
         self.setCursor(Qt.CursorShape.ArrowCursor)
+        # 最小化、隐藏或被完全遮挡时挂起看板的所有动画
+        self.power_watcher = WindowPowerWatcher(self, board.power)
 
     def showEvent(self, event) -> None:  # type: ignore[override]
         super().showEvent(event)
@@ -50,29 +74,288 @@ class MainWindow(QMainWindow):
             self.board.favorite_current()
         elif key == Qt.Key.Key_D:
             self.board.toggle_distraction_free()
+        elif key == Qt.Key.Key_Q:
+            self.board.toggle_quality_overlay()
+        elif key == Qt.Key.Key_H:
+            self.board.toggle_hud()
+        elif key == Qt.Key.Key_T:
+            self.board.toggle_trace()
+        elif key == Qt.Key.Key_BracketRight:
+            self.board.set_speed(self.board.show_clock.speed * 2)
+        elif key == Qt.Key.Key_BracketLeft:
+            self.board.set_speed(self.board.show_clock.speed / 2)
         else:
             super().keyPressEvent(event)
 
 
+def _parse_args(argv: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="温馨金句桌面展示")
+    parser.add_argument(
+        "--target-fps",
+        type=float,
+        default=50.0,
+        help="画质调节器尝试保持的帧率（默认 50）",
+    )
+    parser.add_argument(
+        "--threaded-effects",
+        action="store_true",
+        help="在独立线程中模拟并绘制雪花和烟花",
+    )
+    parser.add_argument(
+        "--composite-cards",
+        action="store_true",
+        help="将散落的卡片缓存为位图并在同一图层合成绘制",
+    )
+    parser.add_argument(
+        "--card-pool-size",
+        type=int,
+        default=24,
+        help="每种卡片模式最多保留的空闲卡片数（默认 24）",
+    )
+    parser.add_argument(
+        "--trace-dir",
+        type=Path,
+        default=Path("traces"),
+        help="按 T 录制的 trace 文件保存目录（默认 ./traces）",
+    )
+    parser.add_argument(
+        "--speed",
+        type=float,
+        default=1.0,
+        help="演出播放倍速（0.25~100，默认 1；运行中可按 [ / ] 减半或加倍）",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=None,
+        help="随机种子：出卡间隔、卡片位置与烟花都由它决定，相同种子得到相同的演出",
+    )
+    parser.add_argument(
+        "--deterministic",
+        action="store_true",
+        help="虚拟时钟按固定步长推进，不受机器快慢影响（逐帧复现时使用）",
+    )
+    parser.add_argument(
+        "--seek",
+        choices=SHOW_PHASES,
+        default=None,
+        help="开场后直接跳到指定阶段",
+    )
+    parser.add_argument(
+        "--no-stream-data",
+        action="store_true",
+        help="编译语料需要重建时也等全部金句读完再开场（默认读到第一批即开场，其余边演边补）",
+    )
+    parser.add_argument(
+        "--watch-data",
+        action="store_true",
+        help="监视 data 目录，演出中修改金句或祝福语文件后自动增量载入，不必重启",
+    )
+    parser.add_argument(
+        "--kiosk",
+        action="store_true",
+        help="常驻展示模式：循环播放金句，并定期采样内存与 Qt 对象数量",
+    )
+    parser.add_argument(
+        "--kiosk-round-size",
+        type=int,
+        default=None,
+        help="常驻模式下每类金句每轮最多展示的条数（默认全部）",
+    )
+    parser.add_argument(
+        "--kiosk-sample-s",
+        type=float,
+        default=60.0,
+        help="常驻模式的资源采样间隔（秒，默认 60）",
+    )
+    parser.add_argument(
+        "--kiosk-report-dir",
+        type=Path,
+        default=Path("kiosk_reports"),
+        help="检测到内存增长或对象数超限时写出报告的目录（默认 ./kiosk_reports）",
+    )
+    parser.add_argument(
+        "--no-gc-policy",
+        action="store_true",
+        help="不调整垃圾回收（默认在动画阶段推迟第 2 代回收，并在启动后冻结长期对象）；停顿仍会记录",
+    )
+    parser.add_argument(
+        "--render",
+        type=Path,
+        default=None,
+        metavar="OUTPUT",
+        help="不打开窗口，把整场演出离线渲染为视频文件（需要 ffmpeg）",
+    )
+    parser.add_argument("--render-fps", type=float, default=30.0, help="离线渲染的帧率（默认 30）")
+    parser.add_argument(
+        "--render-size",
+        type=parse_size,
+        default=(1920, 1080),
+        help="离线渲染的画面尺寸，如 1920x1080",
+    )
+    parser.add_argument(
+        "--render-workers",
+        type=int,
+        default=None,
+        help="离线渲染的并行进程数（默认 CPU 核数）",
+    )
+    parser.add_argument(
+        "--render-duration-s",
+        type=float,
+        default=None,
+        help="只渲染开头若干秒（默认渲染到演出结束）",
+    )
+    parser.add_argument("--ffmpeg", default="ffmpeg", help="ffmpeg 可执行文件（默认在 PATH 中查找）")
+    sync = parser.add_mutually_exclusive_group()
+    sync.add_argument(
+        "--sync-master",
+        action="store_true",
+        help="多屏同步：本实例作为时钟主，向从屏广播演出时间、种子与阶段",
+    )
+    sync.add_argument(
+        "--sync-follow",
+        type=parse_address,
+        default=None,
+        metavar="HOST[:PORT]",
+        help="多屏同步：跟随指定主屏的演出时钟（种子由主屏决定）",
+    )
+    parser.add_argument(
+        "--sync-port",
+        type=int,
+        default=SYNC_PORT,
+        help=f"主屏监听的 UDP 端口（默认 {SYNC_PORT}）",
+    )
+    parser.add_argument(
+        "--sync-tile",
+        type=CanvasTile.parse,
+        default=None,
+        metavar="WxH+X+Y",
+        help="本屏在共享画布中的位置，如 3840x1080+1920+0；卡片与烟花按整块画布摆放",
+    )
+    parser.add_argument(
+        "--live-feed",
+        default=None,
+        metavar="URL",
+        help="订阅 Web 服务的现场愿望推送（如 http://127.0.0.1:5001/wishes/stream），插入 text/other 阶段",
+    )
+    parser.add_argument(
+        "--live-gap-ms",
+        type=int,
+        default=4000,
+        help="两条现场愿望之间的最小演出时间间隔（默认 4000 毫秒）",
+    )
+    parser.add_argument(
+        "--live-capacity",
+        type=int,
+        default=32,
+        help="本地最多缓存的现场愿望条数，满了之后暂停读取推送（默认 32）",
+    )
+    # 其余参数（如 -platform）留给 Qt 处理
+    args, _unknown = parser.parse_known_args(argv[1:])
+    return args
+
+
 def main() -> int:
+    startup_metrics.begin()
+    args = _parse_args(sys.argv)
+    if args.render is not None:
+        return render_show(config_from_args(args))
     app = QApplication(sys.argv)
     app.setApplicationName("温馨金句")
 
-    # 尝试载入项目自带字体（若存在）
-    fonts_dir = Path(__file__).resolve().parent.parent / "assets" / "fonts"
-    if fonts_dir.exists():
-        for font_path in fonts_dir.glob("*.ttf"):
-            QFontDatabase.addApplicationFont(str(font_path))
-
-    data_dir = Path(__file__).resolve().parent.parent / "data"
-    quotes = load_quotes(data_dir)
-    if not quotes:
-        raise RuntimeError("未在 data 目录中找到金句数据")
-    compliments = load_achievements(data_dir)
-    board = QuoteBoard(quotes, compliments)
+    seed = args.seed
+    speed = args.speed
+    follower = None
+    if args.sync_follow is not None:
+        # 从屏的种子与倍速由主屏决定，必须在创建看板之前拿到
+        follower = SyncFollower(*args.sync_follow, parent=app)
+        welcome = follower.wait_for_master()
+        if welcome is None:
+            print(f"错误: 主屏 {args.sync_follow[0]}:{args.sync_follow[1]} 没有响应")
+            return 1
+        seed = int(welcome["seed"])
+        speed = float(welcome.get("speed") or 1.0)
+    elif args.sync_master and seed is None:
+        seed = random.randrange(2**31)
+    if seed is not None:
+        # 雪花粒子使用全局随机数，一并固定
+        random.seed(seed)
+    show_clock = ShowClock(app, speed=max(0.25, min(100.0, speed)), stepped=args.deterministic)
+    gc_policy = GcPolicy(enabled=not args.no_gc_policy)
+    gc_policy.install()
 
+    # 先显示窗口与启动画面，金句数据稍后由后台加载填入
+    board = QuoteBoard(
+        [],
+        target_fps=args.target_fps,
+        threaded_effects=args.threaded_effects,
+        composite_cards=args.composite_cards,
+        card_pool_size=args.card_pool_size,
+        show_clock=show_clock,
+        seed=seed,
+        gc_policy=gc_policy,
+    )
+    board.trace_dir = args.trace_dir
+    if args.sync_tile is not None:
+        board.set_canvas(args.sync_tile.canvas_rect())
+    if args.sync_master:
+        try:
+            board.sync_master = SyncMaster(board, seed, port=args.sync_port, parent=app)
+        except OSError as error:
+            print(f"错误: {error}")
+            return 1
+    if follower is not None:
+        follower.attach(board)
+        app.aboutToQuit.connect(follower.close)
+    if args.seek:
+        board.seek(args.seek)
+    if args.kiosk:
+        board.kiosk_mode = True
+        board.kiosk_round_size = args.kiosk_round_size
+        monitor = LeakMonitor(board, args.kiosk_report_dir, interval_s=args.kiosk_sample_s, parent=app)
+        monitor.start()
+    if args.live_feed:
+        if args.sync_master or follower is not None:
+            print("警告: 现场愿望只在本屏插入，多屏同步时各屏的出卡会不一致")
+        live_queue = LiveQuoteQueue(capacity=max(1, args.live_capacity))
+        board.attach_live_feed(live_queue, min_gap_ms=args.live_gap_ms)
+        subscriber = LiveFeedSubscriber(args.live_feed, live_queue, parent=app)
+        subscriber.wish_received.connect(lambda text: print(f"[live] 收到现场愿望: {text}"))
+        subscriber.start()
+        app.aboutToQuit.connect(subscriber.stop)
     window = MainWindow(board)
     window.showFullScreen()
+    startup_metrics.mark("window_shown")
+
+    # 项目自带字体（若存在）、金句数据、折行预排版与字形预热都在启动画面期间完成
+    project_root = Path(__file__).resolve().parent.parent
+    # 多屏同步与跳转需要开场时就确定完整的时间线，不边读边演
+    streaming = not (args.no_stream_data or args.seek or args.sync_master or follower is not None)
+    loader = StartupLoader(
+        project_root / "data", project_root / "assets" / "fonts", app, streaming=streaming, seed=seed
+    )
+    loader.data_loaded.connect(board.set_quotes)
+    loader.quotes_appended.connect(board.append_quotes)
+    loader.category_loaded.connect(board.finish_category)
+    loader.data_finished.connect(board.finish_loading)
+    app.aboutToQuit.connect(loader.cancel)
+    if args.watch_data:
+        if args.sync_master or follower is not None:
+            print("警告: 热重载只更新本屏，多屏同步时各屏的出卡会不一致")
+        watcher = DataWatcher(project_root / "data", board, parent=app)
+        loader.data_finished.connect(watcher.start)
+        app.aboutToQuit.connect(watcher.stop)
+    loader.add_warm_up(board.warm_up_glyphs)
+    if board.background_cache.is_loading():
+        loader.wait_for("backgrounds")
+        board.background_cache.all_settled.connect(lambda: loader.complete("backgrounds"))
+    if follower is not None:
+        # 从屏等主屏开场后再开场，此后的误差由同步校正
+        loader.ready.connect(lambda: follower.when_master_started(board.mark_ready))
+    else:
+        loader.ready.connect(board.mark_ready)
+    loader.failed.connect(lambda _message: app.exit(1))
+    loader.start()
     return app.exec()
 
 
@@ -0,0 +1,244 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Deque, Dict, Iterable, Iterator, List, Optional
+
+
+class StartupMetrics:
+    """记录启动各阶段相对进程启动的耗时（毫秒），同名标记只记录第一次。"""
+
+    def __init__(self) -> None:
+        self.origin = time.perf_counter()
+        self.marks: Dict[str, float] = {}
+
+    def begin(self, origin: Optional[float] = None) -> None:
+        self.origin = origin if origin is not None else time.perf_counter()
+        self.marks.clear()
+
+    def mark(self, name: str) -> float:
+        elapsed = self.marks.get(name)
+        if elapsed is None:
+            elapsed = (time.perf_counter() - self.origin) * 1000
+            self.marks[name] = elapsed
+            print(f"[startup] {name}: {elapsed:.1f} ms")
+        return elapsed
+
+    def elapsed_ms(self, name: str) -> Optional[float]:
+        return self.marks.get(name)
+
+    @property
+    def time_to_first_pixel_ms(self) -> Optional[float]:
+        return self.marks.get("first_pixel")
+
+    def as_dict(self) -> Dict[str, float]:
+        return {name: round(value, 1) for name, value in self.marks.items()}
+
+
+startup_metrics = StartupMetrics()
+
+
+class FrameStats:
+    """最近若干帧的帧时间（毫秒），用于计算帧率与分位数。"""
+
+    def __init__(self, max_samples: int = 240) -> None:
+        self._samples: Deque[float] = deque(maxlen=max_samples)
+
+    def record(self, frame_ms: float) -> None:
+        self._samples.append(frame_ms)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def percentile(self, percent: float) -> float:
+        return self.percentiles((percent,))[percent]
+
+    def percentiles(self, points: Iterable[float] = (50, 95, 99)) -> Dict[float, float]:
+        ordered = sorted(self._samples)
+        if not ordered:
+            return {point: 0.0 for point in points}
+        last = len(ordered) - 1
+        return {point: ordered[min(last, max(0, round(point / 100.0 * last)))] for point in points}
+
+    def clear(self) -> None:
+        self._samples.clear()
+
+
+class GcPauseStats:
+    """循环垃圾回收各代的停顿（毫秒），由 gc.callbacks 写入。"""
+
+    def __init__(self, max_samples: int = 240) -> None:
+        self.recent: Dict[int, FrameStats] = {generation: FrameStats(max_samples) for generation in range(3)}
+        self.counts = [0, 0, 0]
+        self.total_ms = [0.0, 0.0, 0.0]
+        self.max_ms = [0.0, 0.0, 0.0]
+        self.collected = [0, 0, 0]
+        self.last_ms = 0.0
+        self.last_generation = -1
+
+    def record(self, generation: int, pause_ms: float, collected: int) -> None:
+        generation = min(2, max(0, generation))
+        self.recent[generation].record(pause_ms)
+        self.counts[generation] += 1
+        self.total_ms[generation] += pause_ms
+        self.max_ms[generation] = max(self.max_ms[generation], pause_ms)
+        self.collected[generation] += collected
+        self.last_ms = pause_ms
+        self.last_generation = generation
+
+    def clear(self) -> None:
+        for stats in self.recent.values():
+            stats.clear()
+        self.counts = [0, 0, 0]
+        self.total_ms = [0.0, 0.0, 0.0]
+        self.max_ms = [0.0, 0.0, 0.0]
+        self.collected = [0, 0, 0]
+        self.last_ms = 0.0
+        self.last_generation = -1
+
+    def as_dict(self) -> Dict[str, Dict[str, float]]:
+        return {
+            f"gen{generation}": {
+                "count": self.counts[generation],
+                "total_ms": round(self.total_ms[generation], 3),
+                "max_ms": round(self.max_ms[generation], 3),
+                "p95_ms": round(self.recent[generation].percentile(95), 3),
+                "collected": self.collected[generation],
+            }
+            for generation in range(3)
+        }
+
+
+class TraceRecorder:
+    """录制 Chrome Trace / Perfetto 格式的事件（时间单位为微秒）。
+
+    未在录制时各接口直接返回，调用方可以无条件埋点。
+    """
+
+    def __init__(self, max_events: int = 500000) -> None:
+        self.max_events = max_events
+        self.recording = False
+        self.dropped = 0
+        self._events: List[Dict[str, object]] = []
+        self._origin = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        with self._lock:
+            self._events = []
+            self.dropped = 0
+            self._origin = time.perf_counter()
+            self.recording = True
+        self.instant("trace_start", "meta")
+
+    def stop(self, path: Path) -> int:
+        """停止录制并写入 JSON 文件，返回事件数量。"""
+        with self._lock:
+            self.recording = False
+            events = self._events
+            self._events = []
+        pid = os.getpid()
+        metadata = [
+            {"name": "process_name", "ph": "M", "pid": pid, "args": {"name": "温馨金句"}},
+        ]
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("w", encoding="utf-8") as handle:
+            json.dump({"traceEvents": metadata + events, "displayTimeUnit": "ms"}, handle, ensure_ascii=False)
+        return len(events)
+
+    def _append(self, event: Dict[str, object]) -> None:
+        event["pid"] = os.getpid()
+        event["tid"] = threading.get_ident()
+        with self._lock:
+            if not self.recording:
+                return
+            if len(self._events) >= self.max_events:
+                self.dropped += 1
+                return
+            self._events.append(event)
+
+    def _us(self, timestamp: float) -> float:
+        return round((timestamp - self._origin) * 1_000_000, 1)
+
+    def complete(
+        self,
+        name: str,
+        category: str,
+        start: float,
+        duration_s: float,
+        args: Optional[Dict[str, object]] = None,
+    ) -> None:
+        if not self.recording:
+            return
+        event: Dict[str, object] = {
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": self._us(start),
+            "dur": round(duration_s * 1_000_000, 1),
+        }
+        if args:
+            event["args"] = args
+        self._append(event)
+
+    def instant(self, name: str, category: str, args: Optional[Dict[str, object]] = None) -> None:
+        if not self.recording:
+            return
+        event: Dict[str, object] = {
+            "name": name,
+            "cat": category,
+            "ph": "i",
+            "s": "p",
+            "ts": self._us(time.perf_counter()),
+        }
+        if args:
+            event["args"] = args
+        self._append(event)
+
+    def counter(self, name: str, values: Dict[str, float]) -> None:
+        if not self.recording:
+            return
+        self._append({"name": name, "ph": "C", "ts": self._us(time.perf_counter()), "args": values})
+
+    @contextmanager
+    def span(self, name: str, category: str) -> Iterator[None]:
+        if not self.recording:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.complete(name, category, start, time.perf_counter() - start)
+
+
+class LayerTimings:
+    """各图层 paintEvent 的耗时（指数平滑，毫秒），录制时同时写入 trace。"""
+
+    def __init__(self, smoothing: float = 0.1) -> None:
+        self.smoothing = smoothing
+        self.paint_ms: Dict[str, float] = {}
+
+    @contextmanager
+    def paint(self, layer: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            previous = self.paint_ms.get(layer)
+            elapsed_ms = elapsed * 1000.0
+            self.paint_ms[layer] = (
+                elapsed_ms if previous is None else previous + (elapsed_ms - previous) * self.smoothing
+            )
+            tracer.complete(f"paint:{layer}", "paint", start, elapsed)
+
+
+tracer = TraceRecorder()
+layer_timings = LayerTimings()
+gc_pauses = GcPauseStats()
@@ -3,14 +3,15 @@ from __future__ import annotations
 from dataclasses import dataclass
 
 
-@dataclass(frozen=True)
+# slots：百万条金句时每个对象省掉一个 __dict__；看板只为正在展示的金句创建对象
+@dataclass(frozen=True, slots=True)
 class Quote:
     text: str
     color: str
     category: str
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Achievement:
     text: str
     color: str
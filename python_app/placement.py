@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import math
+import random
+from typing import Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+from PySide6.QtCore import QRect, QSize
+from PySide6.QtGui import QRegion
+
+
+class GridIndex:
+    """均匀网格空间索引：每个矩形登记到它覆盖的所有格子中。"""
+
+    def __init__(self, cell_size: int = 160) -> None:
+        self.cell_size = max(16, cell_size)
+        self._cells: Dict[Tuple[int, int], Set[Hashable]] = {}
+        self._rects: Dict[Hashable, QRect] = {}
+
+    def __len__(self) -> int:
+        return len(self._rects)
+
+    def _cells_for(self, rect: QRect) -> Iterable[Tuple[int, int]]:
+        size = self.cell_size
+        for cx in range(rect.left() // size, rect.right() // size + 1):
+            for cy in range(rect.top() // size, rect.bottom() // size + 1):
+                yield cx, cy
+
+    def insert(self, key: Hashable, rect: QRect) -> None:
+        if key in self._rects:
+            self.remove(key)
+        self._rects[key] = QRect(rect)
+        for cell in self._cells_for(rect):
+            self._cells.setdefault(cell, set()).add(key)
+
+    def remove(self, key: Hashable) -> None:
+        rect = self._rects.pop(key, None)
+        if rect is None:
+            return
+        for cell in self._cells_for(rect):
+            bucket = self._cells.get(cell)
+            if bucket is None:
+                continue
+            bucket.discard(key)
+            if not bucket:
+                del self._cells[cell]
+
+    def rect(self, key: Hashable) -> Optional[QRect]:
+        return self._rects.get(key)
+
+    def query(self, rect: QRect) -> Set[Hashable]:
+        """返回与 ``rect`` 相交的全部键。"""
+        found: Set[Hashable] = set()
+        for cell in self._cells_for(rect):
+            found.update(self._cells.get(cell, ()))
+        return {key for key in found if self._rects[key].intersects(rect)}
+
+    def clear(self) -> None:
+        self._cells.clear()
+        self._rects.clear()
+
+
+class PlacementEngine:
+    """在已有卡片之间挑选重叠最少的位置。
+
+    每次随机采样 ``candidates`` 个位置（best-of-k），优先选择与现有卡片重叠面积最小的；
+    重叠相同时选离最近卡片中心最远的，使分布接近蓝噪声，保留随手散落的观感，
+    同时限制每个像素上叠加的半透明卡片层数。
+    """
+
+    def __init__(self, candidates: int = 12, cell_size: int = 160, rng=random) -> None:
+        self.candidates = max(1, candidates)
+        self.rng = rng
+        self.index = GridIndex(cell_size)
+
+    def place(self, size: QSize, viewport: QSize, margin: int) -> QRect:
+        width = size.width()
+        height = size.height()
+        available_width = max(0, viewport.width() - width - margin * 2)
+        available_height = max(0, viewport.height() - height - margin * 2)
+
+        best: Optional[QRect] = None
+        best_score: Tuple[int, float] = (0, 0.0)
+        for _ in range(self.candidates):
+            x = margin + (self.rng.randint(0, available_width) if available_width > 0 else 0)
+            y = margin + (self.rng.randint(0, available_height) if available_height > 0 else 0)
+            candidate = QRect(x, y, width, height)
+            score = (self._overlap_area(candidate), -self._nearest_distance(candidate))
+            if best is None or score < best_score:
+                best = candidate
+                best_score = score
+                if score[0] == 0 and not len(self.index):
+                    break
+        assert best is not None
+        return best
+
+    def insert(self, key: Hashable, rect: QRect) -> None:
+        self.index.insert(key, rect)
+
+    def remove(self, key: Hashable) -> None:
+        self.index.remove(key)
+
+    def clear(self) -> None:
+        self.index.clear()
+
+    def covered_by(self, key: Hashable, newer: Iterable[Hashable]) -> bool:
+        """``key`` 对应的卡片是否已被 ``newer`` 中的卡片完全遮住。"""
+        rect = self.index.rect(key)
+        if rect is None:
+            return False
+        region = QRegion(rect)
+        for other in newer:
+            other_rect = self.index.rect(other)
+            if other_rect is None or not other_rect.intersects(rect):
+                continue
+            region = region.subtracted(QRegion(other_rect))
+            if region.isEmpty():
+                return True
+        return False
+
+    def _overlap_area(self, rect: QRect) -> int:
+        total = 0
+        for key in self.index.query(rect):
+            other = self.index.rect(key)
+            if other is None:
+                continue
+            overlap = rect.intersected(other)
+            total += overlap.width() * overlap.height()
+        return total
+
+    def _nearest_distance(self, rect: QRect) -> float:
+        center = rect.center()
+        # 只在邻近格子中寻找，找不到时视为足够远
+        search = rect.adjusted(-rect.width(), -rect.height(), rect.width(), rect.height())
+        nearest = math.inf
+        for key in self.index.query(search):
+            other = self.index.rect(key)
+            if other is None:
+                continue
+            other_center = other.center()
+            distance = math.hypot(center.x() - other_center.x(), center.y() - other_center.y())
+            nearest = min(nearest, distance)
+        return nearest if nearest != math.inf else float(search.width() + search.height())
+
+    def keys_intersecting(self, rect: QRect) -> List[Hashable]:
+        return list(self.index.query(rect))
@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import weakref
+from typing import Callable, Dict, FrozenSet, List, Optional, Set, Tuple
+
+from PySide6.QtCore import QAbstractAnimation, QEvent, QObject, Qt, QTimer, Signal
+from PySide6.QtGui import QGuiApplication
+from PySide6.QtWidgets import QWidget
+
+# 挂起原因：窗口隐藏/最小化、被完全遮挡、演出进入 idle、用户暂停、多屏同步时主屏暂停
+POWER_REASONS = ("hidden", "occluded", "idle", "paused", "sync_paused")
+
+
+class PowerManager(QObject):
+    """定时器与动画的统一登记处。
+
+    只要存在任一挂起原因，就停止所有已登记且正在运行的定时器、暂停正在播放的
+    动画，并按登记顺序调用挂起钩子（如冻结演出时钟）；所有原因解除后按相反顺序
+    恢复，只重启挂起时确实在运行的对象。登记使用弱引用，控件销毁后自动失效；
+    遍历保持登记顺序，离线渲染逐帧驱动它们时结果与进程无关。
+    """
+
+    suspended_changed = Signal(bool)
+
+    def __init__(self, parent: Optional[QObject] = None) -> None:
+        super().__init__(parent)
+        self._timers: "weakref.WeakKeyDictionary[QTimer, None]" = weakref.WeakKeyDictionary()
+        self._animations: "weakref.WeakKeyDictionary[QAbstractAnimation, None]" = weakref.WeakKeyDictionary()
+        self._hooks: List[Tuple[Callable[[], None], Callable[[], None]]] = []
+        self._reasons: Set[str] = set()
+        self._pending: Dict[str, int] = {}  # 延迟生效的原因 -> 版本号
+        self._generation = 0
+        self._suspended = False
+        self._stopped_timers: List[QTimer] = []
+        self._paused_animations: List[QAbstractAnimation] = []
+
+    @property
+    def suspended(self) -> bool:
+        return self._suspended
+
+    @property
+    def reasons(self) -> FrozenSet[str]:
+        return frozenset(self._reasons)
+
+    def timers(self) -> List[QTimer]:
+        """已登记且仍存活的定时器（按登记顺序）。"""
+        return list(self._timers)
+
+    def animations(self) -> List[QAbstractAnimation]:
+        return list(self._animations)
+
+    def register_timer(self, timer: QTimer) -> None:
+        self._timers[timer] = None
+        if self._suspended and timer.isActive():
+            timer.stop()
+            self._stopped_timers.append(timer)
+
+    def register_animation(self, animation: QAbstractAnimation) -> None:
+        self._animations[animation] = None
+
+    def register_hooks(self, suspend: Callable[[], None], resume: Callable[[], None]) -> None:
+        self._hooks.append((suspend, resume))
+        if self._suspended:
+            suspend()
+
+    def set_reason(self, reason: str, active: bool, delay_ms: int = 0) -> None:
+        """设置或解除一个挂起原因；``delay_ms`` 让原因在持续一段时间后才生效。"""
+        if reason not in POWER_REASONS:
+            raise ValueError(f"未知的挂起原因 {reason}")
+        self._pending.pop(reason, None)
+        if active and delay_ms > 0 and reason not in self._reasons:
+            self._generation += 1
+            generation = self._generation
+            self._pending[reason] = generation
+            QTimer.singleShot(delay_ms, lambda: self._activate_pending(reason, generation))
+            return
+        if active:
+            self._reasons.add(reason)
+        else:
+            self._reasons.discard(reason)
+        self._apply()
+
+    def _activate_pending(self, reason: str, generation: int) -> None:
+        if self._pending.get(reason) != generation:
+            return
+        del self._pending[reason]
+        self._reasons.add(reason)
+        self._apply()
+
+    def _apply(self) -> None:
+        should_suspend = bool(self._reasons)
+        if should_suspend == self._suspended:
+            return
+        self._suspended = should_suspend
+        if should_suspend:
+            self._suspend()
+            print(f"[power] 挂起动画与定时器（{', '.join(sorted(self._reasons))}）")
+        else:
+            self._resume()
+            print("[power] 恢复动画与定时器")
+        self.suspended_changed.emit(should_suspend)
+
+    def _suspend(self) -> None:
+        for suspend, _resume in self._hooks:
+            suspend()
+        self._stopped_timers = []
+        for timer in list(self._timers):
+            try:
+                if timer.isActive():
+                    timer.stop()
+                    self._stopped_timers.append(timer)
+            except RuntimeError:  # C++ 对象已销毁
+                self._timers.pop(timer, None)
+        self._paused_animations = []
+        for animation in list(self._animations):
+            try:
+                if animation.state() == QAbstractAnimation.State.Running:
+                    animation.pause()
+                    self._paused_animations.append(animation)
+            except RuntimeError:
+                self._animations.pop(animation, None)
+
+    def _resume(self) -> None:
+        for animation in self._paused_animations:
+            try:
+                if animation.state() == QAbstractAnimation.State.Paused:
+                    animation.resume()
+            except RuntimeError:
+                pass
+        for timer in self._stopped_timers:
+            try:
+                if not timer.isActive():
+                    timer.start()
+            except RuntimeError:
+                pass
+        self._paused_animations = []
+        self._stopped_timers = []
+        for _suspend, resume in reversed(self._hooks):
+            resume()
+
+
+class WindowPowerWatcher(QObject):
+    """监视顶层窗口：最小化、隐藏或应用被系统挂起时设置 hidden，
+    窗口不再可见（被其他窗口完全遮挡、锁屏等，平台会发送 isExposed 为假的
+    Expose 事件）时设置 occluded。
+    """
+
+    def __init__(self, window: QWidget, power: PowerManager) -> None:
+        super().__init__(window)
+        self.window = window
+        self.power = power
+        self._handle = None
+        window.installEventFilter(self)
+        app = QGuiApplication.instance()
+        if app is not None:
+            app.applicationStateChanged.connect(self._on_application_state)
+        self._watch_handle()
+
+    def _watch_handle(self) -> None:
+        handle = self.window.windowHandle()
+        if handle is None or handle is self._handle:
+            return
+        self._handle = handle
+        handle.installEventFilter(self)
+
+    def eventFilter(self, watched: QObject, event: QEvent) -> bool:  # type: ignore[override]
+        kind = event.type()
+        if watched is self.window:
+            if kind in (QEvent.Type.Show, QEvent.Type.Hide, QEvent.Type.WindowStateChange):
+                self._watch_handle()
+                self._update_hidden()
+        elif kind == QEvent.Type.Expose and self._handle is not None:
+            self.power.set_reason("occluded", not self._handle.isExposed())
+        return False
+
+    def _update_hidden(self) -> None:
+        hidden = not self.window.isVisible() or self.window.isMinimized()
+        self.power.set_reason("hidden", hidden)
+
+    def _on_application_state(self, state: Qt.ApplicationState) -> None:
+        if state in (Qt.ApplicationState.ApplicationHidden, Qt.ApplicationState.ApplicationSuspended):
+            self.power.set_reason("hidden", True)
+        else:
+            self._update_hidden()
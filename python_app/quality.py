@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Optional, Sequence, Tuple
+
+from PySide6.QtCore import QObject, Qt, Signal
+from PySide6.QtWidgets import QLabel, QWidget
+
+from .metrics import FrameStats
+
+
+@dataclass(frozen=True)
+class QualityLevel:
+    name: str
+    particle_scale: float  # 烟花粒子数量倍率
+    particle_trail: int  # 粒子拖尾长度
+    rocket_trail: int  # 火箭拖尾长度
+    snow_density: float  # 雪花数量倍率
+    antialiasing: bool
+    max_bursts: int  # 同时绽放的烟花层数
+    frame_interval_ms: int  # 烟花渲染间隔，物理模拟步长不受影响
+
+
+QUALITY_LEVELS: Tuple[QualityLevel, ...] = (
+    QualityLevel("high", 1.0, 8, 10, 1.0, True, 18, 16),
+    QualityLevel("medium", 0.7, 6, 8, 0.75, True, 12, 16),
+    QualityLevel("low", 0.45, 4, 5, 0.5, False, 8, 33),
+    QualityLevel("minimal", 0.25, 2, 3, 0.3, False, 4, 33),
+)
+
+
+class QualityGovernor(QObject):
+    """根据真实帧时间升降画质，使特效保持在目标帧率附近。
+
+    各特效的定时器每帧调用 :meth:`record_frame` 上报实际间隔。定时器本身的期望间隔
+    会被归一化到目标帧预算，只保留超出的延迟，因此 40ms 的雪花和 16ms 的烟花可以
+    共用同一个统计窗口。降级与升级使用不同阈值和连续窗口数，并带冷却时间，避免来回抖动。
+
+    看板每次重绘时调用 :meth:`record_present`，记录真实的两帧之间的间隔，供 HUD 显示
+    帧时间分位数；定时器的迟到另记在 ``lateness_stats`` 中。
+    """
+
+    level_changed = Signal(object)
+    stats_updated = Signal(float)
+
+    def __init__(
+        self,
+        target_fps: float = 50.0,
+        parent: Optional[QObject] = None,
+        levels: Sequence[QualityLevel] = QUALITY_LEVELS,
+        window_s: float = 1.0,
+        downgrade_ratio: float = 0.9,
+        upgrade_ratio: float = 0.98,
+        downgrade_after: int = 2,
+        upgrade_after: int = 4,
+        cooldown_s: float = 3.0,
+    ) -> None:
+        super().__init__(parent)
+        if not levels:
+            raise ValueError("至少需要一个画质等级")
+        self.levels: Tuple[QualityLevel, ...] = tuple(levels)
+        self.target_fps = max(1.0, float(target_fps))
+        self.window_s = window_s
+        self.downgrade_ratio = downgrade_ratio
+        self.upgrade_ratio = upgrade_ratio
+        self.downgrade_after = downgrade_after
+        self.upgrade_after = upgrade_after
+        self.cooldown_s = cooldown_s
+        # 超过该间隔视为暂停/空闲后的恢复，不计入统计
+        self.stall_ignore_ms = 500.0
+        # 锁定后只统计帧率，不再自动升降级（基准测试需要固定画质）
+        self.locked = False
+
+        self.level_index = 0
+        self.fps = self.target_fps
+        self._window: Deque[float] = deque()
+        self._window_start: Optional[float] = None
+        self._low_windows = 0
+        self._high_windows = 0
+        self._last_change = 0.0
+        # 最近若干帧真实的重绘间隔与定时器迟到，供 HUD 计算分位数
+        self.frame_stats = FrameStats()
+        self.lateness_stats = FrameStats()
+        self._last_present: Optional[float] = None
+
+    @property
+    def level(self) -> QualityLevel:
+        return self.levels[self.level_index]
+
+    @property
+    def frame_budget_ms(self) -> float:
+        return 1000.0 / self.target_fps
+
+    def set_target_fps(self, target_fps: float) -> None:
+        self.target_fps = max(1.0, float(target_fps))
+        self._reset_window()
+
+    def set_level(self, index: int) -> None:
+        index = max(0, min(len(self.levels) - 1, index))
+        if index == self.level_index:
+            return
+        self.level_index = index
+        self._last_change = time.perf_counter()
+        self._low_windows = 0
+        self._high_windows = 0
+        self._reset_window()
+        self.level_changed.emit(self.level)
+
+    def record_frame(self, interval_ms: float, nominal_ms: float) -> None:
+        """记录一帧：``interval_ms`` 为实际间隔，``nominal_ms`` 为定时器期望间隔。"""
+        if interval_ms <= 0 or interval_ms > self.stall_ignore_ms:
+            return
+        lateness = max(0.0, interval_ms - nominal_ms)
+        frame_ms = min(nominal_ms, self.frame_budget_ms) + lateness
+        self._window.append(frame_ms)
+        self.lateness_stats.record(lateness)
+
+        now = time.perf_counter()
+        if self._window_start is None:
+            self._window_start = now
+            return
+        if now - self._window_start < self.window_s:
+            return
+        self._evaluate(now)
+
+    def record_present(self, now: Optional[float] = None) -> None:
+        """记录一次重绘：与上一次重绘的间隔即真实帧时间；停顿后恢复的第一帧不计入。"""
+        now = time.perf_counter() if now is None else now
+        if self._last_present is not None:
+            interval_ms = (now - self._last_present) * 1000.0
+            if interval_ms <= self.stall_ignore_ms:
+                self.frame_stats.record(interval_ms)
+        self._last_present = now
+
+    def _evaluate(self, now: float) -> None:
+        average_ms = sum(self._window) / len(self._window)
+        self.fps = 1000.0 / average_ms if average_ms > 0 else self.target_fps
+        self._reset_window()
+        self._window_start = now
+        self.stats_updated.emit(self.fps)
+
+        if self.fps < self.target_fps * self.downgrade_ratio:
+            self._low_windows += 1
+            self._high_windows = 0
+        elif self.fps >= self.target_fps * self.upgrade_ratio:
+            self._high_windows += 1
+            self._low_windows = 0
+        else:
+            # 处于滞回区间内，保持当前等级
+            self._low_windows = 0
+            self._high_windows = 0
+            return
+
+        if self.locked or now - self._last_change < self.cooldown_s:
+            return
+        if self._low_windows >= self.downgrade_after and self.level_index < len(self.levels) - 1:
+            print(f"[quality] {self.fps:.1f}fps 低于目标 {self.target_fps:.0f}，降级")
+            self.set_level(self.level_index + 1)
+        elif self._high_windows >= self.upgrade_after and self.level_index > 0:
+            print(f"[quality] {self.fps:.1f}fps 达到目标 {self.target_fps:.0f}，升级")
+            self.set_level(self.level_index - 1)
+
+    def _reset_window(self) -> None:
+        self._window.clear()
+        self._window_start = None
+
+
+class QualityDebugOverlay(QLabel):
+    """左上角的调试信息，显示当前画质等级与实测帧率。"""
+
+    def __init__(self, governor: QualityGovernor, parent: Optional[QWidget] = None) -> None:
+        super().__init__(parent)
+        self.governor = governor
+        self.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents, True)
+        self.setStyleSheet(
+            "background: rgba(0, 0, 0, 0.55);"
+            "color: #9dffb0;"
+            "padding: 6px 10px;"
+            "border-radius: 6px;"
+            "font-family: Menlo, monospace;"
+            "font-size: 12px;"
+        )
+        governor.level_changed.connect(self._refresh)
+        governor.stats_updated.connect(self._refresh)
+        self._refresh()
+        self.hide()
+
+    def _refresh(self, *_args) -> None:
+        level = self.governor.level
+        self.setText(
+            f"画质 {level.name} (L{self.governor.level_index})  "
+            f"{self.governor.fps:.1f}/{self.governor.target_fps:.0f} fps\n"
+            f"粒子×{level.particle_scale:.2f} 拖尾 {level.particle_trail}/{level.rocket_trail} "
+            f"雪花×{level.snow_density:.2f} 烟花层 {level.max_bursts} "
+            f"抗锯齿 {'开' if level.antialiasing else '关'} "
+            f"{1000 // level.frame_interval_ms}Hz"
+        )
+        self.adjustSize()
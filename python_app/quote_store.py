@@ -0,0 +1,233 @@
+"""列式金句存储：百万条金句也只占用与文本字节数相当的内存。
+
+所有文本按 UTF-8 首尾相接存放在一块缓冲区里，``offsets`` 记录每条的起止字节；
+颜色与分类存成指向驻留字符串表的小整数。每个分类维护一个展示顺序的索引数组，
+看板按索引取用，不再复制出三份列表。界面拿到的 ``Quote`` 是按需创建的带
+``__slots__`` 的小对象，卡片回收后即可释放。
+"""
+
+from __future__ import annotations
+
+import random
+import sys
+from array import array
+from typing import Collection, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .models import Quote
+
+# 索引与偏移用 32 位无符号整数（单个语料的文本不超过 4 GB），颜色与分类编码用 16 位
+INDEX_TYPECODE = "I"
+CODE_TYPECODE = "H"
+
+
+class QuoteStore:
+    """按列存放的金句集合；下标是存储顺序，展示顺序由各分类的索引数组决定。"""
+
+    def __init__(self) -> None:
+        self._text = bytearray()
+        self._offsets = array(INDEX_TYPECODE, [0])
+        self._colors = array(CODE_TYPECODE)
+        self._categories = array(CODE_TYPECODE)
+        self.color_table: List[str] = []
+        self.category_table: List[str] = []
+        self._color_codes: Dict[str, int] = {}
+        self._category_codes: Dict[str, int] = {}
+        self._order: Dict[str, array] = {}  # 分类 -> 展示顺序的存储下标
+
+    @classmethod
+    def from_quotes(cls, quotes: Iterable[Quote]) -> "QuoteStore":
+        store = cls()
+        store.extend(quotes)
+        return store
+
+    @classmethod
+    def from_columns(
+        cls,
+        text: bytes,
+        offsets: array,
+        colors: array,
+        categories: array,
+        color_table: Sequence[str],
+        category_table: Sequence[str],
+        orders: Optional[Dict[str, array]] = None,
+    ) -> "QuoteStore":
+        """直接接管已经编码好的列（如编译语料），不逐条构建对象。
+
+        ``orders`` 为各分类的存储下标；省略时按分类列扫描一遍得到。
+        """
+        if len(offsets) != len(colors) + 1 or len(colors) != len(categories):
+            raise ValueError("列长度不一致")
+        store = cls()
+        store._text = bytearray(text)
+        store._offsets = offsets
+        store._colors = colors
+        store._categories = categories
+        store.color_table = [sys.intern(value) for value in color_table]
+        store.category_table = [sys.intern(value) for value in category_table]
+        store._color_codes = {value: code for code, value in enumerate(store.color_table)}
+        store._category_codes = {value: code for code, value in enumerate(store.category_table)}
+        if orders is None:
+            buckets: List[List[int]] = [[] for _ in store.category_table]
+            for index, code in enumerate(categories):
+                buckets[code].append(index)
+            orders = {name: array(INDEX_TYPECODE, bucket) for name, bucket in zip(store.category_table, buckets)}
+        store._order = dict(orders)
+        return store
+
+    def __len__(self) -> int:
+        return len(self._colors)
+
+    def __getitem__(self, index: int) -> Quote:
+        if index < 0:
+            index += len(self)
+        return Quote(
+            text=self.text(index),
+            color=self.color_table[self._colors[index]],
+            category=self.category_table[self._categories[index]],
+        )
+
+    def __iter__(self) -> Iterator[Quote]:
+        """按展示顺序逐条产出（各分类依次排列）。"""
+        for indices in self._order.values():
+            for index in indices:
+                yield self[index]
+
+    def text(self, index: int) -> str:
+        return self._text[self._offsets[index]:self._offsets[index + 1]].decode("utf-8")
+
+    def color(self, index: int) -> str:
+        return self.color_table[self._colors[index]]
+
+    def category(self, index: int) -> str:
+        return self.category_table[self._categories[index]]
+
+    def _code(self, table: List[str], codes: Dict[str, int], value: str) -> int:
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(table)
+            if code > 0xFFFF:
+                raise ValueError("颜色或分类的种类过多")
+            table.append(sys.intern(value))
+        return code
+
+    def append(self, text: str, color: str, category: str) -> int:
+        """追加一条，返回存储下标；同时排到该分类展示顺序的末尾。"""
+        index = len(self._colors)
+        self._text += text.encode("utf-8")
+        self._offsets.append(len(self._text))
+        self._colors.append(self.color_code(color))
+        code = self._code(self.category_table, self._category_codes, category)
+        self._categories.append(code)
+        order = self._order.get(category)
+        if order is None:
+            order = self._order[category] = array(INDEX_TYPECODE)
+        order.append(index)
+        return index
+
+    def extend(self, quotes: Iterable[Quote]) -> List[int]:
+        return [self.append(quote.text, quote.color, quote.category) for quote in quotes]
+
+    def color_code(self, color: str) -> int:
+        return self._code(self.color_table, self._color_codes, color)
+
+    def columns(self) -> Tuple[bytes, array, array, array]:
+        """文本缓冲区、偏移、颜色编码与分类编码四列（用于写出编译语料）。"""
+        return bytes(self._text), self._offsets, self._colors, self._categories
+
+    def categories(self) -> List[str]:
+        return list(self._order)
+
+    def indices(self, category: str) -> array:
+        """该分类按展示顺序排列的存储下标（返回内部数组，调用方不要修改）。"""
+        return self._order.get(category, array(INDEX_TYPECODE))
+
+    def indices_except(self, categories: Iterable[str]) -> array:
+        excluded = set(categories)
+        merged = array(INDEX_TYPECODE)
+        for name, indices in self._order.items():
+            if name not in excluded:
+                merged.extend(indices)
+        return merged
+
+    def discard(self, indices: Collection[int]) -> int:
+        """从各分类的展示顺序中去掉这些下标，返回去掉的条数。
+
+        文本仍留在缓冲区里（下标保持不变），只是不再被取用；重新编译语料时才真正清除。
+        """
+        removed = 0
+        for name, order in self._order.items():
+            kept = array(INDEX_TYPECODE, [index for index in order if index not in indices])
+            if len(kept) != len(order):
+                removed += len(order) - len(kept)
+                self._order[name] = kept
+        return removed
+
+    def shuffle(self, rng: random.Random) -> None:
+        """用 ``rng`` 把各分类的展示顺序分别打乱，结果与对同样长度的列表调用 shuffle 相同。
+
+        不使用全局随机数：加载在后台线程进行，界面线程的雪花等同时也在消耗全局随机数。
+        """
+        for name, indices in self._order.items():
+            order = indices.tolist()
+            rng.shuffle(order)
+            self._order[name] = array(INDEX_TYPECODE, order)
+
+    @property
+    def nbytes(self) -> int:
+        """各列与索引数组占用的字节数（不含驻留字符串表）。"""
+        columns = (self._offsets, self._colors, self._categories, *self._order.values())
+        return len(self._text) + sum(column.itemsize * len(column) for column in columns)
+
+
+class QuoteQueue:
+    """按索引数组依次取出金句的队列，代替 ``Deque[Quote]``；取出时才创建 ``Quote``。"""
+
+    __slots__ = ("store", "_indices", "_head")
+
+    def __init__(self, store: QuoteStore, indices: Iterable[int] = ()) -> None:
+        self.store = store
+        self._indices = array(INDEX_TYPECODE, indices)
+        self._head = 0
+
+    def __len__(self) -> int:
+        return len(self._indices) - self._head
+
+    def __bool__(self) -> bool:
+        return self._head < len(self._indices)
+
+    def __iter__(self) -> Iterator[Quote]:
+        store = self.store
+        for position in range(self._head, len(self._indices)):
+            yield store[self._indices[position]]
+
+    def __getitem__(self, position: int) -> Quote:
+        if position < 0:
+            position += len(self)
+        if not 0 <= position < len(self):
+            raise IndexError("QuoteQueue 下标越界")
+        return self.store[self._indices[self._head + position]]
+
+    def popleft(self) -> Quote:
+        if self._head >= len(self._indices):
+            raise IndexError("QuoteQueue 为空")
+        index = self._indices[self._head]
+        self._head += 1
+        return self.store[index]
+
+    def append(self, index: int) -> None:
+        self._indices.append(index)
+
+    def extend(self, indices: Iterable[int]) -> None:
+        self._indices.extend(indices)
+
+    def discard(self, indices: Collection[int]) -> int:
+        """从尚未取出的部分去掉这些下标，返回去掉的条数。"""
+        remaining = self._indices[self._head:]
+        kept = array(INDEX_TYPECODE, [index for index in remaining if index not in indices])
+        self._indices = kept
+        self._head = 0
+        return len(remaining) - len(kept)
+
+    def clear(self) -> None:
+        self._indices = array(INDEX_TYPECODE)
+        self._head = 0
@@ -0,0 +1,297 @@
+"""离线渲染：把整场演出导出为视频文件，不必占用一台展示机实时录屏。
+
+在 offscreen 平台上用 ``driven`` 模式的虚拟时钟以固定帧率逐帧驱动 QuoteBoard：
+每帧推进演出时钟、动画与逐帧定时器，把看板绘制到 QImage，再把原始像素经管道
+交给 ffmpeg 编码。整场演出只由数据、种子与帧率决定，因此可以按帧号切成若干段
+交给多个进程：每个进程都从头模拟（只跳过绘制与编码）到自己那一段，再渲染并编码
+这一段，最后用 ffmpeg 的 concat 无损拼接。
+
+    python -m python_app.main --render show.mp4 --seed 7 --render-workers 4
+"""
+
+from __future__ import annotations
+
+import math
+import multiprocessing
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from PySide6.QtCore import QAbstractAnimation, QCoreApplication, QEvent, QEventLoop, QSize, Qt
+from PySide6.QtGui import QColor, QImage
+from PySide6.QtWidgets import QApplication
+
+from .board import QuoteBoard
+from .clock import ShowClock
+from .quality import QUALITY_LEVELS
+from .startup import StartupLoader
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+
+@dataclass(frozen=True)
+class RenderConfig:
+    output: Path
+    width: int = 1920
+    height: int = 1080
+    fps: float = 30.0
+    seed: int = 0
+    workers: int = 1
+    ffmpeg: str = "ffmpeg"
+    duration_s: Optional[float] = None  # 默认渲染到时间线结束
+    tail_s: float = 3.0  # 时间线结束后多录的时长，让最后的淡出播完
+    quality: str = "high"
+    composite_cards: bool = False
+    crf: int = 18
+    preset: str = "veryfast"
+    min_segment_s: float = 10.0  # 每段太短时，从头模拟的开销会抵消并行的收益
+
+    @property
+    def size(self) -> QSize:
+        return QSize(self.width, self.height)
+
+    @property
+    def frame_ms(self) -> float:
+        return 1000.0 / self.fps
+
+
+class OfflineShow:
+    """以固定帧长驱动的看板，不依赖真实时间，也不处理任何定时器事件。"""
+
+    def __init__(self, config: RenderConfig) -> None:
+        self.config = config
+        # 雪花、烟花粒子使用全局随机数，每个进程都从同一个种子开始
+        random.seed(config.seed)
+        self.clock = ShowClock(speed=1.0, driven=True)
+        self.board = QuoteBoard(
+            [],
+            target_fps=config.fps,
+            composite_cards=config.composite_cards,
+            show_clock=self.clock,
+            seed=config.seed,
+        )
+        board = self.board
+        # 画质按实测帧时间调节会让各进程走向不同的分支，这里固定下来
+        governor = board.quality
+        governor.set_level(next(i for i, level in enumerate(governor.levels) if level.name == config.quality))
+        governor.locked = True
+        board.setAttribute(Qt.WidgetAttribute.WA_DontShowOnScreen, True)
+        board.resize(config.size)
+        board.show()
+        board.start()
+        self._load()
+        # 加载期间雪花定时器是否已经走过一拍取决于机器快慢，统一从虚拟时间 0 开始模拟
+        board.snow_effect.simulation.reset_clock()
+        self.frames = 0
+        self.image = QImage(config.size, QImage.Format.Format_ARGB32)
+
+    def _load(self) -> None:
+        """与 main 相同的启动流程；加载期间虚拟时间停在 0，事件循环的时序不影响画面。"""
+        board = self.board
+        loader = StartupLoader(PROJECT_ROOT / "data", PROJECT_ROOT / "assets" / "fonts", board, seed=self.config.seed)
+        loader.data_loaded.connect(board.set_quotes)
+        loader.add_warm_up(board.warm_up_glyphs)
+        if board.background_cache.is_loading():
+            loader.wait_for("backgrounds")
+            board.background_cache.all_settled.connect(lambda: loader.complete("backgrounds"))
+        loop = QEventLoop()
+        failures: List[str] = []
+        finished = False
+
+        def finish(message: str = "") -> None:
+            nonlocal finished
+            finished = True
+            if message:
+                failures.append(message)
+            loop.quit()
+
+        loader.ready.connect(board.mark_ready)
+        loader.ready.connect(finish)
+        loader.failed.connect(finish)
+        loader.start()
+        if not finished:
+            loop.exec()
+        if failures:
+            raise RuntimeError(f"加载演出数据失败: {failures[0]}")
+
+    def total_frames(self) -> int:
+        config = self.config
+        if config.duration_s is not None:
+            duration_ms = config.duration_s * 1000.0
+        else:
+            duration_ms = self.board.splash_min_ms + self.board.timeline.duration_ms + config.tail_s * 1000.0
+        return max(1, math.ceil(duration_ms / config.frame_ms))
+
+    def step(self) -> None:
+        """推进一帧：演出调度、属性动画、逐帧定时器，最后处理投递的事件与延迟删除。"""
+        board = self.board
+        before = round(self.clock.now_ms())
+        self.clock.advance(self.config.frame_ms)
+        # 属性动画按整数毫秒推进，用虚拟时间取整后的差值，避免帧长的小数部分累积误差
+        delta_ms = round(self.clock.now_ms()) - before
+        for animation in board.power.animations():
+            try:
+                if animation.group() is None and animation.state() == QAbstractAnimation.State.Running:
+                    animation.setCurrentTime(animation.currentTime() + delta_ms)
+            except RuntimeError:  # C++ 对象已销毁
+                pass
+        for timer in board.power.timers():
+            try:
+                if timer.isActive():
+                    timer.timeout.emit()
+            except RuntimeError:
+                pass
+        QCoreApplication.sendPostedEvents()
+        QCoreApplication.sendPostedEvents(None, QEvent.Type.DeferredDelete)
+        self.frames += 1
+
+    def grab(self) -> QImage:
+        self.image.fill(QColor(0, 0, 0))
+        self.board.render(self.image)
+        return self.image
+
+
+def _encoder_command(config: RenderConfig, path: Path) -> List[str]:
+    size = config.size
+    return [
+        config.ffmpeg,
+        "-y",
+        "-loglevel", "error",
+        "-f", "rawvideo",
+        # Format_ARGB32 在小端机器上的字节顺序为 BGRA
+        "-pix_fmt", "bgra" if sys.byteorder == "little" else "argb",
+        "-s", f"{size.width()}x{size.height()}",
+        "-r", f"{config.fps:g}",
+        "-i", "-",
+        "-c:v", "libx264",
+        "-preset", config.preset,
+        "-crf", str(config.crf),
+        "-pix_fmt", "yuv420p",
+        str(path),
+    ]
+
+
+def _ensure_app() -> QApplication:
+    os.environ["QT_QPA_PLATFORM"] = "offscreen"
+    app = QApplication.instance()
+    if app is None:
+        app = QApplication([sys.argv[0], "-platform", "offscreen"])
+    return app  # type: ignore[return-value]
+
+
+def render_segment(config: RenderConfig, start: int, end: int, path: Path, show: Optional[OfflineShow] = None) -> Dict[str, float]:
+    """渲染 [start, end) 帧到 ``path``；前面的帧只模拟、不绘制。"""
+    _ensure_app()
+    started = time.perf_counter()
+    show = show or OfflineShow(config)
+    encoder = subprocess.Popen(_encoder_command(config, path), stdin=subprocess.PIPE)
+    assert encoder.stdin is not None
+    report_every = max(1, round(config.fps * 10))
+    try:
+        while show.frames < start:
+            show.step()
+        skipped_s = time.perf_counter() - started
+        while show.frames < end:
+            show.step()
+            encoder.stdin.write(show.grab().constBits())
+            if (show.frames - start) % report_every == 0:
+                print(f"[render] {path.name}: {show.frames - start}/{end - start} 帧")
+    except BrokenPipeError:
+        pass
+    finally:
+        encoder.stdin.close()
+        code = encoder.wait()
+    if code != 0:
+        raise RuntimeError(f"ffmpeg 编码 {path.name} 失败（退出码 {code}）")
+    return {
+        "start": start,
+        "end": end,
+        "fast_forward_s": round(skipped_s, 2),
+        "elapsed_s": round(time.perf_counter() - started, 2),
+    }
+
+
+def _split(total: int, parts: int) -> List[Tuple[int, int]]:
+    bounds = [round(total * index / parts) for index in range(parts + 1)]
+    return [(bounds[index], bounds[index + 1]) for index in range(parts) if bounds[index] < bounds[index + 1]]
+
+
+def _concat(config: RenderConfig, segments: List[Path], workdir: Path) -> None:
+    listing = workdir / "segments.txt"
+    listing.write_text("".join(f"file '{path.resolve()}'\n" for path in segments), encoding="utf-8")
+    command = [config.ffmpeg, "-y", "-loglevel", "error", "-f", "concat", "-safe", "0", "-i", str(listing), "-c", "copy", str(config.output)]
+    code = subprocess.run(command).returncode
+    if code != 0:
+        raise RuntimeError(f"ffmpeg 拼接失败（退出码 {code}）")
+
+
+def render_show(config: RenderConfig) -> int:
+    if shutil.which(config.ffmpeg) is None:
+        print(f"错误: 找不到 ffmpeg（{config.ffmpeg}），请安装或用 --ffmpeg 指定路径")
+        return 1
+    if config.quality not in {level.name for level in QUALITY_LEVELS}:
+        raise ValueError(f"未知的画质档位 {config.quality}")
+    _ensure_app()
+    started = time.perf_counter()
+    # 主进程先完整加载一次，得到时间线长度；单进程时直接用它渲染
+    show = OfflineShow(config)
+    total = show.total_frames()
+    show_s = total / config.fps
+    workers = max(1, min(config.workers, int(show_s // config.min_segment_s) or 1))
+    print(f"[render] 共 {total} 帧（{show_s:.1f} 秒，{config.fps:g} fps），{workers} 个进程，种子 {config.seed}")
+    config.output.parent.mkdir(parents=True, exist_ok=True)
+
+    if workers == 1:
+        stats = [render_segment(config, 0, total, config.output, show)]
+    else:
+        ranges = _split(total, workers)
+        with tempfile.TemporaryDirectory(prefix="render-", dir=config.output.parent) as tmp:
+            workdir = Path(tmp)
+            segments = [workdir / f"segment-{index:03d}{config.output.suffix}" for index in range(len(ranges))]
+            # 子进程各自创建 QApplication，必须用 spawn 而不是 fork
+            context = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+                futures = [
+                    pool.submit(render_segment, config, start, end, path)
+                    for (start, end), path in zip(ranges, segments)
+                ]
+                stats = [future.result() for future in futures]
+            _concat(config, segments, workdir)
+
+    elapsed = time.perf_counter() - started
+    for index, segment in enumerate(stats):
+        print(
+            f"[render] 段 {index}: 帧 {int(segment['start'])}-{int(segment['end'])}，"
+            f"快进 {segment['fast_forward_s']} 秒，共 {segment['elapsed_s']} 秒"
+        )
+    print(f"[render] 已写出 {config.output}：用时 {elapsed:.1f} 秒，为演出时长的 {show_s / max(elapsed, 1e-6):.1f} 倍速")
+    return 0
+
+
+def parse_size(value: str) -> Tuple[int, int]:
+    width, _, height = value.lower().partition("x")
+    return int(width), int(height)
+
+
+def config_from_args(args) -> RenderConfig:
+    """由 main 的命令行参数得到渲染配置；没有指定种子时随机选一个并打印出来，便于重渲。"""
+    width, height = args.render_size
+    return RenderConfig(
+        output=args.render,
+        width=width,
+        height=height,
+        fps=args.render_fps,
+        seed=args.seed if args.seed is not None else random.randrange(2**31),
+        workers=args.render_workers or (os.cpu_count() or 1),
+        ffmpeg=args.ffmpeg,
+        duration_s=args.render_duration_s,
+        composite_cards=args.composite_cards,
+    )
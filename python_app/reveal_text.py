@@ -0,0 +1,298 @@
+from __future__ import annotations
+
+from typing import List, Optional, Tuple
+
+from PySide6.QtCore import QPointF, QRectF, QSize, Qt, Signal
+from PySide6.QtGui import (
+    QColor,
+    QFont,
+    QPainter,
+    QPaintEvent,
+    QPixmap,
+    QRegion,
+    QTextLayout,
+    QTextLine,
+    QTextOption,
+)
+from PySide6.QtWidgets import QSizePolicy, QWidget
+
+from .clock import FrameClock
+from .glyph_cache import glyph_cache
+from .metrics import layer_timings
+
+_BLEED = 2  # 字形可能略微超出行矩形，位图四周留出的余量
+
+
+class RevealText(QWidget):
+    """逐字显示的文本控件（打字机效果）。
+
+    整段文本只用 ``QTextLayout`` 排版一次并缓存为位图，显示进度只是一个字符计数：
+    每帧根据经过的时间更新计数，绘制时对当前行按 ``cursorToX`` 裁剪后贴图，
+    并只刷新发生变化的行，长文本与短文本的单帧开销相同。
+    进度由共享的 ``FrameClock`` 驱动，不持有自己的定时器。
+    """
+
+    finished = Signal()
+
+    def __init__(
+        self,
+        text: str = "",
+        parent: Optional[QWidget] = None,
+        clock: Optional[FrameClock] = None,
+    ) -> None:
+        super().__init__(parent)
+        self.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents, True)
+        self.setSizePolicy(QSizePolicy.Policy.Preferred, QSizePolicy.Policy.Preferred)
+        self.clock = clock
+        self._text = text
+        self._color = QColor("#2c2c2c")
+        self._alignment = Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignTop
+        self._word_wrap = True
+        self._line_spacing = 1.0
+        self._background: Optional[QColor] = None
+        self._radius = 0.0
+        self._padding = (0, 0)  # (水平, 垂直)
+        self._minimum_text_width = 0
+        self._layout = QTextLayout()
+        self._layout_width = -1
+        self._line_rects: List[Tuple[int, int, QRectF]] = []  # (起始字符, 结束字符, 行矩形)
+        self._text_size = QSize(0, 0)
+        self._revealed = len(text)
+        self._interval_s = 0.06
+        self._started_at = 0.0
+
+    # region 属性
+    def text(self) -> str:
+        return self._text
+
+    def setText(self, text: str) -> None:
+        """设置文本并立即全部显示。"""
+        self.stop()
+        self._text = text
+        self._revealed = len(text)
+        self._invalidate()
+
+    def setFont(self, font: QFont) -> None:  # type: ignore[override]
+        super().setFont(font)
+        self._invalidate()
+
+    def setColor(self, color: QColor) -> None:
+        self._color = QColor(color)
+        self.update()
+
+    def setAlignment(self, alignment: Qt.AlignmentFlag) -> None:
+        self._alignment = alignment
+        self._invalidate()
+
+    def setWordWrap(self, enabled: bool) -> None:
+        self._word_wrap = enabled
+        self._invalidate()
+
+    def setLineSpacing(self, factor: float) -> None:
+        self._line_spacing = max(1.0, factor)
+        self._invalidate()
+
+    def setBackground(self, color: Optional[QColor], radius: float = 0.0, padding: Tuple[int, int] = (0, 0)) -> None:
+        self._background = QColor(color) if color is not None else None
+        self._radius = radius
+        self._padding = padding
+        self._invalidate()
+
+    def setMinimumTextWidth(self, width: int) -> None:
+        self._minimum_text_width = max(0, width)
+        self._invalidate()
+
+    @property
+    def revealed(self) -> int:
+        return self._revealed
+
+    def is_revealing(self) -> bool:
+        return self.clock is not None and self.clock.is_subscribed(self._on_frame)
+
+    # endregion
+
+    # region 逐字显示
+    def start(self, interval_ms: int, text: Optional[str] = None) -> None:
+        """从头开始逐字显示，每 ``interval_ms`` 毫秒多显示一个字符。"""
+        if text is not None and text != self._text:
+            self._text = text
+            self._invalidate()
+        self._revealed = 0
+        self._interval_s = max(1, interval_ms) / 1000.0
+        self.update()
+        if self.clock is None or not self._text:
+            self.reveal_all()
+            return
+        self._started_at = self.clock.now()
+        self.clock.subscribe(self._on_frame)
+
+    def stop(self) -> None:
+        if self.clock is not None:
+            self.clock.unsubscribe(self._on_frame)
+
+    def reveal_all(self) -> None:
+        self.stop()
+        if self._revealed != len(self._text):
+            self._revealed = len(self._text)
+            self.update()
+        self.finished.emit()
+
+    def _on_frame(self, now: float) -> None:
+        count = min(len(self._text), int((now - self._started_at) / self._interval_s))
+        if count != self._revealed:
+            self._update_range(self._revealed, count)
+            self._revealed = count
+        if count >= len(self._text):
+            self.stop()
+            self.finished.emit()
+
+    def _update_range(self, start: int, end: int) -> None:
+        self._ensure_layout()
+        low, high = min(start, end), max(start, end)
+        dirty = QRectF()
+        for line_start, line_end, rect in self._line_rects:
+            if line_end <= low:
+                continue
+            if line_start > high:
+                break
+            dirty = dirty.united(rect)
+        if dirty.isEmpty():
+            return
+        self.update(dirty.toAlignedRect().adjusted(-2, -2, 2, 2))
+
+    # endregion
+
+    # region 排版
+    def _invalidate(self) -> None:
+        self._layout_width = -1
+        self.updateGeometry()
+        self.update()
+
+    def _text_width_for(self, width: int) -> int:
+        return max(1, width - self._padding[0] * 2)
+
+    def _natural_text_width(self) -> float:
+        probe = QTextLayout(self._text or " ", self.font())
+        probe.beginLayout()
+        line = probe.createLine()
+        line.setNumColumns(max(1, len(self._text)))
+        probe.endLayout()
+        return max(float(self._minimum_text_width), line.naturalTextWidth())
+
+    def _build_layout(self, text_width: int) -> Tuple[QTextLayout, QSize]:
+        layout = QTextLayout(self._text, self.font())
+        option = QTextOption(self._alignment)
+        option.setWrapMode(
+            QTextOption.WrapMode.WrapAtWordBoundaryOrAnywhere if self._word_wrap else QTextOption.WrapMode.NoWrap
+        )
+        layout.setTextOption(option)
+        layout.setCacheEnabled(True)
+        y = 0.0
+        layout.beginLayout()
+        while True:
+            line: QTextLine = layout.createLine()
+            if not line.isValid():
+                break
+            line.setLineWidth(text_width)
+            line.setPosition(QPointF(0, y))
+            y += line.height() * self._line_spacing
+        layout.endLayout()
+        return layout, QSize(text_width, max(1, round(y)))
+
+    def _ensure_layout(self) -> None:
+        width = self.width()
+        if width <= 0:
+            width = self.sizeHint().width()
+        text_width = self._text_width_for(width)
+        if text_width == self._layout_width:
+            return
+        self._layout, self._text_size = self._build_layout(text_width)
+        self._layout_width = text_width
+        origin = self._text_origin()
+        self._line_rects = []
+        for index in range(self._layout.lineCount()):
+            line = self._layout.lineAt(index)
+            rect = line.naturalTextRect().translated(origin)
+            self._line_rects.append((line.textStart(), line.textStart() + line.textLength(), rect))
+
+    def _text_origin(self) -> QPointF:
+        x = float(self._padding[0])
+        y = float(self._padding[1])
+        free_height = self.height() - self._padding[1] * 2 - self._text_size.height()
+        if free_height > 0:
+            if self._alignment & Qt.AlignmentFlag.AlignVCenter:
+                y += free_height / 2
+            elif self._alignment & Qt.AlignmentFlag.AlignBottom:
+                y += free_height
+        return QPointF(x, y)
+
+    def hasHeightForWidth(self) -> bool:  # type: ignore[override]
+        return self._word_wrap
+
+    def heightForWidth(self, width: int) -> int:  # type: ignore[override]
+        _layout, text_size = self._build_layout(self._text_width_for(width))
+        return text_size.height() + self._padding[1] * 2
+
+    def sizeHint(self) -> QSize:  # type: ignore[override]
+        natural = self._natural_text_width()
+        if self.maximumWidth() < 16777215:
+            natural = min(natural, self.maximumWidth() - self._padding[0] * 2)
+        width = int(natural + 1) + self._padding[0] * 2
+        width = max(width, self.minimumWidth())
+        return QSize(width, self.heightForWidth(width))
+
+    def minimumSizeHint(self) -> QSize:  # type: ignore[override]
+        return QSize(self._padding[0] * 2 + 1, self._padding[1] * 2 + 1)
+
+    def resizeEvent(self, event) -> None:  # type: ignore[override]
+        self._layout_width = -1
+        super().resizeEvent(event)
+
+    # endregion
+
+    def paintEvent(self, event: QPaintEvent) -> None:  # type: ignore[override]
+        with layer_timings.paint("text"):
+            painter = QPainter(self)
+            painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+            painter.setRenderHint(QPainter.RenderHint.TextAntialiasing)
+            if self._background is not None:
+                painter.setPen(Qt.PenStyle.NoPen)
+                painter.setBrush(self._background)
+                painter.drawRoundedRect(QRectF(self.rect()), self._radius, self._radius)
+            if not self._text or self._revealed <= 0:
+                return
+            self._ensure_layout()
+            origin = self._text_origin()
+            # 整段文字的位图只光栅化一次，之后每帧按已显示范围裁剪后贴图
+            revealed = QRegion()
+            for index, (line_start, line_end, rect) in enumerate(self._line_rects):
+                if line_start >= self._revealed:
+                    break
+                line_rect = rect.toAlignedRect().adjusted(-_BLEED, -_BLEED, _BLEED, _BLEED)
+                if line_end > self._revealed:
+                    # 当前正在显示的行：只显示到已显示字符的位置
+                    cut_x, _ = self._layout.lineAt(index).cursorToX(self._revealed)
+                    line_rect.setRight(int(origin.x() + cut_x))
+                revealed = revealed.united(line_rect)
+            painter.setClipRegion(revealed.intersected(event.region()))
+            painter.drawPixmap((origin - QPointF(_BLEED, _BLEED)).toPoint(), self._text_pixmap())
+
+    def _text_pixmap(self) -> QPixmap:
+        key = (
+            "reveal",
+            self._text,
+            self.font().key(),
+            self._color.name(QColor.NameFormat.HexArgb),
+            int(self._alignment),
+            self._line_spacing,
+            self._layout_width,
+        )
+        size = QSize(self._text_size.width() + _BLEED * 2, self._text_size.height() + _BLEED * 2)
+        layout = self._layout
+
+        def _paint(painter: QPainter) -> None:
+            painter.setPen(self._color)
+            for index in range(layout.lineCount()):
+                layout.lineAt(index).draw(painter, QPointF(_BLEED, _BLEED))
+
+        return glyph_cache.lookup(key, size, self.devicePixelRatioF(), _paint)
@@ -0,0 +1,268 @@
+from __future__ import annotations
+
+import random
+import threading
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Set, Tuple, Union
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, QTimer, Signal
+from PySide6.QtGui import QFontDatabase
+
+from .corpus import corpus_is_fresh, load_corpus, stream_corpus
+from .data_loader import discover_sources, load_achievements
+from .metrics import startup_metrics
+from .models import Achievement, Quote
+from .quote_store import QuoteStore
+from .text_layout import layout_cache
+from .timeline import derive_rng
+
+
+class _StageSignals(QObject):
+    finished = Signal(str, object)
+    failed = Signal(str, str)
+
+
+class _StageTask(QRunnable):
+    def __init__(self, name: str, function: Callable[[], object]) -> None:
+        super().__init__()
+        self.name = name
+        self.function = function
+        self.signals = _StageSignals()
+
+    def run(self) -> None:
+        try:
+            result = self.function()
+        except Exception as exc:  # noqa: BLE001 - 交给界面线程统一报告
+            self.signals.failed.emit(self.name, str(exc))
+            return
+        self.signals.finished.emit(self.name, result)
+
+
+def _read_font_files(fonts_dir: Path) -> List[Tuple[str, bytes]]:
+    if not fonts_dir.exists():
+        return []
+    return [(path.name, path.read_bytes()) for path in sorted(fonts_dir.glob("*.ttf"))]
+
+
+def _read_data(data_dir: Path, rng: random.Random) -> Tuple[QuoteStore, List[Achievement]]:
+    # 读取编译语料；来源 JSON 有改动时先重新编译
+    quotes, achievements = load_corpus(data_dir, rng)
+    if not quotes:
+        raise RuntimeError("未在 data 目录中找到金句数据")
+    return quotes, achievements
+
+
+class _StreamSignals(QObject):
+    first_batch = Signal(object, list, list)  # QuoteStore, 祝福语, 仍在读取的分类
+    batch = Signal(list)
+    category_done = Signal(str)
+    finished = Signal()
+    failed = Signal(str)
+
+
+class _StreamTask:
+    """流式读取金句：第一批立即交给界面线程，其余分批补入。
+
+    编译语料仍然有效时直接整体读取。界面线程最多积压 ``max_in_flight`` 个批次，
+    超过时读取线程等待，内存不随语料规模增长。读取持续整个解析过程，因此使用独立
+    线程，不占用线程池（单核机器上线程池只有一个线程，字体等阶段会被堵住）。
+    """
+
+    def __init__(self, data_dir: Path, rng: random.Random, max_in_flight: int = 4) -> None:
+        self.data_dir = data_dir
+        self.rng = rng
+        self.slots = threading.Semaphore(max_in_flight)
+        self.cancelled = threading.Event()
+        self.signals = _StreamSignals()
+
+    def run(self) -> None:
+        try:
+            self._stream()
+        except Exception as exc:  # noqa: BLE001 - 交给界面线程统一报告
+            self.signals.failed.emit(str(exc))
+
+    def _stream(self) -> None:
+        if corpus_is_fresh(self.data_dir):
+            quotes, achievements = _read_data(self.data_dir, self.rng)
+            self.signals.first_batch.emit(quotes, achievements, [])
+            self.signals.finished.emit()
+            return
+        achievements = load_achievements(self.data_dir)
+        loading = list(dict.fromkeys(source.category for source in discover_sources(self.data_dir)))
+        started = False
+        for quotes, done in stream_corpus(self.data_dir, self.rng):
+            if not started:
+                started = True
+                self.signals.first_batch.emit(QuoteStore.from_quotes(quotes), achievements, loading)
+            else:
+                while not self.slots.acquire(timeout=0.5):
+                    if self.cancelled.is_set():
+                        return
+                self.signals.batch.emit(quotes)
+            if done is not None:
+                self.signals.category_done.emit(done)
+            if self.cancelled.is_set():
+                return
+        if not started:
+            raise RuntimeError("未在 data 目录中找到金句数据")
+        self.signals.finished.emit()
+
+
+class StartupLoader(QObject):
+    """分阶段的异步启动流程。
+
+    窗口与启动画面先显示，数据解析与字体文件读取在线程池中并行进行；
+    字体在界面线程注册后再进行折行预排版（确保测量使用正确的字体）与
+    界面线程上的字形预热。其他模块的异步任务（如背景图解码）可通过
+    ``wait_for`` / ``complete`` 加入。所有阶段完成后发出 ``ready``。
+
+    ``streaming=True`` 且编译语料需要重建时，边解析边交付：第一批金句到达即算数据
+    阶段完成，其余经 ``quotes_appended`` 补入。无论是否流式读取，``data_finished``
+    都表示金句已全部读完。展示顺序由 ``seed`` 派生的随机数打乱，同一种子总是相同。
+    """
+
+    data_loaded = Signal(object, list, list)  # QuoteStore, List[Achievement], 仍在读取的分类
+    quotes_appended = Signal(list)
+    category_loaded = Signal(str)
+    data_finished = Signal()
+    ready = Signal()
+    failed = Signal(str)
+
+    def __init__(
+        self,
+        data_dir: Path,
+        fonts_dir: Path,
+        parent: Optional[QObject] = None,
+        pool: Optional[QThreadPool] = None,
+        streaming: bool = False,
+        seed: Optional[int] = None,
+    ) -> None:
+        super().__init__(parent)
+        self.data_dir = data_dir
+        self.streaming = streaming
+        # 在后台线程打乱展示顺序，使用独立的随机数，不受界面线程消耗全局随机数的影响
+        self._order_rng = derive_rng(seed, "quote_order")
+        # 流式读取的洗牌缓冲同样由种子派生，与窗口出现前后全局随机数被用掉多少无关
+        self._stream_rng = derive_rng(seed, "quote_stream")
+        self._stream: Optional[_StreamTask] = None
+        self.fonts_dir = fonts_dir
+        self._pool = pool or QThreadPool.globalInstance()
+        self._pending: Set[str] = {"data", "fonts", "layout", "glyphs"}
+        self._tasks: Dict[str, _StageTask] = {}
+        self._gui_stages: List[Callable[[], None]] = []
+        self._quotes: Optional[Union[QuoteStore, List[Quote]]] = None
+        self._fonts_registered = False
+        self._layout_started = False
+        self._failed = False
+
+    def add_warm_up(self, callback: Callable[[], None]) -> None:
+        """登记一个在界面线程执行的预热步骤（字体注册之后、空闲时执行）。"""
+        self._gui_stages.append(callback)
+
+    def wait_for(self, name: str) -> None:
+        self._pending.add(name)
+
+    def complete(self, name: str) -> None:
+        if name not in self._pending or self._failed:
+            return
+        self._pending.discard(name)
+        startup_metrics.mark(f"stage:{name}")
+        if not self._pending:
+            startup_metrics.mark("ready")
+            self.ready.emit()
+
+    def start(self) -> None:
+        if self.streaming:
+            self._start_stream()
+        else:
+            self._run("data", lambda: _read_data(self.data_dir, self._order_rng))
+        self._run("fonts", lambda: _read_font_files(self.fonts_dir))
+
+    def cancel(self) -> None:
+        """退出时让流式读取线程尽快结束，避免线程池等待。"""
+        if self._stream is not None:
+            self._stream.cancelled.set()
+
+    def _start_stream(self) -> None:
+        task = _StreamTask(self.data_dir, self._stream_rng)
+        task.signals.first_batch.connect(self._on_stream_started)
+        task.signals.batch.connect(self._on_stream_batch)
+        task.signals.category_done.connect(self.category_loaded)
+        task.signals.finished.connect(self._on_stream_finished)
+        task.signals.failed.connect(self._on_stream_failed)
+        self._stream = task
+        threading.Thread(target=task.run, name="corpus-stream", daemon=True).start()
+
+    def _on_stream_started(self, quotes: QuoteStore, compliments: List[Achievement], loading: List[str]) -> None:
+        # 看板会往同一个存储里补入后续批次，预排版只处理开场前已有的这一批
+        self._quotes = list(quotes)
+        self.data_loaded.emit(quotes, compliments, loading)
+        self.complete("data")
+        self._start_layout_if_ready()
+
+    def _on_stream_batch(self, quotes: List[Quote]) -> None:
+        try:
+            self.quotes_appended.emit(quotes)
+        finally:
+            if self._stream is not None:
+                self._stream.slots.release()
+
+    def _on_stream_finished(self) -> None:
+        self._stream = None
+        self.data_finished.emit()
+
+    def _on_stream_failed(self, message: str) -> None:
+        self._stream = None
+        if self._quotes is None:
+            self._on_stage_failed("data", message)
+            return
+        # 已经开场：只展示已读入的部分，不中断演出
+        print(f"警告: 流式读取金句中断: {message}，只展示已读入的部分")
+        self.data_finished.emit()
+
+    def _run(self, name: str, function: Callable[[], object]) -> None:
+        task = _StageTask(name, function)
+        task.signals.finished.connect(self._on_stage_finished)
+        task.signals.failed.connect(self._on_stage_failed)
+        # 保留引用，避免信号对象在任务完成前被回收
+        self._tasks[name] = task
+        self._pool.start(task)
+
+    def _on_stage_finished(self, name: str, result: object) -> None:
+        self._tasks.pop(name, None)
+        if name == "data":
+            quotes, compliments = result  # type: ignore[misc]
+            self._quotes = quotes
+            self.data_loaded.emit(quotes, compliments, [])
+            self.data_finished.emit()
+        elif name == "fonts":
+            self._register_fonts(result)  # type: ignore[arg-type]
+        self.complete(name)
+        self._start_layout_if_ready()
+
+    def _on_stage_failed(self, name: str, message: str) -> None:
+        self._tasks.pop(name, None)
+        self._failed = True
+        print(f"错误: 启动阶段 {name} 失败: {message}")
+        self.failed.emit(message)
+
+    def _register_fonts(self, fonts: List[Tuple[str, bytes]]) -> None:
+        for filename, data in fonts:
+            if QFontDatabase.addApplicationFontFromData(data) < 0:
+                print(f"警告: 字体 {filename} 载入失败")
+        self._fonts_registered = True
+        # 字形预热需要访问界面线程的字体缓存，在事件循环空闲时逐个执行
+        QTimer.singleShot(0, self._run_warm_up)
+
+    def _run_warm_up(self) -> None:
+        if self._gui_stages:
+            self._gui_stages.pop(0)()
+            QTimer.singleShot(0, self._run_warm_up)
+            return
+        self.complete("glyphs")
+
+    def _start_layout_if_ready(self) -> None:
+        if self._quotes is None or not self._fonts_registered or self._layout_started:
+            return
+        self._layout_started = True
+        layout_cache.prefill_async(self._quotes, on_finished=lambda _measured: self.complete("layout"))
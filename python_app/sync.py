@@ -0,0 +1,298 @@
+"""多屏同步：几台机器（或同一台机器上的几个实例）拼成一块共享画布。
+
+主屏（``--sync-master``）是时钟主：经 UDP 把演出时间、倍速、暂停状态和阶段事件
+发给所有从屏，并在从屏加入时告知种子。从屏（``--sync-follow HOST[:PORT]``）拿到
+种子后才创建看板，等主屏开场后再开场；之后用 ping/pong 测得的往返时间补偿单程
+延迟，小误差通过微调倍速平滑追赶，大误差直接快进。所有屏使用同一份数据与种子，
+阶段、出卡和每次烟花绽放都相同；配合 ``--sync-tile``，每块屏只显示共享画布中
+属于自己的那一块，卡片与烟花可以横跨多块屏幕。不依赖任何外部服务。
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, Deque, Dict, List, Optional, Tuple
+
+from PySide6.QtCore import QEventLoop, QObject, QRect, QTimer, Signal
+from PySide6.QtNetwork import QHostAddress, QUdpSocket
+
+if TYPE_CHECKING:  # pragma: no cover - 仅用于类型标注
+    from .board import QuoteBoard
+
+SYNC_PORT = 47810
+PROTOCOL_VERSION = 1
+
+
+@dataclass(frozen=True)
+class CanvasTile:
+    """本屏在共享画布中的位置，写法同 X11 几何：``3840x1080+1920+0``。"""
+
+    canvas_width: int
+    canvas_height: int
+    x: int
+    y: int
+
+    @classmethod
+    def parse(cls, value: str) -> "CanvasTile":
+        size, _, offset = value.lower().partition("+")
+        width, _, height = size.partition("x")
+        x, _, y = offset.partition("+")
+        try:
+            return cls(int(width), int(height), int(x or 0), int(y or 0))
+        except ValueError:
+            raise ValueError(f"无法解析画布分块 {value}（应为 宽x高+X+Y，如 3840x1080+1920+0）") from None
+
+    def canvas_rect(self) -> QRect:
+        """共享画布在本屏坐标系中的位置。"""
+        return QRect(-self.x, -self.y, self.canvas_width, self.canvas_height)
+
+
+def parse_address(value: str) -> Tuple[str, int]:
+    host, _, port = value.rpartition(":")
+    if not host:
+        return value, SYNC_PORT
+    return host, int(port)
+
+
+def _encode(kind: str, **fields: object) -> bytes:
+    return json.dumps({"v": PROTOCOL_VERSION, "type": kind, **fields}, separators=(",", ":")).encode("utf-8")
+
+
+def _decode(data: bytes) -> Optional[Dict[str, object]]:
+    try:
+        message = json.loads(data.decode("utf-8"))
+    except (UnicodeDecodeError, ValueError):
+        return None
+    if not isinstance(message, dict) or message.get("v") != PROTOCOL_VERSION:
+        return None
+    return message
+
+
+def _show_state(board: "QuoteBoard") -> Dict[str, object]:
+    return {
+        "show_ms": board.show_time_ms() if board.show_started else None,
+        "speed": board.show_clock.speed,
+        # 窗口隐藏、idle 等挂起同样会冻结主屏的演出时钟，从屏一并停下
+        "paused": board.show_clock.paused,
+        "phase": board.card_phase,
+    }
+
+
+class SyncMaster(QObject):
+    """时钟主：应答从屏的 hello/ping，并定期把演出状态发给所有在线的从屏。"""
+
+    def __init__(
+        self,
+        board: "QuoteBoard",
+        seed: int,
+        port: int = SYNC_PORT,
+        tick_ms: int = 100,
+        peer_timeout_s: float = 10.0,
+        parent: Optional[QObject] = None,
+    ) -> None:
+        super().__init__(parent)
+        self.board = board
+        self.seed = seed
+        self.peer_timeout_s = peer_timeout_s
+        self.peers: Dict[Tuple[str, int], float] = {}  # (地址, 端口) -> 最近一次收到消息的时刻
+        self._socket = QUdpSocket(self)
+        if not self._socket.bind(QHostAddress(QHostAddress.SpecialAddress.AnyIPv4), port):
+            raise OSError(f"无法监听 UDP 端口 {port}: {self._socket.errorString()}")
+        self._socket.readyRead.connect(self._on_ready_read)
+        self._timer = QTimer(self)
+        self._timer.setInterval(tick_ms)
+        self._timer.timeout.connect(self._on_tick)
+        self._timer.start()
+        board.phase_changed.connect(self._on_phase_changed)
+        print(f"[sync] 主屏已在 UDP {port} 端口等待从屏，种子 {seed}")
+
+    def _send(self, peer: Tuple[str, int], kind: str, **fields: object) -> None:
+        self._socket.writeDatagram(_encode(kind, **fields), QHostAddress(peer[0]), peer[1])
+
+    def _broadcast(self, kind: str, **fields: object) -> None:
+        data = _encode(kind, **fields)
+        for host, port in self.peers:
+            self._socket.writeDatagram(data, QHostAddress(host), port)
+
+    def _on_ready_read(self) -> None:
+        while self._socket.hasPendingDatagrams():
+            datagram = self._socket.receiveDatagram()
+            message = _decode(bytes(datagram.data()))
+            if message is None:
+                continue
+            peer = (datagram.senderAddress().toString(), datagram.senderPort())
+            kind = message.get("type")
+            if kind == "hello":
+                if peer not in self.peers:
+                    print(f"[sync] 从屏 {peer[0]}:{peer[1]} 已加入")
+                self.peers[peer] = time.monotonic()
+                self._send(
+                    peer,
+                    "welcome",
+                    seed=self.seed,
+                    timeline_ms=self.board.timeline.duration_ms,
+                    **_show_state(self.board),
+                )
+            elif kind == "ping":
+                self.peers[peer] = time.monotonic()
+                self._send(peer, "pong", t0=message.get("t0"), **_show_state(self.board))
+            elif kind == "bye":
+                self.peers.pop(peer, None)
+
+    def _on_tick(self) -> None:
+        deadline = time.monotonic() - self.peer_timeout_s
+        for peer, seen in list(self.peers.items()):
+            if seen < deadline:
+                print(f"[sync] 从屏 {peer[0]}:{peer[1]} 已失联")
+                del self.peers[peer]
+        if self.peers:
+            self._broadcast("tick", **_show_state(self.board))
+
+    def _on_phase_changed(self, _phase: str) -> None:
+        # 阶段事件立即发出，从屏不必等下一次 tick 就能校正
+        if self.peers:
+            self._broadcast("phase", **_show_state(self.board))
+
+
+class SyncFollower(QObject):
+    """从屏：把本地演出时钟锁定到主屏。
+
+    主屏时间估计为 ``show_ms + 单程延迟 × 倍速``，单程延迟取最近若干次 ping 往返
+    时间的最小值的一半（排队造成的抖动只会让往返变长）。误差在 ``hard_ms`` 以内时
+    按 ``slew_window_ms`` 内追平的速度微调倍速，超过时落后则快进、领先则放慢等待。
+    """
+
+    synced = Signal()
+
+    def __init__(
+        self,
+        host: str,
+        port: int = SYNC_PORT,
+        ping_ms: int = 1000,
+        hard_ms: float = 500.0,
+        slew_window_ms: float = 2000.0,
+        max_slew: float = 0.5,
+        parent: Optional[QObject] = None,
+    ) -> None:
+        super().__init__(parent)
+        self.master = (host, port)
+        self.hard_ms = hard_ms
+        self.slew_window_ms = slew_window_ms
+        self.max_slew = max_slew
+        self.board: Optional["QuoteBoard"] = None
+        self.welcome: Optional[Dict[str, object]] = None
+        self.master_started = False
+        self.last_error_ms = 0.0
+        self._master_speed = 1.0
+        self._rtts_ms: Deque[float] = deque(maxlen=16)
+        self._on_master_start: List[Callable[[], None]] = []
+        self._socket = QUdpSocket(self)
+        self._socket.bind(QHostAddress(QHostAddress.SpecialAddress.AnyIPv4), 0)
+        self._socket.readyRead.connect(self._on_ready_read)
+        self._hello_timer = QTimer(self)
+        self._hello_timer.setInterval(1000)
+        self._hello_timer.timeout.connect(lambda: self._send("hello"))
+        self._ping_timer = QTimer(self)
+        self._ping_timer.setInterval(ping_ms)
+        self._ping_timer.timeout.connect(self._ping)
+
+    @property
+    def latency_ms(self) -> float:
+        return min(self._rtts_ms) / 2.0 if self._rtts_ms else 0.0
+
+    def _send(self, kind: str, **fields: object) -> None:
+        self._socket.writeDatagram(_encode(kind, **fields), QHostAddress(self.master[0]), self.master[1])
+
+    def _ping(self) -> None:
+        self._send("ping", t0=time.perf_counter())
+
+    def wait_for_master(self, timeout_s: float = 30.0) -> Optional[Dict[str, object]]:
+        """向主屏报到并等待应答，返回 welcome 消息（含种子）；超时返回 None。"""
+        if self.welcome is None:
+            loop = QEventLoop()
+            self.synced.connect(loop.quit)
+            QTimer.singleShot(round(timeout_s * 1000), loop.quit)
+            self._send("hello")
+            self._hello_timer.start()
+            print(f"[sync] 正在连接主屏 {self.master[0]}:{self.master[1]}")
+            loop.exec()
+            self.synced.disconnect(loop.quit)
+            self._hello_timer.stop()
+        return self.welcome
+
+    def attach(self, board: "QuoteBoard") -> None:
+        self.board = board
+        self._ping_timer.start()
+        self._ping()
+
+    def when_master_started(self, callback: Callable[[], None]) -> None:
+        """主屏开场后再调用 ``callback``（用于推迟本屏的开场）。"""
+        board = self.board
+        expected = self.welcome.get("timeline_ms") if self.welcome else None
+        if board is not None and expected and expected != board.timeline.duration_ms:
+            print(f"警告: [sync] 本屏时间线 {board.timeline.duration_ms} ms 与主屏 {expected} ms 不一致，请确认数据相同")
+        if self.master_started:
+            callback()
+        else:
+            self._on_master_start.append(callback)
+
+    def _on_ready_read(self) -> None:
+        while self._socket.hasPendingDatagrams():
+            datagram = self._socket.receiveDatagram()
+            message = _decode(bytes(datagram.data()))
+            if message is None:
+                continue
+            kind = message.get("type")
+            if kind == "welcome":
+                if self.welcome is None:
+                    self.welcome = message
+                    print(f"[sync] 已连接主屏，种子 {message.get('seed')}")
+                    self.synced.emit()
+                self._follow(message, self.latency_ms)
+            elif kind == "pong":
+                t0 = message.get("t0")
+                if isinstance(t0, (int, float)):
+                    self._rtts_ms.append((time.perf_counter() - t0) * 1000.0)
+                self._follow(message, self.latency_ms)
+            elif kind in ("tick", "phase"):
+                self._follow(message, self.latency_ms)
+
+    def _follow(self, state: Dict[str, object], latency_ms: float) -> None:
+        show_ms = state.get("show_ms")
+        if show_ms is None:
+            return
+        if not self.master_started:
+            self.master_started = True
+            callbacks, self._on_master_start = self._on_master_start, []
+            for callback in callbacks:
+                callback()
+        board = self.board
+        if board is None or not board.show_started:
+            return
+        paused = bool(state.get("paused"))
+        # 单独的原因：不覆盖本屏的空格暂停，也不影响隐藏、idle 等本地原因
+        board.power.set_reason("sync_paused", paused)
+        if paused:
+            return
+        speed = float(state.get("speed") or 1.0)
+        if speed != self._master_speed:
+            self._master_speed = speed
+            board.set_speed(speed)
+        error = float(show_ms) + latency_ms * speed - board.show_time_ms()
+        self.last_error_ms = error
+        if error > self.hard_ms:
+            print(f"[sync] 落后主屏 {error:.0f} ms，快进追上")
+            board.show_clock.advance(error)
+            board.show_clock.set_speed(speed)
+        elif error < -self.hard_ms:
+            board.show_clock.set_speed(speed * (1.0 - self.max_slew))
+        else:
+            slew = max(-self.max_slew, min(self.max_slew, error / self.slew_window_ms))
+            board.show_clock.set_speed(speed * (1.0 + slew))
+
+    def close(self) -> None:
+        self._send("bye")
+        self._ping_timer.stop()
@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from PySide6.QtCore import QObject, QRunnable, Qt, QThreadPool, Signal
+from PySide6.QtGui import QFont, QFontMetrics
+
+from .models import Quote
+
+# 卡片正文的字体与边距，QuoteCard 与后台预排版共用同一份定义
+CONTENT_FONTS: Dict[str, Tuple[str, int]] = {
+    "program": ("Microsoft YaHei", 13),
+    "letter": ("Songti SC", 22),
+}
+CONTENT_MARGINS: Dict[str, Tuple[int, int, int, int]] = {
+    "program": (24, 12, 24, 22),
+    "letter": (34, 30, 34, 36),
+}
+CONTENT_COLORS: Dict[str, str] = {
+    "program": "#6b3a29",
+    "letter": "#2c2c2c",
+}
+_TARGET_WIDTHS: Dict[str, Tuple[int, int, int]] = {
+    "program": (420, 500, 580),
+    "letter": (440, 520, 600),
+}
+
+
+def card_mode(quote: Quote) -> str:
+    return "program" if quote.category == "text" else "letter"
+
+
+def content_font(mode: str) -> QFont:
+    family, size = CONTENT_FONTS[mode]
+    return QFont(family, size)
+
+
+def target_width_for(mode: str, length: int) -> int:
+    short, medium, long = _TARGET_WIDTHS[mode]
+    if length <= 60:
+        return short
+    if length <= 120:
+        return medium
+    return long
+
+
+def available_text_width(mode: str, target_width: int) -> int:
+    left, _top, right, _bottom = CONTENT_MARGINS[mode]
+    return max(160, target_width - left - right)
+
+
+def measure_text_height(font: QFont, text: str, available_width: int) -> int:
+    metrics = QFontMetrics(font)
+    return metrics.boundingRect(
+        0,
+        0,
+        available_width,
+        0,
+        Qt.TextFlag.TextWordWrap | Qt.AlignmentFlag.AlignLeft,
+        text,
+    ).height()
+
+
+class _PrefillSignals(QObject):
+    finished = Signal(int)
+
+
+class _PrefillTask(QRunnable):
+    def __init__(self, cache: "CardLayoutCache", texts: Tuple[Tuple[str, str], ...]) -> None:
+        super().__init__()
+        self.cache = cache
+        self.texts = texts
+        self.signals = _PrefillSignals()
+
+    def run(self) -> None:
+        fonts = {mode: content_font(mode) for mode in CONTENT_FONTS}
+        measured = 0
+        for text, mode in self.texts:
+            font = fonts[mode]
+            width = target_width_for(mode, len(text))
+            if self.cache.lookup(text, mode, font.key(), width) is not None:
+                continue
+            height = measure_text_height(font, text, available_text_width(mode, width))
+            self.cache.store(text, mode, font.key(), width, height)
+            measured += 1
+        self.signals.finished.emit(measured)
+
+
+class CardLayoutCache:
+    """卡片正文折行高度的缓存，键为 (文本, 模式, 字体, 目标宽度)。
+
+    折行测量是 ``QuoteCard`` 计算尺寸时最耗时的部分，而 Qt 布局会反复调用
+    ``sizeHint``。载入金句后即可在线程池中批量预排版，卡片展示时直接命中缓存。
+    """
+
+    def __init__(self, max_entries: int = 50000) -> None:
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._heights: "OrderedDict[Tuple[str, str, str, int], int]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._tasks: List[_PrefillTask] = []
+
+    def lookup(self, text: str, mode: str, font_key: str, target_width: int) -> Optional[int]:
+        with self._lock:
+            return self._heights.get((text, mode, font_key, target_width))
+
+    def store(self, text: str, mode: str, font_key: str, target_width: int, height: int) -> None:
+        with self._lock:
+            self._heights[(text, mode, font_key, target_width)] = height
+            while len(self._heights) > self.max_entries:
+                self._heights.popitem(last=False)
+
+    def text_height(self, font: QFont, text: str, mode: str, target_width: int) -> int:
+        font_key = font.key()
+        height = self.lookup(text, mode, font_key, target_width)
+        if height is not None:
+            self.hits += 1
+            return height
+        self.misses += 1
+        height = measure_text_height(font, text, available_text_width(mode, target_width))
+        self.store(text, mode, font_key, target_width, height)
+        return height
+
+    def prefill_async(
+        self,
+        quotes: Iterable[Quote],
+        pool: Optional[QThreadPool] = None,
+        on_finished: Optional[Callable[[int], None]] = None,
+    ) -> _PrefillSignals:
+        """在线程池中为一批金句预先测量折行高度。
+
+        完成回调要通过 ``on_finished`` 在任务启动前连接；任务可能在本函数返回前
+        就已结束，返回后再连接会错过信号。
+        """
+        texts = tuple((quote.text.strip() or " ", card_mode(quote)) for quote in quotes)
+        task = _PrefillTask(self, texts)
+        task.signals.finished.connect(lambda measured, task=task: self._on_prefill_finished(task, measured))
+        if on_finished is not None:
+            task.signals.finished.connect(on_finished)
+        # 保留引用，避免信号对象在任务完成前被回收
+        self._tasks.append(task)
+        (pool or QThreadPool.globalInstance()).start(task)
+        return task.signals
+
+    def _on_prefill_finished(self, task: _PrefillTask, measured: int) -> None:
+        if task in self._tasks:
+            self._tasks.remove(task)
+        print(f"[layout] 预排版完成，新测量 {measured} 条，缓存 {len(self._heights)} 条")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._heights)
+
+
+layout_cache = CardLayoutCache()
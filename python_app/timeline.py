@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+# 演出阶段按出现顺序排列，seek 只能在这个顺序上向后跳
+SHOW_PHASES = ("intro", "text", "book", "post_fireworks", "other", "idle")
+
+
+def derive_rng(seed: Optional[int], stream: str) -> random.Random:
+    """由演出种子派生一条独立的随机数流。
+
+    各流的抽取次数互不影响：画质、机器快慢等只改变某一流的消耗时，其余各流照旧。
+    ``seed`` 为 None 时不可复现。
+    """
+    if seed is None:
+        return random.Random()
+    return random.Random(f"{seed}:{stream}")
+
+
+@dataclass(frozen=True)
+class ShowTimings:
+    """演出节奏的全部时长（毫秒）。"""
+
+    intro_ms: int = 5200
+    card_fade_ms: int = 600
+    fade_all_ms: int = 1600
+    phase_gap_ms: int = 500
+    text_interval_ms: int = 800
+    book_interval_ms: int = 1200
+    other_interval_ms: Tuple[int, int] = (2400, 3200)
+    heart_interval_ms: int = 2000  # 没有祝福语时每轮烟花的间隔
+    # 进入烟花阶段时先淡入城堡背景，再停顿 fireworks_pause_ms 后开始第一轮烟花；
+    # 关闭时间隔 phase_gap_ms 直接开始
+    fireworks_fade_in: bool = False
+    fireworks_fade_ms: int = 1000
+    fireworks_pause_ms: int = 2000
+    compliment_char_ms: int = 120
+
+    @property
+    def fireworks_lead_ms(self) -> int:
+        """烟花阶段开始到第一轮烟花的时间。"""
+        if self.fireworks_fade_in:
+            return self.fireworks_fade_ms + self.fireworks_pause_ms
+        return self.phase_gap_ms
+
+    def compliment_interval_ms(self, text: str) -> int:
+        """一轮烟花的时长：祝福语逐字显示完，再停留 1~3 秒供阅读。"""
+        if not text:
+            return self.heart_interval_ms
+        extra_display_time = min(3000, max(1000, len(text) * 20))
+        return len(text) * self.compliment_char_ms + extra_display_time
+
+
+@dataclass(frozen=True)
+class Cue:
+    at_ms: int  # 相对开场（启动画面结束）的虚拟时间
+    event: str  # phase / card / burst / end
+    phase: str
+
+
+@dataclass
+class ShowTimeline:
+    """编译好的演出时间线：各阶段、每张卡片与每轮烟花的时刻。
+
+    other 阶段的随机出卡间隔在编译时由种子一次性抽好，演出时按序取用，
+    因此同一份数据与种子总是得到同一条时间线。
+    """
+
+    cues: List[Cue] = field(default_factory=list)
+    other_intervals: List[int] = field(default_factory=list)
+    seed: Optional[int] = None
+
+    def __iter__(self) -> Iterator[Cue]:
+        return iter(self.cues)
+
+    def __len__(self) -> int:
+        return len(self.cues)
+
+    @property
+    def duration_ms(self) -> int:
+        return self.cues[-1].at_ms if self.cues else 0
+
+    def phase_starts(self) -> Dict[str, int]:
+        return {cue.phase: cue.at_ms for cue in self.cues if cue.event == "phase"}
+
+    def phase_start(self, phase: str) -> int:
+        starts = self.phase_starts()
+        if phase not in starts:
+            raise ValueError(f"时间线中没有阶段 {phase}（可选: {', '.join(starts)}）")
+        return starts[phase]
+
+    def other_interval(self, index: int) -> Optional[int]:
+        if 0 <= index < len(self.other_intervals):
+            return self.other_intervals[index]
+        return None
+
+
+def compile_timeline(
+    timings: ShowTimings,
+    text_count: int,
+    book_count: int,
+    other_count: int,
+    compliments: Sequence[str],
+    seed: Optional[int] = None,
+    intro: bool = True,
+) -> ShowTimeline:
+    """按 QuoteBoard 的阶段流转规则，把整场演出展开成时间线。
+
+    ``intro=False`` 用于常驻模式的后续轮次：没有开场卡片，直接从 text 阶段开始。
+    """
+    rng = random.Random(seed)
+    low, high = timings.other_interval_ms
+    timeline = ShowTimeline(
+        other_intervals=[rng.randint(low, high) for _ in range(other_count)],
+        seed=seed,
+    )
+    cues = timeline.cues
+    now = 0
+
+    def cards(phase: str, count: int, interval: int) -> None:
+        nonlocal now
+        for _ in range(count):
+            now += interval
+            cues.append(Cue(now, "card", phase))
+
+    if intro:
+        cues.append(Cue(now, "phase", "intro"))
+        now += timings.intro_ms + timings.card_fade_ms
+
+    fireworks = False
+    if text_count:
+        cues.append(Cue(now, "phase", "text"))
+        cards("text", text_count, timings.text_interval_ms)
+        now += timings.fade_all_ms
+        if book_count:
+            cues.append(Cue(now, "phase", "book"))
+            now += timings.phase_gap_ms
+            cards("book", book_count, timings.book_interval_ms)
+            now += timings.fade_all_ms
+        fireworks = True
+    elif book_count:
+        # 没有 text 时直接进入 book，网格未初始化，结束时没有需要淡出的卡片
+        cues.append(Cue(now, "phase", "book"))
+        cards("book", book_count, timings.book_interval_ms)
+        fireworks = True
+
+    if fireworks:
+        cues.append(Cue(now, "phase", "post_fireworks"))
+        now += timings.fireworks_lead_ms
+        rounds = len(compliments) if compliments else 3
+        for index in range(rounds):
+            cues.append(Cue(now, "burst", "post_fireworks"))
+            text = compliments[index] if index < len(compliments) else ""
+            now += timings.compliment_interval_ms(text)
+
+    if other_count:
+        cues.append(Cue(now, "phase", "other"))
+        for interval in timeline.other_intervals:
+            now += interval
+            cues.append(Cue(now, "card", "other"))
+    # other 的最后一张卡片出现后（或没有 other 时）随即进入 idle
+    cues.append(Cue(now, "phase", "idle"))
+    cues.append(Cue(now, "end", "idle"))
+    return timeline
@@ -0,0 +1,75 @@
+import time
+
+import pytest
+
+pytest.importorskip("PySide6")
+
+from PySide6.QtCore import QCoreApplication, QSize  # noqa: E402
+from PySide6.QtGui import QColor, QImage  # noqa: E402
+
+from python_app.backgrounds import FOOTER_HEIGHT_RATIO, LAYOUT_COVER, LAYOUT_FOOTER, BackgroundCache  # noqa: E402
+
+
+def _settle(cache, timeout=5.0):
+    settled = []
+    cache.all_settled.connect(lambda: settled.append(True))
+    deadline = time.monotonic() + timeout
+    while not settled and time.monotonic() < deadline:
+        QCoreApplication.processEvents()
+        time.sleep(0.005)
+    return bool(settled)
+
+
+@pytest.fixture
+def image_path(tmp_path):
+    image = QImage(QSize(400, 200), QImage.Format.Format_RGB32)
+    image.fill(QColor("#336699"))
+    path = tmp_path / "background.png"
+    assert image.save(str(path))
+    return str(path)
+
+
+def test_decoded_image_is_scaled_once_per_size(qapp, image_path):
+    cache = BackgroundCache()
+    ready = []
+    cache.image_ready.connect(ready.append)
+    cache.load("default", image_path, decode_hint=QSize(400, 200))
+    assert cache.is_loading()
+    assert cache.scaled("default", QSize(100, 100), LAYOUT_COVER, 1.0) is None
+    assert _settle(cache)
+    assert ready == ["default"]
+    assert cache.source_size("default") == QSize(400, 200)
+
+    cover = cache.scaled("default", QSize(100, 100), LAYOUT_COVER, 2.0)
+    # 铺满：按较短边放大到覆盖整个区域
+    assert (cover.width(), cover.height(), cover.devicePixelRatio()) == (400, 200, 2.0)
+    assert cache.scaled("default", QSize(100, 100), LAYOUT_COVER, 2.0) is cover
+
+    footer = cache.scaled("default", QSize(1000, 500), LAYOUT_FOOTER, 1.0)
+    assert footer.height() == int(500 * FOOTER_HEIGHT_RATIO)
+    assert footer.width() == footer.height() * 2
+
+
+def test_scaled_results_are_bounded(qapp, image_path):
+    cache = BackgroundCache(max_scaled=2)
+    cache.load("default", image_path, decode_hint=QSize(400, 200))
+    assert _settle(cache)
+    first = cache.scaled("default", QSize(100, 50), LAYOUT_COVER, 1.0)
+    cache.scaled("default", QSize(200, 100), LAYOUT_COVER, 1.0)
+    cache.scaled("default", QSize(300, 150), LAYOUT_COVER, 1.0)
+    assert cache.scaled("default", QSize(100, 50), LAYOUT_COVER, 1.0) is not first
+
+
+def test_large_images_decode_near_the_hint(qapp, image_path):
+    cache = BackgroundCache()
+    cache.load("default", image_path, decode_hint=QSize(100, 40))
+    assert _settle(cache)
+    assert cache.source_size("default") == QSize(100, 50)
+
+
+def test_failed_decode_still_settles(qapp, tmp_path):
+    cache = BackgroundCache()
+    cache.load("book", str(tmp_path / "missing.png"), decode_hint=QSize(100, 100))
+    assert _settle(cache)
+    assert not cache.is_ready("book")
+    assert not cache.is_loading()
@@ -0,0 +1,49 @@
+import json
+import os
+import random
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("PySide6")
+
+from python_app.benchmark import PHASES, _frame_summary, synthetic_quotes  # noqa: E402
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def test_synthetic_quotes_are_reproducible_and_split_by_category():
+    quotes = synthetic_quotes(30, 40, random.Random(3))
+    assert quotes == synthetic_quotes(30, 40, random.Random(3))
+    assert [quote.category for quote in quotes[:6]] == ["text", "book", "other"] * 2
+    assert all(quote.text.startswith(f"{index:04d} ") for index, quote in enumerate(quotes))
+
+
+def test_frame_summary_percentiles():
+    summary = _frame_summary([float(value) for value in range(1, 101)])
+    assert summary == {"mean": 50.5, "p50": 51.0, "p95": 95.0, "p99": 99.0, "max": 100.0}
+    assert _frame_summary([]) == {}
+
+
+def test_cli_writes_a_report_for_every_phase(tmp_path):
+    output = tmp_path / "bench.json"
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    subprocess.run(
+        [
+            sys.executable, "-m", "python_app.benchmark",
+            "--quotes", "30", "--frames", "4", "--size", "640x360", "--no-tracemalloc", "-o", str(output),
+        ],
+        cwd=ROOT,
+        env=env,
+        check=True,
+        capture_output=True,
+        timeout=120,
+    )
+    report = json.loads(output.read_text(encoding="utf-8"))
+    assert list(report["phases"]) == list(PHASES)
+    assert report["config"]["size"] == [640, 360]
+    for phase in report["phases"].values():
+        assert phase["frames"] == 4
+        assert set(phase["frame_ms"]) == {"mean", "p50", "p95", "p99", "max"}
@@ -0,0 +1,68 @@
+import pytest
+
+pytest.importorskip("PySide6")
+
+from python_app.card_pool import CardPool, CardPoolStats  # noqa: E402
+from python_app.models import Quote  # noqa: E402
+
+
+def _text(index: int) -> Quote:
+    return Quote(f"金句{index}", "#FFFFFF", "text")
+
+
+def _book(index: int) -> Quote:
+    return Quote(f"书摘{index}", "#FFCC00", "book")
+
+
+def test_released_card_is_rebound_for_the_same_mode(qapp):
+    created = []
+    pool = CardPool(on_create=created.append)
+    card = pool.acquire(_text(0))
+    card.show()
+    pool.release(card)
+    assert card.isHidden()
+    assert pool.idle_count() == 1
+
+    again = pool.acquire(_text(1))
+    assert again is card
+    assert again.quote == _text(1)
+    assert again.content_label.text() == "金句1"
+    assert created == [card]
+    assert (pool.stats.created, pool.stats.reused) == (1, 1)
+
+
+def test_modes_are_pooled_separately(qapp):
+    pool = CardPool()
+    program = pool.acquire(_text(0))
+    pool.release(program)
+    letter = pool.acquire(_book(0))
+    assert letter is not program
+    assert letter.mode == "letter"
+    assert pool.idle_count() == 1
+
+
+def test_double_release_is_ignored(qapp):
+    pool = CardPool()
+    card = pool.acquire(_text(0))
+    pool.release(card)
+    pool.release(card)
+    assert pool.idle_count() == 1
+    assert pool.stats.released == 1
+
+
+def test_cards_beyond_high_water_are_discarded(qapp):
+    pool = CardPool(high_water=1)
+    first, second = pool.acquire(_text(0)), pool.acquire(_text(1))
+    pool.release(first)
+    pool.release(second)
+    assert pool.idle_count() == 1
+    assert pool.stats.discarded == 1
+    pool.clear()
+    assert pool.idle_count() == 0
+
+
+def test_stats_summary():
+    stats = CardPoolStats(created=4, reused=12, released=10, discarded=1)
+    assert stats.reuse_rate == 0.75
+    assert stats.as_dict() == {"created": 4, "reused": 12, "released": 10, "discarded": 1, "reuse_rate": 0.75}
+    assert CardPoolStats().reuse_rate == 0.0
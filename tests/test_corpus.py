@@ -0,0 +1,101 @@
+import json
+import os
+import random
+
+import pytest
+
+from python_app.corpus import (
+    CORPUS_DIRNAME,
+    CORPUS_FILENAME,
+    CompiledCorpus,
+    compile_corpus,
+    corpus_is_fresh,
+    load_corpus,
+    stream_corpus,
+)
+from python_app.data_loader import collect_quotes, load_achievements, order_quotes
+
+
+def _write_json(path, items):
+    path.write_text(json.dumps(items, ensure_ascii=False), encoding="utf-8")
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    data = tmp_path / "data"
+    data.mkdir()
+    _write_json(data / "text.json", [{"text": f"金句{i}", "color": f"#0000{i % 3:02d}"} for i in range(40)] + [{"text": "金句1"}])
+    _write_json(data / "book.json", [{"text": f"书摘{i}", "color": "#FFCC00"} for i in range(15)])
+    (data / "QA.txt").write_text("Q：问一\nA：答一\nQ：问二\nA：答二\n", encoding="utf-8")
+    _write_json(data / "zanshang.json", [{"text": "祝福", "color": "#F3B8D9"}, "谢谢"])
+    return data
+
+
+def _rows(quotes):
+    return [(quote.text, quote.color, quote.category) for quote in quotes]
+
+
+def test_compiled_corpus_round_trips_parsed_sources(data_dir):
+    path = compile_corpus(data_dir)
+    assert path == data_dir / CORPUS_DIRNAME / CORPUS_FILENAME
+    corpus = CompiledCorpus(path)
+    try:
+        store, achievements = corpus.read()
+    finally:
+        corpus.close()
+    expected = collect_quotes(data_dir)
+    assert _rows(store) == _rows(quote for quotes in expected.values() for quote in quotes)
+    assert store.categories() == ["text", "book", "other"]
+    assert achievements == load_achievements(data_dir)
+
+
+def test_truncated_corpus_is_rejected(data_dir):
+    path = compile_corpus(data_dir)
+    path.write_bytes(path.read_bytes()[:-3])
+    with pytest.raises(ValueError):
+        CompiledCorpus(path)
+
+
+def test_manifest_tracks_source_content(data_dir):
+    assert not corpus_is_fresh(data_dir)
+    compile_corpus(data_dir)
+    assert corpus_is_fresh(data_dir)
+
+    # 只改 mtime：内容哈希相同，仍然有效
+    book = data_dir / "book.json"
+    stat = book.stat()
+    os.utime(book, ns=(stat.st_atime_ns, stat.st_mtime_ns + 5_000_000_000))
+    assert corpus_is_fresh(data_dir)
+
+    # 同样大小、不同内容
+    book.write_text(book.read_text(encoding="utf-8").replace("书摘1", "书摘X"), encoding="utf-8")
+    assert not corpus_is_fresh(data_dir)
+
+
+def test_adding_a_source_invalidates_the_corpus(data_dir):
+    compile_corpus(data_dir)
+    (data_dir / "extra.txt").write_text("新的一行\n", encoding="utf-8")
+    assert not corpus_is_fresh(data_dir)
+
+
+def test_load_corpus_matches_order_quotes_for_the_same_seed(data_dir):
+    expected = order_quotes(collect_quotes(data_dir), random.Random(5))
+    store, _ = load_corpus(data_dir, random.Random(5))
+    assert corpus_is_fresh(data_dir)
+    again, _ = load_corpus(data_dir, random.Random(5))
+    assert _rows(store) == _rows(expected)
+    assert _rows(again) == _rows(expected)
+
+
+def test_stream_yields_every_quote_and_writes_the_corpus(data_dir):
+    streamed = []
+    finished = []
+    for batch, done in stream_corpus(data_dir, random.Random(1), first_batch=4, batch_size=8, shuffle_buffer=6):
+        streamed.extend(batch)
+        if done is not None:
+            finished.append(done)
+    assert finished == ["text", "book", "other"]
+    expected = collect_quotes(data_dir)
+    for category, quotes in expected.items():
+        assert sorted(_rows(q for q in streamed if q.category == category)) == sorted(_rows(quotes))
+    assert corpus_is_fresh(data_dir)
@@ -0,0 +1,108 @@
+import json
+
+import pytest
+
+from python_app.data_loader import (
+    DEFAULT_QUOTE_COLOR,
+    QuoteSource,
+    collect_quotes,
+    discover_sources,
+    iter_quotes,
+    iter_source,
+    load_quote_source,
+)
+from python_app.models import Quote
+
+
+def _write(path, text):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+
+
+def _source(path, category="qa", color="#F5DEB3"):
+    return QuoteSource(path, path.name, category, color)
+
+
+def test_default_rules_without_manifest(tmp_path):
+    for name in ("book.json", "text.json", "zz.jsonl", "notes.txt", "zanshang.json", "song.mp3", ".hidden.json"):
+        _write(tmp_path / name, "[]")
+    _write(tmp_path / ".compiled" / "more.json", "[]")
+    _write(tmp_path / "live_wishes.jsonl", "")
+    assert [(s.name, s.category) for s in discover_sources(tmp_path)] == [
+        ("text.json", "text"),
+        ("book.json", "book"),
+        ("notes.txt", "other"),
+        ("zz.jsonl", "other"),
+    ]
+
+
+def test_manifest_rules_order_categories_and_colours(tmp_path):
+    _write(tmp_path / "sources.json", json.dumps({
+        "sources": [
+            {"pattern": "packs/spring/*", "category": "spring", "color": "#FFB6C1"},
+            {"pattern": "packs/*", "category": "festival"},
+            {"pattern": "text.json", "category": "text"},
+        ],
+        "default_category": "misc",
+        "ignore": ["drafts/*"],
+    }))
+    for name in ("text.json", "packs/a.jsonl", "packs/spring/b.txt", "drafts/c.json", "loose.txt"):
+        _write(tmp_path / name, "[]")
+    sources = discover_sources(tmp_path)
+    assert [(s.name, s.category, s.color) for s in sources] == [
+        ("text.json", "text", DEFAULT_QUOTE_COLOR),
+        ("packs/spring/b.txt", "spring", "#FFB6C1"),
+        ("packs/a.jsonl", "festival", DEFAULT_QUOTE_COLOR),
+        ("loose.txt", "misc", DEFAULT_QUOTE_COLOR),
+    ]
+
+
+def test_manifest_rule_without_category_is_rejected(tmp_path):
+    _write(tmp_path / "sources.json", json.dumps({"sources": [{"pattern": "*.txt"}]}))
+    with pytest.raises(ValueError):
+        discover_sources(tmp_path)
+
+
+def test_text_source_groups_questions_and_answers(tmp_path):
+    path = tmp_path / "QA.txt"
+    _write(path, "Q：什么是自由？\u200b\nA：像猪一样\n特立独行。\n\n问：第二问\n答：第二答\nA: 没有问题的回答\n")
+    assert [quote.text for quote in iter_source(_source(path))] == [
+        "什么是自由？\n像猪一样特立独行。",
+        "第二问\n第二答",
+        "没有问题的回答",
+    ]
+
+
+def test_text_source_without_markers_is_one_quote_per_line(tmp_path):
+    path = tmp_path / "lines.txt"
+    _write(path, "\ufeff第一行\n\n 第二行 \n")
+    assert list(iter_source(_source(path, "other", DEFAULT_QUOTE_COLOR))) == [
+        Quote("第一行", DEFAULT_QUOTE_COLOR, "other"),
+        Quote("第二行", DEFAULT_QUOTE_COLOR, "other"),
+    ]
+
+
+def test_jsonl_source_accepts_strings_and_objects(tmp_path):
+    path = tmp_path / "pack.jsonl"
+    _write(path, '"金句一"\n\n{"text": "金句二", "color": "#FF0000"}\n{"text": ""}\n"金句一"\n')
+    source = _source(path, "festival", "#FFB6C1")
+    assert load_quote_source(source) == [
+        Quote("金句一", "#FFB6C1", "festival"),
+        Quote("金句二", "#FF0000", "festival"),
+    ]
+
+
+def test_jsonl_source_reports_the_bad_line(tmp_path):
+    path = tmp_path / "broken.jsonl"
+    _write(path, '"好的"\n{oops\n')
+    with pytest.raises(ValueError, match="第 2 行"):
+        list(iter_source(_source(path)))
+
+
+def test_streamed_and_collected_quotes_agree(tmp_path):
+    _write(tmp_path / "text.json", json.dumps(["甲", "乙", "甲"], ensure_ascii=False))
+    _write(tmp_path / "more.txt", "乙\n丙\n")
+    _write(tmp_path / "extra.jsonl", '"丙"\n"丁"\n')
+    collected = collect_quotes(tmp_path)
+    assert [quote.text for quote in collected["other"]] == ["丙", "丁", "乙"]
+    assert list(iter_quotes(tmp_path)) == [quote for quotes in collected.values() for quote in quotes]
@@ -0,0 +1,75 @@
+import json
+
+import pytest
+
+pytest.importorskip("PySide6")
+
+from python_app.data_loader import discover_sources  # noqa: E402
+from python_app.data_watcher import compute_diff  # noqa: E402
+from python_app.models import Achievement, Quote  # noqa: E402
+from python_app.quote_store import QuoteStore  # noqa: E402
+
+
+def _write_json(path, items):
+    path.write_text(json.dumps(items, ensure_ascii=False), encoding="utf-8")
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    data = tmp_path / "data"
+    data.mkdir()
+    _write_json(data / "text.json", [{"text": "甲", "color": "#111111"}, {"text": "乙", "color": "#222222"}])
+    _write_json(data / "book.json", [{"text": "书", "color": "#333333"}])
+    return data
+
+
+@pytest.fixture
+def store():
+    return QuoteStore.from_quotes(
+        [Quote("甲", "#111111", "text"), Quote("乙", "#222222", "text"), Quote("书", "#333333", "book")]
+    )
+
+
+def test_unchanged_sources_give_an_empty_diff(data_dir, store):
+    diff = compute_diff(discover_sources(data_dir), {"text", "book"}, set(), store, {})
+    assert diff.added == [] and diff.removed == []
+    assert set(diff.parsed) == {"text.json", "book.json"}
+    assert diff.compliments is None
+
+
+def test_added_removed_and_recoloured_quotes(data_dir, store):
+    _write_json(data_dir / "text.json", [
+        {"text": "甲", "color": "#999999"},
+        {"text": "丙", "color": "#444444"},
+        {"text": "丙", "color": "#555555"},
+    ])
+    diff = compute_diff(discover_sources(data_dir), {"text"}, {"text.json"}, store, {})
+    # 颜色改变按先删后增处理；同一分类内重复的文本只保留第一条
+    assert diff.added == [Quote("甲", "#999999", "text"), Quote("丙", "#444444", "text")]
+    assert sorted(diff.removed) == [0, 1]
+
+
+def test_cached_sources_are_not_reparsed(data_dir, store):
+    cache = {"text.json": [Quote("甲", "#111111", "text")]}
+    # 文件里还有“乙”，但 text.json 不在 reparse 中，按缓存计算
+    diff = compute_diff(discover_sources(data_dir), {"text"}, set(), store, cache)
+    assert diff.parsed == {}
+    assert diff.removed == [1]
+    assert diff.added == []
+
+
+def test_new_source_and_compliments(data_dir, store):
+    (data_dir / "extra.txt").write_text("丁\n", encoding="utf-8")
+    _write_json(data_dir / "zanshang.json", [{"text": "谢谢", "color": "#F3B8D9"}])
+    sources = discover_sources(data_dir)
+    diff = compute_diff(sources, {"other"}, {"extra.txt"}, store, {}, data_dir=data_dir)
+    assert diff.added == [Quote("丁", "#ffffff", "other")]
+    assert diff.removed == []
+    assert diff.compliments == [Achievement("谢谢", "#F3B8D9")]
+
+
+def test_discarded_quotes_are_not_reported_again(data_dir, store):
+    store.discard({1})
+    _write_json(data_dir / "text.json", [{"text": "甲", "color": "#111111"}])
+    diff = compute_diff(discover_sources(data_dir), {"text"}, {"text.json"}, store, {})
+    assert diff.added == [] and diff.removed == []
@@ -0,0 +1,119 @@
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("PySide6")
+
+from PySide6.QtCore import QCoreApplication, QSize  # noqa: E402
+from PySide6.QtGui import QColor, QPainter  # noqa: E402
+
+from python_app.effects_worker import EffectsRenderer  # noqa: E402
+
+
+class FakeSimulation:
+    """推进 ``frames`` 帧后结束的模拟，记录各接口在哪个线程被调用。"""
+
+    def __init__(self, frames: int) -> None:
+        self.frames = frames
+        self.active = False
+        self.size = (0, 0)
+        self.triggers = []
+        self.threads = set()
+
+    def resize(self, width: int, height: int) -> None:
+        self.size = (width, height)
+
+    def trigger(self, **options) -> None:
+        self.threads.add(threading.get_ident())
+        self.triggers.append(options)
+        self.active = True
+        self.remaining = self.frames
+
+    def advance(self) -> bool:
+        self.threads.add(threading.get_ident())
+        if self.remaining <= 0:
+            self.active = False
+            return False
+        self.remaining -= 1
+        return True
+
+    def render(self, painter: QPainter) -> None:
+        painter.fillRect(0, 0, 4, 4, QColor("#FF0000"))
+
+    def reset_clock(self) -> None:
+        pass
+
+
+class FakeWidget:
+    def __init__(self, renderer: EffectsRenderer, consume: bool = True) -> None:
+        self.renderer = renderer
+        self.consume = consume
+        self.sim_id = -1
+        self.frames = []
+        self.idle = []
+
+    def present_frame(self, frame, generation: int) -> None:
+        self.frames.append((generation, frame.size(), frame.pixelColor(1, 1).name()))
+        if self.consume:
+            self.renderer.frame_consumed(self.sim_id)
+
+    def simulation_idle(self, generation: int) -> None:
+        self.idle.append(generation)
+
+
+def _wait(condition, timeout=3.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        QCoreApplication.processEvents()
+        time.sleep(0.002)
+    return condition()
+
+
+@pytest.fixture
+def renderer(qapp):
+    renderer = EffectsRenderer()
+    yield renderer
+    renderer.shutdown()
+
+
+def test_frames_and_idle_carry_the_trigger_generation(renderer):
+    simulation = FakeSimulation(frames=3)
+    widget = FakeWidget(renderer)
+    widget.sim_id = renderer.register(widget, simulation, 5)
+    renderer.resize(widget.sim_id, QSize(20, 10), 2.0)
+    renderer.trigger(widget.sim_id, {"x": 5}, generation=7)
+    assert _wait(lambda: widget.idle)
+    assert [frame[0] for frame in widget.frames] == [7, 7, 7]
+    assert widget.frames[0][1:] == (QSize(40, 20), "#ff0000")
+    assert widget.idle[0] == 7
+    assert simulation.size == (20, 10)
+    assert simulation.triggers == [{"x": 5}]
+    # 模拟只在渲染线程中推进
+    assert threading.get_ident() not in simulation.threads
+
+
+def test_unconsumed_frame_holds_back_the_next(renderer):
+    simulation = FakeSimulation(frames=100)
+    widget = FakeWidget(renderer, consume=False)
+    widget.sim_id = renderer.register(widget, simulation, 5)
+    renderer.resize(widget.sim_id, QSize(10, 10), 1.0)
+    renderer.trigger(widget.sim_id, {}, generation=1)
+    assert _wait(lambda: widget.frames)
+    _wait(lambda: False, timeout=0.1)
+    assert len(widget.frames) == 1
+    renderer.frame_consumed(widget.sim_id)
+    assert _wait(lambda: len(widget.frames) >= 2)
+
+
+def test_suspended_renderer_produces_no_frames(renderer):
+    simulation = FakeSimulation(frames=100)
+    widget = FakeWidget(renderer)
+    widget.sim_id = renderer.register(widget, simulation, 5)
+    renderer.resize(widget.sim_id, QSize(10, 10), 1.0)
+    renderer.set_suspended(True)
+    renderer.trigger(widget.sim_id, {}, generation=1)
+    _wait(lambda: False, timeout=0.1)
+    assert widget.frames == []
+    renderer.set_suspended(False)
+    assert _wait(lambda: widget.frames)
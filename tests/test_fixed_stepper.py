@@ -0,0 +1,67 @@
+import pytest
+
+pytest.importorskip("PySide6")
+
+from python_app.effects import FixedStepper  # noqa: E402
+
+
+class FakeTime:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_first_advance_only_starts_the_clock():
+    clock = FakeTime()
+    stepper = FixedStepper(0.01, time_source=clock)
+    clock.now = 5.0
+    assert stepper.advance() == 0
+    assert stepper.alpha == 0.0
+
+
+def test_steps_and_remainder_become_alpha():
+    clock = FakeTime()
+    stepper = FixedStepper(0.01, time_source=clock)
+    stepper.advance()
+    clock.now = 0.035
+    assert stepper.advance() == 3
+    assert stepper.alpha == pytest.approx(0.5)
+    clock.now = 0.04
+    assert stepper.advance() == 1
+    assert stepper.alpha == pytest.approx(0.0, abs=1e-9)
+
+
+def test_long_stall_is_capped_and_the_excess_dropped():
+    clock = FakeTime()
+    stepper = FixedStepper(0.01, max_steps=8, time_source=clock)
+    stepper.advance()
+    clock.now = 1.0
+    assert stepper.advance() == 8
+    assert 0.0 <= stepper.alpha < 1.0
+    clock.now = 1.01
+    assert stepper.advance() <= 2
+
+
+def test_reset_discards_accumulated_time():
+    clock = FakeTime()
+    stepper = FixedStepper(0.01, time_source=clock)
+    stepper.advance()
+    clock.now = 0.005
+    stepper.advance()
+    stepper.reset()
+    assert stepper.alpha == 0.0
+    clock.now = 0.012
+    assert stepper.advance() == 0
+    assert stepper.alpha == pytest.approx(0.7)
+
+
+def test_clock_going_backwards_adds_no_time():
+    clock = FakeTime()
+    clock.now = 1.0
+    stepper = FixedStepper(0.01, time_source=clock)
+    stepper.advance()
+    clock.now = 0.5
+    assert stepper.advance() == 0
+    assert stepper.alpha == 0.0
@@ -0,0 +1,49 @@
+import pytest
+
+pytest.importorskip("PySide6")
+
+from python_app.clock import FrameClock, ManualClock  # noqa: E402
+
+
+def test_timer_runs_only_while_subscribed(qapp):
+    clock = FrameClock()
+    callback = lambda now: None  # noqa: E731
+    assert not clock.timer.isActive()
+    clock.subscribe(callback)
+    clock.subscribe(callback)
+    assert clock.timer.isActive() and clock.is_subscribed(callback)
+    clock.unsubscribe(callback)
+    assert not clock.timer.isActive() and not clock.is_subscribed(callback)
+
+
+def test_tick_passes_the_time_source_to_every_subscriber(qapp):
+    source = ManualClock(2.5)
+    clock = FrameClock(time_source=source)
+    seen = []
+    clock.subscribe(lambda now: seen.append(("a", now)))
+    clock.subscribe(lambda now: seen.append(("b", now)))
+    clock._on_timeout()
+    source.advance(0.016)
+    clock._on_timeout()
+    assert seen == [("a", 2.5), ("b", 2.5), ("a", 2.516), ("b", 2.516)]
+
+
+def test_subscriber_may_unsubscribe_during_a_tick(qapp):
+    clock = FrameClock(time_source=ManualClock())
+    calls = []
+
+    def once(now):
+        calls.append("once")
+        clock.unsubscribe(once)
+
+    clock.subscribe(once)
+    clock.subscribe(lambda now: calls.append("always"))
+    clock._on_timeout()
+    clock._on_timeout()
+    assert calls == ["once", "always", "always"]
+
+
+def test_manual_clock_never_goes_backwards():
+    clock = ManualClock(1.0)
+    assert clock.advance(-5) == 1.0
+    assert clock.advance(0.5) == clock() == 1.5
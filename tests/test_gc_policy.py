@@ -0,0 +1,83 @@
+import gc
+
+import pytest
+
+pytest.importorskip("PySide6")
+
+from python_app import gc_policy  # noqa: E402
+from python_app.gc_policy import ANIMATION_THRESHOLDS, GcPolicy  # noqa: E402
+from python_app.metrics import GcPauseStats  # noqa: E402
+
+
+@pytest.fixture
+def policy(monkeypatch):
+    monkeypatch.setattr(gc_policy, "gc_pauses", GcPauseStats())
+    thresholds = gc.get_threshold()
+    policy = GcPolicy()
+    policy.install()
+    yield policy
+    policy.uninstall()
+    gc.set_threshold(*thresholds)
+
+
+def test_pause_stats_per_generation():
+    stats = GcPauseStats()
+    stats.record(0, 0.5, 10)
+    stats.record(2, 4.0, 100)
+    stats.record(5, 6.0, 1)  # 超出范围的代数并入第 2 代
+    summary = stats.as_dict()
+    assert summary["gen0"] == {"count": 1, "total_ms": 0.5, "max_ms": 0.5, "p95_ms": 0.5, "collected": 10}
+    assert (summary["gen2"]["count"], summary["gen2"]["max_ms"], summary["gen2"]["collected"]) == (2, 6.0, 101)
+    assert (stats.last_generation, stats.last_ms) == (2, 6.0)
+    stats.clear()
+    assert stats.as_dict()["gen2"]["count"] == 0
+    assert stats.last_generation == -1
+
+
+def test_animation_phases_raise_thresholds(policy):
+    defaults = gc.get_threshold()
+    policy.transition("text")
+    assert policy.animating
+    assert gc.get_threshold() == ANIMATION_THRESHOLDS
+    policy.transition("book")
+    assert gc.get_threshold() == ANIMATION_THRESHOLDS
+    policy.transition("idle")
+    assert not policy.animating
+    assert gc.get_threshold() == defaults
+    assert policy.forced_collections == {"phase": 3}
+
+
+def test_uninstall_restores_thresholds(policy):
+    defaults = gc.get_threshold()
+    policy.transition("other")
+    policy.uninstall()
+    assert gc.get_threshold() == defaults
+    gc.collect()
+    assert gc_policy.gc_pauses.as_dict()["gen2"]["count"] == 1
+
+
+def test_collections_are_recorded(policy):
+    policy.collect("idle")
+    stats = gc_policy.gc_pauses.as_dict()
+    assert stats["gen2"]["count"] >= 1
+    assert policy.forced_collections == {"idle": 1}
+
+
+def test_overdue_collection_only_after_deferral(policy):
+    policy.max_deferral_s = 3600.0
+    assert not policy.maybe_collect()
+    policy.max_deferral_s = 0.0
+    assert policy.maybe_collect()
+    assert policy.forced_collections == {"overdue": 1}
+
+
+def test_disabled_policy_only_records():
+    thresholds = gc.get_threshold()
+    policy = GcPolicy(enabled=False)
+    policy.transition("text")
+    policy.idle_gap()
+    assert not policy.animating
+    assert gc.get_threshold() == thresholds
+    assert policy.freeze_startup() == 0
+    assert not policy.maybe_collect()
+    assert policy.forced_collections == {}
@@ -0,0 +1,47 @@
+import pytest
+
+pytest.importorskip("PySide6")
+
+from PySide6.QtCore import QSize  # noqa: E402
+from PySide6.QtGui import QColor, QFont  # noqa: E402
+
+from python_app.glyph_cache import GlyphPixmapCache  # noqa: E402
+
+
+def test_text_is_rasterized_once_per_key(qapp):
+    cache = GlyphPixmapCache()
+    font = QFont("Microsoft YaHei", 48)
+    size = QSize(200, 80)
+    first = cache.text("新年快乐", font, QColor("#FFD700"), size, 2.0)
+    assert cache.text("新年快乐", font, QColor("#FFD700"), size, 2.0) is first
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert (first.width(), first.height(), first.devicePixelRatio()) == (400, 160, 2.0)
+
+    cache.text("新年快乐", font, QColor("#FF0000"), size, 2.0)
+    cache.text("新年快乐", font, QColor("#FFD700"), size, 1.0)
+    assert cache.misses == 3
+    assert len(cache) == 3
+
+
+def test_least_recently_used_entry_is_evicted(qapp):
+    cache = GlyphPixmapCache(max_entries=2)
+    painted = []
+    size = QSize(10, 10)
+    for key in ("a", "b"):
+        cache.lookup((key,), size, 1.0, lambda painter, key=key: painted.append(key))
+    cache.lookup(("a",), size, 1.0, lambda painter: painted.append("a"))
+    cache.lookup(("c",), size, 1.0, lambda painter: painted.append("c"))
+    cache.lookup(("a",), size, 1.0, lambda painter: painted.append("a"))
+    cache.lookup(("b",), size, 1.0, lambda painter: painted.append("b"))
+    assert painted == ["a", "b", "c", "b"]
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_fitted_text_grows_with_the_text(qapp):
+    cache = GlyphPixmapCache()
+    font = QFont("Microsoft YaHei", 32)
+    short = cache.fitted_text("福", font, QColor("#FFFFFF"), 1.0)
+    long = cache.fitted_text("福福福福", font, QColor("#FFFFFF"), 1.0)
+    assert long.width() > short.width()
+    assert long.height() == short.height()
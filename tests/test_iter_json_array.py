@@ -0,0 +1,51 @@
+import json
+import random
+
+import pytest
+
+from python_app.data_loader import iter_json_array
+
+
+def _round_trip(tmp_path, text, chunk_size):
+    path = tmp_path / "data.json"
+    path.write_text(text, encoding="utf-8")
+    return list(iter_json_array(path, chunk_size=chunk_size))
+
+
+@pytest.mark.parametrize("text", ["[1.5]", "[0.25]", "[1e3]", "[-2.5E-3, true, null, false]", '[{"text": "金句"}, "x"]'])
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 64])
+def test_small_chunks_match_json_loads(tmp_path, text, chunk_size):
+    assert _round_trip(tmp_path, text, chunk_size) == json.loads(text)
+
+
+def _random_value(rng, depth=0):
+    kind = rng.randrange(6 if depth < 2 else 4)
+    if kind == 0:
+        return rng.randint(-10**6, 10**6)
+    if kind == 1:
+        return rng.choice([rng.uniform(-1e6, 1e6), rng.random() * 10 ** rng.randint(-30, 30)])
+    if kind == 2:
+        return rng.choice([True, False, None])
+    if kind == 3:
+        return "".join(rng.choice("ab\"\\金句 \n") for _ in range(rng.randrange(8)))
+    if kind == 4:
+        return [_random_value(rng, depth + 1) for _ in range(rng.randrange(4))]
+    return {str(i): _random_value(rng, depth + 1) for i in range(rng.randrange(4))}
+
+
+@pytest.mark.parametrize("chunk_size", [2, 3, 7, 64])
+def test_random_arrays_match_json_loads(tmp_path, chunk_size):
+    rng = random.Random(chunk_size)
+    for _ in range(200):
+        value = [_random_value(rng) for _ in range(rng.randrange(10))]
+        text = json.dumps(value, ensure_ascii=False, indent=rng.choice([None, 2]))
+        assert _round_trip(tmp_path, text, chunk_size) == json.loads(text)
+
+
+def test_number_split_at_default_chunk_boundary(tmp_path):
+    # "1." 恰好落在第一个 64 KiB 读块的末尾
+    chunk_size = 1 << 16
+    prefix = '["' + "x" * (chunk_size - 7) + '", '
+    text = prefix + "1.5]"
+    assert len(prefix.encode("utf-8")) == chunk_size - 2
+    assert _round_trip(tmp_path, text, chunk_size) == json.loads(text)
@@ -0,0 +1,44 @@
+import random
+import sys
+
+import pytest
+
+pytest.importorskip("PySide6")
+
+from python_app import kiosk  # noqa: E402
+from python_app.kiosk import RecyclingSampler  # noqa: E402
+
+
+def test_each_round_takes_every_item_once():
+    items = list(range(20))
+    sampler = RecyclingSampler(items, random.Random(1), avoid_recent=4)
+    for expected_rounds in (1, 2, 3):
+        assert sorted(sampler.take(len(items))) == items
+        assert sampler.rounds == expected_rounds
+
+
+def test_round_boundary_avoids_recent_items():
+    items = list(range(30))
+    for seed in range(20):
+        sampler = RecyclingSampler(items, random.Random(seed), avoid_recent=8)
+        first = sampler.take(len(items))
+        second = sampler.take(len(items))
+        assert not set(first[-8:]) & set(second[:len(items) - 8])
+
+
+def test_empty_and_tiny_sources():
+    assert RecyclingSampler([], random.Random(0)).take(5) == []
+    assert RecyclingSampler(["only"], random.Random(0), avoid_recent=8).take(3) == ["only"] * 3
+
+
+def test_same_seed_same_sequence():
+    def run():
+        return RecyclingSampler("abcdefghij", random.Random(42)).take(35)
+
+    assert run() == run()
+
+
+def test_rss_falls_back_to_zero_without_resource(monkeypatch):
+    assert kiosk._current_rss_kib() > 0
+    monkeypatch.setitem(sys.modules, "resource", None)
+    assert kiosk._current_rss_kib() == 0
@@ -0,0 +1,124 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+pytest.importorskip("PySide6")
+
+from python_app import live_feed  # noqa: E402
+from python_app.live_feed import DEFAULT_LIVE_COLOR, LiveFeedSubscriber, LiveQuoteQueue  # noqa: E402
+from python_app.models import Quote  # noqa: E402
+
+STREAM = (
+    ": heartbeat\n\n"
+    "id: 1\nevent: wish\ndata: {\"text\": \"新年快乐\"}\n\n"
+    "id: 2\ndata: not json\n\n"
+    "id: 3\nevent: stats\ndata: {\"text\": \"不是愿望\"}\n\n"
+    "id: 4\nevent: wish\ndata: {\"text\": \"万事如意\", \"color\": \"#FF0000\",\n"
+    "data:  \"priority\": 5}\n\n"
+)
+
+
+class FakeTime:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+def _quote(text: str) -> Quote:
+    return Quote(text=text, color=DEFAULT_LIVE_COLOR, category="text")
+
+
+def test_higher_priority_first_then_arrival_order():
+    queue = LiveQuoteQueue()
+    for text, priority in (("a", 0), ("b", 2), ("c", 0), ("d", 2)):
+        assert queue.put(_quote(text), priority)
+    assert [queue.pop().text for _ in range(4)] == ["b", "d", "a", "c"]
+    assert queue.pop() is None
+    assert queue.received == 4
+
+
+def test_full_queue_blocks_until_popped():
+    queue = LiveQuoteQueue(capacity=1)
+    assert queue.put(_quote("a"))
+    assert queue.full
+    assert not queue.put(_quote("b"), timeout=0.01)
+
+    result = []
+    waiter = threading.Thread(target=lambda: result.append(queue.put(_quote("b"), timeout=2.0)))
+    waiter.start()
+    time.sleep(0.05)
+    assert queue.pop().text == "a"
+    waiter.join(2.0)
+    assert result == [True]
+    assert queue.pop().text == "b"
+
+
+def test_close_releases_blocked_producer():
+    queue = LiveQuoteQueue(capacity=1)
+    queue.put(_quote("a"))
+    result = []
+    waiter = threading.Thread(target=lambda: result.append(queue.put(_quote("b"))))
+    waiter.start()
+    time.sleep(0.05)
+    queue.close()
+    waiter.join(2.0)
+    assert result == [False]
+    assert not queue.put(_quote("c"))
+
+
+def test_stale_wishes_are_dropped(monkeypatch):
+    clock = FakeTime()
+    monkeypatch.setattr(live_feed, "time", clock)
+    queue = LiveQuoteQueue(max_age_s=60.0)
+    queue.put(_quote("old"), priority=9)
+    clock.now += 30.0
+    queue.put(_quote("fresh"))
+    clock.now += 45.0
+    assert queue.pop().text == "fresh"
+    assert queue.expired == 1
+
+
+class _StreamHandler(BaseHTTPRequestHandler):
+    headers_seen = []
+
+    def do_GET(self):  # noqa: N802 - http.server 的接口
+        self.headers_seen.append(self.headers.get("Last-Event-ID"))
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.end_headers()
+        self.wfile.write(STREAM.encode("utf-8"))
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _StreamHandler)
+    _StreamHandler.headers_seen = []
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}/wishes/stream"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_subscriber_parses_events_and_remembers_last_id(qapp, server):
+    queue = LiveQuoteQueue()
+    subscriber = LiveFeedSubscriber(server, queue)
+    subscriber.start()
+    deadline = time.monotonic() + 5.0
+    while (len(queue) < 2 or subscriber.last_event_id != "4") and time.monotonic() < deadline:
+        time.sleep(0.01)
+    subscriber.stop()
+
+    first, second = queue.pop(), queue.pop()
+    assert (first.text, first.color) == ("万事如意", "#FF0000")
+    assert (second.text, second.color, second.category) == ("新年快乐", DEFAULT_LIVE_COLOR, "text")
+    assert queue.pop() is None
+    assert subscriber.last_event_id == "4"
+    assert _StreamHandler.headers_seen[0] is None
@@ -0,0 +1,92 @@
+import json
+
+import pytest
+
+pytest.importorskip("PySide6")
+
+from python_app import metrics  # noqa: E402
+from python_app.metrics import FrameStats, LayerTimings, TraceRecorder  # noqa: E402
+
+
+class FakeTime:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def perf_counter(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def fake_time(monkeypatch):
+    clock = FakeTime()
+    monkeypatch.setattr(metrics, "time", clock)
+    return clock
+
+
+def test_frame_percentiles_use_nearest_rank():
+    stats = FrameStats()
+    for frame_ms in range(1, 101):
+        stats.record(float(frame_ms))
+    assert stats.percentiles((0, 50, 95, 100)) == {0: 1.0, 50: 51.0, 95: 95.0, 100: 100.0}
+    assert stats.percentile(99) == 99.0
+
+
+def test_frame_stats_keep_only_recent_samples():
+    stats = FrameStats(max_samples=3)
+    for frame_ms in (50.0, 1.0, 2.0, 3.0):
+        stats.record(frame_ms)
+    assert len(stats) == 3
+    assert stats.percentile(100) == 3.0
+    stats.clear()
+    assert stats.percentiles((50, 95)) == {50: 0.0, 95: 0.0}
+
+
+def test_trace_records_only_while_started(fake_time, tmp_path):
+    tracer = TraceRecorder()
+    tracer.instant("ignored", "test")
+    tracer.complete("ignored", "test", 100.0, 0.1)
+    tracer.start()
+    fake_time.now = 100.002
+    tracer.instant("card", "board", {"index": 1})
+    tracer.complete("paint:board", "paint", 100.001, 0.0005)
+    tracer.counter("memory", {"rss_mb": 12.5})
+    path = tmp_path / "trace" / "show.json"
+    assert tracer.stop(path) == 4
+    tracer.instant("after_stop", "test")
+
+    events = json.loads(path.read_text(encoding="utf-8"))["traceEvents"]
+    assert [event["name"] for event in events] == ["process_name", "trace_start", "card", "paint:board", "memory"]
+    card, paint, counter = events[2:]
+    assert (card["ph"], card["ts"], card["args"]) == ("i", 2000.0, {"index": 1})
+    assert (paint["ph"], paint["ts"], paint["dur"]) == ("X", 1000.0, 500.0)
+    assert (counter["ph"], counter["args"]) == ("C", {"rss_mb": 12.5})
+
+
+def test_trace_drops_events_beyond_the_limit(tmp_path):
+    tracer = TraceRecorder(max_events=3)
+    tracer.start()
+    for index in range(5):
+        tracer.instant(f"event{index}", "test")
+    assert tracer.dropped == 3
+    assert tracer.stop(tmp_path / "trace.json") == 3
+    tracer.start()
+    assert tracer.dropped == 0
+
+
+def test_span_writes_a_complete_event(fake_time, tmp_path):
+    tracer = TraceRecorder()
+    tracer.start()
+    with tracer.span("layout", "startup"):
+        fake_time.now += 0.25
+    tracer.stop(tmp_path / "trace.json")
+    events = json.loads((tmp_path / "trace.json").read_text(encoding="utf-8"))["traceEvents"]
+    assert (events[-1]["name"], events[-1]["dur"]) == ("layout", 250000.0)
+
+
+def test_layer_timings_are_smoothed(fake_time, monkeypatch):
+    monkeypatch.setattr(metrics, "tracer", TraceRecorder())
+    timings = LayerTimings(smoothing=0.5)
+    for elapsed_ms in (10.0, 20.0):
+        with timings.paint("board"):
+            fake_time.now += elapsed_ms / 1000.0
+    assert timings.paint_ms["board"] == pytest.approx(15.0)
@@ -0,0 +1,86 @@
+import random
+
+import pytest
+
+pytest.importorskip("PySide6")
+
+from PySide6.QtCore import QRect, QSize  # noqa: E402
+
+from python_app.placement import GridIndex, PlacementEngine  # noqa: E402
+
+
+def _brute_force(rects, query):
+    return {key for key, rect in rects.items() if rect.intersects(query)}
+
+
+def test_grid_query_matches_brute_force():
+    rng = random.Random(3)
+    index = GridIndex(cell_size=64)
+    rects = {}
+    for key in range(200):
+        rect = QRect(rng.randint(-50, 1800), rng.randint(-50, 1000), rng.randint(1, 400), rng.randint(1, 300))
+        rects[key] = rect
+        index.insert(key, rect)
+    for key in range(0, 200, 3):
+        index.remove(key)
+        del rects[key]
+    for _ in range(100):
+        query = QRect(rng.randint(0, 1800), rng.randint(0, 1000), rng.randint(1, 500), rng.randint(1, 500))
+        assert index.query(query) == _brute_force(rects, query)
+    assert len(index) == len(rects)
+
+
+def test_reinserting_a_key_moves_it():
+    index = GridIndex(cell_size=100)
+    index.insert("card", QRect(0, 0, 50, 50))
+    index.insert("card", QRect(500, 500, 50, 50))
+    assert index.query(QRect(0, 0, 60, 60)) == set()
+    assert index.query(QRect(490, 490, 20, 20)) == {"card"}
+    index.remove("card")
+    index.remove("card")
+    assert len(index) == 0 and index.rect("card") is None
+
+
+def test_placement_stays_inside_the_margins():
+    engine = PlacementEngine(rng=random.Random(1))
+    viewport, size, margin = QSize(1280, 720), QSize(300, 200), 40
+    for key in range(50):
+        rect = engine.place(size, viewport, margin)
+        assert rect.size() == size
+        assert margin <= rect.left() and rect.right() < viewport.width() - margin
+        assert margin <= rect.top() and rect.bottom() < viewport.height() - margin
+        engine.insert(key, rect)
+
+
+def test_placement_avoids_overlap_when_there_is_room():
+    engine = PlacementEngine(candidates=32, rng=random.Random(5))
+    viewport, size = QSize(1600, 900), QSize(200, 150)
+    placed = []
+    for key in range(6):
+        rect = engine.place(size, viewport, 0)
+        assert not any(rect.intersects(other) for other in placed)
+        engine.insert(key, rect)
+        placed.append(rect)
+
+
+def test_placement_is_reproducible_with_the_same_rng():
+    def run(seed):
+        engine = PlacementEngine(rng=random.Random(seed))
+        rects = []
+        for key in range(20):
+            rect = engine.place(QSize(320, 180), QSize(1280, 720), 20)
+            engine.insert(key, rect)
+            rects.append(rect.getRect())
+        return rects
+
+    assert run(11) == run(11)
+
+
+def test_covered_by_newer_cards():
+    engine = PlacementEngine()
+    engine.insert("old", QRect(100, 100, 100, 100))
+    engine.insert("left", QRect(90, 90, 60, 120))
+    assert not engine.covered_by("old", ["left"])
+    engine.insert("right", QRect(140, 90, 70, 120))
+    assert engine.covered_by("old", ["left", "right"])
+    assert not engine.covered_by("missing", ["left"])
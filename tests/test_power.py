@@ -0,0 +1,98 @@
+import time
+
+import pytest
+
+pytest.importorskip("PySide6")
+
+from PySide6.QtCore import QCoreApplication, QTimer, QVariantAnimation  # noqa: E402
+
+from python_app.power import PowerManager  # noqa: E402
+
+
+def _wait(milliseconds: int) -> None:
+    deadline = time.monotonic() + milliseconds / 1000.0
+    while time.monotonic() < deadline:
+        QCoreApplication.processEvents()
+        time.sleep(0.002)
+
+
+def test_suspended_while_any_reason_is_active(qapp):
+    power = PowerManager()
+    changes = []
+    power.suspended_changed.connect(changes.append)
+    power.set_reason("paused", True)
+    power.set_reason("sync_paused", True)
+    power.set_reason("paused", False)
+    assert power.suspended
+    assert power.reasons == {"sync_paused"}
+    power.set_reason("sync_paused", False)
+    assert not power.suspended
+    assert changes == [True, False]
+
+
+def test_unknown_reason_is_rejected(qapp):
+    with pytest.raises(ValueError):
+        PowerManager().set_reason("sleepy", True)
+
+
+def test_only_running_timers_are_restarted(qapp):
+    power = PowerManager()
+    running, stopped = QTimer(), QTimer()
+    running.start(1000)
+    for timer in (running, stopped):
+        power.register_timer(timer)
+    power.set_reason("idle", True)
+    assert not running.isActive() and not stopped.isActive()
+    power.set_reason("idle", False)
+    assert running.isActive() and not stopped.isActive()
+    running.stop()
+
+
+def test_timer_registered_while_suspended_is_stopped(qapp):
+    power = PowerManager()
+    power.set_reason("hidden", True)
+    timer = QTimer()
+    timer.start(1000)
+    power.register_timer(timer)
+    assert not timer.isActive()
+    power.set_reason("hidden", False)
+    assert timer.isActive()
+    timer.stop()
+
+
+def test_animations_pause_and_resume(qapp):
+    power = PowerManager()
+    animation = QVariantAnimation()
+    animation.setDuration(10_000)
+    animation.setStartValue(0.0)
+    animation.setEndValue(1.0)
+    animation.start()
+    power.register_animation(animation)
+    power.set_reason("occluded", True)
+    assert animation.state() == QVariantAnimation.State.Paused
+    power.set_reason("occluded", False)
+    assert animation.state() == QVariantAnimation.State.Running
+    animation.stop()
+
+
+def test_hooks_resume_in_reverse_order(qapp):
+    power = PowerManager()
+    calls = []
+    power.register_hooks(lambda: calls.append("suspend clock"), lambda: calls.append("resume clock"))
+    power.register_hooks(lambda: calls.append("suspend hud"), lambda: calls.append("resume hud"))
+    power.set_reason("paused", True)
+    power.set_reason("paused", False)
+    assert calls == ["suspend clock", "suspend hud", "resume hud", "resume clock"]
+
+
+def test_delayed_reason_is_cancelled_when_cleared_early(qapp):
+    power = PowerManager()
+    power.set_reason("occluded", True, delay_ms=20)
+    assert not power.suspended
+    power.set_reason("occluded", False)
+    _wait(60)
+    assert not power.suspended
+
+    power.set_reason("occluded", True, delay_ms=20)
+    _wait(60)
+    assert power.reasons == {"occluded"}
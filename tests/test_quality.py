@@ -0,0 +1,97 @@
+import pytest
+
+pytest.importorskip("PySide6")
+
+from python_app import quality  # noqa: E402
+from python_app.quality import QualityGovernor  # noqa: E402
+
+
+class FakeTime:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def perf_counter(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeTime()
+    monkeypatch.setattr(quality, "time", fake)
+    return fake
+
+
+def _run(governor, clock, seconds, interval_ms, nominal_ms=16.0):
+    """按 ``interval_ms`` 的间隔连续上报 ``seconds`` 秒的帧。"""
+    for _ in range(round(seconds * 1000 / interval_ms)):
+        clock.now += interval_ms / 1000.0
+        governor.record_frame(interval_ms, nominal_ms)
+
+
+def test_sustained_slow_frames_downgrade_one_level(clock):
+    governor = QualityGovernor(target_fps=50)
+    changes = []
+    governor.level_changed.connect(changes.append)
+    _run(governor, clock, 3.5, 40)
+    assert governor.level_index == 1
+    assert [level.name for level in changes] == ["medium"]
+    assert governor.fps == pytest.approx(25.0)
+
+
+def test_cooldown_limits_consecutive_downgrades(clock):
+    governor = QualityGovernor(target_fps=50, cooldown_s=3.0)
+    _run(governor, clock, 4.5, 40)
+    assert governor.level_index == 1
+    _run(governor, clock, 3.0, 40)
+    assert governor.level_index == 2
+
+
+def test_fast_frames_upgrade_after_more_windows(clock):
+    governor = QualityGovernor(target_fps=50)
+    governor.set_level(2)
+    clock.now += 10
+    _run(governor, clock, 3.5, 16)
+    assert governor.level_index == 2
+    _run(governor, clock, 1.0, 16)
+    assert governor.level_index == 1
+
+
+def test_frames_inside_the_hysteresis_band_keep_the_level(clock):
+    governor = QualityGovernor(target_fps=50)
+    _run(governor, clock, 10, 21, nominal_ms=21)  # 47.6 fps：介于降级与升级阈值之间
+    assert governor.level_index == 0
+
+
+def test_locked_governor_only_measures(clock):
+    governor = QualityGovernor(target_fps=50)
+    governor.locked = True
+    _run(governor, clock, 10, 40)
+    assert governor.level_index == 0
+    assert governor.fps == pytest.approx(25.0)
+
+
+def test_timer_lateness_is_normalised_to_the_frame_budget(clock):
+    governor = QualityGovernor(target_fps=50)
+    # 40ms 的雪花定时器准时触发，不算掉帧
+    _run(governor, clock, 2.5, 40, nominal_ms=40)
+    assert governor.fps == pytest.approx(50.0)
+    assert governor.lateness_stats.percentile(99) == 0.0
+
+
+def test_stalls_are_not_recorded(clock):
+    governor = QualityGovernor(target_fps=50)
+    governor.record_frame(900, 16)
+    assert len(governor.lateness_stats) == 0
+
+
+def test_record_present_measures_paint_intervals():
+    governor = QualityGovernor(target_fps=50)
+    for now in (1.000, 1.016, 1.050, 3.000, 3.020):
+        governor.record_present(now)
+    # 第一帧只作起点，1.95 秒的停顿不计入
+    assert len(governor.frame_stats) == 3
+    assert {point: round(value) for point, value in governor.frame_stats.percentiles((0, 50, 100)).items()} == {
+        0: 16,
+        50: 20,
+        100: 34,
+    }
@@ -0,0 +1,92 @@
+import random
+from array import array
+
+import pytest
+
+from python_app.models import Quote
+from python_app.quote_store import INDEX_TYPECODE, QuoteQueue, QuoteStore
+
+QUOTES = [Quote(f"金句{i}", "#FFFFFF" if i % 2 else "#FFCC00", "text") for i in range(12)] + [
+    Quote(f"书摘{i}", "#FFCC00", "book") for i in range(5)
+]
+
+
+@pytest.fixture
+def store():
+    return QuoteStore.from_quotes(QUOTES)
+
+
+def test_append_keeps_text_colour_and_category(store):
+    assert len(store) == len(QUOTES)
+    assert list(store) == QUOTES
+    assert store[-1] == QUOTES[-1]
+    assert store.categories() == ["text", "book"]
+    assert store.color_table == ["#FFCC00", "#FFFFFF"]
+    index = store.append("新年快乐", "#FF0000", "other")
+    assert store[index] == Quote("新年快乐", "#FF0000", "other")
+    assert list(store.indices("other")) == [index]
+    assert list(store.indices("missing")) == []
+
+
+def test_indices_except_merges_other_categories(store):
+    assert list(store.indices_except(["text"])) == list(range(12, 17))
+
+
+def test_discard_only_hides_from_display_order(store):
+    assert store.discard({0, 3, 13, 99}) == 3
+    assert list(store.indices("text")) == [i for i in range(12) if i not in (0, 3)]
+    assert list(store.indices("book")) == [12, 14, 15, 16]
+    # 下标不变，文本仍可按下标读取
+    assert store.text(3) == "金句3"
+    assert len(store) == len(QUOTES)
+
+
+@pytest.mark.parametrize("seed", [0, 1, 42])
+def test_shuffle_matches_list_shuffle_per_category(store, seed):
+    expected = {}
+    rng = random.Random(seed)
+    for category in ("text", "book"):
+        order = list(store.indices(category))
+        rng.shuffle(order)
+        expected[category] = order
+    store.shuffle(random.Random(seed))
+    assert {category: list(store.indices(category)) for category in ("text", "book")} == expected
+
+
+def test_from_columns_shares_encoded_columns(store):
+    text, offsets, colors, categories = store.columns()
+    copy = QuoteStore.from_columns(text, offsets, colors, categories, store.color_table, store.category_table)
+    assert list(copy) == QUOTES
+    with pytest.raises(ValueError):
+        QuoteStore.from_columns(text, offsets[:-1], colors, categories, store.color_table, store.category_table)
+
+
+def test_nbytes_counts_columns_and_orders(store):
+    text_bytes = sum(len(quote.text.encode("utf-8")) for quote in QUOTES)
+    itemsize = array(INDEX_TYPECODE).itemsize
+    expected = text_bytes + itemsize * (len(QUOTES) + 1) + 2 * len(QUOTES) * 2 + itemsize * len(QUOTES)
+    assert store.nbytes == expected
+
+
+def test_queue_pops_in_index_order(store):
+    queue = QuoteQueue(store, [5, 2])
+    queue.append(13)
+    queue.extend([0, 1])
+    assert len(queue) == 5
+    assert queue[0] == store[5]
+    assert queue[-1] == store[1]
+    assert queue.popleft() == store[5]
+    assert list(queue) == [store[i] for i in (2, 13, 0, 1)]
+    with pytest.raises(IndexError):
+        queue[4]
+
+
+def test_queue_discard_and_clear(store):
+    queue = QuoteQueue(store, range(6))
+    queue.popleft()
+    assert queue.discard({0, 2, 4}) == 2
+    assert [quote.text for quote in queue] == ["金句1", "金句3", "金句5"]
+    queue.clear()
+    assert not queue
+    with pytest.raises(IndexError):
+        queue.popleft()
@@ -0,0 +1,59 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("PySide6")
+
+from python_app.render import OfflineShow, RenderConfig, _encoder_command, _split, parse_size, render_show  # noqa: E402
+
+
+def test_segments_cover_every_frame_once():
+    assert _split(10, 3) == [(0, 3), (3, 7), (7, 10)]
+    assert _split(2, 4) == [(0, 1), (1, 2)]
+    for total, parts in ((2504, 4), (97, 7), (1, 1)):
+        ranges = _split(total, parts)
+        assert ranges[0][0] == 0 and ranges[-1][1] == total
+        assert all(end == start for (_, end), (start, _) in zip(ranges, ranges[1:]))
+
+
+def test_encoder_reads_raw_frames_of_the_configured_size():
+    config = RenderConfig(output=Path("show.mp4"), width=1280, height=720, fps=29.97, crf=20)
+    command = _encoder_command(config, Path("segment.mp4"))
+    assert command[0] == "ffmpeg" and command[-1] == "segment.mp4"
+    options = dict(zip(command[1:-1], command[2:]))
+    assert options["-s"] == "1280x720"
+    assert options["-r"] == "29.97"
+    assert options["-crf"] == "20"
+    assert options["-i"] == "-"
+    assert ("bgra" if sys.byteorder == "little" else "argb") in command
+    assert parse_size("1280X720") == (1280, 720)
+    assert config.frame_ms == pytest.approx(1000.0 / 29.97)
+
+
+def test_missing_ffmpeg_is_reported(tmp_path):
+    config = RenderConfig(output=tmp_path / "show.mp4", ffmpeg=str(tmp_path / "no-ffmpeg"))
+    assert render_show(config) == 1
+
+
+def _frames(seed):
+    show = OfflineShow(RenderConfig(output=Path("unused.mp4"), width=320, height=180, fps=10, seed=seed))
+    frames = []
+    try:
+        for index in range(40):
+            show.step()
+            if index % 10 == 9:
+                frames.append(show.grab().copy())
+        return show.total_frames(), frames
+    finally:
+        show.board.close()
+        show.board.deleteLater()
+
+
+def test_same_seed_renders_identical_frames(qapp):
+    total, frames = _frames(3)
+    again_total, again = _frames(3)
+    assert total == again_total
+    assert frames == again
+    _, other = _frames(4)
+    assert frames != other
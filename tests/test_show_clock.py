@@ -0,0 +1,108 @@
+import pytest
+
+pytest.importorskip("PySide6")
+
+from python_app import clock as clock_module  # noqa: E402
+from python_app.clock import ShowClock  # noqa: E402
+
+
+@pytest.fixture
+def clock(qapp):
+    return ShowClock(driven=True)
+
+
+def test_callbacks_run_in_due_order_then_registration_order(clock):
+    order = []
+    clock.call_later(300, lambda: order.append("c"))
+    clock.call_later(100, lambda: order.append("a"))
+    clock.call_later(100, lambda: order.append("b"))
+    clock.advance(250)
+    assert order == ["a", "b"]
+    clock.advance(50)
+    assert order == ["a", "b", "c"]
+    assert clock.now_ms() == 300
+
+
+def test_callback_sees_its_own_due_time_and_chains_from_it(clock):
+    seen = []
+
+    def first():
+        seen.append(clock.now_ms())
+        clock.call_later(40, lambda: seen.append(clock.now_ms()))
+
+    clock.call_later(100, first)
+    clock.advance(1000)  # 一次快进跨过两次回调
+    assert seen == [100, 140]
+    assert clock.now_ms() == 1000
+
+
+def test_cancel_and_cancel_all(clock):
+    fired = []
+    call = clock.call_later(10, lambda: fired.append("cancelled"))
+    clock.call_later(20, lambda: fired.append("kept"))
+    clock.cancel(call)
+    clock.cancel(None)
+    assert clock.pending() == 1
+    clock.advance(30)
+    assert fired == ["kept"]
+    clock.call_later(10, lambda: fired.append("dropped"))
+    clock.cancel_all()
+    clock.advance(30)
+    assert fired == ["kept"] and clock.pending() == 0
+
+
+def test_driven_clock_only_moves_on_advance(clock, qapp):
+    qapp.processEvents()
+    assert clock.now_ms() == 0
+    assert clock.advance(-5) == 0
+    clock.advance(16.5)
+    assert clock.now() == pytest.approx(0.0165)
+
+
+class FakeTime:
+    def __init__(self) -> None:
+        self.now = 10.0
+
+    def perf_counter(self) -> float:
+        return self.now
+
+
+def test_pause_freezes_wall_clock_time(qapp, monkeypatch):
+    fake = FakeTime()
+    monkeypatch.setattr(clock_module, "time", fake)
+    show = ShowClock(speed=2.0)
+    fake.now += 1.0
+    assert show.now_ms() == pytest.approx(2000)
+    show.pause()
+    fake.now += 5.0
+    assert show.now_ms() == pytest.approx(2000)
+    show.resume()
+    fake.now += 0.5
+    assert show.now_ms() == pytest.approx(3000)
+    show.set_speed(1.0)
+    fake.now += 1.0
+    assert show.now_ms() == pytest.approx(4000)
+
+
+def test_stepped_tick_advances_a_fixed_amount(qapp):
+    show = ShowClock(speed=4.0, tick_ms=10, stepped=True)
+    fired = []
+    show.call_later(35, lambda: fired.append(show.now_ms()))
+    for _ in range(3):
+        show._on_tick()
+    assert show.now_ms() == 120 and fired == [35]
+
+
+def test_show_timer_restart_and_remaining(clock):
+    fired = []
+    timer = clock.timer(lambda: fired.append(clock.now_ms()), "card")
+    timer.start(100)
+    clock.advance(40)
+    assert timer.is_active() and timer.remaining_ms() == 60
+    timer.start(100)  # 重新开始：之前的调度作废
+    clock.advance(100)
+    assert fired == [140] and not timer.is_active()
+    timer.start(10)
+    timer.stop()
+    clock.advance(50)
+    assert fired == [140] and timer.remaining_ms() == 0.0
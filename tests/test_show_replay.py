@@ -0,0 +1,87 @@
+import pytest
+
+pytest.importorskip("PySide6")
+
+from PySide6.QtCore import QCoreApplication, Qt  # noqa: E402
+
+from python_app.board import QuoteBoard  # noqa: E402
+from python_app.clock import ShowClock  # noqa: E402
+from python_app.effects import FireworksOverlay  # noqa: E402
+from python_app.models import Achievement, Quote  # noqa: E402
+from python_app.quality import QUALITY_LEVELS  # noqa: E402
+
+QUOTES = (
+    [Quote(f"文本金句 {i}", "#E6E6FA", "text") for i in range(5)]
+    + [Quote(f"书摘 {i}", "#FFF8DC", "book") for i in range(4)]
+    + [Quote(f"其他金句 {i}", "#F0FFF0", "other") for i in range(5)]
+)
+COMPLIMENTS = [Achievement("新年快乐", "#FFFFFF"), Achievement("万事如意", "#FFFFFF")]
+
+
+def _replay(monkeypatch, seed, quality):
+    """以驱动模式的虚拟时钟把整场演出跑到 idle，记下每张卡片与每轮烟花。"""
+    clock = ShowClock(speed=1.0, driven=True)
+    board = QuoteBoard([], show_clock=clock, seed=seed)
+    governor = board.quality
+    governor.set_level(next(i for i, level in enumerate(governor.levels) if level.name == quality))
+    governor.locked = True
+    board.setAttribute(Qt.WidgetAttribute.WA_DontShowOnScreen, True)
+    board.resize(1280, 720)
+    board.show()
+    board.start()
+    board.set_quotes(QUOTES, COMPLIMENTS)
+    board.mark_ready()
+
+    cards, rounds, acquired = [], [], []
+    acquire, add_card, burst = board.card_pool.acquire, board._add_new_card, board._heart_fireworks_burst
+    trigger = FireworksOverlay.trigger
+
+    def record_acquire(quote):
+        acquired.append(acquire(quote))
+        return acquired[-1]
+
+    def record_card():
+        add_card()
+        cards.append((acquired[-1].quote.text, acquired[-1].geometry().getRect()))
+
+    def record_round():
+        rounds.append([])
+        burst()
+
+    def record_trigger(overlay, color, center=None, *args, seed=None, **kwargs):
+        rounds[-1].append((round(center.x(), 3), round(center.y(), 3), seed))
+        trigger(overlay, color, center, *args, seed=seed, **kwargs)
+
+    monkeypatch.setattr(board.card_pool, "acquire", record_acquire)
+    monkeypatch.setattr(board, "_add_new_card", record_card)
+    monkeypatch.setattr(board, "_heart_fireworks_burst", record_round)
+    monkeypatch.setattr(FireworksOverlay, "trigger", record_trigger)
+    try:
+        while board.card_phase != "idle" and clock.now_ms() < 120000:
+            clock.advance(50)
+            QCoreApplication.processEvents()
+        phases = list(board.phase_log)
+    finally:
+        monkeypatch.undo()
+        board.close()
+        board.deleteLater()
+        QCoreApplication.processEvents()
+    return cards, rounds, phases
+
+
+def test_same_seed_replays_identically(qapp, monkeypatch):
+    cards, rounds, phases = _replay(monkeypatch, 7, "high")
+    assert len(cards) == len(QUOTES) - 1  # 第一条 text 用作开场卡片
+    assert len(rounds) == len(COMPLIMENTS) and all(rounds)
+    assert phases[-1][1] == "idle"
+    assert _replay(monkeypatch, 7, "high") == (cards, rounds, phases)
+
+
+def test_quality_level_does_not_change_the_show(qapp, monkeypatch):
+    cards, rounds, phases = _replay(monkeypatch, 7, "high")
+    low_cards, low_rounds, low_phases = _replay(monkeypatch, 7, "minimal")
+    assert (low_cards, low_phases) == (cards, phases)
+    # 低画质只绘制前 max_bursts 层，落点与种子与高画质的同一层相同
+    max_bursts = next(level.max_bursts for level in QUALITY_LEVELS if level.name == "minimal")
+    assert [len(bursts) for bursts in low_rounds] == [max_bursts] * len(rounds)
+    assert low_rounds == [bursts[:max_bursts] for bursts in rounds]
@@ -0,0 +1,99 @@
+import json
+import time
+
+import pytest
+
+pytest.importorskip("PySide6")
+
+from PySide6.QtCore import QCoreApplication  # noqa: E402
+
+from python_app import metrics  # noqa: E402
+from python_app.metrics import StartupMetrics  # noqa: E402
+from python_app.startup import StartupLoader  # noqa: E402
+
+
+class FakeTime:
+    def __init__(self) -> None:
+        self.now = 10.0
+
+    def perf_counter(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def fake_time(monkeypatch):
+    clock = FakeTime()
+    monkeypatch.setattr(metrics, "time", clock)
+    return clock
+
+
+def test_marks_are_relative_to_origin_and_recorded_once(fake_time):
+    startup = StartupMetrics()
+    startup.begin(origin=9.0)
+    assert startup.mark("window_shown") == pytest.approx(1000.0)
+    fake_time.now = 10.5
+    assert startup.mark("window_shown") == pytest.approx(1000.0)
+    startup.mark("first_pixel")
+    assert startup.time_to_first_pixel_ms == pytest.approx(1500.0)
+    assert startup.as_dict() == {"window_shown": 1000.0, "first_pixel": 1500.0}
+    assert startup.elapsed_ms("ready") is None
+
+
+def test_begin_clears_previous_marks(fake_time):
+    startup = StartupMetrics()
+    startup.mark("ready")
+    startup.begin()
+    assert startup.as_dict() == {}
+    assert startup.time_to_first_pixel_ms is None
+
+
+def _write_data(data_dir):
+    data_dir.mkdir()
+    text = [{"text": f"金句{i}", "color": "#ffffff"} for i in range(30)]
+    book = [{"text": f"书摘{i}", "color": "#ffcc00"} for i in range(10)]
+    (data_dir / "text.json").write_text(json.dumps(text, ensure_ascii=False), encoding="utf-8")
+    (data_dir / "book.json").write_text(json.dumps(book, ensure_ascii=False), encoding="utf-8")
+    return data_dir
+
+
+def _load(data_dir, fonts_dir, streaming=False, seed=None, timeout=10.0):
+    loader = StartupLoader(data_dir, fonts_dir, streaming=streaming, seed=seed)
+    received = []
+    events = []
+    loader.data_loaded.connect(lambda quotes, compliments, loading: received.extend(quotes))
+    loader.quotes_appended.connect(received.extend)
+    loader.data_finished.connect(lambda: events.append("data_finished"))
+    loader.ready.connect(lambda: events.append("ready"))
+    loader.failed.connect(lambda message: events.append(f"failed: {message}"))
+    loader.start()
+    deadline = time.monotonic() + timeout
+    while not {"ready", "data_finished"} <= set(events) and time.monotonic() < deadline:
+        if any(event.startswith("failed") for event in events):
+            break
+        QCoreApplication.processEvents()
+        time.sleep(0.005)
+    loader.cancel()
+    return [(quote.text, quote.category) for quote in received], events
+
+
+def test_loader_reaches_ready_with_every_quote(qapp, tmp_path):
+    data_dir = _write_data(tmp_path / "data")
+    quotes, events = _load(data_dir, tmp_path / "fonts", seed=1)
+    assert "ready" in events and "data_finished" in events
+    assert sorted(text for text, _ in quotes) == sorted([f"金句{i}" for i in range(30)] + [f"书摘{i}" for i in range(10)])
+
+
+def test_same_seed_gives_same_order(qapp, tmp_path):
+    data_dir = _write_data(tmp_path / "data")
+    first, _ = _load(data_dir, tmp_path / "fonts", seed=7)
+    again, _ = _load(data_dir, tmp_path / "fonts", seed=7)
+    other, _ = _load(data_dir, tmp_path / "fonts", seed=8)
+    assert first == again
+    assert first != other
+
+
+def test_streaming_delivers_the_same_quotes(qapp, tmp_path):
+    data_dir = _write_data(tmp_path / "data")
+    streamed, events = _load(data_dir, tmp_path / "fonts", streaming=True, seed=3)
+    assert "ready" in events and "data_finished" in events
+    assert sorted(streamed) == sorted(_load(data_dir, tmp_path / "fonts", seed=3)[0])
@@ -0,0 +1,104 @@
+import pytest
+
+pytest.importorskip("PySide6")
+
+from PySide6.QtCore import QRect  # noqa: E402
+
+from python_app.clock import ShowClock  # noqa: E402
+from python_app.power import PowerManager  # noqa: E402
+from python_app.sync import SYNC_PORT, CanvasTile, SyncFollower, _decode, _encode, parse_address  # noqa: E402
+
+
+class FakeBoard:
+    """只提供从屏跟随所需的接口：演出时钟、电源管理与倍速。"""
+
+    def __init__(self) -> None:
+        self.show_clock = ShowClock(driven=True)
+        self.power = PowerManager()
+        self.power.register_hooks(self.show_clock.pause, self.show_clock.resume)
+        self.show_started = True
+        self.speeds = []
+
+    def show_time_ms(self) -> float:
+        return self.show_clock.now_ms()
+
+    def set_speed(self, speed: float) -> None:
+        self.speeds.append(speed)
+        self.show_clock.set_speed(speed)
+
+
+@pytest.fixture
+def follower(qapp):
+    follower = SyncFollower("127.0.0.1", hard_ms=500.0, slew_window_ms=2000.0, max_slew=0.5)
+    follower.board = FakeBoard()
+    yield follower
+    follower.close()
+
+
+def test_tile_geometry_parses_x11_style():
+    tile = CanvasTile.parse("3840x1080+1920+0")
+    assert tile == CanvasTile(3840, 1080, 1920, 0)
+    assert tile.canvas_rect() == QRect(-1920, 0, 3840, 1080)
+    assert CanvasTile.parse("1920X1080") == CanvasTile(1920, 1080, 0, 0)
+
+
+def test_bad_tile_is_rejected():
+    with pytest.raises(ValueError):
+        CanvasTile.parse("wide+left")
+
+
+def test_address_defaults_to_sync_port():
+    assert parse_address("10.0.0.2") == ("10.0.0.2", SYNC_PORT)
+    assert parse_address("10.0.0.2:9000") == ("10.0.0.2", 9000)
+
+
+def test_messages_round_trip_and_reject_other_versions():
+    message = _decode(_encode("tick", show_ms=1200.0, paused=False))
+    assert message == {"v": 1, "type": "tick", "show_ms": 1200.0, "paused": False}
+    assert _decode(b'{"v": 99, "type": "tick"}') is None
+    assert _decode(b"\xff") is None
+
+
+def test_large_lag_fast_forwards(follower):
+    board = follower.board
+    follower._follow({"show_ms": 2000.0, "speed": 1.0, "paused": False}, latency_ms=0.0)
+    assert follower.master_started
+    assert board.show_time_ms() == pytest.approx(2000.0)
+    assert board.show_clock.speed == 1.0
+
+
+def test_small_error_slews_speed(follower):
+    board = follower.board
+    board.show_clock.advance(1000.0)
+    follower._follow({"show_ms": 1100.0, "speed": 1.0, "paused": False}, latency_ms=0.0)
+    assert board.show_clock.speed == pytest.approx(1.05)
+    follower._follow({"show_ms": 800.0, "speed": 1.0, "paused": False}, latency_ms=0.0)
+    assert board.show_clock.speed == pytest.approx(0.9)
+    follower._follow({"show_ms": 0.0, "speed": 1.0, "paused": False}, latency_ms=0.0)
+    assert board.show_clock.speed == pytest.approx(0.5)
+
+
+def test_latency_is_scaled_by_master_speed(follower):
+    board = follower.board
+    follower._follow({"show_ms": 1000.0, "speed": 2.0, "paused": False}, latency_ms=400.0)
+    assert board.speeds == [2.0]
+    assert board.show_time_ms() == pytest.approx(1800.0)
+
+
+def test_master_pause_does_not_clear_local_pause(follower):
+    power = follower.board.power
+    power.set_reason("paused", True)
+    follower._follow({"show_ms": 0.0, "speed": 1.0, "paused": True}, latency_ms=0.0)
+    assert power.reasons == {"paused", "sync_paused"}
+    follower._follow({"show_ms": 0.0, "speed": 1.0, "paused": False}, latency_ms=0.0)
+    assert power.reasons == {"paused"}
+    assert follower.board.show_clock.paused
+
+
+def test_start_callbacks_wait_for_master(follower):
+    started = []
+    follower.when_master_started(lambda: started.append("board"))
+    follower._follow({"show_ms": None}, latency_ms=0.0)
+    assert started == []
+    follower._follow({"show_ms": 0.0, "speed": 1.0}, latency_ms=0.0)
+    assert started == ["board"]
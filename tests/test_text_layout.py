@@ -0,0 +1,68 @@
+import time
+
+import pytest
+
+pytest.importorskip("PySide6")
+
+from PySide6.QtCore import QCoreApplication  # noqa: E402
+
+from python_app.models import Quote  # noqa: E402
+from python_app.text_layout import (  # noqa: E402
+    CardLayoutCache,
+    available_text_width,
+    card_mode,
+    content_font,
+    measure_text_height,
+    target_width_for,
+)
+
+
+def test_width_grows_with_text_length():
+    assert [target_width_for("program", length) for length in (60, 61, 120, 121)] == [420, 500, 500, 580]
+    assert available_text_width("letter", 440) == 440 - 34 - 34
+    assert available_text_width("program", 100) == 160
+    assert card_mode(Quote("x", "#fff", "text")) == "program"
+    assert card_mode(Quote("x", "#fff", "book")) == "letter"
+
+
+def test_text_height_is_measured_once(qapp):
+    cache = CardLayoutCache()
+    font = content_font("letter")
+    text = "岁月静好，愿你被这个世界温柔以待。" * 6
+    height = cache.text_height(font, text, "letter", 520)
+    assert height == measure_text_height(font, text, available_text_width("letter", 520))
+    assert cache.text_height(font, text, "letter", 520) == height
+    assert (cache.hits, cache.misses) == (1, 1)
+    # 目标宽度不同是另一条缓存
+    cache.text_height(font, text, "letter", 440)
+    assert cache.misses == 2
+    assert len(cache) == 2
+
+
+def test_oldest_entries_are_evicted():
+    cache = CardLayoutCache(max_entries=2)
+    for index in range(3):
+        cache.store(f"t{index}", "program", "font", 420, index)
+    assert len(cache) == 2
+    assert cache.lookup("t0", "program", "font", 420) is None
+    assert cache.lookup("t2", "program", "font", 420) == 2
+
+
+def test_prefill_measures_in_the_background(qapp):
+    cache = CardLayoutCache()
+    quotes = [Quote(f"第{i}条金句，" * (i + 1), "#fff", "text" if i % 2 else "book") for i in range(8)]
+    finished = []
+    cache.prefill_async(quotes, on_finished=finished.append)
+    deadline = time.monotonic() + 5.0
+    while not finished and time.monotonic() < deadline:
+        QCoreApplication.processEvents()
+        time.sleep(0.005)
+    assert finished == [8]
+    for quote in quotes:
+        mode = card_mode(quote)
+        font = content_font(mode)
+        width = target_width_for(mode, len(quote.text))
+        assert cache.text_height(font, quote.text, mode, width) == measure_text_height(
+            font, quote.text, available_text_width(mode, width)
+        )
+    assert cache.misses == 0
@@ -0,0 +1,88 @@
+import pytest
+
+from python_app.timeline import SHOW_PHASES, ShowTimings, compile_timeline, derive_rng
+
+TIMINGS = ShowTimings()
+
+
+def _phases(timeline):
+    return [cue.phase for cue in timeline if cue.event == "phase"]
+
+
+def test_full_show_phase_boundaries():
+    timeline = compile_timeline(TIMINGS, 3, 2, 2, ["新年快乐"], seed=1)
+    starts = timeline.phase_starts()
+    assert _phases(timeline) == list(SHOW_PHASES)
+
+    text = TIMINGS.intro_ms + TIMINGS.card_fade_ms
+    book = text + 3 * TIMINGS.text_interval_ms + TIMINGS.fade_all_ms
+    fireworks = book + TIMINGS.phase_gap_ms + 2 * TIMINGS.book_interval_ms + TIMINGS.fade_all_ms
+    other = fireworks + TIMINGS.fireworks_lead_ms + TIMINGS.compliment_interval_ms("新年快乐")
+    idle = other + sum(timeline.other_intervals)
+    assert starts == {"intro": 0, "text": text, "book": book, "post_fireworks": fireworks, "other": other, "idle": idle}
+    assert timeline.duration_ms == idle
+    assert [cue.event for cue in timeline.cues[-2:]] == ["phase", "end"]
+
+
+def test_cards_and_bursts_are_counted_per_phase():
+    timeline = compile_timeline(TIMINGS, 4, 3, 5, ["a", "bb"], seed=2)
+    cards = [cue.phase for cue in timeline if cue.event == "card"]
+    assert cards == ["text"] * 4 + ["book"] * 3 + ["other"] * 5
+    assert sum(cue.event == "burst" for cue in timeline) == 2
+
+
+def test_without_compliments_three_default_rounds():
+    timeline = compile_timeline(TIMINGS, 1, 0, 0, [], seed=0)
+    bursts = [cue.at_ms for cue in timeline if cue.event == "burst"]
+    assert len(bursts) == 3
+    assert {b - a for a, b in zip(bursts, bursts[1:])} == {TIMINGS.heart_interval_ms}
+
+
+def test_book_only_show_skips_text_and_the_grid_fade():
+    timeline = compile_timeline(TIMINGS, 0, 2, 0, [], seed=0)
+    starts = timeline.phase_starts()
+    assert "text" not in starts
+    assert starts["post_fireworks"] - starts["book"] == 2 * TIMINGS.book_interval_ms
+
+
+def test_nothing_to_show_goes_straight_to_idle():
+    timeline = compile_timeline(TIMINGS, 0, 0, 0, [], seed=0)
+    assert _phases(timeline) == ["intro", "idle"]
+    assert timeline.phase_start("idle") == TIMINGS.intro_ms + TIMINGS.card_fade_ms
+
+
+def test_kiosk_rounds_have_no_intro():
+    timeline = compile_timeline(TIMINGS, 2, 0, 0, [], seed=0, intro=False)
+    assert timeline.phase_start("text") == 0
+    with pytest.raises(ValueError):
+        timeline.phase_start("intro")
+
+
+def test_fireworks_fade_in_lengthens_the_lead():
+    timings = ShowTimings(fireworks_fade_in=True)
+    plain = compile_timeline(TIMINGS, 1, 0, 1, ["x"], seed=3).phase_starts()
+    faded = compile_timeline(timings, 1, 0, 1, ["x"], seed=3).phase_starts()
+    assert faded["post_fireworks"] == plain["post_fireworks"]
+    assert faded["other"] - plain["other"] == timings.fireworks_fade_ms + timings.fireworks_pause_ms - timings.phase_gap_ms
+
+
+def test_other_intervals_depend_only_on_the_seed():
+    first = compile_timeline(TIMINGS, 0, 0, 20, [], seed=9)
+    second = compile_timeline(TIMINGS, 0, 0, 20, [], seed=9)
+    assert first.other_intervals == second.other_intervals
+    low, high = TIMINGS.other_interval_ms
+    assert all(low <= interval <= high for interval in first.other_intervals)
+    assert first.other_interval(20) is None and first.other_interval(-1) is None
+
+
+def test_compliment_interval_has_reading_time():
+    assert TIMINGS.compliment_interval_ms("") == TIMINGS.heart_interval_ms
+    assert TIMINGS.compliment_interval_ms("新年") == 2 * TIMINGS.compliment_char_ms + 1000
+    long_text = "福" * 200
+    assert TIMINGS.compliment_interval_ms(long_text) == 200 * TIMINGS.compliment_char_ms + 3000
+
+
+def test_derived_streams_are_reproducible_and_independent():
+    assert derive_rng(7, "fireworks").random() == derive_rng(7, "fireworks").random()
+    assert derive_rng(7, "fireworks").random() != derive_rng(7, "quote_order").random()
+    assert derive_rng(7, "fireworks").random() != derive_rng(8, "fireworks").random()